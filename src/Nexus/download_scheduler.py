@@ -0,0 +1,283 @@
+"""
+download_scheduler.py
+Process-wide scheduler shared by every NexusDownloader.
+
+The collection pipeline, the Nexus browser and the modlist "update" path each
+ran their own NexusDownloader with no shared view of connections or
+bandwidth, so a slow 10 GB archive could hold a slot while dozens of tiny
+mods waited behind it.  All CDN transfers now go through one scheduler:
+
+- **Connection cap** — at most ``max_connections`` streams run at once.
+- **Size-aware ordering** — waiting jobs are admitted by (priority desc,
+  expected size asc, arrival), i.e. shortest-job-first within a priority.
+  Unknown sizes are looked up in a cache primed from
+  ``NexusAPI.graphql_file_sizes_batch`` (:meth:`prime_sizes`) and otherwise
+  sort last.
+- **Priority** — each job is queued with a priority (collections low,
+  one-off downloads normal), so bulk traffic never delays a single download.
+  :meth:`set_priority` re-ranks a waiting job at runtime (the status-bar
+  queue popup uses it for "Download next").
+- **Bandwidth cap** — a shared token bucket throttles the combined stream
+  rate to ``max_bytes_per_sec`` (0 = unlimited).
+- **Metrics** — :meth:`metrics` returns a :class:`DownloadMetrics` snapshot
+  (active/queued jobs, aggregate throughput) for the status bar.
+
+Usage::
+
+    sched = get_download_scheduler()
+    with sched.slot("SkyUI.7z", size_bytes=12_000_000) as job:
+        for chunk in resp.iter_content(...):
+            sched.consume(len(chunk), job)
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from Utils.app_log import app_log
+
+# Priorities — higher runs first.  User-initiated single downloads jump ahead
+# of bulk collection traffic.
+PRIORITY_LOW = -10
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 10
+
+_DEFAULT_MAX_CONNECTIONS = 8
+_RATE_WINDOW = 3.0   # seconds of history used for the throughput figure
+
+
+@dataclass
+class DownloadJob:
+    """A download registered with the scheduler."""
+    job_id: int
+    name: str
+    size_bytes: int = 0
+    priority: int = PRIORITY_NORMAL
+    seq: int = 0
+    bytes_done: int = 0
+    started_at: float = 0.0
+
+    def sort_key(self) -> tuple:
+        # Unknown sizes sort after every known size within the same priority.
+        size = self.size_bytes if self.size_bytes > 0 else float("inf")
+        return (-self.priority, size, self.seq)
+
+
+@dataclass
+class DownloadMetrics:
+    """Snapshot of scheduler state for UI display."""
+    active: int = 0
+    queued: int = 0
+    bytes_per_sec: float = 0.0
+    total_bytes: int = 0
+    max_connections: int = 0
+    max_bytes_per_sec: int = 0
+
+
+class DownloadScheduler:
+    """Global connection / bandwidth scheduler (thread-safe)."""
+
+    def __init__(self, max_connections: int = _DEFAULT_MAX_CONNECTIONS,
+                 max_bytes_per_sec: int = 0):
+        self._cond = threading.Condition()
+        self._max_connections = max(1, int(max_connections))
+        self._max_bps = max(0, int(max_bytes_per_sec))
+        self._ids = itertools.count(1)
+        self._waiting: dict[int, DownloadJob] = {}
+        self._active: dict[int, DownloadJob] = {}
+        self._size_cache: dict[tuple[int, int], int] = {}
+        # Token bucket (bandwidth cap) — guarded by its own lock so chunk
+        # accounting never contends with admission.
+        self._bucket_lock = threading.Lock()
+        self._tokens = 0.0
+        self._bucket_ts = time.monotonic()
+        # Throughput samples: (monotonic_ts, nbytes)
+        self._samples: list[tuple[float, int]] = []
+        self._total_bytes = 0
+
+    # -- configuration ------------------------------------------------------
+
+    def configure(self, max_connections: Optional[int] = None,
+                  max_bytes_per_sec: Optional[int] = None) -> None:
+        """Change the caps at runtime; waiting jobs are re-evaluated."""
+        with self._cond:
+            if max_connections is not None:
+                self._max_connections = max(1, int(max_connections))
+            if max_bytes_per_sec is not None:
+                self._max_bps = max(0, int(max_bytes_per_sec))
+            self._cond.notify_all()
+
+    # -- size information ---------------------------------------------------
+
+    def prime_sizes(self, api, game_domain: str,
+                    mod_file_pairs: list[tuple[int, int]]) -> None:
+        """Fill the size cache for (mod_id, file_id) pairs not yet known.
+
+        One ``graphql_file_sizes_batch`` call covers the whole list, so it is
+        cheap to call before queueing a batch of downloads.
+        """
+        with self._cond:
+            missing = [p for p in mod_file_pairs if p not in self._size_cache]
+        if not missing or api is None:
+            return
+        try:
+            sizes = api.graphql_file_sizes_batch(game_domain, missing)
+        except Exception as exc:
+            app_log(f"Download scheduler: size lookup failed ({exc})")
+            return
+        with self._cond:
+            self._size_cache.update(sizes)
+
+    def known_size(self, mod_id: int, file_id: int) -> int:
+        with self._cond:
+            return self._size_cache.get((mod_id, file_id), 0)
+
+    def remember_size(self, mod_id: int, file_id: int, size_bytes: int) -> None:
+        if mod_id > 0 and file_id > 0 and size_bytes > 0:
+            with self._cond:
+                self._size_cache[(mod_id, file_id)] = size_bytes
+
+    # -- admission ----------------------------------------------------------
+
+    def _next_admissible(self) -> Optional[int]:
+        if len(self._active) >= self._max_connections or not self._waiting:
+            return None
+        return min(self._waiting.values(), key=DownloadJob.sort_key).job_id
+
+    @contextmanager
+    def slot(
+        self,
+        name: str,
+        size_bytes: int = 0,
+        priority: int = PRIORITY_NORMAL,
+        mod_id: int = 0,
+        file_id: int = 0,
+        cancel: Optional[threading.Event] = None,
+    ) -> Iterator[Optional[DownloadJob]]:
+        """Block until this job may open a connection, then yield it.
+
+        Yields None if *cancel* is set while waiting; the caller should then
+        abort without transferring anything.
+        """
+        if size_bytes <= 0 and mod_id and file_id:
+            size_bytes = self.known_size(mod_id, file_id)
+        job = DownloadJob(job_id=next(self._ids), name=name,
+                          size_bytes=size_bytes, priority=priority)
+        job.seq = job.job_id
+        admitted = False
+        with self._cond:
+            self._waiting[job.job_id] = job
+            try:
+                while self._next_admissible() != job.job_id:
+                    if cancel is not None and cancel.is_set():
+                        break
+                    self._cond.wait(timeout=0.5)
+                else:
+                    admitted = True
+            finally:
+                self._waiting.pop(job.job_id, None)
+                if admitted:
+                    job.started_at = time.monotonic()
+                    self._active[job.job_id] = job
+                self._cond.notify_all()
+        if not admitted:
+            yield None
+            return
+        try:
+            yield job
+        finally:
+            with self._cond:
+                self._active.pop(job.job_id, None)
+                self._cond.notify_all()
+
+    def set_priority(self, job_id: int, priority: int) -> bool:
+        """Re-rank a waiting job.  Returns False if it is no longer queued.
+
+        Admission always picks the best ``sort_key`` among waiting jobs, so
+        waking the waiters is enough for the new order to take effect.
+        """
+        with self._cond:
+            job = self._waiting.get(job_id)
+            if job is None:
+                return False
+            job.priority = priority
+            self._cond.notify_all()
+            return True
+
+    def jobs(self) -> list[DownloadJob]:
+        """Return active jobs followed by waiting jobs in admission order."""
+        with self._cond:
+            waiting = sorted(self._waiting.values(), key=DownloadJob.sort_key)
+            return list(self._active.values()) + waiting
+
+    # -- bandwidth ----------------------------------------------------------
+
+    def consume(self, nbytes: int, job: Optional[DownloadJob] = None) -> None:
+        """Account *nbytes* just received; sleeps as needed to honour the cap."""
+        now = time.monotonic()
+        with self._bucket_lock:
+            self._total_bytes += nbytes
+            self._samples.append((now, nbytes))
+            if len(self._samples) > 4096:
+                cutoff = now - _RATE_WINDOW
+                self._samples = [s for s in self._samples if s[0] >= cutoff]
+            if job is not None:
+                job.bytes_done += nbytes
+            rate = self._max_bps
+            if rate <= 0:
+                return
+            # Refill, allowing at most one second of burst.
+            self._tokens = min(rate, self._tokens + (now - self._bucket_ts) * rate)
+            self._bucket_ts = now
+            self._tokens -= nbytes
+            deficit = -self._tokens
+        if deficit > 0:
+            time.sleep(deficit / rate)
+
+    # -- metrics ------------------------------------------------------------
+
+    def metrics(self) -> DownloadMetrics:
+        now = time.monotonic()
+        cutoff = now - _RATE_WINDOW
+        with self._bucket_lock:
+            recent = sum(n for ts, n in self._samples if ts >= cutoff)
+            total = self._total_bytes
+        with self._cond:
+            active = len(self._active)
+            queued = len(self._waiting)
+            max_conn = self._max_connections
+            max_bps = self._max_bps
+        return DownloadMetrics(
+            active=active,
+            queued=queued,
+            bytes_per_sec=recent / _RATE_WINDOW,
+            total_bytes=total,
+            max_connections=max_conn,
+            max_bytes_per_sec=max_bps,
+        )
+
+
+_scheduler: Optional[DownloadScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_download_scheduler() -> DownloadScheduler:
+    """Return the process-wide scheduler, configured from amethyst.ini."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            try:
+                from Utils.ui_config import load_download_scheduler_settings
+                cfg = load_download_scheduler_settings()
+            except Exception:
+                cfg = {}
+            _scheduler = DownloadScheduler(
+                max_connections=cfg.get("max_connections", _DEFAULT_MAX_CONNECTIONS),
+                max_bytes_per_sec=cfg.get("max_bandwidth_kbps", 0) * 1024,
+            )
+        return _scheduler
@@ -0,0 +1,253 @@
+"""
+meta_catalog.py
+Consolidated, persisted catalog of every mod's ``meta.ini``.
+
+The update checker, the modlist panel and several dialogs used to open and
+parse ``meta.ini`` for every mod in staging, often several times per
+refresh.  The catalog parses each file once, keeps the result in memory and
+persists it next to ``modindex.bin`` so a fresh session only has to
+``stat()`` each ``meta.ini`` instead of running configparser on it.  Hits
+also seed the ``read_meta`` memo in :mod:`Nexus.nexus_meta`, so one-off
+``read_meta`` calls (context menus, endorse/update actions) on a mod the
+catalog has seen do not re-parse its file.
+
+Entries are validated by the ``meta.ini`` (mtime_ns, size) pair, so a file
+edited behind our back (MO2, a text editor, ``write_meta``) is re-read on the
+next lookup.  The install / rename / remove paths also update the catalog
+directly via :func:`refresh_catalog_entries`, :func:`rename_in_meta_catalog`
+and :func:`remove_from_meta_catalog`.
+
+Catalog format — msgpack binary, v1, at ``<staging_root.parent>/metacatalog.bin``:
+    {"v": 1, "mods": {folder_name: [mtime_ns, size, {attr: value, ...}]}}
+where the attribute dict holds the :class:`NexusModMeta` fields.
+Folders without a ``meta.ini`` are recorded as ``[0, -1, None]`` so they are
+not probed again until one appears.
+
+Returned :class:`NexusModMeta` objects are fresh copies; callers may mutate
+them freely (e.g. before ``write_meta``).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+import msgpack
+
+from Nexus.nexus_meta import NexusModMeta, read_meta, remember_meta
+
+_CATALOG_VERSION = 1
+_CATALOG_NAME = "metacatalog.bin"
+
+_META_FIELDS = tuple(f.name for f in dataclasses.fields(NexusModMeta))
+
+# Sentinel stat key for folders that have no meta.ini.
+_NO_META = (0, -1)
+
+
+def _stat_key(meta_path: str) -> tuple[int, int]:
+    try:
+        st = os.stat(meta_path)
+    except OSError:
+        return _NO_META
+    return (st.st_mtime_ns, st.st_size)
+
+
+class MetaCatalog:
+    """In-memory ``meta.ini`` catalog for one staging root (thread-safe)."""
+
+    def __init__(self, staging_root: Path):
+        self.staging_root = Path(staging_root)
+        self.path = self.staging_root.parent / _CATALOG_NAME
+        self._lock = threading.RLock()
+        # folder_name -> (stat_key, attrs dict | None)
+        self._entries: dict[str, tuple[tuple[int, int], Optional[dict]]] = {}
+        self._dirty = False
+        self._load()
+
+    # -- persistence --------------------------------------------------------
+
+    def _load(self) -> None:
+        try:
+            with self.path.open("rb") as f:
+                data = msgpack.unpack(f, raw=False)
+        except Exception:
+            return
+        if not isinstance(data, dict) or data.get("v") != _CATALOG_VERSION:
+            return
+        mods = data.get("mods")
+        if not isinstance(mods, dict):
+            return
+        for name, entry in mods.items():
+            # Skip entries this version can't use (old schema, truncated
+            # write) rather than discarding the whole catalog; they are
+            # re-read from meta.ini on the next lookup.
+            try:
+                mtime_ns, size, attrs = entry
+                if attrs is not None:
+                    NexusModMeta(**attrs)
+                self._entries[name] = ((int(mtime_ns), int(size)), attrs)
+            except (TypeError, ValueError):
+                self._dirty = True
+
+    def save(self) -> None:
+        """Write the catalog atomically if anything changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {
+                "v": _CATALOG_VERSION,
+                "mods": {
+                    name: [key[0], key[1], attrs]
+                    for name, (key, attrs) in self._entries.items()
+                },
+            }
+            self._dirty = False
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp.open("wb") as f:
+                msgpack.pack(payload, f, use_bin_type=True)
+            tmp.replace(self.path)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+    # -- lookups ------------------------------------------------------------
+
+    def _lookup(self, name: str) -> Optional[dict]:
+        """Return the attrs dict for *name*, re-reading meta.ini if it changed."""
+        meta_path = os.path.join(self.staging_root, name, "meta.ini")
+        key = _stat_key(meta_path)
+        with self._lock:
+            cached = self._entries.get(name)
+            if cached is not None and cached[0] == key:
+                attrs = cached[1]
+                if attrs is not None:
+                    # Let plain read_meta() calls on this file skip parsing too.
+                    remember_meta(Path(meta_path), key, NexusModMeta(**attrs))
+                return attrs
+        if key == _NO_META:
+            attrs = None
+        else:
+            meta = read_meta(Path(meta_path))
+            attrs = {f: getattr(meta, f) for f in _META_FIELDS}
+        with self._lock:
+            self._entries[name] = (key, attrs)
+            self._dirty = True
+        return attrs
+
+    def get(self, mod_name: str) -> Optional[NexusModMeta]:
+        """Return the metadata for *mod_name*, or None if it has no meta.ini."""
+        attrs = self._lookup(mod_name)
+        if attrs is None:
+            return None
+        meta = NexusModMeta(**attrs)
+        meta.mod_name = mod_name
+        return meta
+
+    def get_many(self, mod_names: Iterable[str]) -> dict[str, NexusModMeta]:
+        """Return {mod_name: meta} for the given folders that have a meta.ini."""
+        out: dict[str, NexusModMeta] = {}
+        for name in mod_names:
+            meta = self.get(name)
+            if meta is not None:
+                out[name] = meta
+        return out
+
+    def all(self) -> dict[str, NexusModMeta]:
+        """Return {folder_name: meta} for every folder in staging with a meta.ini.
+
+        Also drops catalog entries whose folder no longer exists.
+        """
+        try:
+            with os.scandir(self.staging_root) as it:
+                names = sorted(e.name for e in it if e.is_dir())
+        except OSError:
+            names = []
+        live = set(names)
+        with self._lock:
+            for stale in [n for n in self._entries if n not in live]:
+                del self._entries[stale]
+                self._dirty = True
+        return self.get_many(names)
+
+    # -- mutations ----------------------------------------------------------
+
+    def refresh(self, mod_names: Iterable[str]) -> None:
+        """Force a re-read of the given mods' meta.ini (after install/edit)."""
+        mod_names = list(mod_names)
+        with self._lock:
+            for name in mod_names:
+                if self._entries.pop(name, None) is not None:
+                    self._dirty = True
+        for name in mod_names:
+            self._lookup(name)
+
+    def remove(self, mod_names: Iterable[str]) -> None:
+        with self._lock:
+            for name in mod_names:
+                if self._entries.pop(name, None) is not None:
+                    self._dirty = True
+
+    def rename(self, old_name: str, new_name: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(old_name, None)
+            if entry is None:
+                return
+            key, attrs = entry
+            if attrs is not None:
+                attrs = dict(attrs, mod_name=new_name)
+            self._entries[new_name] = (key, attrs)
+            self._dirty = True
+
+
+# ---------------------------------------------------------------------------
+# Process-wide registry
+# ---------------------------------------------------------------------------
+
+_catalogs: dict[str, MetaCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_meta_catalog(staging_root: Path) -> MetaCatalog:
+    """Return the shared catalog for *staging_root* (created on first use).
+
+    Keyed by the resolved path, so every spelling of one staging folder
+    (symlink, relative path, trailing separator) shares one catalog."""
+    root = Path(staging_root).resolve()
+    key = str(root)
+    with _catalogs_lock:
+        cat = _catalogs.get(key)
+        if cat is None:
+            cat = MetaCatalog(root)
+            _catalogs[key] = cat
+        return cat
+
+
+def refresh_catalog_entries(staging_root: Path, mod_names: Iterable[str]) -> None:
+    """Re-read and persist the catalog entries for freshly installed/edited mods."""
+    cat = get_meta_catalog(staging_root)
+    cat.refresh(list(mod_names))
+    cat.save()
+
+
+def remove_from_meta_catalog(staging_root: Path, mod_names: Iterable[str]) -> None:
+    """Drop catalog entries after their staging folders were deleted."""
+    cat = get_meta_catalog(staging_root)
+    cat.remove(list(mod_names))
+    cat.save()
+
+
+def rename_in_meta_catalog(staging_root: Path, old_name: str, new_name: str) -> None:
+    """Move a catalog entry after its staging folder was renamed."""
+    if old_name == new_name:
+        return
+    cat = get_meta_catalog(staging_root)
+    cat.rename(old_name, new_name)
+    cat.save()
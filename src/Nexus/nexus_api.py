@@ -28,10 +28,11 @@ from __future__ import annotations
 
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import keyring
 import requests
@@ -416,9 +417,34 @@ class NexusAPIError(Exception):
 
 
 class RateLimitError(NexusAPIError):
-    """Raised when the server returns HTTP 429."""
-    def __init__(self, url: str = ""):
+    """Raised when the server returns HTTP 429.
+
+    *retry_after* is the server's Retry-After delay in seconds (0 if absent).
+    """
+    def __init__(self, url: str = "", retry_after: float = 0.0):
         super().__init__("Rate limit exceeded — slow down", 429, url)
+        self.retry_after = retry_after
+
+
+def _retry_after_seconds(resp: requests.Response) -> float:
+    """Delay requested by a Retry-After header (seconds form only), or 0."""
+    try:
+        return max(0.0, float(resp.headers.get("Retry-After", "")))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """True for failures a later attempt can fix: transport errors, 429 and
+    5xx.  Other 4xx responses (bad key, forbidden, not found) and malformed
+    payloads will fail the same way again."""
+    if isinstance(exc, RateLimitError):
+        return True
+    if isinstance(exc, NexusAPIError):
+        if exc.status_code >= 500:
+            return True
+        return isinstance(exc.__cause__, requests.RequestException)
+    return isinstance(exc, requests.RequestException)
 
 
 class NexusAPI:
@@ -1270,6 +1296,102 @@ class NexusAPI:
             app_log(f"GraphQL NxmModAndFile error: {exc}")
             return (None, None)
 
+    # -- Pipelined GraphQL batches -------------------------------------------
+
+    _GRAPHQL_CONCURRENCY = 4     # chunks in flight at once for a single batch call
+    _GRAPHQL_CHUNK_RETRIES = 1   # extra attempts for a chunk that failed outright
+    _GRAPHQL_MAX_RETRY_AFTER = 60.0  # give up rather than wait longer on a 429
+
+    def _post_graphql_chunk(self, label: str, body: dict) -> dict:
+        """
+        POST one GraphQL chunk and return the decoded payload.
+
+        Raises NexusAPIError on transport failures, non-OK responses and
+        non-dict payloads; _run_graphql_chunks retries the transient ones.
+        Partial ``errors`` alongside ``data`` are logged but not fatal.
+        """
+        try:
+            resp = self._session.post(GRAPHQL_BASE, json=body, timeout=self._timeout)
+        except requests.RequestException as exc:
+            raise NexusAPIError(f"Connection failed: {exc}", url=GRAPHQL_BASE) from exc
+        self._log_response("POST", f"GraphQL {label}", resp)
+        if resp.status_code == 429:
+            raise RateLimitError(GRAPHQL_BASE, _retry_after_seconds(resp))
+        if not resp.ok:
+            raise NexusAPIError(
+                f"GraphQL {label} failed: {resp.status_code}",
+                resp.status_code, GRAPHQL_BASE)
+        payload = resp.json()
+        if not isinstance(payload, dict):
+            raise NexusAPIError(
+                f"GraphQL {label}: unexpected response format", url=GRAPHQL_BASE)
+        if "errors" in payload:
+            app_log(f"GraphQL {label} errors: {payload['errors']}")
+        return payload
+
+    def _run_graphql_chunks(
+        self,
+        label: str,
+        chunks: list[list],
+        fetch_chunk: "Callable[[list], dict]",
+    ) -> dict:
+        """
+        Run *fetch_chunk* over every chunk with up to _GRAPHQL_CONCURRENCY
+        requests in flight, and merge the returned dicts in chunk order.
+
+        A chunk that fails transiently (connection error, 429, 5xx — see
+        _is_retryable) is retried on its own (serially, after the concurrent
+        pass) up to _GRAPHQL_CHUNK_RETRIES times, waiting at least as long
+        as any Retry-After the server sent.  Other failures are not retried:
+        a 401/403/404 would only fail again and spend rate-limit budget.
+        Chunks that still fail are logged and left out — callers already
+        treat missing mods as "fall back to REST".
+        """
+        if not chunks:
+            return {}
+        self._refresh_oauth_if_needed()
+        chunk_results: list[dict | None] = [None] * len(chunks)
+        errors: dict[int, BaseException] = {}
+        failed: list[int] = []
+
+        def _attempt(idx: int) -> bool:
+            try:
+                chunk_results[idx] = fetch_chunk(chunks[idx])
+                errors.pop(idx, None)
+                return True
+            except Exception as exc:
+                errors[idx] = exc
+                app_log(f"GraphQL {label} chunk {idx + 1}/{len(chunks)} error: {exc}")
+                return False
+
+        workers = max(1, min(self._GRAPHQL_CONCURRENCY, len(chunks)))
+        if workers == 1:
+            failed = [i for i in range(len(chunks)) if not _attempt(i)]
+        else:
+            with ThreadPoolExecutor(max_workers=workers,
+                                    thread_name_prefix="nexus_gql") as pool:
+                ok = list(pool.map(_attempt, range(len(chunks))))
+            failed = [i for i, good in enumerate(ok) if not good]
+
+        for attempt in range(self._GRAPHQL_CHUNK_RETRIES):
+            retry = [i for i in failed if _is_retryable(errors[i])
+                     and getattr(errors[i], "retry_after", 0.0) <= self._GRAPHQL_MAX_RETRY_AFTER]
+            if not retry:
+                break
+            wait = max([_RATE_LIMIT_BACKOFF * (attempt + 1)]
+                       + [getattr(errors[i], "retry_after", 0.0) for i in retry])
+            time.sleep(wait)
+            app_log(f"GraphQL {label}: retrying {len(retry)} failed chunk(s)")
+            failed = [i for i in failed if i not in retry or not _attempt(i)]
+        if failed:
+            app_log(f"GraphQL {label}: {len(failed)} chunk(s) failed")
+
+        merged: dict = {}
+        for part in chunk_results:
+            if part:
+                merged.update(part)
+        return merged
+
     # -- Batch update check (GraphQL v2) ------------------------------------
 
     _GRAPHQL_UPDATE_BATCH = 20  # legacyModsByDomain returns at most 20 nodes per request
@@ -1316,34 +1438,20 @@ class NexusAPI:
             }
         }
         """
-        results: dict[int, NexusModUpdateInfo] = {}
-        batch_size = self._GRAPHQL_UPDATE_BATCH
-        for i in range(0, len(ids), batch_size):
-            batch = ids[i: i + batch_size]
+
+        def _fetch(batch: list[tuple[str, int]]) -> dict[int, NexusModUpdateInfo]:
             variables = {
                 "ids": [{"gameDomain": gd, "modId": mid} for gd, mid in batch]
             }
-            try:
-                resp = self._session.post(
-                    GRAPHQL_BASE,
-                    json={"query": query, "variables": variables},
-                    timeout=self._timeout,
-                )
-                self._log_response("POST", "GraphQL batchUpdateCheck", resp)
-                if not resp.ok:
-                    app_log(f"GraphQL batch update check failed: {resp.status_code}")
-                    continue
-                data = resp.json()
-                if not isinstance(data, dict):
-                    app_log("GraphQL batch update check: unexpected response format")
-                    continue
-                if "errors" in data:
-                    app_log(f"GraphQL batch update check errors: {data['errors']}")
-                nodes = (
-                    (data.get("data") or {})
-                    .get("legacyModsByDomain") or {}
-                ).get("nodes") or []
-                for n in nodes:
+            data = self._post_graphql_chunk(
+                "batchUpdateCheck", {"query": query, "variables": variables})
+            nodes = (
+                (data.get("data") or {})
+                .get("legacyModsByDomain") or {}
+            ).get("nodes") or []
+            part: dict[int, NexusModUpdateInfo] = {}
+            for n in nodes:
+                try:
                     mid = int(n.get("modId", 0))
                     updated_at = None
                     raw_ts = n.get("updatedAt")
@@ -1377,7 +1485,7 @@ class NexusAPI:
                     cat_id = int(mcat.get("categoryId") or 0) if isinstance(mcat.get("categoryId"), (int, str)) else 0
                     cat_name = (mcat.get("name") or "").strip() if isinstance(mcat.get("name"), str) else ""
                     # Mod type from legacyModsByDomain has no 'files' field; file-level checks use REST get_mod_files
-                    results[mid] = NexusModUpdateInfo(
+                    part[mid] = NexusModUpdateInfo(
                         mod_id=mid,
                         name=n.get("name", "") or "",
                         version=n.get("version", "") or "",
@@ -1388,9 +1496,14 @@ class NexusAPI:
                         category_name=cat_name,
                         files=[],  # Mod has no files field in GraphQL; REST used for file checks
                     )
-            except Exception as exc:
-                app_log(f"GraphQL batch update check error: {exc}")
-        return results
+                except (AttributeError, TypeError, ValueError) as exc:
+                    # One malformed entry must not hide the rest of the chunk.
+                    app_log(f"GraphQL batchUpdateCheck: skipping malformed entry for a mod: {exc}")
+            return part
+
+        batch_size = self._GRAPHQL_UPDATE_BATCH
+        chunks = [ids[i: i + batch_size] for i in range(0, len(ids), batch_size)]
+        return self._run_graphql_chunks("batchUpdateCheck", chunks, _fetch)
 
     def graphql_mod_files_batch(
         self,
@@ -1440,11 +1553,7 @@ class NexusAPI:
             app_log(f"GraphQL modFilesBatch: could not resolve game ID for {game_domain!r}")
             return {}
 
-        results: dict[int, list[NexusModFile]] = {}
-        unique_mods = list(dict.fromkeys(mod_ids))
-        batch_size = self._GRAPHQL_FILE_BATCH
-        for i in range(0, len(unique_mods), batch_size):
-            batch = unique_mods[i: i + batch_size]
+        def _fetch(batch: list[int]) -> dict[int, list[NexusModFile]]:
             aliases = "\n".join(
                 f"    m{mid}: modFiles(gameId: {game_id}, modId: {mid}) {{\n"
                 f"        fileId name version description\n"
@@ -1454,21 +1563,11 @@ class NexusAPI:
                 for mid in batch
             )
             query = f"query ModFilesBatch {{\n{aliases}\n}}"
-            try:
-                resp = self._session.post(
-                    GRAPHQL_BASE,
-                    json={"query": query},
-                    timeout=self._timeout,
-                )
-                self._log_response("POST", "GraphQL modFilesBatch", resp)
-                if not resp.ok:
-                    app_log(f"GraphQL modFilesBatch failed: {resp.status_code}")
-                    continue
-                payload = resp.json()
-                if "errors" in payload:
-                    app_log(f"GraphQL modFilesBatch errors: {payload['errors']}")
-                data = (payload.get("data") or {})
-                for mid in batch:
+            payload = self._post_graphql_chunk("modFilesBatch", {"query": query})
+            data = (payload.get("data") or {})
+            part: dict[int, list[NexusModFile]] = {}
+            for mid in batch:
+                try:
                     entries = data.get(f"m{mid}")
                     if not entries:
                         continue
@@ -1508,11 +1607,16 @@ class NexusAPI:
                             uploaded_timestamp=ts,
                         ))
                     if files:
-                        results[mid] = files
-            except Exception as exc:
-                app_log(f"GraphQL modFilesBatch error: {exc}")
+                        part[mid] = files
+                except (AttributeError, TypeError, ValueError) as exc:
+                    app_log(f"GraphQL modFilesBatch: skipping malformed entry for mod {mid}: {exc}")
+            return part
 
-        return results
+        unique_mods = list(dict.fromkeys(mod_ids))
+        batch_size = self._GRAPHQL_FILE_BATCH
+        chunks = [unique_mods[i: i + batch_size]
+                  for i in range(0, len(unique_mods), batch_size)]
+        return self._run_graphql_chunks("modFilesBatch", chunks, _fetch)
 
     def graphql_mod_info_batch(
         self,
@@ -1553,37 +1657,26 @@ class NexusAPI:
             }
         }
         """
-        results: dict[int, NexusModInfo] = {}
-        batch_size = self._GRAPHQL_UPDATE_BATCH
-        for i in range(0, len(ids), batch_size):
-            batch = ids[i: i + batch_size]
+
+        def _fetch(batch: list[tuple[str, int]]) -> dict[int, NexusModInfo]:
             variables = {
                 "ids": [{"gameDomain": gd, "modId": mid} for gd, mid in batch]
             }
-            try:
-                resp = self._session.post(
-                    GRAPHQL_BASE,
-                    json={"query": query, "variables": variables},
-                    timeout=self._timeout,
-                )
-                self._log_response("POST", "GraphQL modInfoBatch", resp)
-                if not resp.ok:
-                    app_log(f"GraphQL modInfoBatch failed: {resp.status_code}")
-                    continue
-                data = resp.json()
-                if "errors" in data:
-                    app_log(f"GraphQL modInfoBatch errors: {data['errors']}")
-                nodes = (
-                    (data.get("data") or {})
-                    .get("legacyModsByDomain") or {}
-                ).get("nodes") or []
-                for n in nodes:
+            data = self._post_graphql_chunk(
+                "modInfoBatch", {"query": query, "variables": variables})
+            nodes = (
+                (data.get("data") or {})
+                .get("legacyModsByDomain") or {}
+            ).get("nodes") or []
+            part: dict[int, NexusModInfo] = {}
+            for n in nodes:
+                try:
                     mid = int(n.get("modId", 0))
                     domain = (n.get("game") or {}).get("domainName", "") or ""
                     # Use the domain from the input batch if GraphQL doesn't return it
                     if not domain:
                         domain = next((gd for gd, bid in batch if bid == mid), "")
-                    results[mid] = NexusModInfo(
+                    part[mid] = NexusModInfo(
                         mod_id=mid,
                         name=n.get("name", "") or "",
                         summary=n.get("summary", "") or "",
@@ -1597,9 +1690,13 @@ class NexusAPI:
                         endorsement_count=int(n.get("endorsements", 0) or 0),
                         downloads_total=int(n.get("downloads", 0) or 0),
                     )
-            except Exception as exc:
-                app_log(f"GraphQL modInfoBatch error: {exc}")
-        return results
+                except (AttributeError, TypeError, ValueError) as exc:
+                    app_log(f"GraphQL modInfoBatch: skipping malformed entry for a mod: {exc}")
+            return part
+
+        batch_size = self._GRAPHQL_UPDATE_BATCH
+        chunks = [ids[i: i + batch_size] for i in range(0, len(ids), batch_size)]
+        return self._run_graphql_chunks("modInfoBatch", chunks, _fetch)
 
     # -- Batch file-size lookup (GraphQL v2) ---------------------------------
 
@@ -1649,12 +1746,7 @@ class NexusAPI:
         for mod_id, file_id in mod_file_pairs:
             mod_to_file_ids[mod_id].append(file_id)
 
-        unique_mods = list(mod_to_file_ids.keys())
-        results: dict[tuple[int, int], int] = {}
-
-        batch_size = self._GRAPHQL_FILE_BATCH
-        for i in range(0, len(unique_mods), batch_size):
-            batch = unique_mods[i: i + batch_size]
+        def _fetch(batch: list[int]) -> dict[tuple[int, int], int]:
             # One alias per mod: m<mod_id>: modFiles(gameId: <int>, modId: <int>)
             aliases = "\n".join(
                 f"    m{mid}: modFiles(gameId: {game_id}, modId: {mid}) {{\n"
@@ -1662,28 +1754,26 @@ class NexusAPI:
                 for mid in batch
             )
             query = f"query FileSizesBatch {{\n{aliases}\n}}"
-            try:
-                resp = self._session.post(
-                    GRAPHQL_BASE,
-                    json={"query": query},
-                    timeout=self._timeout,
-                )
-                self._log_response("POST", "GraphQL fileSizesBatch", resp)
-                if not resp.ok:
-                    app_log(f"GraphQL fileSizesBatch failed: {resp.status_code}")
-                    continue
-                data = (resp.json().get("data") or {})
-                for mid in batch:
+            payload = self._post_graphql_chunk("fileSizesBatch", {"query": query})
+            data = (payload.get("data") or {})
+            part: dict[tuple[int, int], int] = {}
+            for mid in batch:
+                try:
                     entries = data.get(f"m{mid}") or []
                     for entry in entries:
                         fid = int(entry.get("fileId") or 0)
                         sz  = int(entry.get("sizeInBytes") or 0)
-                        if fid and (mid, fid) not in results:
-                            results[(mid, fid)] = sz
-            except Exception as exc:
-                app_log(f"GraphQL fileSizesBatch error: {exc}")
+                        if fid and (mid, fid) not in part:
+                            part[(mid, fid)] = sz
+                except (AttributeError, TypeError, ValueError) as exc:
+                    app_log(f"GraphQL fileSizesBatch: skipping malformed entry for mod {mid}: {exc}")
+            return part
 
-        return results
+        unique_mods = list(mod_to_file_ids.keys())
+        batch_size = self._GRAPHQL_FILE_BATCH
+        chunks = [unique_mods[i: i + batch_size]
+                  for i in range(0, len(unique_mods), batch_size)]
+        return self._run_graphql_chunks("fileSizesBatch", chunks, _fetch)
 
     # -- Top mods (GraphQL v2) -----------------------------------------------
 
@@ -37,6 +37,7 @@ from typing import Callable, Optional
 import requests
 
 from .nexus_api import NexusAPI, NexusDownloadLink, NexusAPIError
+from .download_scheduler import PRIORITY_NORMAL, DownloadJob, get_download_scheduler
 from .nxm_handler import NxmLink
 from Utils.app_log import app_log
 
@@ -439,6 +440,7 @@ class NexusDownloader:
         progress_cb: ProgressCallback | None = None,
         cancel: threading.Event | None = None,
         known_file_name: str = "",
+        priority: int = PRIORITY_NORMAL,
     ) -> DownloadResult:
         """
         Download a file using a parsed NXM link.
@@ -452,6 +454,7 @@ class NexusDownloader:
         dest_dir    : Override download directory. Defaults to self.download_dir.
         progress_cb : Called periodically with (bytes_so_far, total_bytes).
         cancel      : Set this event to abort the download.
+        priority    : Download scheduler priority (higher is admitted first).
 
         Returns
         -------
@@ -499,6 +502,7 @@ class NexusDownloader:
             game_domain=link.game_domain,
             mod_id=link.mod_id,
             file_id=link.file_id,
+            priority=priority,
         )
 
     def download_file(
@@ -511,6 +515,7 @@ class NexusDownloader:
         cancel: threading.Event | None = None,
         known_file_name: str = "",
         expected_size_bytes: int = 0,
+        priority: int = PRIORITY_NORMAL,
     ) -> DownloadResult:
         """
         Download a file directly (premium users only — no key needed).
@@ -531,6 +536,9 @@ class NexusDownloader:
                                (from the API).  Used to validate cached files
                                and detect partial downloads.  Pass 0 if
                                unknown.
+        priority             : Download scheduler priority (higher is
+                               admitted first; smaller files first within a
+                               priority).
 
         Returns
         -------
@@ -611,6 +619,8 @@ class NexusDownloader:
             game_domain=game_domain,
             mod_id=mod_id,
             file_id=file_id,
+            size_bytes=expected_size_bytes,
+            priority=priority,
         )
 
     # -- Internal -----------------------------------------------------------
@@ -625,35 +635,52 @@ class NexusDownloader:
         game_domain: str,
         mod_id: int,
         file_id: int,
+        size_bytes: int = 0,
+        priority: int = PRIORITY_NORMAL,
     ) -> DownloadResult:
-        """Try each mirror in order until one succeeds."""
+        """Try each mirror in order until one succeeds.
 
+        The transfer waits for a slot in the global download scheduler, so
+        connection and bandwidth caps hold across every downloader instance.
+        """
+        sched = get_download_scheduler()
+        sched.remember_size(mod_id, file_id, size_bytes)
         last_error = ""
-        for link in links:
-            try:
-                result = self._stream_download(
-                    url=link.URI,
-                    file_name=file_name,
-                    dest_dir=dest_dir,
-                    progress_cb=progress_cb,
-                    cancel=cancel,
-                    game_domain=game_domain,
-                    mod_id=mod_id,
-                    file_id=file_id,
-                )
-                if result.success:
-                    return result
-                last_error = result.error
-            except DownloadCancelled:
+        with sched.slot(file_name or f"{mod_id}/{file_id}", size_bytes=size_bytes,
+                        priority=priority, mod_id=mod_id, file_id=file_id,
+                        cancel=cancel) as job:
+            if job is None:
                 return DownloadResult(
                     success=False, error="Download cancelled",
                     game_domain=game_domain,
                     mod_id=mod_id, file_id=file_id,
                 )
-            except Exception as exc:
-                last_error = str(exc)
-                app_log(f"Mirror {link.name} failed: {exc}")
-                continue
+            for link in links:
+                try:
+                    result = self._stream_download(
+                        url=link.URI,
+                        file_name=file_name,
+                        dest_dir=dest_dir,
+                        progress_cb=progress_cb,
+                        cancel=cancel,
+                        game_domain=game_domain,
+                        mod_id=mod_id,
+                        file_id=file_id,
+                        job=job,
+                    )
+                    if result.success:
+                        return result
+                    last_error = result.error
+                except DownloadCancelled:
+                    return DownloadResult(
+                        success=False, error="Download cancelled",
+                        game_domain=game_domain,
+                        mod_id=mod_id, file_id=file_id,
+                    )
+                except Exception as exc:
+                    last_error = str(exc)
+                    app_log(f"Mirror {link.name} failed: {exc}")
+                    continue
 
         return DownloadResult(
             success=False,
@@ -672,8 +699,10 @@ class NexusDownloader:
         game_domain: str,
         mod_id: int,
         file_id: int,
+        job: DownloadJob | None = None,
     ) -> DownloadResult:
         """Stream-download a single URL to disk."""
+        sched = get_download_scheduler()
 
         with requests.get(url, stream=True, timeout=60) as resp:
             resp.raise_for_status()
@@ -703,6 +732,8 @@ class NexusDownloader:
                 file_name = f"{game_domain}_{mod_id}_{file_id}.zip"
 
             total = int(resp.headers.get("Content-Length", 0))
+            if job is not None and total > 0:
+                job.size_bytes = total
             dest = dest_dir / file_name
 
             # Don't clobber existing files — add a suffix
@@ -731,6 +762,7 @@ class NexusDownloader:
 
                     fh.write(chunk)
                     downloaded += len(chunk)
+                    sched.consume(len(chunk), job)
 
                     if progress_cb:
                         progress_cb(downloaded, total)
@@ -18,7 +18,11 @@ This module provides:
 
 - **NexusModMeta** — data class holding per-mod Nexus info
 - **read_meta** / **write_meta** — I/O helpers (non-destructive: preserves
-  existing ``meta.ini`` content when writing)
+  existing ``meta.ini`` content when writing).  ``read_meta`` is memoised per
+  path and validated by the file's (mtime_ns, size), so repeated reads of an
+  unchanged ``meta.ini`` cost one ``stat()``.  The meta catalog seeds the
+  memo as it serves lookups, so the modlist panel's background meta scan on
+  profile load warms it for every mod.
 - **scan_installed_mods** — walk a staging root and collect all mods that
   have Nexus metadata (``modid`` > 0)
 """
@@ -26,8 +30,10 @@ This module provides:
 from __future__ import annotations
 
 import configparser
+import os
 import re
-from dataclasses import dataclass, field
+import threading
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
@@ -147,12 +153,57 @@ _INT_FIELDS = {"mod_id", "file_id", "category_id", "latest_file_id"}
 _BOOL_FIELDS = {"endorsed", "has_update", "ignore_update", "is_fomod", "root_folder"}
 
 
+# meta.ini path -> ((mtime_ns, size), parsed meta).  Entries are never handed
+# out directly; read_meta returns copies so callers can mutate them.
+_meta_memo: dict[str, tuple[tuple[int, int], NexusModMeta]] = {}
+_meta_memo_lock = threading.Lock()
+
+
+def _stat_key(meta_ini_path: Path) -> Optional[tuple[int, int]]:
+    try:
+        st = os.stat(meta_ini_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def remember_meta(meta_ini_path: Path, key: tuple[int, int], meta: NexusModMeta) -> None:
+    """Record *meta* as the parse of *meta_ini_path* at stat *key*
+    (used by the meta catalog to seed the memo without re-parsing)."""
+    with _meta_memo_lock:
+        _meta_memo[str(meta_ini_path)] = (key, replace(meta))
+
+
+def invalidate_meta_cache(meta_ini_path: Optional[Path] = None) -> None:
+    """Forget the memoised parse of *meta_ini_path* (or of every file)."""
+    with _meta_memo_lock:
+        if meta_ini_path is None:
+            _meta_memo.clear()
+        else:
+            _meta_memo.pop(str(meta_ini_path), None)
+
+
 def read_meta(meta_ini_path: Path) -> NexusModMeta:
     """
     Parse a ``meta.ini`` file and return a :class:`NexusModMeta`.
 
-    Missing keys are silently defaulted.
+    Missing keys are silently defaulted.  Unchanged files are served from
+    the memo; the result is always a fresh copy.
     """
+    key = _stat_key(meta_ini_path)
+    if key is not None:
+        with _meta_memo_lock:
+            cached = _meta_memo.get(str(meta_ini_path))
+        if cached is not None and cached[0] == key:
+            return replace(cached[1], mod_name=meta_ini_path.parent.name)
+
+    meta = _parse_meta(meta_ini_path)
+    if key is not None:
+        remember_meta(meta_ini_path, key, meta)
+    return meta
+
+
+def _parse_meta(meta_ini_path: Path) -> NexusModMeta:
     cp = configparser.ConfigParser()
     cp.read(str(meta_ini_path), encoding="utf-8")
 
@@ -209,6 +260,7 @@ def write_meta(meta_ini_path: Path, meta: NexusModMeta) -> None:
     meta_ini_path.parent.mkdir(parents=True, exist_ok=True)
     with open(meta_ini_path, "w", encoding="utf-8") as f:
         cp.write(f)
+    invalidate_meta_cache(meta_ini_path)
 
     app_log(f"Wrote meta.ini: {meta_ini_path}")
 
@@ -232,6 +284,7 @@ def ensure_installed_stamp(meta_ini_path: Path) -> bool:
     cp.set(_SECTION, "installed", dt.strftime("%Y-%m-%dT%H:%M:%S"))
     with open(meta_ini_path, "w", encoding="utf-8") as f:
         cp.write(f)
+    invalidate_meta_cache(meta_ini_path)
     return True
 
 
@@ -289,19 +342,17 @@ def scan_installed_mods(staging_root: Path) -> list[NexusModMeta]:
     """
     Walk all mod folders under *staging_root* and return metadata for
     those that have a Nexus ``modid`` set (i.e. were installed from Nexus).
-    """
-    results: list[NexusModMeta] = []
-    if not staging_root.is_dir():
-        return results
 
-    for folder in sorted(staging_root.iterdir()):
-        meta_path = folder / "meta.ini"
-        if not meta_path.is_file():
-            continue
-        meta = read_meta(meta_path)
-        if meta.mod_id > 0:
-            results.append(meta)
+    Served from the shared meta catalog, so unchanged ``meta.ini`` files
+    cost a ``stat()`` rather than a configparser round trip.
+    """
+    from Nexus.meta_catalog import get_meta_catalog
 
+    if not staging_root.is_dir():
+        return []
+    catalog = get_meta_catalog(staging_root)
+    results = [m for m in catalog.all().values() if m.mod_id > 0]
+    catalog.save()
     return results
 
 
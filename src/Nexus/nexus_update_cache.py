@@ -0,0 +1,199 @@
+"""
+nexus_update_cache.py
+Persisted per-mod results of the last update check, used for delta checks.
+
+``check_for_updates()`` used to re-query every installed mod on each run.
+This cache remembers, per Nexus mod ID, when it was last checked, which file
+was installed at the time, what the latest file/version was, and the
+GraphQL update info (category + requirements) needed by the requirements
+pass.  A routine check then asks ``get_updated_mods()`` (1d / 1w / 1m window)
+which mods changed on Nexus since the oldest cached check, and only queries
+those plus mods that are new or were reinstalled locally.  The sweep is
+decided per mod: a mod not queried for ``FULL_SWEEP_INTERVAL`` is queried
+regardless of get_updated_mods(), so checks limited to enabled mods still
+refresh every mod they cover.
+
+Cache lives under ``~/.config/AmethystModManager/update_cache/``:
+    <sha1(staging_root)>.json -> {"v": 1, "game_domain": "...",
+                                  "mods": {"<mod_id>": {...}, ...}}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from Nexus.nexus_api import NexusModRequirement, NexusModUpdateInfo
+from Utils.app_log import app_log
+from Utils.config_paths import get_config_dir
+
+_CACHE_VERSION = 1
+
+# A mod not queried for this long is re-queried regardless of get_updated_mods().
+FULL_SWEEP_INTERVAL = 7 * 24 * 3600
+
+# get_updated_mods() periods, smallest first.  The usable span is shortened a
+# little so a mod updated just before the previous check is never missed.
+_PERIODS: tuple[tuple[str, int], ...] = (
+    ("1d", 24 * 3600),
+    ("1w", 7 * 24 * 3600),
+    ("1m", 28 * 24 * 3600),
+)
+_PERIOD_MARGIN = 3600
+
+
+def _cache_path(staging_root: Path) -> Path:
+    d = get_config_dir() / "update_cache"
+    d.mkdir(parents=True, exist_ok=True)
+    key = hashlib.sha1(str(Path(staging_root).resolve()).encode("utf-8")).hexdigest()
+    return d / f"{key}.json"
+
+
+def pick_period(oldest_check: float, now: Optional[float] = None) -> str:
+    """
+    Return the smallest ``get_updated_mods`` period covering *oldest_check*,
+    or ``""`` if it is older than every window (a full sweep is needed).
+    """
+    age = (now if now is not None else time.time()) - oldest_check
+    for period, span in _PERIODS:
+        if age <= span - _PERIOD_MARGIN:
+            return period
+    return ""
+
+
+class UpdateCheckCache:
+    """Per-staging-root store of the last update-check result for each mod."""
+
+    def __init__(self, staging_root: Path, game_domain: str = ""):
+        self._path = _cache_path(staging_root)
+        self.game_domain = game_domain
+        self.mods: dict[int, dict] = {}
+        self._load()
+
+    # -- persistence --------------------------------------------------------
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("v") != _CACHE_VERSION:
+            return
+        # A domain change (e.g. staging shared by Enderal/Skyrim handlers)
+        # invalidates everything.
+        if self.game_domain and data.get("game_domain") != self.game_domain:
+            return
+        mods = data.get("mods") or {}
+        for key, entry in mods.items():
+            try:
+                self.mods[int(key)] = entry
+            except (TypeError, ValueError):
+                continue
+
+    def save(self) -> None:
+        """Write the cache atomically (temp file + rename)."""
+        data = {
+            "v": _CACHE_VERSION,
+            "game_domain": self.game_domain,
+            "mods": {str(k): v for k, v in self.mods.items()},
+        }
+        tmp = self._path.with_suffix(".json.tmp")
+        try:
+            tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self._path)
+        except OSError as exc:
+            app_log(f"Update cache: could not write {self._path}: {exc}")
+
+    # -- queries ------------------------------------------------------------
+
+    def sweep_due(self, mod_id: int, now: Optional[float] = None) -> bool:
+        """True if *mod_id* has not been queried for FULL_SWEEP_INTERVAL."""
+        now = now if now is not None else time.time()
+        return now - self.checked_at(mod_id) >= FULL_SWEEP_INTERVAL
+
+    def is_stale_locally(self, mod_id: int, metas: list) -> bool:
+        """
+        True if *mod_id* has never been checked, or any installed copy's
+        file id / version differs from what was installed at the last check
+        (i.e. the user updated or reinstalled it since).
+        """
+        entry = self.mods.get(mod_id)
+        if entry is None:
+            return True
+        seen = {(int(f), v) for f, v in entry.get("installed") or []}
+        return any((m.file_id, m.version or "") not in seen for m in metas)
+
+    def checked_at(self, mod_id: int) -> float:
+        entry = self.mods.get(mod_id)
+        return float(entry.get("checked_at") or 0.0) if entry else 0.0
+
+    def update_info(self, mod_id: int) -> Optional[NexusModUpdateInfo]:
+        """Rebuild the cached NexusModUpdateInfo (without files) for *mod_id*."""
+        entry = self.mods.get(mod_id)
+        if entry is None or "info" not in entry:
+            return None
+        raw = entry["info"]
+        updated_at = None
+        if raw.get("updated_at"):
+            try:
+                updated_at = datetime.fromisoformat(raw["updated_at"])
+            except ValueError:
+                pass
+        return NexusModUpdateInfo(
+            mod_id=mod_id,
+            name=raw.get("name", ""),
+            version=raw.get("version", ""),
+            updated_at=updated_at,
+            viewer_update_available=raw.get("viewer_update_available"),
+            requirements=[NexusModRequirement(**r) for r in raw.get("requirements") or []],
+            category_id=int(raw.get("category_id") or 0),
+            category_name=raw.get("category_name", ""),
+        )
+
+    # -- updates ------------------------------------------------------------
+
+    def record(
+        self,
+        mod_id: int,
+        metas: list,
+        info: Optional[NexusModUpdateInfo],
+        now: Optional[float] = None,
+    ) -> None:
+        """Store the outcome of checking *mod_id* (metas already updated)."""
+        entry: dict = {
+            "checked_at": now if now is not None else time.time(),
+            "installed": [[m.file_id, m.version or ""] for m in metas],
+            "latest_file_id": max((m.latest_file_id for m in metas), default=0),
+            "latest_version": next((m.latest_version for m in metas if m.latest_version), ""),
+        }
+        if info is not None:
+            entry["info"] = {
+                "name": info.name,
+                "version": info.version,
+                "updated_at": info.updated_at.isoformat() if info.updated_at else "",
+                "viewer_update_available": info.viewer_update_available,
+                "category_id": info.category_id,
+                "category_name": info.category_name,
+                "requirements": [
+                    {
+                        "mod_id": r.mod_id,
+                        "mod_name": r.mod_name,
+                        "game_domain": r.game_domain,
+                        "url": r.url,
+                        "is_external": r.is_external,
+                        "notes": r.notes,
+                    }
+                    for r in info.requirements
+                ],
+            }
+        self.mods[mod_id] = entry
+
+    def prune(self, installed_ids: set[int]) -> None:
+        """Drop entries for mods that are no longer installed."""
+        for mod_id in [k for k in self.mods if k not in installed_ids]:
+            del self.mods[mod_id]
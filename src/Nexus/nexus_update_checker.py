@@ -4,9 +4,13 @@ Check installed Nexus mods for available updates.
 
 Workflow:
   1. Scan ``meta.ini`` files in the staging root to find mods with Nexus IDs.
-  2. For each mod with a stored ``file_id``, fetch the mod's file list from
+  2. Ask ``get_updated_mods()`` which of them changed on Nexus since they
+     were last checked (see nexus_update_cache) and only query those, plus
+     mods installed or reinstalled since and mods due for their periodic
+     re-check.
+  3. For each mod with a stored ``file_id``, fetch the mod's file list from
      the API and compare against the latest MAIN file.
-  3. Return a list of mods that have newer files available.
+  4. Return a list of mods that have newer files available.
 
 Usage::
 
@@ -18,6 +22,7 @@ Usage::
 from __future__ import annotations
 
 import threading
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -27,6 +32,7 @@ from typing import Callable, Optional
 from Nexus.nexus_api import NexusAPI, NexusAPIError, NexusModUpdateInfo
 from Nexus.nexus_meta import NexusModMeta, scan_installed_mods, read_meta, write_meta
 from Nexus.nexus_requirements import MissingRequirementInfo, check_requirements_from_gql
+from Nexus.nexus_update_cache import UpdateCheckCache, pick_period
 
 ProgressCallback = Callable[[str], None]
 
@@ -158,6 +164,7 @@ def check_for_updates(
     save_results: bool = True,
     enabled_only: Optional[set] = None,
     max_workers: int = 10,
+    full_sweep: bool = False,
 ) -> tuple[list["UpdateInfo"], list["MissingRequirementInfo"]]:
     """
     Check all Nexus-sourced mods under *staging_root* for updates and missing
@@ -183,6 +190,15 @@ def check_for_updates(
     file-ID + version comparison when GraphQL returns no data for them.  These
     requests consume the hourly rate limit but are expected to be very few.
 
+    **Delta checks:**
+    When *save_results* is set, results are also cached per mod.  Routine
+    checks then cost one ``get_updated_mods()`` REST call and only re-query
+    mods Nexus reports as changed since their last check (plus mods that are
+    new or were reinstalled locally); the others keep their ``meta.ini``
+    flags and cached requirements.  Each mod is re-queried anyway once
+    ``FULL_SWEEP_INTERVAL`` has passed since its last query, and every mod
+    is when *full_sweep* is True.
+
     Parameters
     ----------
     api : NexusAPI
@@ -197,6 +213,8 @@ def check_for_updates(
         If True, write results back to each mod’s ``meta.ini``.
     max_workers : int
         Parallel threads for the REST fallback.  Default is 10.
+    full_sweep : bool
+        Re-query every mod even if the update cache says it is unchanged.
 
     Returns
     -------
@@ -249,17 +267,34 @@ def check_for_updates(
     for meta in checkable:
         by_mod_id.setdefault(meta.mod_id, []).append(meta)
 
-    total = len(by_mod_id)
     updates: list[UpdateInfo] = []
 
+    # Delta selection — decide which mods actually need asking about.
+    # Without save_results the meta.ini flags of skipped mods would be stale,
+    # so the cache is only used when results are persisted.
+    check_started = time.time()
+    cache = UpdateCheckCache(staging_root, game_domain) if save_results else None
+    query_ids: Optional[set[int]] = None
+    if cache is not None and not full_sweep:
+        query_ids = _select_delta_mods(api, cache, by_mod_id, game_domain, _log,
+                                       now=check_started)
+    if query_ids is None:
+        to_query = by_mod_id
+    else:
+        to_query = {mid: metas for mid, metas in by_mod_id.items() if mid in query_ids}
+        _log(f"  {len(to_query)} of {len(by_mod_id)} mod(s) changed since the last "
+             "check; reusing cached results for the rest.")
+
     # -----------------------------------------------------------------------
     # 2. Batch GraphQL call — fetch updatedAt + viewerUpdateAvailable for
     #    all mods in a handful of requests instead of one REST call per mod.
     #    This does not consume the REST hourly rate limit.
     # -----------------------------------------------------------------------
-    _log("Fetching update info via GraphQL...")
-    gql_ids = [(game_domain, mod_id) for mod_id in by_mod_id]
-    gql_info: dict[int, NexusModUpdateInfo] = api.graphql_mod_update_info_batch(gql_ids)
+    gql_info: dict[int, NexusModUpdateInfo] = {}
+    if to_query:
+        _log("Fetching update info via GraphQL...")
+        gql_ids = [(game_domain, mod_id) for mod_id in to_query]
+        gql_info = api.graphql_mod_update_info_batch(gql_ids)
 
     # -------------------------------------------------------------------
     # Fetch per-mod file lists via GraphQL (rate-limit-free) for any mod
@@ -269,7 +304,7 @@ def check_for_updates(
     # installs don't false-positive off a newer MAIN upload.
     # -------------------------------------------------------------------
     mods_needing_files = [
-        mod_id for mod_id, metas in by_mod_id.items()
+        mod_id for mod_id, metas in to_query.items()
         if any(m.file_id > 0 for m in metas)
     ]
     if mods_needing_files:
@@ -285,7 +320,7 @@ def check_for_updates(
             if info is not None:
                 info.files = files
             by_fid = {f.file_id: f for f in files}
-            for meta in by_mod_id.get(mod_id, []):
+            for meta in to_query.get(mod_id, []):
                 if meta.file_id <= 0:
                     continue
                 f = by_fid.get(meta.file_id)
@@ -339,7 +374,7 @@ def check_for_updates(
     # -----------------------------------------------------------------------
     rest_fallback: dict[int, list[NexusModMeta]] = {}
 
-    for mod_id, metas in by_mod_id.items():
+    for mod_id, metas in to_query.items():
         info = gql_info.get(mod_id)
 
         for meta in metas:
@@ -418,7 +453,8 @@ def check_for_updates(
             )
 
     if not gql_info:
-        _log("  GraphQL returned no results — falling back to REST for all mods.")
+        if to_query:
+            _log("  GraphQL returned no results — falling back to REST for all mods.")
     else:
         _log(f"  {len(rest_fallback)} mod(s) will be compared at file level.")
 
@@ -554,6 +590,35 @@ def check_for_updates(
                 for future in as_completed(futures):
                     future.result()
 
+    # Mods skipped by the delta check keep the verdict stored in meta.ini.
+    cached_info: dict[int, NexusModUpdateInfo] = {}
+    if cache is not None:
+        for mod_id, metas in by_mod_id.items():
+            if mod_id in to_query:
+                continue
+            info = cache.update_info(mod_id)
+            if info is not None:
+                cached_info[mod_id] = info
+            for meta in metas:
+                if meta.has_update and not meta.ignore_update:
+                    updates.append(UpdateInfo(
+                        mod_name=meta.mod_name,
+                        mod_id=mod_id,
+                        game_domain=game_domain,
+                        installed_file_id=meta.file_id,
+                        installed_version=meta.version,
+                        latest_file_id=meta.latest_file_id,
+                        latest_version=meta.latest_version,
+                        nexus_url=meta.nexus_page_url,
+                    ))
+        # Only mods GraphQL answered for are cached; REST-only mods are
+        # cheap to re-ask and may be hidden/removed on Nexus.
+        for mod_id, metas in to_query.items():
+            if mod_id in gql_info:
+                cache.record(mod_id, metas, gql_info[mod_id], now=check_started)
+        cache.prune({m.mod_id for m in all_installed})
+        cache.save()
+
     _log(f"Update check complete: {len(updates)} update(s) available.")
 
     # -----------------------------------------------------------------------
@@ -562,7 +627,7 @@ def check_for_updates(
     # -----------------------------------------------------------------------
     _log("Checking mod requirements...")
     missing_reqs = check_requirements_from_gql(
-        gql_info,
+        {**cached_info, **gql_info},
         all_installed,
         game_domain=game_domain,
         staging_root=staging_root,
@@ -574,6 +639,60 @@ def check_for_updates(
     return updates, missing_reqs
 
 
+def _select_delta_mods(
+    api: NexusAPI,
+    cache: UpdateCheckCache,
+    by_mod_id: dict[int, list[NexusModMeta]],
+    game_domain: str,
+    _log: Callable,
+    now: Optional[float] = None,
+) -> Optional[set[int]]:
+    """
+    Return the mod IDs that need a fresh check, or None for a full sweep.
+
+    A mod is re-checked when it is missing from the cache, its installed
+    file/version changed locally, it has not been queried for
+    FULL_SWEEP_INTERVAL, or ``get_updated_mods()`` reports Nexus activity on
+    it since its last check.  The period is the smallest window that covers
+    the oldest remaining cached check.
+    """
+    due = {
+        mid for mid, metas in by_mod_id.items()
+        if cache.is_stale_locally(mid, metas) or cache.sweep_due(mid, now)
+    }
+    fresh = [mid for mid in by_mod_id if mid not in due]
+    if not fresh:
+        return None
+    period = pick_period(min(cache.checked_at(mid) for mid in fresh))
+    if not period:
+        return None
+    try:
+        changed = api.get_updated_mods(game_domain, period)
+    except NexusAPIError as exc:
+        _log(f"  Recently-updated list unavailable ({exc}); checking all mods.")
+        return None
+
+    activity: dict[int, int] = {}
+    for entry in changed or []:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            mid = int(entry.get("mod_id", 0))
+            ts = max(int(entry.get("latest_file_update") or 0),
+                     int(entry.get("latest_mod_activity") or 0))
+        except (TypeError, ValueError):
+            continue
+        activity[mid] = max(activity.get(mid, 0), ts)
+
+    selected = set(due)
+    for mid in fresh:
+        if mid in activity and activity[mid] >= cache.checked_at(mid) - 60:
+            selected.add(mid)
+    _log(f"  Delta check via get_updated_mods({period}): "
+         f"{len(selected)} mod(s) to query.")
+    return selected
+
+
 def _apply_update_result(
     has_update: bool,
     meta: NexusModMeta,
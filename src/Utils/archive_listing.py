@@ -0,0 +1,283 @@
+"""
+archive_listing.py
+List the contents of a mod archive without extracting it.
+
+Used by the installer to plan partial extractions (e.g. only the ``fomod/``
+folder before the FOMOD wizard runs).  Listing prefers the native ``7z``
+binary (``7z l -slt``), which handles zip/7z/rar/tar alike, and falls back to
+the pure-Python readers (zipfile, py7zr, tarfile, rarfile).
+
+Paths are returned with forward slashes and without a leading ``./``.
+
+:func:`get_archive_listing` caches listings in memory and on disk so the
+installer's pre-flight checks (size estimate, FOMOD planning) need no
+subprocess for an archive seen before — e.g. on collection retries and
+reinstalls.  Cache files live under ``~/.config/AmethystModManager/
+archive_listings/`` as msgpack, one per archive:
+    stat-<sha1(path, size, mtime_ns)>.bin   always written
+    md5-<md5>.bin                          also written when the md5 is known,
+                                           so a moved or re-downloaded copy of
+                                           the same file still hits
+Each holds ``{"v": 1, "size": int, "entries": [[path, size, is_dir, crc], ...]}``.
+The oldest files are pruned once more than ``_CACHE_MAX_FILES`` exist.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tarfile
+import threading
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import msgpack
+
+from Utils.config_paths import get_archive_listing_cache_dir
+
+_CACHE_VERSION = 1
+_CACHE_MAX_FILES = 4000
+_MEMORY_MAX_ENTRIES = 256
+
+TAR_SUFFIXES = (".tar.gz", ".tar.bz2", ".tar.xz", ".tar")
+
+
+@dataclass
+class ArchiveEntry:
+    """One member of an archive."""
+    path: str
+    size: int = 0
+    is_dir: bool = False
+    crc: str = ""
+
+
+def normalize_member_path(path: str) -> str:
+    """Return *path* with forward slashes and no leading ``./`` or slashes."""
+    path = path.replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path.strip("/")
+
+
+def _find_7z() -> Optional[str]:
+    return shutil.which("7zzs") or shutil.which("7zz") or shutil.which("7z") or shutil.which("7za")
+
+
+def _list_with_7z(archive_path: str, bin_7z: str) -> Optional[list[ArchiveEntry]]:
+    try:
+        res = subprocess.run(
+            [bin_7z, "l", "-slt", "-ba", archive_path],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, errors="replace", timeout=60,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if res.returncode != 0:
+        return None
+    entries: list[ArchiveEntry] = []
+    cur: Optional[ArchiveEntry] = None
+    for line in res.stdout.splitlines():
+        key, sep, value = line.partition(" = ")
+        if not sep:
+            continue
+        if key == "Path":
+            cur = ArchiveEntry(path=normalize_member_path(value))
+            entries.append(cur)
+        elif cur is None:
+            continue
+        elif key == "Size":
+            try:
+                cur.size = int(value or 0)
+            except ValueError:
+                pass
+        elif key == "Folder":
+            cur.is_dir = value.strip() == "+"
+        elif key == "Attributes" and value.startswith("D"):
+            cur.is_dir = True
+        elif key == "CRC":
+            cur.crc = value.strip().upper()
+    return [e for e in entries if e.path]
+
+
+def _list_with_python(archive_path: str) -> Optional[list[ArchiveEntry]]:
+    lower = archive_path.lower()
+    try:
+        if lower.endswith(".zip"):
+            with zipfile.ZipFile(archive_path, "r") as z:
+                return [
+                    ArchiveEntry(path=normalize_member_path(i.filename), size=i.file_size,
+                                 is_dir=i.is_dir() or i.filename.endswith("\\"),
+                                 crc=f"{i.CRC:08X}")
+                    for i in z.infolist() if normalize_member_path(i.filename)
+                ]
+        if lower.endswith(".7z"):
+            # py7zr is not thread-safe (see py7zr_pool), so list in a worker.
+            from Utils import py7zr_pool
+            return [
+                ArchiveEntry(path=normalize_member_path(name), size=size,
+                             is_dir=is_dir,
+                             crc=f"{crc:08X}" if crc is not None else "")
+                for name, size, is_dir, crc in py7zr_pool.list_members(archive_path)
+                if normalize_member_path(name)
+            ]
+        if lower.endswith(TAR_SUFFIXES):
+            with tarfile.open(archive_path, "r:*") as t:
+                return [
+                    ArchiveEntry(path=normalize_member_path(m.name), size=m.size, is_dir=m.isdir())
+                    for m in t.getmembers() if normalize_member_path(m.name)
+                ]
+        if lower.endswith(".rar"):
+            import rarfile
+            with rarfile.RarFile(archive_path, "r") as r:
+                return [
+                    ArchiveEntry(path=normalize_member_path(i.filename), size=i.file_size,
+                                 is_dir=i.is_dir(),
+                                 crc=f"{i.CRC:08X}" if i.CRC is not None else "")
+                    for i in r.infolist() if normalize_member_path(i.filename)
+                ]
+    except Exception:
+        return None
+    return None
+
+
+def list_archive(archive_path: str) -> Optional[list[ArchiveEntry]]:
+    """Return every member of *archive_path*, or None if it cannot be listed.
+
+    Compressed tarballs are listed with tarfile: ``7z l`` only shows the
+    inner ``.tar`` for them.
+    """
+    archive_path = os.fspath(archive_path)
+    lower = archive_path.lower()
+    bin_7z = _find_7z()
+    if bin_7z and not (lower.endswith(TAR_SUFFIXES) and not lower.endswith(".tar")):
+        entries = _list_with_7z(archive_path, bin_7z)
+        if entries is not None:
+            return entries
+    return _list_with_python(archive_path)
+
+
+# ---------------------------------------------------------------------------
+# Cached listings
+# ---------------------------------------------------------------------------
+
+_mem_cache: dict[str, list[ArchiveEntry]] = {}
+_mem_lock = threading.Lock()
+_saves_since_prune = 0
+
+
+def _stat_key(archive_path: str) -> Optional[tuple[str, int]]:
+    """Return (cache key, size) for the archive's path + size + mtime."""
+    try:
+        st = os.stat(archive_path)
+    except OSError:
+        return None
+    raw = f"{os.path.abspath(archive_path)}\0{st.st_size}\0{st.st_mtime_ns}"
+    return "stat-" + hashlib.sha1(raw.encode("utf-8", "surrogateescape")).hexdigest(), st.st_size
+
+
+def _read_cache_file(key: str, size: int) -> Optional[list[ArchiveEntry]]:
+    path = get_archive_listing_cache_dir() / f"{key}.bin"
+    try:
+        with path.open("rb") as f:
+            data = msgpack.unpack(f, raw=False)
+    except Exception:
+        return None
+    if (not isinstance(data, dict) or data.get("v") != _CACHE_VERSION
+            or data.get("size") != size):
+        return None
+    try:
+        return [ArchiveEntry(p, s, bool(d), c) for p, s, d, c in data["entries"]]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _write_cache_file(key: str, size: int, entries: list[ArchiveEntry]) -> None:
+    cache_dir = get_archive_listing_cache_dir()
+    path = cache_dir / f"{key}.bin"
+    tmp = path.with_suffix(".tmp")
+    payload = {
+        "v": _CACHE_VERSION,
+        "size": size,
+        "entries": [[e.path, e.size, e.is_dir, e.crc] for e in entries],
+    }
+    try:
+        with tmp.open("wb") as f:
+            msgpack.pack(payload, f, use_bin_type=True)
+        tmp.replace(path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def _prune_cache_dir(cache_dir: Path) -> None:
+    try:
+        files = [(e.stat().st_mtime, e.path) for e in os.scandir(cache_dir)
+                 if e.name.endswith(".bin")]
+    except OSError:
+        return
+    if len(files) <= _CACHE_MAX_FILES:
+        return
+    files.sort()
+    for _mtime, path in files[:len(files) - _CACHE_MAX_FILES]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _remember(key: str, entries: list[ArchiveEntry]) -> None:
+    with _mem_lock:
+        if len(_mem_cache) >= _MEMORY_MAX_ENTRIES:
+            _mem_cache.pop(next(iter(_mem_cache)))
+        _mem_cache[key] = entries
+
+
+def get_archive_listing(archive_path: str, md5: str = "") -> Optional[list[ArchiveEntry]]:
+    """Cached :func:`list_archive`.
+
+    The listing is looked up by (path, size, mtime) and, when *md5* is given
+    (e.g. from the collection manifest or Nexus metadata), by content hash.
+    Callers must not mutate the returned entries.
+    """
+    global _saves_since_prune
+    archive_path = os.fspath(archive_path)
+    stat = _stat_key(archive_path)
+    if stat is None:
+        return None
+    key, size = stat
+    md5_key = f"md5-{md5.lower()}" if md5 else ""
+    with _mem_lock:
+        hit = _mem_cache.get(key) or (_mem_cache.get(md5_key) if md5_key else None)
+    if hit is not None:
+        return hit
+    for k in (key, md5_key):
+        if k:
+            entries = _read_cache_file(k, size)
+            if entries is not None:
+                _remember(key, entries)
+                return entries
+
+    entries = list_archive(archive_path)
+    if entries is None:
+        return None
+    _remember(key, entries)
+    _write_cache_file(key, size, entries)
+    if md5_key:
+        _remember(md5_key, entries)
+        _write_cache_file(md5_key, size, entries)
+    _saves_since_prune += 1
+    if _saves_since_prune >= 64:
+        _saves_since_prune = 0
+        _prune_cache_dir(get_archive_listing_cache_dir())
+    return entries
+
+
+def listing_uncompressed_size(entries: list[ArchiveEntry]) -> int:
+    """Total uncompressed size of the files in a listing."""
+    return sum(e.size for e in entries if not e.is_dir)
@@ -31,6 +31,7 @@ from pathlib import Path
 
 import msgpack
 
+from Utils import perf_trace as _trace
 from Utils.bsa_reader import read_bsa_file_list
 from Utils.filemap import (
     CONFLICT_NONE,
@@ -186,6 +187,7 @@ def _scan_mod_bsas(
     return (mod_name, results, parse_count)
 
 
+@_trace.traced("bsa index")
 def rebuild_bsa_index(
     index_path: Path,
     staging_root: Path,
@@ -197,6 +199,7 @@ def rebuild_bsa_index(
     Uses the existing BSA index for incremental updates: only re-parses
     BSAs whose mtime has changed since the last scan.
     """
+    _trace.annotate(profile_dir=index_path.parent)
     if not staging_root.is_dir():
         return
 
@@ -237,6 +240,10 @@ def rebuild_bsa_index(
             for _bsa, _mt, paths in archives:
                 total_files += len(paths)
 
+    _trace.count("archives", total_bsa)
+    _trace.count("parsed", total_parsed)
+    _trace.count("files", total_files)
+
     _write_bsa_index(index_path, index)
     if log_fn:
         log_fn(
@@ -456,6 +463,7 @@ def compute_bsa_winner_map(
     return bsa_winner, bsa_losers
 
 
+@_trace.traced("bsa conflicts")
 def build_bsa_conflicts(
     modlist_path: Path,
     index_path: Path,
@@ -541,6 +549,7 @@ def build_bsa_conflicts(
                 bsa_winner[file_path] = name
         if had_file:
             mods_with_files.add(name)
+    _trace.count("files", len(bsa_winner))
 
     # Cross-compare against loose files: the winning loose-file mod at a BSA
     # path always overrides the BSA. A loose file that loses its own loose
@@ -22,7 +22,7 @@ the old manifest) are NEVER touched - matches Vortex's safety guarantee.
 
 from __future__ import annotations
 
-import configparser
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterable
@@ -35,6 +35,7 @@ class CollectionDiff:
     to_update_new_fids: list[int] = field(default_factory=list) # new file_ids for to_update
     to_install_fids: list[int] = field(default_factory=list)    # new file_ids needing download
     orphans: list[str] = field(default_factory=list)            # mod folder names
+    installed_folders: dict[int, str] = field(default_factory=dict)  # file_id → folder, every installed mod
 
     @property
     def removals(self) -> list[str]:
@@ -99,38 +100,32 @@ def _read_installed_mods(
 ) -> list[tuple[str, int, int, str]]:
     """Return [(folder_name, mod_id, file_id, from_collection), ...] for every
     folder whose lowercased name is in *installed_names_lower*. Missing meta.ini
-    is treated as (0, 0, "")."""
+    is treated as (0, 0, "").
+
+    Metadata comes from the shared meta.ini catalog, so only folders whose
+    meta.ini changed since the catalog was last saved are parsed again.
+    The catalog is not written back here; its next save elsewhere keeps
+    what this call parsed.
+    """
+    from Nexus.meta_catalog import get_meta_catalog
+
     out: list[tuple[str, int, int, str]] = []
-    if not staging_path.is_dir():
+    try:
+        with os.scandir(staging_path) as it:
+            names = [e.name for e in it
+                     if e.name.lower() in installed_names_lower and e.is_dir()]
+    except OSError:
         return out
-    for mod_dir in staging_path.iterdir():
-        if not mod_dir.is_dir():
-            continue
-        if mod_dir.name.lower() not in installed_names_lower:
-            continue
-        mod_id = 0
-        file_id = 0
-        from_collection = ""
-        meta_ini = mod_dir / "meta.ini"
-        if meta_ini.is_file():
-            cp = configparser.ConfigParser()
-            try:
-                cp.read(str(meta_ini), encoding="utf-8")
-                if cp.has_section("General"):
-                    try:
-                        mod_id = int(cp.get("General", "modid", fallback="0") or "0")
-                    except ValueError:
-                        pass
-                    try:
-                        file_id = int(cp.get("General", "fileid", fallback="0") or "0")
-                    except ValueError:
-                        pass
-                    from_collection = cp.get(
-                        "General", "fromCollection", fallback=""
-                    ).strip()
-            except Exception:
-                pass
-        out.append((mod_dir.name, mod_id, file_id, from_collection))
+    catalog = get_meta_catalog(staging_path)
+    for name in names:
+        try:
+            meta = catalog.get(name)
+        except Exception:
+            meta = None
+        if meta is None:
+            out.append((name, 0, 0, ""))
+        else:
+            out.append((name, meta.mod_id, meta.file_id, meta.from_collection.strip()))
     return out
 
 
@@ -156,57 +151,50 @@ def diff_collection(
     currently listed in the profile's modlist.txt.
     """
     old_fids = _old_manifest_file_ids(old_manifest)
+    # Indexes over the new revision: file_id → mod, and mod_id → the first
+    # new file_id from that mod page (in manifest order), so every lookup
+    # below is a dict hit rather than a scan of the new mod list.
     new_fids_to_mod: dict[int, object] = {}
     for m in new_mods:
         fid = getattr(m, "file_id", 0) or 0
         if fid > 0:
             new_fids_to_mod[fid] = m
-    new_fids = set(new_fids_to_mod.keys())
+    new_fids = set(new_fids_to_mod)
+    new_fid_by_mod_id: dict[int, int] = {}
+    for nfid, nmod in new_fids_to_mod.items():
+        new_fid_by_mod_id.setdefault(getattr(nmod, "mod_id", 0), nfid)
 
     installed = _read_installed_mods(staging_path, installed_names_lower)
 
     diff = CollectionDiff()
-
-    installed_by_mod_id: dict[int, tuple[str, int]] = {}
-    collection_owned_folders: set[str] = set()
+    installed_fids: set[int] = set()
 
     for folder, mod_id, file_id, origin in installed:
+        if file_id > 0:
+            installed_fids.add(file_id)
+            diff.installed_folders.setdefault(file_id, folder)
         is_owned_by_slug = bool(origin) and origin == collection_slug
         fallback_owned = (
             not origin and file_id > 0 and file_id in old_fids
         )
         if not (is_owned_by_slug or fallback_owned):
             continue
-        collection_owned_folders.add(folder)
 
         if mod_id <= 0 or file_id <= 0:
             diff.orphans.append(folder)
             continue
-
-        if mod_id > 0:
-            installed_by_mod_id[mod_id] = (folder, file_id)
-
-    for folder, mod_id, file_id, origin in installed:
-        if folder not in collection_owned_folders:
-            continue
-        if mod_id <= 0 or file_id <= 0:
-            continue
         if file_id in new_fids:
             continue
-        matched_new_fid = None
-        for nfid, nmod in new_fids_to_mod.items():
-            if getattr(nmod, "mod_id", 0) == mod_id:
-                matched_new_fid = nfid
-                break
+        matched_new_fid = new_fid_by_mod_id.get(mod_id)
         if matched_new_fid is not None:
             diff.to_update_old.append(folder)
             diff.to_update_new_fids.append(matched_new_fid)
         else:
             diff.to_remove.append(folder)
 
-    installed_fids = {fid for _, _, fid, _ in installed if fid > 0}
+    # Manifest order, so the install list is stable from run to run.
     update_new_set = set(diff.to_update_new_fids)
-    for fid in new_fids:
+    for fid in new_fids_to_mod:
         if fid in installed_fids:
             continue
         if fid in update_new_set:
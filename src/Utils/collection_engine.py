@@ -0,0 +1,1054 @@
+"""
+collection_engine.py
+UI-independent collection install engine.
+
+The download → extract → stage pipeline used to live inside the collection
+dialog.  It is split out here so it can run without a display — from
+``cli.py install-collection`` and from benchmarks — while the dialog drives
+the same code and only supplies a fetch function and progress callbacks:
+
+- :func:`parse_collection_manifest` turns a ``collection.json`` into the
+  per-file lookups the installer needs (priority order, folder names,
+  phases, FOMOD choices).
+- :func:`collection_mods_from_manifest` builds NexusCollectionMod objects
+  from a local manifest (no API needed).
+- :class:`CollectionPipeline` runs the producer/consumer pipeline: a pool of
+  fetch workers (download, or look up an archive already on disk) feeds a
+  bounded queue drained by install workers.  Extraction is gated by
+  ExtractionMemoryBudget, admission by DiskSpaceBudget.  FOMODs without
+  collection choices are deferred and installed last, phase by phase.
+
+Usage::
+
+    schema = load_collection_manifest(Path("collection.json"))
+    manifest = parse_collection_manifest(schema)
+    mods, _offsite = collection_mods_from_manifest(schema)
+    pipeline = CollectionPipeline(manifest, game, profile_dir,
+                                  local_archive_fetch([archives_dir]))
+    result = pipeline.run(mods)
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import json
+import os
+import queue
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from Utils.app_log import app_log
+from Utils.disk_budget import DiskSpaceBudget
+from Utils.ui_config import (
+    load_clear_archive_after_install,
+    load_collection_settings,
+    load_keep_fomod_archives,
+)
+
+_PRELIMINARY_PLUGIN_EXTS = (".esm", ".esl", ".esp")
+
+
+# ---------------------------------------------------------------------------
+# Manifest parsing
+# ---------------------------------------------------------------------------
+
+def topo_sort_collection(schema_mods: list[dict], mod_rules: list[dict]) -> dict[int, int]:
+    """Return file_id → priority-position dict respecting modRules before/after constraints.
+
+    Position 0 = highest priority (wins conflicts), higher number = lower priority.
+    Falls back to the mods-array order for any mod not constrained by rules.
+    Cycles are broken by ignoring the offending edge (Kahn's algorithm skips them naturally).
+    """
+    # Build logical_name → file_id map from the mods array
+    logical_to_fid: dict[str, int] = {}
+    fid_order: list[int] = []  # original mods-array order, used as topo fallback
+    for m in schema_mods:
+        src = m.get("source") or {}
+        fid = src.get("fileId")
+        if fid is None:
+            continue
+        fid = int(fid)
+        logical = (src.get("logicalFilename") or m.get("name") or "").strip()
+        if logical:
+            logical_to_fid[logical] = fid
+        if fid not in fid_order:
+            fid_order.append(fid)
+
+    # Reverse so that mods[-1] (last installed = highest priority in collection.json)
+    # gets position 0 → top of modlist.txt (highest priority in the manager).
+    # Without this, mods[0] (lowest priority) would incorrectly end up at the top.
+    fid_order = list(reversed(fid_order))
+
+    all_fids: set[int] = set(fid_order)
+
+    # edges: higher_priority_fid → {lower_priority_fids}
+    # "source after reference"  → reference has higher priority than source
+    # "source before reference" → source has higher priority than reference
+    higher_than: dict[int, set[int]] = {f: set() for f in all_fids}  # fid → fids it beats
+    in_degree: dict[int, int] = {f: 0 for f in all_fids}
+
+    def _resolve(name: str) -> int | None:
+        return logical_to_fid.get(name)
+
+    for rule in mod_rules:
+        rtype = rule.get("type")
+        if rtype not in ("before", "after"):
+            continue
+        ref_name = (rule.get("reference") or {}).get("logicalFileName", "")
+        src_name = (rule.get("source") or {}).get("logicalFileName", "")
+        ref_fid = _resolve(ref_name)
+        src_fid = _resolve(src_name)
+        if ref_fid is None or src_fid is None or ref_fid == src_fid:
+            continue
+
+        if rtype == "after":
+            # source loads after reference → source wins (loads on top of reference)
+            winner, loser = src_fid, ref_fid
+        else:  # "before"
+            # source loads before reference → reference wins
+            winner, loser = ref_fid, src_fid
+
+        if loser not in higher_than[winner]:
+            higher_than[winner].add(loser)
+            in_degree[loser] += 1
+
+    # Kahn's topological sort — highest priority first
+    pending = deque(f for f in fid_order if in_degree[f] == 0)
+    sorted_fids: list[int] = []
+    remaining = set(fid_order)
+
+    while pending:
+        fid = pending.popleft()
+        if fid not in remaining:
+            continue
+        remaining.discard(fid)
+        sorted_fids.append(fid)
+        # Process dependents in original-array order for determinism
+        for dep in sorted(higher_than[fid], key=lambda f: fid_order.index(f) if f in fid_order else 999999):
+            in_degree[dep] -= 1
+            if in_degree[dep] == 0:
+                pending.append(dep)
+
+    # Append any fids not reached (cycle members) in original order
+    for fid in fid_order:
+        if fid in remaining:
+            sorted_fids.append(fid)
+
+    # sorted_fids[0] = highest priority → position 0
+    return {fid: pos for pos, fid in enumerate(sorted_fids)}
+
+
+def fomod_choices_from_collection(choices: dict) -> "dict[str, dict[str, list[str]]]":
+    """Convert a collection.json FOMOD choices block to the saved_selections
+    format that ``resolve_files()`` / ``FomodDialog`` expect.
+
+    Collection format::
+
+        {
+          "type": "fomod",
+          "options": [
+            {
+              "name": "<step_name>",
+              "groups": [
+                {
+                  "name": "<group_name>",
+                  "choices": [{"name": "<plugin_name>", "idx": 0}, ...]
+                },
+                ...
+              ]
+            },
+            ...
+          ]
+        }
+
+    Saved-selections format::
+
+        {
+          "<step_name>": {
+            "<group_name>": ["<plugin_name>", ...]
+          },
+          ...
+        }
+    """
+    result: dict = {}
+    for step_idx, step in enumerate(choices.get("options", [])):
+        groups: dict = {}
+        for group in step.get("groups", []):
+            group_name = group.get("name", "")
+            plugin_names = [c["name"] for c in group.get("choices", []) if c.get("name")]
+            if plugin_names:
+                groups[group_name] = plugin_names
+        if groups:
+            result[str(step_idx)] = groups
+    return result
+
+
+@dataclass
+class CollectionManifest:
+    """Per-file lookups derived from a collection.json (keys are file ids)."""
+    schema: dict = field(default_factory=dict)
+    file_id_to_pos: dict[int, int] = field(default_factory=dict)       # 0 = highest priority
+    pos_to_name: dict[int, str] = field(default_factory=dict)          # schema mod name
+    file_id_to_logical: dict[int, str] = field(default_factory=dict)   # deduplicated logicalFilename
+    file_id_to_mod_id: dict[int, int] = field(default_factory=dict)
+    file_id_to_install_type: dict[int, str] = field(default_factory=dict)  # details.type, e.g. "dinput"
+    file_id_to_phase: dict[int, int] = field(default_factory=dict)     # 0 = earliest
+    fomod_by_file_id: dict[int, dict] = field(default_factory=dict)    # saved_selections
+
+    @property
+    def mod_count(self) -> int:
+        return len(self.schema.get("mods", []))
+
+    def sort_key(self, mod) -> int:
+        """Priority position of *mod*; unknown mods sort last."""
+        return self.file_id_to_pos.get(mod.file_id, self.mod_count)
+
+    def schema_name(self, file_id: int) -> str:
+        return self.pos_to_name.get(self.file_id_to_pos.get(file_id, -1), "") or ""
+
+    def preferred_name(self, mod) -> str:
+        """Folder name to install *mod* under.
+
+        logicalFilename from collection.json is the most specific, then the
+        schema name, then the Nexus mod page name.
+        """
+        return (self.file_id_to_logical.get(mod.file_id, "")
+                or self.schema_name(mod.file_id)
+                or mod.mod_name or "")
+
+
+def parse_collection_manifest(schema: dict) -> CollectionManifest:
+    """Build the install lookups for a parsed collection.json."""
+    schema_mods: list[dict] = schema.get("mods", [])
+    mod_rules: list[dict] = schema.get("modRules", [])
+    manifest = CollectionManifest(
+        schema=schema,
+        file_id_to_pos=topo_sort_collection(schema_mods, mod_rules),
+    )
+    # First pass: collect raw logicalFilename values to detect duplicates
+    raw_logical: dict[int, str] = {}   # file_id → raw logicalFilename from source
+    raw_name: dict[int, str] = {}      # file_id → schema mod name
+    for schema_mod in schema_mods:
+        src = schema_mod.get("source") or {}
+        fid = src.get("fileId")
+        if fid is not None:
+            fid = int(fid)
+            raw_logical[fid] = src.get("logicalFilename") or ""
+            raw_name[fid] = schema_mod.get("name") or ""
+    # Count how many file_ids share each logicalFilename
+    logical_counts: dict[str, int] = {}
+    for raw in raw_logical.values():
+        if raw:
+            logical_counts[raw] = logical_counts.get(raw, 0) + 1
+
+    for pos, schema_mod in enumerate(schema_mods):
+        src = schema_mod.get("source") or {}
+        fid = src.get("fileId")
+        if fid is None:
+            continue
+        fid = int(fid)
+        topo_pos = manifest.file_id_to_pos.get(fid, pos)
+        manifest.pos_to_name[topo_pos] = schema_mod.get("name") or ""
+        logical = raw_logical.get(fid, "")
+        schema_name = raw_name.get(fid, "")
+        # If multiple entries share the same logicalFilename, fall back to
+        # the more specific schema name to avoid folder-name collisions
+        # (e.g. "Capital Whiterun Expansion" shared by main mod + meshes patch).
+        if logical and logical_counts.get(logical, 0) > 1:
+            logical = schema_name or logical
+        else:
+            logical = logical or schema_name
+        manifest.file_id_to_logical[fid] = logical
+        mid = src.get("modId")
+        if mid:
+            manifest.file_id_to_mod_id[fid] = int(mid)
+        det_type = ((schema_mod.get("details") or {}).get("type") or "").strip()
+        if det_type:
+            manifest.file_id_to_install_type[fid] = det_type
+        try:
+            manifest.file_id_to_phase[fid] = int(schema_mod.get("phase") or 0)
+        except (TypeError, ValueError):
+            manifest.file_id_to_phase[fid] = 0
+        choices = schema_mod.get("choices") or {}
+        if choices.get("type") == "fomod":
+            manifest.fomod_by_file_id[fid] = fomod_choices_from_collection(choices)
+        elif choices.get("type") == "fomod_selections":
+            manifest.fomod_by_file_id[fid] = choices["selections"]
+    return manifest
+
+
+def load_collection_manifest(path: Path) -> dict:
+    """Read a collection.json from disk."""
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def collection_mods_from_manifest(schema: dict) -> "tuple[list, list[tuple[str, str]]]":
+    """Return (mods, offsite) for a local collection.json.
+
+    *mods* are NexusCollectionMod objects for the Nexus and bundled entries,
+    in manifest order; *offsite* lists (name, url) for browse/direct entries,
+    which must be fetched by hand.
+    """
+    from Nexus.nexus_api import NexusCollectionMod
+
+    mods: list = []
+    offsite: list[tuple[str, str]] = []
+    for m in schema.get("mods", []):
+        src = m.get("source") or {}
+        src_type = (src.get("type") or "nexus").lower()
+        mod_name = m.get("name") or ""
+        fid_raw = src.get("fileId")
+        fid = int(fid_raw) if fid_raw is not None else 0
+        mid_raw = src.get("modId")
+        mid = int(mid_raw) if mid_raw is not None else 0
+        file_size = int(src.get("fileSize") or 0)
+
+        if src_type in ("browse", "direct"):
+            url = src.get("url") or src.get("fileUrl") or ""
+            if url:
+                offsite.append((mod_name, url))
+            continue
+        if src_type == "bundle":
+            mods.append(NexusCollectionMod(
+                mod_name=mod_name,
+                file_name=src.get("fileExpression") or mod_name,
+                source_type="bundle",
+            ))
+            continue
+
+        details = m.get("details") or {}
+        cat = m.get("category") or {}
+        # collection.json stores the category as a string under
+        # details.category; fall back to the older object-shaped field.
+        cat_name = (details.get("category") or cat.get("name") or "").strip()
+        cat_id = int(cat.get("id") or 0)
+        mods.append(NexusCollectionMod(
+            mod_id=mid,
+            file_id=fid,
+            mod_name=mod_name,
+            file_name=src.get("logicalFilename") or src.get("fileExpression") or mod_name,
+            size_bytes=file_size,
+            optional=bool(m.get("optional", False)),
+            source_type="nexus",
+            version=m.get("version") or "",
+            category_id=cat_id,
+            category_name=cat_name,
+            install_type=(details.get("type") or "").strip(),
+            md5=(src.get("md5") or "").strip().lower(),
+            domain_name=(m.get("domainName") or "").strip(),
+        ))
+    return mods, offsite
+
+
+# ---------------------------------------------------------------------------
+# Fetching
+# ---------------------------------------------------------------------------
+
+# fetch(mod, game_domain, progress_cb, cancel) -> (DownloadResult | None, external)
+# *external* marks archives that belong to the user (downloads folder, custom
+# locations, a local archive directory); those are never deleted.
+FetchFn = Callable[[object, str, Callable[[int, int], None], threading.Event],
+                   "tuple[Optional[object], bool]"]
+
+
+def find_local_archive(mod, search_dirs: Iterable[Path], game_domain: str = ""):
+    """Return a DownloadResult for *mod* if an archive is in *search_dirs*."""
+    from Nexus.nexus_download import DownloadResult, _find_cached_archive
+
+    for search_dir in search_dirs:
+        found, complete = _find_cached_archive(
+            Path(search_dir),
+            mod.file_name or mod.mod_name or "",
+            getattr(mod, "size_bytes", 0) or 0,
+            mod.mod_id,
+            mod.file_id,
+            expected_md5=getattr(mod, "md5", "") or "",
+        )
+        if found and complete:
+            return DownloadResult(
+                success=True,
+                file_path=found,
+                file_name=found.name,
+                bytes_downloaded=found.stat().st_size,
+                game_domain=game_domain,
+                mod_id=mod.mod_id,
+                file_id=mod.file_id,
+            )
+    return None
+
+
+def local_archive_fetch(search_dirs: Iterable[Path]) -> FetchFn:
+    """Fetch function that only looks for archives already on disk."""
+    dirs = [Path(d) for d in search_dirs]
+
+    def _fetch(mod, game_domain, _progress_cb, _cancel):
+        from Nexus.nexus_download import DownloadResult
+
+        result = find_local_archive(mod, dirs, game_domain)
+        if result is None:
+            return DownloadResult(
+                success=False,
+                error=f"archive not found in {', '.join(str(d) for d in dirs)}",
+                game_domain=game_domain,
+                mod_id=mod.mod_id,
+                file_id=mod.file_id,
+            ), True
+        return result, True
+
+    return _fetch
+
+
+def default_archive_policy(was_fomod: bool) -> bool:
+    """Return True if an archive should be deleted once all its mods are installed.
+
+    The collection "Clear archive after install" setting overrides both
+    Downloads settings (clear_archive_after_install + keep_fomod_archives).
+    Settings are read on each call so a change mid-install takes effect.
+    """
+    if load_collection_settings().get("clear_archive_after_install", False):
+        return True
+    return load_clear_archive_after_install() and not (was_fomod and load_keep_fomod_archives())
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+@dataclass
+class PipelineCallbacks:
+    """Optional progress hooks.  All are called from worker threads."""
+    status: Optional[Callable[[str], None]] = None
+    progress: Optional[Callable[[float], None]] = None           # fraction of mods done
+    download_progress: Optional[Callable[[object, int, int], None]] = None  # (mod, cur, total)
+    download_finished: Optional[Callable[[object, object], None]] = None    # (mod, result)
+    extract_started: Optional[Callable[[object, str], None]] = None         # (mod, display name)
+    extract_finished: Optional[Callable[[object], None]] = None
+    installed: Optional[Callable[[object, str], None]] = None               # (mod, folder)
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of :meth:`CollectionPipeline.run`."""
+    installed: int = 0
+    skipped: int = 0
+    install_results: dict[int, str] = field(default_factory=dict)   # file_id → folder
+    # FOMODs that need the wizard but the pipeline has no window to show it.
+    unresolved_fomods: list = field(default_factory=list)
+    bytes_fetched: int = 0
+    fetch_seconds: float = 0.0
+    total_seconds: float = 0.0
+    # Throughput samples (see collection_plan.record_throughput).
+    network_bytes: int = 0       # bytes actually downloaded
+    extract_bytes: int = 0       # uncompressed bytes of installed archives
+    install_seconds: float = 0.0  # first extraction start → last finish
+
+
+_DONE_SENTINEL = None  # pushed once per install consumer to signal shutdown
+
+
+class CollectionPipeline:
+    """Download and install collection mods concurrently.
+
+    Fetch workers (producers) push each archive onto a bounded queue so
+    install workers start extracting as soon as an archive is available,
+    rather than waiting for every download.  When the queue is full the
+    fetch workers block, preventing archives from piling up on disk.
+    """
+
+    def __init__(
+        self,
+        manifest: CollectionManifest,
+        game,
+        profile_dir: Path,
+        fetch: FetchFn,
+        *,
+        log_fn: Callable[[str], None] = app_log,
+        game_domain: str = "",
+        fetch_workers: int = 4,
+        install_workers: int = 4,
+        download_dir: Optional[Path] = None,
+        evict_archives: bool = False,
+        archive_policy: Callable[[bool], bool] = default_archive_policy,
+        from_collection: str = "",
+        overwrite_existing: "bool | None" = None,
+        parent_window=None,
+        interactive_fomods: bool = False,
+        download_order: str = "smallest",
+        expected_size_fn: Optional[Callable[[object], int]] = None,
+        callbacks: Optional[PipelineCallbacks] = None,
+        stop: Optional[threading.Event] = None,
+    ):
+        from gui.install_mod import ExtractionMemoryBudget
+
+        self._manifest = manifest
+        self._game = game
+        self._profile_dir = Path(profile_dir)
+        self._fetch = fetch
+        self._log = log_fn
+        self._game_domain = game_domain or getattr(game, "nexus_game_domain", "") or ""
+        self._fetch_workers = max(1, int(fetch_workers))
+        self._install_workers = max(1, int(install_workers))
+        self._archive_policy = archive_policy
+        self._from_collection = from_collection
+        self._overwrite_existing = overwrite_existing
+        self._parent_window = parent_window
+        self._interactive_fomods = interactive_fomods
+        self._download_order = download_order
+        self._expected_size_fn = expected_size_fn or _expected_archive_size
+        self._cb = callbacks or PipelineCallbacks()
+        self.stop = stop or threading.Event()
+        self.downloads_finished = threading.Event()
+
+        staging = game.get_effective_mod_staging_path()
+        # Memory-budget gated extraction: each worker reserves the estimated
+        # uncompressed size (×1.5 spike factor) before extracting.  If the
+        # estimate exceeds the total budget the archive is still allowed
+        # through once all other extractions have finished.
+        self._mem_budget = ExtractionMemoryBudget(max_workers=self._install_workers)
+        # Disk-space gated admission: each mod reserves its archive size on
+        # the download filesystem and 2× its uncompressed size on the staging
+        # filesystem (scratch + staged copy) before it is fetched.
+        self._disk_budget = DiskSpaceBudget(
+            Path(download_dir) if download_dir else staging, staging,
+            evict_archives=evict_archives,
+        )
+
+        self._queue: queue.Queue = queue.Queue(
+            maxsize=max(self._install_workers + 1, 5))
+        self._lock = threading.Lock()         # counters, archive refcounts
+        self._dl_lock = threading.Lock()      # fetch progress
+        self._fetched = 0
+        self._bytes_done = 0
+        self._per_mod_prev: dict[int, int] = {}   # file_id → last reported bytes
+        self._total = 0
+        self._counters = {"installed": 0, "skipped": 0, "done": 0}
+        self._results: dict[int, str] = {}
+        self._deferred: list = []              # (mod, result, domain)
+        # Two mods can reference the same archive (same file_id, or different
+        # file_ids whose lookup resolved to the same file).
+        self._archive_use_count: dict[str, int] = {}
+        self._external_archive_paths: set[str] = set()
+        self._network_bytes = 0
+        self._extract_bytes = 0
+        self._install_span: list[float] = []   # [first start, last finish]
+
+    # -- public -------------------------------------------------------------
+
+    def downloaded_bytes(self) -> int:
+        """Bytes fetched so far (for an aggregate progress bar)."""
+        with self._dl_lock:
+            return self._bytes_done
+
+    def run(self, mods: list) -> PipelineResult:
+        """Fetch and install *mods*; blocks until the pipeline drains."""
+        t0 = time.monotonic()
+        result = PipelineResult()
+        self._total = len(mods)
+        for plan in self._disk_budget.estimate(
+            (self._expected_size_fn(m), 0) for m in mods
+        ):
+            if not plan.fits:
+                self._log(
+                    f"Collection install: estimated peak disk use "
+                    f"{plan.peak_bytes / 1024 ** 3:.1f} GB on {plan.path} exceeds "
+                    f"{plan.free_bytes / 1024 ** 3:.1f} GB free — mods will be "
+                    f"installed as space allows"
+                    + ("" if self._disk_budget.evict_archives else
+                       "; enabling 'Clear archive after install' reduces the peak")
+                )
+        if not mods:
+            self.downloads_finished.set()
+            return result
+
+        self._emit("status", f"Downloading & installing {self._total} mod(s)…")
+        self._emit("progress", 0.0)
+        ordered = sorted(
+            mods,
+            key=lambda m: getattr(m, "size_bytes", 0) or 0,
+            reverse=(self._download_order == "largest"),
+        )
+
+        # Start install consumer threads first so they're ready for work.
+        consumers: list[threading.Thread] = []
+        for i in range(self._install_workers):
+            t = threading.Thread(target=self._install_consumer, daemon=True,
+                                 name=f"col-install-{i}")
+            t.start()
+            consumers.append(t)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._fetch_workers) as pool:
+            list(pool.map(self._fetch_one, ordered))
+        self.downloads_finished.set()
+        result.fetch_seconds = time.monotonic() - t0
+
+        for _ in consumers:
+            self._queue.put(_DONE_SENTINEL)
+        for t in consumers:
+            t.join()
+
+        if self._deferred and not self.stop.is_set():
+            if self._interactive_fomods:
+                self._install_deferred_fomods()
+            else:
+                for mod, _res, _dom in self._deferred:
+                    self._log(
+                        f"Collection install: '{mod.mod_name}' needs the FOMOD wizard "
+                        f"(no collection choices) — skipped"
+                    )
+                    result.unresolved_fomods.append(mod)
+                    self._counters["skipped"] += 1
+
+        if self._counters["installed"] > 0:
+            self._rebuild_mod_index()
+
+        result.installed = self._counters["installed"]
+        result.skipped = self._counters["skipped"]
+        result.install_results = dict(self._results)
+        result.bytes_fetched = self.downloaded_bytes()
+        result.total_seconds = time.monotonic() - t0
+        result.network_bytes = self._network_bytes
+        result.extract_bytes = self._extract_bytes
+        if len(self._install_span) == 2:
+            result.install_seconds = self._install_span[1] - self._install_span[0]
+        if not self.stop.is_set():
+            from Utils.collection_plan import record_throughput
+            record_throughput(result.network_bytes, result.fetch_seconds,
+                              result.extract_bytes, result.install_seconds)
+        return result
+
+    # -- helpers ------------------------------------------------------------
+
+    def _emit(self, name: str, *args) -> None:
+        fn = getattr(self._cb, name)
+        if fn is None:
+            return
+        try:
+            fn(*args)
+        except Exception:
+            pass
+
+    def _status_line(self) -> str:
+        with self._dl_lock:
+            fetched = self._fetched
+        with self._lock:
+            done = self._counters["done"]
+        return f"Downloaded {fetched}/{self._total}, installed {done}/{self._total}…"
+
+    def _progress_cb(self, mod) -> Callable[[int, int], None]:
+        fid = mod.file_id
+
+        def _cb(cur: int, tot: int) -> None:
+            with self._dl_lock:
+                prev = self._per_mod_prev.get(fid, 0)
+                self._per_mod_prev[fid] = cur
+                self._bytes_done += max(cur - prev, 0)
+            self._emit("download_progress", mod, cur, tot)
+
+        return _cb
+
+    def _build_meta(self, mod, domain: str):
+        """Prebuilt metadata so no extra API calls are needed.
+
+        Prefers the mod_id from collection.json (source.modId) over the
+        GraphQL value, which can be wrong when Nexus associates a file with
+        the wrong mod page.
+        """
+        from Nexus.nexus_meta import build_meta_from_download
+        try:
+            meta = build_meta_from_download(
+                game_domain=domain,
+                mod_id=self._manifest.file_id_to_mod_id.get(mod.file_id, 0) or mod.mod_id,
+                file_id=mod.file_id,
+                archive_name=mod.file_name or "",
+                from_collection=self._from_collection,
+            )
+            meta.nexus_name = mod.mod_name or ""
+            meta.author = mod.mod_author or ""
+            meta.version = mod.version or ""
+            if mod.category_id:
+                meta.category_id = mod.category_id
+            if mod.category_name:
+                meta.category_name = mod.category_name
+            if self._manifest.file_id_to_install_type.get(mod.file_id, "").lower() == "dinput":
+                meta.root_folder = True
+            return meta
+        except Exception:
+            return None
+
+    def _release_archive(self, archive_path: str, was_fomod: bool, ticket) -> None:
+        """Drop one use of *archive_path*; delete it once no mod needs it.
+
+        Archives from the user's own locations are never deleted.  Caller
+        holds ``self._lock``.
+        """
+        if archive_path not in self._archive_use_count:
+            return
+        self._archive_use_count[archive_path] -= 1
+        if (
+            self._archive_use_count[archive_path] == 0
+            and archive_path not in self._external_archive_paths
+            and self._archive_policy(was_fomod)
+        ):
+            from Nexus.nexus_download import delete_archive_and_sidecar
+            try:
+                delete_archive_and_sidecar(Path(archive_path))
+                if ticket is not None:
+                    self._disk_budget.archive_removed(ticket)
+            except Exception as exc:
+                self._log(
+                    f"Collection install: could not remove archive "
+                    f"'{archive_path}': {exc}"
+                )
+
+    # -- producer -----------------------------------------------------------
+
+    def _fetch_one(self, mod) -> None:
+        # Per-mod domain from collection.json (e.g. Skyrim mods inside an
+        # Enderal collection); fall back to the collection's own domain.
+        domain = (getattr(mod, "domain_name", "") or "").strip() or self._game_domain
+
+        # If stopped, skip this mod (still queue it so the consumers drain).
+        ticket = None
+        if not self.stop.is_set():
+            ticket = self._disk_budget.admit(
+                mod.mod_name or mod.file_name or str(mod.file_id),
+                archive_bytes=self._expected_size_fn(mod),
+                cancel=self.stop,
+            )
+        if ticket is None:
+            with self._dl_lock:
+                self._fetched += 1
+            self._queue.put((mod, None, domain, None))
+            return
+
+        # The ticket travels with the queue item, so a file listed twice in
+        # the manifest gets (and releases) a reservation per entry.
+        progress_cb = self._progress_cb(mod)
+        res = None
+        external = False
+        try:
+            res, external = self._fetch(mod, domain, progress_cb, self.stop)
+        except Exception as exc:
+            self._log(
+                f"Collection install: download exception for '{mod.mod_name}' "
+                f"(mod_id={mod.mod_id}, file_id={mod.file_id}): {exc}\n{traceback.format_exc()}"
+            )
+        ok = bool(res is not None and res.success and res.file_path)
+        if ok and external:
+            with self._lock:
+                self._external_archive_paths.add(str(res.file_path))
+            self._disk_budget.set_archive_size(ticket, 0)
+        elif ok:
+            with self._dl_lock:
+                self._network_bytes += self._per_mod_prev.get(mod.file_id, 0)
+
+        # If progress was never reported (archive already on disk), advance by the full size.
+        mod_size = getattr(mod, "size_bytes", 0) or 0
+        if mod_size > 0 and self._per_mod_prev.get(mod.file_id, 0) == 0:
+            progress_cb(mod_size, mod_size)
+
+        with self._dl_lock:
+            self._fetched += 1
+        # Count archive uses under the same lock consumers use to decrement.
+        if ok:
+            with self._lock:
+                key = str(res.file_path)
+                self._archive_use_count[key] = self._archive_use_count.get(key, 0) + 1
+        self._emit("status", self._status_line())
+        self._emit("download_finished", mod, res)
+        # Blocks while the queue is full (back-pressure).
+        self._queue.put((mod, res, domain, ticket))
+
+    # -- consumers ----------------------------------------------------------
+
+    def _install_consumer(self) -> None:
+        """Long-lived consumer thread: pull items from the queue and install."""
+        while True:
+            item = self._queue.get()
+            if item is _DONE_SENTINEL:
+                self._queue.task_done()
+                break
+            mod, res, domain, ticket = item
+            try:
+                self._install_one(mod, res, domain, ticket)
+            except Exception as exc:
+                self._log(f"Collection install: unexpected error installing '{mod.mod_name}': {exc}")
+                with self._lock:
+                    self._counters["skipped"] += 1
+                    self._counters["done"] += 1
+            finally:
+                if ticket is not None:
+                    self._disk_budget.finished(ticket)
+                self._queue.task_done()
+
+    def _install_one(self, mod, res, domain: str, ticket=None) -> None:
+        """Install a single fetched mod archive.
+
+        *ticket* is the mod's disk reservation; the consumer settles it with
+        ``DiskSpaceBudget.finished`` however this returns.
+        """
+        from gui.install_mod import FOMOD_DEFERRED, get_uncompressed_size, install_mod_from_archive
+
+        if self.stop.is_set() or res is None or not res.success:
+            if ticket is not None:
+                self._disk_budget.abandon(ticket)
+                ticket = None
+        if self.stop.is_set():
+            with self._lock:
+                self._counters["skipped"] += 1
+                self._counters["done"] += 1
+            self._emit("extract_finished", mod)
+            return
+
+        if res is None or not res.success or not res.file_path:
+            if res is None:
+                reason = "no result (exception during download)"
+            elif not res.success:
+                reason = (res.error or "unknown error").strip() or "unknown error"
+                if not res.file_path:
+                    reason += " (no file_path)"
+            else:
+                reason = "success but no file_path"
+            self._log(
+                f"Collection install: download failed for '{mod.mod_name}' "
+                f"(mod_id={mod.mod_id}, file_id={mod.file_id}): {reason}"
+            )
+            with self._lock:
+                self._counters["skipped"] += 1
+                self._counters["done"] += 1
+            self._emit("extract_finished", mod)
+            return
+
+        archive_path = str(res.file_path)
+        auto_fomod = self._manifest.fomod_by_file_id.get(mod.file_id)
+        preferred = self._manifest.preferred_name(mod)
+
+        # Estimate uncompressed size and acquire memory budget before extracting.
+        extract_est = get_uncompressed_size(archive_path, md5=getattr(mod, "md5", "") or "")
+        if ticket is not None:
+            self._disk_budget.set_extract_size(ticket, extract_est)
+        self._mem_budget.acquire(extract_est)
+        fomod_flag = {"value": False}
+
+        def _capture_fomod(is_fomod: bool = False):
+            fomod_flag["value"] = is_fomod
+
+        self._emit("extract_started", mod, preferred or mod.mod_name or mod.file_name or "")
+        started = time.monotonic()
+        try:
+            folder_name = install_mod_from_archive(
+                archive_path, self._parent_window, self._log, self._game,
+                fomod_auto_selections=auto_fomod,
+                prebuilt_meta=self._build_meta(mod, domain),
+                profile_dir=self._profile_dir,
+                headless=True,
+                preferred_name=preferred,
+                skip_index_update=True,
+                overwrite_existing=self._overwrite_existing,
+                defer_interactive_fomod=(auto_fomod is None),
+                on_installed=_capture_fomod,
+                archive_md5=getattr(mod, "md5", "") or "",
+            )
+        finally:
+            self._mem_budget.release(extract_est)
+            self._emit("extract_finished", mod)
+            if ticket is not None:
+                self._disk_budget.extracted(ticket)
+
+        if folder_name == FOMOD_DEFERRED:
+            # FOMOD with no auto-selections — queue for after all other mods install.
+            with self._lock:
+                self._deferred.append((mod, res, domain))
+                self._counters["done"] += 1
+            return
+
+        with self._lock:
+            if folder_name:
+                self._results[mod.file_id] = folder_name
+                self._counters["installed"] += 1
+                self._extract_bytes += extract_est
+                if not self._install_span:
+                    self._install_span = [started, started]
+                self._install_span[0] = min(self._install_span[0], started)
+                self._install_span[1] = time.monotonic()
+            else:
+                self._counters["skipped"] += 1
+            self._counters["done"] += 1
+            done_so_far = self._counters["done"]
+            self._release_archive(archive_path, fomod_flag["value"], ticket)
+
+        self._emit("status", self._status_line())
+        self._emit("progress", done_so_far / self._total if self._total else 1.0)
+        if mod.file_id and folder_name:
+            self._emit("installed", mod, folder_name)
+
+    # -- deferred FOMODs ----------------------------------------------------
+
+    def _write_preliminary_plugins_txt(self, label: str) -> None:
+        """Write a plugins.txt listing every plugin that has landed in staging.
+
+        Called before the first deferred FOMOD and again between phases so
+        later-phase FOMOD XML conditions can see plugins produced by earlier
+        phases (Vortex-equivalent behaviour).
+        """
+        from Utils.plugins import PluginEntry, write_loadorder, write_plugins
+        try:
+            plugins: list = []
+            seen: set[str] = set()
+            staging = self._game.get_effective_mod_staging_path()
+            for folder in list(self._results.values()):
+                mod_dir = staging / folder
+                if not mod_dir.is_dir():
+                    continue
+                for _root, _dirs, files in os.walk(str(mod_dir)):
+                    for fn in files:
+                        if fn.lower().endswith(_PRELIMINARY_PLUGIN_EXTS) and fn.lower() not in seen:
+                            seen.add(fn.lower())
+                            plugins.append(PluginEntry(name=fn, enabled=True))
+            if plugins:
+                write_plugins(self._profile_dir / "plugins.txt", plugins,
+                              star_prefix=getattr(self._game, "plugins_use_star_prefix", True))
+                write_loadorder(self._profile_dir / "loadorder.txt", plugins)
+                self._log(
+                    f"Collection install: wrote preliminary plugins.txt "
+                    f"({len(plugins)} plugin(s)) — {label}."
+                )
+        except Exception as exc:
+            self._log(f"Collection install: preliminary plugins.txt skipped — {exc}")
+
+    def _install_deferred_fomods(self) -> None:
+        """Install FOMODs without collection choices once everything else is in.
+
+        Sorted by (phase, priority) so lower-phase FOMODs run first — phase N
+        FOMODs can see files from phase N-1.
+        """
+        from gui.install_mod import install_mod_from_archive
+
+        m = self._manifest
+        self._write_preliminary_plugins_txt("pre-FOMOD")
+        self._deferred.sort(key=lambda t: (
+            m.file_id_to_phase.get(t[0].file_id, 0), m.sort_key(t[0])))
+        phase_counts: dict[int, int] = {}
+        for t in self._deferred:
+            ph = m.file_id_to_phase.get(t[0].file_id, 0)
+            phase_counts[ph] = phase_counts.get(ph, 0) + 1
+        phase_summary = ", ".join(f"phase {p}: {phase_counts[p]}" for p in sorted(phase_counts))
+        self._log(f"Installing {len(self._deferred)} deferred FOMOD mod(s) ({phase_summary})…")
+        self._emit("status", f"Installing {len(self._deferred)} deferred FOMOD mod(s)…")
+
+        current_phase: int | None = None
+        for mod, res, domain in self._deferred:
+            this_phase = m.file_id_to_phase.get(mod.file_id, 0)
+            if current_phase is not None and this_phase != current_phase:
+                self._write_preliminary_plugins_txt(f"phase {current_phase} → {this_phase}")
+            current_phase = this_phase
+            archive_path = str(res.file_path)
+            try:
+                folder = install_mod_from_archive(
+                    archive_path, self._parent_window, self._log, self._game,
+                    fomod_auto_selections=m.fomod_by_file_id.get(mod.file_id),
+                    prebuilt_meta=self._build_meta(mod, domain),
+                    profile_dir=self._profile_dir,
+                    headless=True,
+                    preferred_name=m.preferred_name(mod),
+                    skip_index_update=True,
+                    overwrite_existing=self._overwrite_existing,
+                    archive_md5=getattr(mod, "md5", "") or "",
+                )
+            except Exception as exc:
+                self._log(f"Collection install: failed to install deferred FOMOD '{mod.mod_name}': {exc}")
+                folder = None
+            with self._lock:
+                if folder:
+                    self._results[mod.file_id] = folder
+                    self._counters["installed"] += 1
+                else:
+                    self._counters["skipped"] += 1
+                self._release_archive(archive_path, True, None)
+            if folder and mod.file_id:
+                self._emit("installed", mod, folder)
+
+    def _rebuild_mod_index(self) -> None:
+        """Rebuild the mod index once for all newly installed mods rather than
+        per mod inside the workers (which caused lock contention)."""
+        from Utils.filemap import rebuild_mod_index
+        try:
+            self._log("Updating mod index…")
+            rebuild_mod_index(
+                self._profile_dir / "modindex.bin",
+                self._game.get_effective_mod_staging_path(),
+                strip_prefixes=set(getattr(self._game, "strip_prefixes", None) or []),
+                allowed_extensions=set(getattr(self._game, "install_extensions", None) or []),
+                root_deploy_folders=set(getattr(self._game, "root_deploy_folders", None) or []),
+                normalize_folder_case=getattr(self._game, "normalize_folder_case", True),
+            )
+        except Exception as exc:
+            self._log(f"Mod index rebuild skipped: {exc}")
+
+
+def _expected_archive_size(mod) -> int:
+    size = getattr(mod, "size_bytes", 0) or 0
+    if size:
+        return size
+    from Nexus.download_scheduler import get_download_scheduler
+    return get_download_scheduler().known_size(mod.mod_id, mod.file_id)
+
+
+# ---------------------------------------------------------------------------
+# Headless load order
+# ---------------------------------------------------------------------------
+
+def write_collection_modlist(modlist_path: Path, install_order: list[tuple[int, str]]) -> int:
+    """Write modlist.txt with *install_order* ((priority, folder) pairs) first,
+    followed by any entries already in the modlist that the collection does
+    not own.  Returns the number of entries written."""
+    from Utils.modlist import ModEntry, read_modlist, write_modlist
+
+    ordered = [folder for _key, folder in sorted(install_order, key=lambda x: x[0])]
+    owned = {f.lower() for f in ordered}
+    try:
+        existing = read_modlist(modlist_path) if modlist_path.is_file() else []
+    except Exception:
+        existing = []
+    entries = [ModEntry(name=f, enabled=True, locked=False) for f in ordered]
+    entries.extend(e for e in existing if e.name.lower() not in owned)
+    write_modlist(modlist_path, entries)
+    return len(entries)
+
+
+def write_collection_plugins(game, profile_dir: Path, schema: dict,
+                             folders: Iterable[str]) -> int:
+    """Write plugins.txt / loadorder.txt in the collection author's order.
+
+    Only plugins present in the installed *folders* are written (vanilla
+    masters are managed by the game); plugins the author did not list are
+    appended.  No LOOT sort is run.  Returns the number of plugins written.
+    """
+    from Utils.plugins import PluginEntry, write_loadorder, write_plugins
+
+    exts = tuple(e.lower() for e in (getattr(game, "plugin_extensions", None) or []))
+    if not exts:
+        return 0
+    staging = game.get_effective_mod_staging_path()
+    present: dict[str, str] = {}   # lower → on-disk name
+    for folder in folders:
+        for _root, _dirs, files in os.walk(str(staging / folder)):
+            for fn in files:
+                if fn.lower().endswith(exts):
+                    present.setdefault(fn.lower(), fn)
+    entries: list = []
+    for p in schema.get("plugins", []):
+        name = p.get("name", "")
+        if name and present.pop(name.lower(), None) is not None:
+            entries.append(PluginEntry(name=name, enabled=p.get("enabled", True)))
+    entries.extend(PluginEntry(name=n, enabled=True) for n in present.values())
+    if entries:
+        write_plugins(Path(profile_dir) / "plugins.txt", entries,
+                      star_prefix=getattr(game, "plugins_use_star_prefix", True))
+        write_loadorder(Path(profile_dir) / "loadorder.txt", entries)
+    return len(entries)
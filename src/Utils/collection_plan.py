@@ -0,0 +1,546 @@
+"""
+collection_plan.py
+Dry-run planner for collection installs.
+
+Before a multi-hour install, :func:`plan_collection_install` works out —
+without downloading or extracting anything — what the run will do:
+
+- which mods are already installed, which are updates (via
+  ``diff_collection()`` against the profile's saved collection.json) and
+  which need installing, plus the folders an update removes;
+- which archives are already on disk (download cache, downloads folder,
+  custom locations) and which must be downloaded;
+- download, extraction and staging bytes — exact for archives on disk
+  (cached archive listing), estimated at ``DEFAULT_EXPANSION`` otherwise —
+  and whether the peak fits each filesystem (``DiskSpaceBudget.estimate``);
+- which FOMODs replay the collection author's choices and which would need
+  the wizard;
+- an estimated wall time from the throughput measured on previous runs.
+
+The plan serialises to JSON (``CollectionPlan.save``) and the installer
+executes it (``cli.py install-collection --plan``): the manifest hash
+guards against running a plan built for a different revision, planned
+archive paths are used directly instead of searching again, and the folders
+the plan removes are only set aside until the install has succeeded.
+
+Throughput is recorded by CollectionPipeline after every run in
+``~/.config/AmethystModManager/install_throughput.json``::
+
+    {"download_bps": float, "install_bps": float}
+
+``install_bps`` is uncompressed bytes staged per second across all install
+workers.  New measurements are blended with the stored value.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from Utils.app_log import app_log
+from Utils.archive_listing import get_archive_listing, listing_uncompressed_size
+from Utils.collection_diff import diff_collection
+from Utils.collection_engine import (
+    FetchFn,
+    collection_mods_from_manifest,
+    find_local_archive,
+    parse_collection_manifest,
+)
+from Utils.config_paths import get_install_throughput_path
+from Utils.disk_budget import DEFAULT_EXPANSION, DiskSpaceBudget
+
+PLAN_VERSION = 1
+
+# Used until a run has been measured.
+_DEFAULT_DOWNLOAD_BPS = 10 * 1024 * 1024
+_DEFAULT_INSTALL_BPS = 150 * 1024 * 1024
+_THROUGHPUT_BLEND = 0.5   # weight of the newest measurement
+_MIN_SAMPLE_BYTES = 64 * 1024 * 1024   # ignore runs too small to time reliably
+
+_FOMOD_CONFIG_SUFFIX = "fomod/moduleconfig.xml"
+
+# Next to the staging folder: where removed folders wait for the install.
+_PARKED_DIR = ".collection_replaced"
+
+
+# ---------------------------------------------------------------------------
+# Throughput
+# ---------------------------------------------------------------------------
+
+def load_throughput() -> tuple[float, float, bool]:
+    """Return (download_bps, install_bps, measured)."""
+    try:
+        data = json.loads(get_install_throughput_path().read_text(encoding="utf-8"))
+        dl = float(data.get("download_bps") or 0)
+        inst = float(data.get("install_bps") or 0)
+    except (OSError, ValueError, AttributeError):
+        return float(_DEFAULT_DOWNLOAD_BPS), float(_DEFAULT_INSTALL_BPS), False
+    return (dl or float(_DEFAULT_DOWNLOAD_BPS), inst or float(_DEFAULT_INSTALL_BPS),
+            bool(dl or inst))
+
+
+def record_throughput(download_bytes: int, download_seconds: float,
+                      install_bytes: int, install_seconds: float) -> None:
+    """Blend one run's measured rates into the stored throughput."""
+    path = get_install_throughput_path()
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(data, dict):
+            data = {}
+    except (OSError, ValueError):
+        data = {}
+    changed = False
+    for key, nbytes, secs in (("download_bps", download_bytes, download_seconds),
+                              ("install_bps", install_bytes, install_seconds)):
+        if nbytes < _MIN_SAMPLE_BYTES or secs <= 0:
+            continue
+        rate = nbytes / secs
+        old = float(data.get(key) or 0)
+        data[key] = rate if old <= 0 else old + _THROUGHPUT_BLEND * (rate - old)
+        changed = True
+    if not changed:
+        return
+    tmp = path.with_suffix(".tmp")
+    try:
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        tmp.replace(path)
+    except OSError as exc:
+        app_log(f"Could not save install throughput: {exc}")
+
+
+# ---------------------------------------------------------------------------
+# Plan model
+# ---------------------------------------------------------------------------
+
+@dataclass
+class PlannedMod:
+    """One collection entry in a plan."""
+    file_id: int
+    mod_id: int
+    name: str
+    folder: str                  # staging folder (the existing one if "installed")
+    action: str                  # "install" | "update" | "installed"
+    priority: int = 0            # 0 = highest
+    phase: int = 0
+    replaces: str = ""           # old folder removed by an update
+    archive_path: str = ""       # archive already on disk, if any
+    archive_bytes: int = 0
+    extract_bytes: int = 0
+    extract_exact: bool = False  # False = estimated from the archive size
+    fomod: str = ""              # "choices" (replayed) | "wizard" | ""
+
+    @property
+    def needs_fetch(self) -> bool:
+        return self.action in ("install", "update")
+
+    @property
+    def cached(self) -> bool:
+        return bool(self.archive_path)
+
+
+@dataclass
+class DiskEstimate:
+    """Peak usage on one filesystem (see DiskSpaceBudget.estimate)."""
+    path: str
+    free_bytes: int
+    peak_bytes: int
+    fits: bool
+
+
+@dataclass
+class CollectionPlan:
+    """Machine-readable result of :func:`plan_collection_install`."""
+    collection: str = ""
+    manifest_sha1: str = ""
+    game: str = ""
+    profile: str = ""
+    created: str = ""
+    mods: list[PlannedMod] = field(default_factory=list)
+    removals: list[str] = field(default_factory=list)        # folders removed before install
+    offsite: list[list[str]] = field(default_factory=list)   # [name, url] — manual downloads
+    bundled: int = 0
+    disk: list[DiskEstimate] = field(default_factory=list)
+    download_bps: float = 0.0
+    install_bps: float = 0.0
+    throughput_measured: bool = False
+    estimated_seconds: float = 0.0
+    version: int = PLAN_VERSION
+
+    # -- totals -------------------------------------------------------------
+
+    @property
+    def to_fetch(self) -> list[PlannedMod]:
+        return [m for m in self.mods if m.needs_fetch]
+
+    @property
+    def download_bytes(self) -> int:
+        return sum(m.archive_bytes for m in self.to_fetch if not m.cached)
+
+    @property
+    def cached_bytes(self) -> int:
+        return sum(m.archive_bytes for m in self.to_fetch if m.cached)
+
+    @property
+    def extract_bytes(self) -> int:
+        return sum(m.extract_bytes for m in self.to_fetch)
+
+    @property
+    def fits(self) -> bool:
+        return all(d.fits for d in self.disk)
+
+    # -- (de)serialisation --------------------------------------------------
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["totals"] = {
+            "mods": len(self.mods),
+            "to_fetch": len(self.to_fetch),
+            "to_download": sum(1 for m in self.to_fetch if not m.cached),
+            "download_bytes": self.download_bytes,
+            "cached_bytes": self.cached_bytes,
+            "extract_bytes": self.extract_bytes,
+            "staging_bytes": self.extract_bytes,
+            "fomod_choices": sum(1 for m in self.to_fetch if m.fomod == "choices"),
+            "fomod_wizard": sum(1 for m in self.to_fetch if m.fomod == "wizard"),
+        }
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CollectionPlan":
+        if data.get("version") != PLAN_VERSION:
+            raise ValueError(f"unsupported plan version {data.get('version')!r}")
+        fields = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        fields["mods"] = [PlannedMod(**m) for m in data.get("mods", [])]
+        fields["disk"] = [DiskEstimate(**d) for d in data.get("disk", [])]
+        return cls(**fields)
+
+    def save(self, path: Path) -> None:
+        """Write the plan as JSON (atomically)."""
+        path = Path(path)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "CollectionPlan":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    # -- report -------------------------------------------------------------
+
+    def summary_lines(self) -> list[str]:
+        """Human-readable report."""
+        gb = 1024 ** 3
+        fetch = self.to_fetch
+        n_cached = sum(1 for m in fetch if m.cached)
+        n_installed = sum(1 for m in self.mods if m.action == "installed")
+        n_update = sum(1 for m in fetch if m.action == "update")
+        exact = all(m.extract_exact for m in fetch)
+        lines = [
+            f"Collection: {self.collection or '(unnamed)'} — {len(self.mods)} mod(s)",
+            f"  already installed: {n_installed}, to install: {len(fetch) - n_update}, "
+            f"updates: {n_update}, folders to remove: {len(self.removals)}",
+            f"  archives: {len(fetch) - n_cached} to download "
+            f"({self.download_bytes / gb:.2f} GB), {n_cached} already on disk "
+            f"({self.cached_bytes / gb:.2f} GB)",
+            f"  extraction / staging: {self.extract_bytes / gb:.2f} GB"
+            + ("" if exact else " (partly estimated)"),
+        ]
+        choices = [m.name for m in fetch if m.fomod == "choices"]
+        wizard = [m.name for m in fetch if m.fomod == "wizard"]
+        if choices:
+            lines.append(f"  FOMOD choices to replay: {len(choices)}")
+            lines.extend(f"    - {n}" for n in choices)
+        if wizard:
+            lines.append(f"  FOMODs needing the wizard (no collection choices): {len(wizard)}")
+            lines.extend(f"    - {n}" for n in wizard)
+        for d in self.disk:
+            lines.append(
+                f"  disk {d.path}: peak {d.peak_bytes / gb:.2f} GB of "
+                f"{d.free_bytes / gb:.2f} GB free — {'ok' if d.fits else 'DOES NOT FIT'}"
+            )
+        if self.offsite:
+            lines.append(f"  off-site mods to fetch by hand: {len(self.offsite)}")
+        if self.bundled:
+            lines.append(f"  bundled mods (installed from the collection archive): {self.bundled}")
+        mins = self.estimated_seconds / 60
+        lines.append(
+            f"  estimated time: {mins:.0f} min "
+            f"(download {self.download_bps / 1024 ** 2:.1f} MB/s, "
+            f"install {self.install_bps / 1024 ** 2:.1f} MB/s"
+            + (")" if self.throughput_measured else ", defaults — no run measured yet)")
+        )
+        return lines
+
+
+# ---------------------------------------------------------------------------
+# Planning
+# ---------------------------------------------------------------------------
+
+def manifest_sha1(schema: dict) -> str:
+    """Stable hash of a parsed collection.json."""
+    raw = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _estimate_seconds(download_bytes: int, extract_bytes: int, largest_extract: int,
+                      download_bps: float, install_bps: float) -> float:
+    """Downloads and installs overlap, so the slower stage dominates; the
+    last archive still has to be installed after its download finishes."""
+    dl = download_bytes / download_bps if download_bps > 0 else 0.0
+    inst = extract_bytes / install_bps if install_bps > 0 else 0.0
+    tail = largest_extract / install_bps if install_bps > 0 and dl >= inst else 0.0
+    return max(dl, inst) + tail
+
+
+def plan_collection_install(
+    schema: dict,
+    game,
+    profile_dir: Path,
+    archive_dirs: Iterable[Path],
+    *,
+    download_dir: Optional[Path] = None,
+    collection_slug: str = "",
+    log_fn: Callable[[str], None] = app_log,
+) -> CollectionPlan:
+    """Build a plan for installing *schema* into *profile_dir* (no side effects).
+
+    *archive_dirs* are searched for archives already on disk; *download_dir*
+    is where missing archives would be downloaded (defaults to the first
+    archive dir).
+    """
+    from Utils.modlist import read_modlist
+
+    profile_dir = Path(profile_dir)
+    archive_dirs = [Path(d) for d in archive_dirs]
+    manifest = parse_collection_manifest(schema)
+    mods, offsite = collection_mods_from_manifest(schema)
+    bundled = sum(1 for m in mods if m.source_type == "bundle")
+    mods = [m for m in mods if m.source_type != "bundle" and m.file_id]
+    staging = game.get_effective_mod_staging_path()
+
+    modlist_path = profile_dir / "modlist.txt"
+    try:
+        entries = read_modlist(modlist_path) if modlist_path.is_file() else []
+    except Exception:
+        entries = []
+    try:
+        old_manifest = json.loads((profile_dir / "collection.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        old_manifest = {}
+    diff = diff_collection(
+        old_manifest=old_manifest,
+        new_mods=mods,
+        staging_path=staging,
+        installed_names_lower={e.name.lower() for e in entries if not e.is_separator},
+        collection_slug=collection_slug,
+    )
+    to_install = set(diff.to_install_fids)
+    replaces = dict(zip(diff.to_update_new_fids, diff.to_update_old))
+
+    plan = CollectionPlan(
+        collection=(schema.get("info") or {}).get("name") or "",
+        manifest_sha1=manifest_sha1(schema),
+        game=getattr(game, "name", "") or "",
+        profile=profile_dir.name,
+        created=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        removals=list(diff.removals),
+        offsite=[[name, url] for name, url in offsite],
+        bundled=bundled,
+    )
+    domain = getattr(game, "nexus_game_domain", "") or ""
+    for mod in sorted(mods, key=manifest.sort_key):
+        if mod.file_id in replaces:
+            action = "update"
+        elif mod.file_id in to_install:
+            action = "install"
+        else:
+            action = "installed"
+        pm = PlannedMod(
+            file_id=mod.file_id,
+            mod_id=manifest.file_id_to_mod_id.get(mod.file_id, 0) or mod.mod_id,
+            name=mod.mod_name or mod.file_name or str(mod.file_id),
+            folder=(diff.installed_folders.get(mod.file_id, "") if action == "installed"
+                    else "") or manifest.preferred_name(mod),
+            action=action,
+            priority=manifest.sort_key(mod),
+            phase=manifest.file_id_to_phase.get(mod.file_id, 0),
+            replaces=replaces.get(mod.file_id, ""),
+            archive_bytes=mod.size_bytes or 0,
+            fomod="choices" if mod.file_id in manifest.fomod_by_file_id else "",
+        )
+        plan.mods.append(pm)
+        if not pm.needs_fetch:
+            continue
+        local = find_local_archive(mod, archive_dirs, domain)
+        if local is not None:
+            pm.archive_path = str(local.file_path)
+            pm.archive_bytes = local.bytes_downloaded or pm.archive_bytes
+            listing = get_archive_listing(pm.archive_path, md5=mod.md5 or "")
+            if listing:
+                pm.extract_bytes = listing_uncompressed_size(listing)
+                pm.extract_exact = True
+                has_installer = any(
+                    e.path.lower().endswith(_FOMOD_CONFIG_SUFFIX) for e in listing)
+                if has_installer and not pm.fomod:
+                    pm.fomod = "wizard"
+        if not pm.extract_exact:
+            pm.extract_bytes = int(pm.archive_bytes * DEFAULT_EXPANSION)
+
+    fetch = plan.to_fetch
+    dl_dir = Path(download_dir) if download_dir else (archive_dirs[0] if archive_dirs else staging)
+    budget = DiskSpaceBudget(dl_dir, staging)
+    plan.disk = [
+        DiskEstimate(path=str(p.path), free_bytes=p.free_bytes,
+                     peak_bytes=p.peak_bytes, fits=p.fits)
+        for p in budget.estimate(
+            (0 if m.cached else m.archive_bytes, m.extract_bytes) for m in fetch)
+    ]
+    plan.download_bps, plan.install_bps, plan.throughput_measured = load_throughput()
+    plan.estimated_seconds = _estimate_seconds(
+        plan.download_bytes, plan.extract_bytes,
+        max((m.extract_bytes for m in fetch), default=0),
+        plan.download_bps, plan.install_bps,
+    )
+    log_fn(f"Collection plan: {len(fetch)} of {len(plan.mods)} mod(s) to install, "
+           f"{plan.download_bytes / 1024 ** 3:.2f} GB to download")
+    return plan
+
+
+# ---------------------------------------------------------------------------
+# Execution helpers
+# ---------------------------------------------------------------------------
+
+def check_plan(plan: CollectionPlan, schema: dict) -> None:
+    """Raise ValueError if *plan* was not built from *schema*."""
+    if plan.manifest_sha1 != manifest_sha1(schema):
+        raise ValueError("plan was built for a different collection.json — re-run the planner")
+
+
+def planned_mods(plan: CollectionPlan, mods: Iterable) -> list:
+    """Return the collection mods the plan installs or updates."""
+    wanted = {m.file_id for m in plan.to_fetch}
+    return [m for m in mods if m.file_id in wanted]
+
+
+def planned_fetch(plan: CollectionPlan, fallback: FetchFn) -> FetchFn:
+    """Fetch function that uses the plan's archive paths, else *fallback*."""
+    by_fid = {m.file_id: m for m in plan.to_fetch if m.archive_path}
+
+    def _fetch(mod, game_domain, progress_cb, cancel):
+        from Nexus.nexus_download import DownloadResult
+
+        pm = by_fid.get(mod.file_id)
+        if pm is not None:
+            path = Path(pm.archive_path)
+            try:
+                size = path.stat().st_size
+            except OSError:
+                size = -1
+            if size == pm.archive_bytes:
+                return DownloadResult(
+                    success=True, file_path=path, file_name=path.name,
+                    bytes_downloaded=size, game_domain=game_domain,
+                    mod_id=mod.mod_id, file_id=mod.file_id,
+                ), True
+        return fallback(mod, game_domain, progress_cb, cancel)
+
+    return _fetch
+
+
+def _removal_names(plan: CollectionPlan) -> list[str]:
+    """Folders the plan removes: obsolete mods and the old versions of
+    updated mods."""
+    names = dict.fromkeys([*plan.removals, *(m.replaces for m in plan.mods if m.replaces)])
+    return [n for n in names if n and "/" not in n and n not in (".", "..")]
+
+
+def park_plan_removals(plan: CollectionPlan, staging: Path,
+                       log_fn: Callable[[str], None] = app_log) -> dict[str, Path]:
+    """Move the folders the plan removes out of the staging folder before
+    installing, so an update can reuse the old folder name.
+
+    Nothing is deleted: :func:`apply_plan_removals` deletes the parked
+    folders once the install has succeeded, :func:`restore_plan_removals`
+    puts them back if it did not.  Returns {folder name: parked path}.
+    """
+    staging = Path(staging)
+    park_root = staging.parent / _PARKED_DIR
+    parked: dict[str, Path] = {}
+    for name in _removal_names(plan):
+        target = staging / name
+        if not target.is_dir():
+            continue
+        dest = park_root / name
+        try:
+            if dest.exists():
+                shutil.rmtree(dest)
+            park_root.mkdir(parents=True, exist_ok=True)
+            os.replace(target, dest)
+        except OSError as exc:
+            log_fn(f"Could not set aside '{name}': {exc}")
+            continue
+        parked[name] = dest
+    return parked
+
+
+def restore_plan_removals(parked: dict[str, Path], staging: Path,
+                          log_fn: Callable[[str], None] = app_log) -> None:
+    """Move folders parked by :func:`park_plan_removals` back into staging,
+    unless the install has since created a folder of the same name."""
+    for name, src in parked.items():
+        target = Path(staging) / name
+        if target.exists():
+            log_fn(f"Keeping the new '{name}'; the old version stays in {src.parent}")
+            continue
+        try:
+            os.replace(src, target)
+        except OSError as exc:
+            log_fn(f"Could not restore '{name}' from {src}: {exc}")
+    _drop_park_root(parked)
+
+
+def apply_plan_removals(plan: CollectionPlan, staging: Path, modlist_path: Path,
+                        log_fn: Callable[[str], None] = app_log,
+                        parked: Optional[dict[str, Path]] = None) -> int:
+    """Delete the staging folders the plan removes (obsolete mods and the
+    old versions of updated mods) and drop them from modlist.txt.
+
+    Folders already moved aside by :func:`park_plan_removals` are deleted
+    from where they were parked; a folder the install has reused keeps its
+    modlist entry.
+    """
+    from Utils.modlist import read_modlist, write_modlist
+
+    parked = parked or {}
+    removed: set[str] = set()
+    for name in _removal_names(plan):
+        target = parked.get(name) or Path(staging) / name
+        if target.is_dir():
+            try:
+                shutil.rmtree(target)
+            except OSError as exc:
+                log_fn(f"Could not remove '{name}': {exc}")
+                continue
+            log_fn(f"Removed '{name}'")
+        if not (Path(staging) / name).is_dir():
+            removed.add(name)
+    _drop_park_root(parked)
+    if removed and modlist_path.is_file():
+        entries = read_modlist(modlist_path)
+        write_modlist(modlist_path, [e for e in entries if e.name not in removed])
+    return len(removed)
+
+
+def _drop_park_root(parked: dict[str, Path]) -> None:
+    if not parked:
+        return
+    try:
+        next(iter(parked.values())).parent.rmdir()   # only once empty
+    except OSError:
+        pass
@@ -184,6 +184,60 @@ def get_dotnet_cache_dir() -> Path:
     return path
 
 
+def get_archive_listing_cache_dir() -> Path:
+    """Return the directory holding cached archive listings (paths, sizes, CRCs).
+
+    Result: ~/.config/AmethystModManager/archive_listings/
+    """
+    d = get_config_dir() / "archive_listings"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def get_fomod_cache_dir() -> Path:
+    """Return the directory holding parsed FOMOD installers and resolved file lists.
+
+    Result: ~/.config/AmethystModManager/fomod_cache/
+    """
+    d = get_config_dir() / "fomod_cache"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def get_extract_cache_dir() -> Path:
+    """Return the content-addressed store of extracted archives.
+
+    Result: ~/.config/AmethystModManager/extract_cache/
+    """
+    d = get_config_dir() / "extract_cache"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def get_game_manifest_path() -> Path:
+    """Return the path to the cached game handler manifest.
+
+    Result: ~/.config/AmethystModManager/game_manifest.json
+    """
+    return get_config_dir() / "game_manifest.json"
+
+
+def get_install_throughput_path() -> Path:
+    """Return the path to the measured download / install throughput file.
+
+    Result: ~/.config/AmethystModManager/install_throughput.json
+    """
+    return get_config_dir() / "install_throughput.json"
+
+
+def get_library_index_path() -> Path:
+    """Return the path to the cached Steam / Heroic library discovery index.
+
+    Result: ~/.config/AmethystModManager/library_index.bin
+    """
+    return get_config_dir() / "library_index.bin"
+
+
 def get_custom_game_images_dir() -> Path:
     """Return the directory where downloaded custom game banner images are cached.
 
@@ -14,6 +14,7 @@ import shutil
 from pathlib import Path
 
 from Utils.app_log import safe_log as _safe_log
+from Utils.filemap_bin import open_filemap
 from Utils.deploy_shared import (
     CustomRule,
     LinkMode,
@@ -181,61 +182,59 @@ def deploy_custom_rules(
     # "stems" (e.g. "foo.dekcns.json" has stems "foo" and "foo.dekcns").
     entries_by_parent: dict[str, list[tuple[str, str, str]]] = {}
 
-    with filemap_path.open(encoding="utf-8") as f:
-        for line in f:
-            line = line.rstrip("\n")
-            if "\t" not in line:
-                continue
-            rel_str, mod_name = line.split("\t", 1)
-            rel_lower = rel_str.lower()
-            if rel_lower in already_seen:
-                continue
-            already_seen.add(rel_lower)
-
-            # Index every entry by parent dir for companion resolution.
-            parent_lower, _, name_lower = rel_lower.rpartition("/")
-            entries_by_parent.setdefault(parent_lower, []).append(
-                (rel_str, mod_name, name_lower)
-            )
+    _fm = open_filemap(filemap_path)
+    if _fm is None:
+        raise FileNotFoundError(f"Filemap not found: {filemap_path}")
+    for rel_str, mod_name in _fm:
+        rel_lower = rel_str.lower()
+        if rel_lower in already_seen:
+            continue
+        already_seen.add(rel_lower)
 
-            match = _match_rule(rel_lower)
-            if match is None:
-                continue
-            rule, strip_len, matched_ext = match
-            primary_matches[rel_lower] = (rule, strip_len, rel_str, mod_name, matched_ext)
+        # Index every entry by parent dir for companion resolution.
+        parent_lower, _, name_lower = rel_lower.rpartition("/")
+        entries_by_parent.setdefault(parent_lower, []).append(
+            (rel_str, mod_name, name_lower)
+        )
 
-            src_str = _resolve_source(
-                mod_name, rel_str, rel_lower, overwrite_dir, staging_root,
-                _overwrite_str, _staging_str, sorted_strip, _per_mod_strip,
-                nocase_cache,
-            )
-            if src_str is None:
-                _log(f"  WARN: source not found — {rel_str} ({mod_name})")
-                continue
-            src = Path(src_str)
+        match = _match_rule(rel_lower)
+        if match is None:
+            continue
+        rule, strip_len, matched_ext = match
+        primary_matches[rel_lower] = (rule, strip_len, rel_str, mod_name, matched_ext)
 
-            dest_base = game_root / rule.dest if rule.dest else game_root
-            if rule.flatten:
-                if strip_len >= 0:
-                    # Folder match + flatten=True: strip the prefix above the
-                    # matched folder so the folder + contents land under dest.
-                    #   strip_len=0: LogicMods/f → dest/LogicMods/f
-                    #   strip_len=5: Paks/LogicMods/f → dest/LogicMods/f
-                    kept = rel_str[strip_len:].lstrip("/")
-                    dst = dest_base / kept if kept else dest_base
-                else:
-                    # Ext/filename-only + flatten=True: bare filename under dest.
-                    dst = dest_base / src.name
+        src_str = _resolve_source(
+            mod_name, rel_str, rel_lower, overwrite_dir, staging_root,
+            _overwrite_str, _staging_str, sorted_strip, _per_mod_strip,
+            nocase_cache,
+        )
+        if src_str is None:
+            _log(f"  WARN: source not found — {rel_str} ({mod_name})")
+            continue
+        src = Path(src_str)
+
+        dest_base = game_root / rule.dest if rule.dest else game_root
+        if rule.flatten:
+            if strip_len >= 0:
+                # Folder match + flatten=True: strip the prefix above the
+                # matched folder so the folder + contents land under dest.
+                #   strip_len=0: LogicMods/f → dest/LogicMods/f
+                #   strip_len=5: Paks/LogicMods/f → dest/LogicMods/f
+                kept = rel_str[strip_len:].lstrip("/")
+                dst = dest_base / kept if kept else dest_base
             else:
-                # flatten=False (any match type): preserve the full
-                # mod-relative path under dest.
-                #   folders=["LogicMods"] dest="" file=Paks/LogicMods/x.pak
-                #     → Paks/LogicMods/x.pak (at game root)
-                #   exts=[".dll"] dest="win64/mods/dlls" file=folder1/x.dll
-                #     → win64/mods/dlls/folder1/x.dll
-                dst = dest_base / rel_str
-            tasks.append((src, dst))
-            handled_lower.add(rel_lower)
+                # Ext/filename-only + flatten=True: bare filename under dest.
+                dst = dest_base / src.name
+        else:
+            # flatten=False (any match type): preserve the full
+            # mod-relative path under dest.
+            #   folders=["LogicMods"] dest="" file=Paks/LogicMods/x.pak
+            #     → Paks/LogicMods/x.pak (at game root)
+            #   exts=[".dll"] dest="win64/mods/dlls" file=folder1/x.dll
+            #     → win64/mods/dlls/folder1/x.dll
+            dst = dest_base / rel_str
+        tasks.append((src, dst))
+        handled_lower.add(rel_lower)
 
     # Second pass: companion files ride along with their primary match.
     # Companions are matched longest-first too so a ".dekcns.json" companion
@@ -13,6 +13,7 @@ import shutil
 from pathlib import Path
 
 from Utils.app_log import safe_log as _safe_log
+from Utils.filemap_bin import open_filemap
 from Utils.deploy_shared import (
     LinkMode,
     _FILEMAP_SNAPSHOT_NAME,
@@ -116,20 +117,20 @@ def deploy_filemap_to_root(
     _dir_listing_cache: dict[str, dict[str, str]] = {}
     _resolved_dir_cache: dict[str, str] = {}
 
-    with filemap_path.open(encoding="utf-8") as f:
-        _tab_lines = [ln.rstrip("\n") for ln in f if "\t" in ln]
-    total_lines = len(_tab_lines)
+    _fm = open_filemap(filemap_path)
+    if _fm is None:
+        raise FileNotFoundError(f"Filemap not found: {filemap_path}")
+    total_lines = len(_fm)
     line_idx = 0
 
     _prebuild_mod_indexes(
-        _tab_lines, overwrite_dir, staging_root, mod_index_cache,
+        _fm.mods, overwrite_dir, staging_root, mod_index_cache,
         profile_dir=filemap_path.parent,
         strip_prefixes=strip_prefixes,
         per_mod_strip_prefixes=per_mod_strip_prefixes,
     )
 
-    for line in _tab_lines:
-        rel_str, mod_name = line.split("\t", 1)
+    for rel_str, mod_name in _fm:
         rel_lower = rel_str.lower()
         if rel_lower in already_seen:
             continue
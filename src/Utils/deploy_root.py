@@ -11,10 +11,11 @@ import concurrent.futures
 import os
 import shutil
 import stat as _stat
-import time as _time
 from pathlib import Path
 
+from Utils import perf_trace as _trace
 from Utils.app_log import safe_log as _safe_log
+from Utils.filemap_bin import open_filemap
 from Utils.deploy_shared import (
     LinkMode,
     _deploy_workers,
@@ -30,6 +31,7 @@ _ROOT_BACKUP_NAME = "Root_Backup"
 _ROOT_LOG_NAME    = "root_folder_deployed.txt"
 
 
+@_trace.traced("deploy root folder")
 def deploy_root_folder(
     root_folder_dir: Path,
     game_root: Path,
@@ -108,7 +110,7 @@ def deploy_root_folder(
             f.write("\n---dirs---\n")
             f.write("\n".join(sorted(created_dirs)))
 
-    print(f"  [TIMER] deploy_root_folder: transferred {len(placed)} files")
+    _trace.count("files", len(placed))
     _log(f"  Root Folder: {len(placed)} file(s) transferred to game root.")
     return len(placed)
 
@@ -141,15 +143,9 @@ def deploy_root_flagged_mods(
     if not filemap_root_path.is_file():
         return 0
 
-    # Read filemap_root.txt — each line is "rel_str\tmod_name"
-    entries: list[tuple[str, str]] = []
-    with filemap_root_path.open(encoding="utf-8") as f:
-        for line in f:
-            line = line.rstrip("\n")
-            if "\t" not in line:
-                continue
-            rel_str, mod_name = line.split("\t", 1)
-            entries.append((rel_str, mod_name))
+    # filemap_root.txt entries, via its mapped filemap_bin companion
+    _fm = open_filemap(filemap_root_path)
+    entries: list[tuple[str, str]] = list(_fm) if _fm is not None else []
 
     if not entries:
         return 0
@@ -245,6 +241,7 @@ def deploy_root_flagged_mods(
     return len(placed)
 
 
+@_trace.traced("restore root folder")
 def restore_root_folder(
     root_folder_dir: Path,
     game_root: Path,
@@ -262,7 +259,6 @@ def restore_root_folder(
     Silently does nothing if the log file is absent (no prior deploy).
     """
     _log = _safe_log(log_fn)
-    _t_root_restore = _time.perf_counter()
 
     log_path   = root_folder_dir.parent / _ROOT_LOG_NAME
     backup_dir = root_folder_dir.parent / _ROOT_BACKUP_NAME
@@ -355,7 +351,7 @@ def restore_root_folder(
         except OSError:
             pass
 
-    print(f"  [TIMER] restore_root_folder: {_time.perf_counter() - _t_root_restore:.3f}s")
+    _trace.count("files", removed)
     _log(f"  Root Folder restore: removed {removed} file(s) from game root.")
     return removed
 
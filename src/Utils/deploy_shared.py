@@ -18,7 +18,9 @@ from contextlib import contextmanager as _contextmanager
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from pathlib import Path
+from typing import Iterable
 
+from Utils import perf_trace as _trace
 from Utils.app_log import safe_log as _safe_log
 from Utils.path_utils import has_path_traversal as _has_traversal
 
@@ -65,11 +67,9 @@ def _deploy_workers() -> int:
 
 @_contextmanager
 def _timer(label: str):
-    """Print elapsed wall-clock time for a labelled block to stderr."""
-    t0 = _time.perf_counter()
-    yield
-    dt = _time.perf_counter() - t0
-    print(f"  [TIMER] {label}: {dt:.3f}s")
+    """Time a labelled block as a perf_trace span of the running operation."""
+    with _trace.span(label) as s:
+        yield s
 
 
 def load_per_mod_strip_prefixes(profile_dir: Path) -> dict[str, list[str]]:
@@ -433,12 +433,14 @@ def _clear_dir(directory: Path) -> int:
     """
     if not directory.is_dir():
         return 0
-    files = [p for p in directory.rglob("*") if p.is_file()]
-    count = len(files)
-    if count == 0:
-        return 0
-    shutil.rmtree(directory)
-    directory.mkdir(parents=True, exist_ok=True)
+    with _trace.span("clear dir"):
+        files = [p for p in directory.rglob("*") if p.is_file()]
+        count = len(files)
+        if count == 0:
+            return 0
+        shutil.rmtree(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        _trace.count("files", count)
     return count
 
 
@@ -604,24 +606,30 @@ def _restore_from_log(
         return 0
 
     if safe_targets:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=_deploy_workers()) as pool:
-            for n in pool.map(_unlink_one, safe_targets):
-                removed += n
+        with _trace.span("unlink placed"):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=_deploy_workers()) as pool:
+                for n in pool.map(_unlink_one, safe_targets):
+                    removed += n
+            _trace.count("files", removed)
+            # One lstat per target plus one unlink per removed file.
+            _trace.count("syscalls", len(safe_targets) + removed)
 
     # Restore backed-up originals.
     if backup_dir is not None and backup_dir.is_dir():
-        for bak_src in backup_dir.rglob("*"):
-            if not bak_src.is_file():
-                continue
-            rel = bak_src.relative_to(backup_dir)
-            orig = target_root / rel
-            if not _path_under_root(orig, target_root):
-                _log(f"  SKIP: path traversal blocked — {rel}")
-                continue
-            orig.parent.mkdir(parents=True, exist_ok=True)
-            shutil.move(str(bak_src), str(orig))
-            _log(f"  Restored {rel} from {backup_dir.name}/")
-        shutil.rmtree(backup_dir, ignore_errors=True)
+        with _trace.span("restore backups"):
+            for bak_src in backup_dir.rglob("*"):
+                if not bak_src.is_file():
+                    continue
+                rel = bak_src.relative_to(backup_dir)
+                orig = target_root / rel
+                if not _path_under_root(orig, target_root):
+                    _log(f"  SKIP: path traversal blocked — {rel}")
+                    continue
+                orig.parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(str(bak_src), str(orig))
+                _log(f"  Restored {rel} from {backup_dir.name}/")
+                _trace.count("files")
+            shutil.rmtree(backup_dir, ignore_errors=True)
 
     log_path.unlink()
 
@@ -643,7 +651,7 @@ def _restore_from_log(
 
 
 def _prebuild_mod_indexes(
-    tab_lines: list[str],
+    mod_names: Iterable[str],
     overwrite_dir: Path,
     staging_root: Path,
     mod_index_cache: dict,
@@ -652,7 +660,8 @@ def _prebuild_mod_indexes(
     strip_prefixes: "set[str] | None" = None,
     per_mod_strip_prefixes: "dict[str, list[str]] | None" = None,
 ) -> None:
-    """Pre-build per-mod file indexes for all mods referenced in the filemap.
+    """Pre-build per-mod file indexes for *mod_names* (the mods referenced in
+    the filemap — ``FilemapView.mods``).
 
     Fast path: load on-disk paths from Profiles/<game>/modindex.bin (already
     built by filemap.py) for mods whose files aren't behind a strip prefix —
@@ -661,12 +670,6 @@ def _prebuild_mod_indexes(
     Slow path: os.walk each mod folder (for mods with strip prefixes, or
     when the index is missing/stale).
     """
-    mod_names: set[str] = set()
-    for ln in tab_lines:
-        tab_pos = ln.find("\t")
-        if tab_pos > 0:
-            mod_names.add(ln[tab_pos + 1:])
-
     # Try to reuse the on-disk mod index written by filemap.py. It stores
     # stripped rel_str values — fine for mods with no strip prefixes, since
     # the on-disk path is just mod_root/rel_str. For mods that do have strip
@@ -703,8 +706,10 @@ def _prebuild_mod_indexes(
             for rel_lower, rel_str in root.items():
                 built[rel_lower] = mr_str + "/" + rel_str
             mod_index_cache[mr] = built
+            _trace.count("index hits")
         else:
             mod_index_cache[mr] = _build_mod_index(mr)
+            _trace.count("walked mods")
 
 
 def _resolve_root_path(base: Path, rel: Path,
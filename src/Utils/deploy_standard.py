@@ -10,10 +10,11 @@ from __future__ import annotations
 import concurrent.futures
 import os
 import shutil
-import time as _time
 from pathlib import Path
 
+from Utils import perf_trace as _trace
 from Utils.app_log import safe_log as _safe_log
+from Utils.filemap_bin import open_filemap
 from Utils.path_utils import has_path_traversal as _has_traversal
 from Utils.deploy_shared import (
     LinkMode,
@@ -36,6 +37,7 @@ from Utils.deploy_shared import (
 # Step 1 — back up the game install directory
 # ---------------------------------------------------------------------------
 
+@_trace.traced("move to core")
 def move_to_core(
     deploy_dir: Path,
     core_dir: Path | None = None,
@@ -65,7 +67,7 @@ def move_to_core(
     # Count files before the move so we can report the number moved.
     # os.walk gets file/dir classification from readdir d_type on Linux —
     # no extra stat() per entry unlike rglob + is_file().
-    with _timer("move_to_core — count files"):
+    with _timer("count files"):
         count = sum(len(fns) for _, _, fns in os.walk(str(deploy_dir)))
     if not count:
         core_dir.mkdir(parents=True, exist_ok=True)
@@ -73,7 +75,7 @@ def move_to_core(
 
     # Same filesystem → os.rename is a single instant syscall.
     # shutil.move falls back to copy+delete if cross-device.
-    with _timer("move_to_core — rename dir"):
+    with _timer("rename dir"):
         core_dir.parent.mkdir(parents=True, exist_ok=True)
         shutil.move(str(deploy_dir), str(core_dir))
 
@@ -86,6 +88,7 @@ def move_to_core(
 # Step 2 — link mod files listed in filemap.txt into the deploy directory
 # ---------------------------------------------------------------------------
 
+@_trace.traced("deploy filemap")
 def deploy_filemap(
     filemap_path: Path,
     deploy_dir: Path,
@@ -122,6 +125,7 @@ def deploy_filemap(
         pass it to deploy_core() so it can skip files already provided by mods.
     """
     _log = _safe_log(log_fn)
+    _trace.annotate(profile_dir=filemap_path.parent)
     _strip = {p.lower() for p in strip_prefixes} if strip_prefixes else set()
     _per_mod = per_mod_strip_prefixes or {}
     _per_deploy = per_mod_deploy_dirs or {}
@@ -139,84 +143,84 @@ def deploy_filemap(
     mod_index_cache: dict[Path, dict[str, Path]] = {}
     dst_dir_cache: dict[Path, dict[str, str]] = {}
 
-    _t_resolve_start = _time.perf_counter()
-    with filemap_path.open(encoding="utf-8") as f:
-        _tab_lines = [ln.rstrip("\n") for ln in f if "\t" in ln]
-    total_lines = len(_tab_lines)
-    line_idx = 0
-
-    _prebuild_mod_indexes(
-        _tab_lines, overwrite_dir, staging_root, mod_index_cache,
-        profile_dir=filemap_path.parent,
-        strip_prefixes=strip_prefixes,
-        per_mod_strip_prefixes=per_mod_strip_prefixes,
-    )
-    print(f"  [TIMER] deploy_filemap — pre-build mod indexes: "
-          f"{_time.perf_counter() - _t_resolve_start:.3f}s")
-
-    _t_resolve_loop = _time.perf_counter()
-    _index_hits = 0
-    _slow_hits = 0
-    # Cache mod_root Path objects — avoids 92k Path / operations for ~520 mods
-    _mod_root_cache: dict[str, Path] = {}
-    # String-based caches for _resolve_root_path_str
-    _deploy_dir_str = str(deploy_dir)
-    _core_base_str = str(core_dir) if core_dir is not None else None
-    _dir_listing_cache: dict[str, dict[str, str]] = {}
-    _resolved_dir_cache: dict[str, str] = {}
-    for line in _tab_lines:
-        rel_str, mod_name = line.split("\t", 1)
-        # Guard against path traversal in filemap entries.
-        if _has_traversal(rel_str) or _has_traversal(mod_name):
-            _log(f"  WARN: skipping suspicious filemap entry — rel={rel_str!r} mod={mod_name!r}")
-            continue
-        rel_lower = rel_str.lower()
-        if rel_lower in already_seen:
-            continue
-        already_seen.add(rel_lower)
-        if rel_lower in _exclude:
-            continue
-        line_idx += 1
-
-        # --- Fast path: O(1) mod-index lookup (no syscall) ---
-        _mr = _mod_root_cache.get(mod_name)
-        if _mr is None:
-            _mr = overwrite_dir if mod_name == _OVERWRITE_NAME else staging_root / mod_name
-            _mod_root_cache[mod_name] = _mr
-        _idx = mod_index_cache.get(_mr)
-        src_str: str | None = None
-        if _idx is not None:
-            _hit = _idx.get(rel_lower)
-            if _hit is not None:
-                src_str = _hit if isinstance(_hit, str) else str(_hit)
-                _index_hits += 1
-        if src_str is None:
-            # Fall back to full resolve (stat-based)
-            src_str = _resolve_source(
-                mod_name, rel_str, rel_lower, overwrite_dir, staging_root,
-                _overwrite_str, _staging_str, sorted_strip, _per_mod,
-                nocase_cache, mod_index_cache,
-            )
-            if src_str is not None:
-                _slow_hits += 1
-        if src_str is None:
-            _log(f"  WARN: source not found — {rel_str} ({mod_name})")
-            continue
+    with _trace.span("pre-build mod indexes"):
+        _fm = open_filemap(filemap_path)
+        if _fm is None:
+            raise FileNotFoundError(f"Filemap not found: {filemap_path}")
+        total_lines = len(_fm)
+        line_idx = 0
+
+        _prebuild_mod_indexes(
+            _fm.mods, overwrite_dir, staging_root, mod_index_cache,
+            profile_dir=filemap_path.parent,
+            strip_prefixes=strip_prefixes,
+            per_mod_strip_prefixes=per_mod_strip_prefixes,
+        )
+        _trace.count("lines", total_lines)
+
+    with _trace.span("resolve loop"):
+        _index_hits = 0
+        _slow_hits = 0
+        # Cache mod_root Path objects — avoids 92k Path / operations for ~520 mods
+        _mod_root_cache: dict[str, Path] = {}
+        # String-based caches for _resolve_root_path_str
+        _deploy_dir_str = str(deploy_dir)
+        _core_base_str = str(core_dir) if core_dir is not None else None
+        _dir_listing_cache: dict[str, dict[str, str]] = {}
+        _resolved_dir_cache: dict[str, str] = {}
+        for rel_str, mod_name in _fm:
+            # Guard against path traversal in filemap entries.
+            if _has_traversal(rel_str) or _has_traversal(mod_name):
+                _log(f"  WARN: skipping suspicious filemap entry — rel={rel_str!r} mod={mod_name!r}")
+                continue
+            rel_lower = rel_str.lower()
+            if rel_lower in already_seen:
+                continue
+            already_seen.add(rel_lower)
+            if rel_lower in _exclude:
+                continue
+            line_idx += 1
+
+            # --- Fast path: O(1) mod-index lookup (no syscall) ---
+            _mr = _mod_root_cache.get(mod_name)
+            if _mr is None:
+                _mr = overwrite_dir if mod_name == _OVERWRITE_NAME else staging_root / mod_name
+                _mod_root_cache[mod_name] = _mr
+            _idx = mod_index_cache.get(_mr)
+            src_str: str | None = None
+            if _idx is not None:
+                _hit = _idx.get(rel_lower)
+                if _hit is not None:
+                    src_str = _hit if isinstance(_hit, str) else str(_hit)
+                    _index_hits += 1
+            if src_str is None:
+                # Fall back to full resolve (stat-based)
+                src_str = _resolve_source(
+                    mod_name, rel_str, rel_lower, overwrite_dir, staging_root,
+                    _overwrite_str, _staging_str, sorted_strip, _per_mod,
+                    nocase_cache, mod_index_cache,
+                )
+                if src_str is not None:
+                    _slow_hits += 1
+            if src_str is None:
+                _log(f"  WARN: source not found — {rel_str} ({mod_name})")
+                continue
 
-        effective_dir = _per_deploy.get(mod_name, deploy_dir)
-        _core_s = _core_base_str if effective_dir is deploy_dir else None
-        _eff_s = _deploy_dir_str if effective_dir is deploy_dir else str(effective_dir)
-        dst_str = _resolve_root_path_str(_eff_s, rel_str, _dir_listing_cache,
-                                         core_base_str=_core_s,
-                                         resolved_dir_cache=_resolved_dir_cache)
-        use_symlink = symlink_exts is not None and os.path.splitext(src_str)[1].lower() in symlink_exts
-        tasks.append((src_str, dst_str, rel_lower, effective_dir is not deploy_dir, use_symlink))
+            effective_dir = _per_deploy.get(mod_name, deploy_dir)
+            _core_s = _core_base_str if effective_dir is deploy_dir else None
+            _eff_s = _deploy_dir_str if effective_dir is deploy_dir else str(effective_dir)
+            dst_str = _resolve_root_path_str(_eff_s, rel_str, _dir_listing_cache,
+                                             core_base_str=_core_s,
+                                             resolved_dir_cache=_resolved_dir_cache)
+            use_symlink = symlink_exts is not None and os.path.splitext(src_str)[1].lower() in symlink_exts
+            tasks.append((src_str, dst_str, rel_lower, effective_dir is not deploy_dir, use_symlink))
+
+            if progress_fn is not None and line_idx % 500 == 0:
+                progress_fn(line_idx, total_lines)
 
-        if progress_fn is not None and line_idx % 500 == 0:
-            progress_fn(line_idx, total_lines)
+        _trace.count("index hits", _index_hits)
+        _trace.count("slow hits", _slow_hits)
 
-    print(f"  [TIMER] deploy_filemap — resolve loop: {_time.perf_counter() - _t_resolve_loop:.3f}s "
-          f"(index={_index_hits}, slow={_slow_hits})")
     total = len(tasks)
     if total == 0:
         return 0, placed_lower
@@ -232,7 +236,7 @@ def deploy_filemap(
 
     # Pre-create all destination directories up front (single-threaded) to
     # avoid mkdir races inside the thread pool.
-    with _timer("deploy_filemap — mkdir"):
+    with _timer("mkdir"):
         needed_dirs: set[str] = {os.path.dirname(dst) for _, dst, _, _is_custom, _ in tasks}
         _mkdir_leaves(needed_dirs)
 
@@ -270,19 +274,20 @@ def deploy_filemap(
             return rel_lower, None
         return None, (dst, err)
 
-    _t_transfer = _time.perf_counter()
-    with concurrent.futures.ThreadPoolExecutor(max_workers=_deploy_workers()) as pool:
-        for result, err in pool.map(_do_transfer, tasks):
-            done_count += 1
-            if result is not None:
-                placed_lower.add(result)
-                linked += 1
-            elif err is not None:
-                dst_err, exc = err
-                _log(f"  WARN: could not transfer {dst_err}: {exc}")
-            if progress_fn is not None and (done_count % 200 == 0 or done_count == total):
-                progress_fn(done_count, total)
-    print(f"  [TIMER] deploy_filemap — transfer {total} files: {_time.perf_counter() - _t_transfer:.3f}s")
+    with _trace.span("transfer"):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=_deploy_workers()) as pool:
+            for result, err in pool.map(_do_transfer, tasks):
+                done_count += 1
+                if result is not None:
+                    placed_lower.add(result)
+                    linked += 1
+                elif err is not None:
+                    dst_err, exc = err
+                    _log(f"  WARN: could not transfer {dst_err}: {exc}")
+                if progress_fn is not None and (done_count % 200 == 0 or done_count == total):
+                    progress_fn(done_count, total)
+        _trace.count("files", linked)
+        _trace.count("syscalls", total)  # one link/symlink/copy per task
 
     # Write a log of files placed in custom locations so cleanup knows what to
     # remove.  Each line is the absolute path of a deployed file.
@@ -306,6 +311,7 @@ def deploy_filemap(
 # Step 3 — fill gaps with vanilla files from the backup
 # ---------------------------------------------------------------------------
 
+@_trace.traced("deploy core")
 def deploy_core(
     deploy_dir: Path,
     already_placed: set[str],
@@ -333,15 +339,15 @@ def deploy_core(
     _core_str = str(core_dir)
     _core_prefix_len = len(_core_str) + 1  # +1 for the trailing separator
 
-    _t_core_walk = _time.perf_counter()
-    tasks_core: list[tuple[str, str]] = []  # (src_str, rel_str)
-    for dirpath, _dirnames, filenames in os.walk(_core_str):
-        for fname in filenames:
-            src_str = dirpath + "/" + fname
-            rel_str = src_str[_core_prefix_len:]
-            if rel_str.replace("\\", "/").lower() not in already_placed:
-                tasks_core.append((src_str, rel_str))
-    print(f"  [TIMER] deploy_core — walk + filter: {_time.perf_counter() - _t_core_walk:.3f}s")
+    with _trace.span("core walk"):
+        tasks_core: list[tuple[str, str]] = []  # (src_str, rel_str)
+        for dirpath, _dirnames, filenames in os.walk(_core_str):
+            for fname in filenames:
+                src_str = dirpath + "/" + fname
+                rel_str = src_str[_core_prefix_len:]
+                if rel_str.replace("\\", "/").lower() not in already_placed:
+                    tasks_core.append((src_str, rel_str))
+        _trace.count("files", len(tasks_core))
 
     if not tasks_core:
         return 0
@@ -376,17 +382,18 @@ def deploy_core(
         err = _do_link(src, dst_str, mode)
         return (True, dst_str, None) if err is None else (False, dst_str, err)
 
-    _t_core_transfer = _time.perf_counter()
-    with concurrent.futures.ThreadPoolExecutor(max_workers=_deploy_workers()) as pool:
-        for ok, rel_str, exc in pool.map(_do_core, resolved_tasks):
-            done_count += 1
-            if ok:
-                linked += 1
-            else:
-                _log(f"  WARN: could not transfer {rel_str}: {exc}")
-            if progress_fn is not None:
-                progress_fn(done_count, total)
-    print(f"  [TIMER] deploy_core — transfer {total} files: {_time.perf_counter() - _t_core_transfer:.3f}s")
+    with _trace.span("core transfer"):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=_deploy_workers()) as pool:
+            for ok, rel_str, exc in pool.map(_do_core, resolved_tasks):
+                done_count += 1
+                if ok:
+                    linked += 1
+                else:
+                    _log(f"  WARN: could not transfer {rel_str}: {exc}")
+                if progress_fn is not None:
+                    progress_fn(done_count, total)
+        _trace.count("files", linked)
+        _trace.count("syscalls", total)
 
     return linked
 
@@ -395,6 +402,7 @@ def deploy_core(
 # Restore — undo a deploy
 # ---------------------------------------------------------------------------
 
+@_trace.traced("restore")
 def restore_data_core(
     deploy_dir: Path,
     core_dir: Path | None = None,
@@ -426,6 +434,8 @@ def restore_data_core(
     0 is returned — no error is raised.
     """
     _log = _safe_log(log_fn)
+    if overwrite_dir is not None:
+        _trace.annotate(profile_dir=overwrite_dir.parent)
     core_dir = core_dir or _default_core(deploy_dir)
 
     if not core_dir.is_dir():
@@ -458,205 +468,200 @@ def restore_data_core(
         # xEdit Quick Auto Clean writes a fresh file over the deployed symlink
         # or hardlink).  An "original" deploy shares the core inode (hardlink)
         # or matches size+mtime (copy).  A replaced file fails both checks.
-        _t_rescue_start = _time.perf_counter()
-        _core_str = str(core_dir)
-        _core_plen = len(_core_str) + 1
-        core_lower: set[str] = set()
-        core_stat: dict[str, tuple[int, int, int]] = {}
-        core_path: dict[str, str] = {}
-        for _dp, _dns, _fns in os.walk(_core_str):
-            for _fn in _fns:
-                _cp = _dp + "/" + _fn
-                _rel = _cp[_core_plen:].lower()
-                core_lower.add(_rel)
-                core_path[_rel] = _cp
-                try:
-                    _cs = os.lstat(_cp)
-                    core_stat[_rel] = (_cs.st_ino, _cs.st_size, _cs.st_mtime_ns)
-                except OSError:
-                    pass
-        filemap_path = overwrite_dir.parent / "filemap.txt"
-        filemap_lower: set[str] = set()
-        filemap_rel_to_mod: dict[str, str] = {}
-        if filemap_path.is_file():
-            with filemap_path.open(encoding="utf-8") as _fm:
-                for _line in _fm:
-                    _line = _line.rstrip("\n")
-                    if "\t" in _line:
-                        rel_str, mod_name = _line.split("\t", 1)
-                        rel_lower = rel_str.lower()
-                        filemap_lower.add(rel_lower)
-                        filemap_rel_to_mod[rel_lower] = mod_name
-        # Build a set of every file known to any mod in the index (all profiles,
-        # all mods, enabled or disabled).  Runtime-created files won't appear here,
-        # so any hit means "this is a mod file, don't rescue it".
-        modindex_lower: set[str] = set()
-        modindex_rel_to_mods: dict[str, list[str]] = {}
-        try:
-            from Utils.filemap import read_mod_index
-            _index = read_mod_index(overwrite_dir.parent / "modindex.bin")
-            if _index:
-                for _mod_name, (_normal, _root) in _index.items():
-                    if _mod_name == _OVERWRITE_NAME:
-                        continue
-                    for rel_key in _normal.keys():
-                        modindex_lower.add(rel_key)
-                        modindex_rel_to_mods.setdefault(rel_key, []).append(_mod_name)
-        except Exception:
-            pass
-        _strip = {p.lower() for p in (strip_prefixes or set())}
-        _staging = staging_root
-        rescued = 0
-        rescued_to_mod = 0
-        rescued_to_overwrite = 0
-        rescued_edited_vanilla = 0
-        # Track rel_strs rescued to overwrite/ so we can update modindex.bin
-        # by appending entries instead of re-walking the entire overwrite tree.
-        rescued_overwrite_rels: list[str] = []
-        _deploy_str = str(deploy_dir)
-        _deploy_plen = len(_deploy_str) + 1
-        _overwrite_str = str(overwrite_dir)
-        _staging_str = str(_staging) if _staging else ""
-        _lstat = os.lstat
-        # Use os.scandir-based walk: DirEntry.is_symlink() and is_file() use
-        # d_type from readdir on Linux — no extra syscall.  Only non-symlink
-        # regular files need a real lstat() to check st_nlink.
-        _scandir = os.scandir
-        _walk_stack = [_deploy_str]
-        while _walk_stack:
-            _cur_dir = _walk_stack.pop()
-            try:
-                _scan_it = _scandir(_cur_dir)
-            except OSError:
-                continue
-            with _scan_it:
-                for _de in _scan_it:
-                    if _de.is_dir(follow_symlinks=False):
-                        _walk_stack.append(_de.path)
-                        continue
-                    if _de.is_symlink():
-                        continue  # deployed mod symlink — free check via d_type
-                    if not _de.is_file(follow_symlinks=False):
-                        continue
-                    src_str = _de.path
+        with _trace.span("rescue walk"):
+            _core_str = str(core_dir)
+            _core_plen = len(_core_str) + 1
+            core_lower: set[str] = set()
+            core_stat: dict[str, tuple[int, int, int]] = {}
+            core_path: dict[str, str] = {}
+            for _dp, _dns, _fns in os.walk(_core_str):
+                for _fn in _fns:
+                    _cp = _dp + "/" + _fn
+                    _rel = _cp[_core_plen:].lower()
+                    core_lower.add(_rel)
+                    core_path[_rel] = _cp
                     try:
-                        st = _lstat(src_str)
+                        _cs = os.lstat(_cp)
+                        core_stat[_rel] = (_cs.st_ino, _cs.st_size, _cs.st_mtime_ns)
                     except OSError:
-                        continue
-                    if st.st_nlink > 1:
-                        continue  # deployed mod hardlink
-                    rel_str = src_str[_deploy_plen:]
+                        pass
+            filemap_lower: set[str] = set()
+            filemap_rel_to_mod: dict[str, str] = {}
+            _fm = open_filemap(overwrite_dir.parent / "filemap.txt")
+            if _fm is not None:
+                for rel_str, mod_name in _fm:
                     rel_lower = rel_str.lower()
-                    if rel_lower in core_lower:
-                        # Vanilla path — but the file might have been replaced by
-                        # an external tool (e.g. xEdit Quick Auto Clean deletes
-                        # the symlink/hardlink and writes a fresh file).  If the
-                        # on-disk file no longer matches the core backup by inode
-                        # or by (size, mtime), overwrite the core copy with the
-                        # edited file so the rmtree+rename below restores the
-                        # edited vanilla plugin back into Data/.
-                        _cs = core_stat.get(rel_lower)
-                        if _cs is not None:
-                            _core_ino, _core_sz, _core_mt = _cs
-                            if (st.st_ino == _core_ino or
-                                (st.st_size == _core_sz and st.st_mtime_ns == _core_mt)):
-                                continue  # untouched vanilla — restore from core
-                            core_dst = core_path.get(rel_lower)
-                            if core_dst is not None:
-                                try:
-                                    os.replace(src_str, core_dst)
-                                    rescued += 1
-                                    rescued_edited_vanilla += 1
-                                except OSError:
-                                    pass
+                    filemap_lower.add(rel_lower)
+                    filemap_rel_to_mod[rel_lower] = mod_name
+            # Build a set of every file known to any mod in the index (all profiles,
+            # all mods, enabled or disabled).  Runtime-created files won't appear here,
+            # so any hit means "this is a mod file, don't rescue it".
+            modindex_lower: set[str] = set()
+            modindex_rel_to_mods: dict[str, list[str]] = {}
+            try:
+                from Utils.filemap import read_mod_index
+                _index = read_mod_index(overwrite_dir.parent / "modindex.bin")
+                if _index:
+                    for _mod_name, (_normal, _root) in _index.items():
+                        if _mod_name == _OVERWRITE_NAME:
                             continue
-                        continue  # vanilla file — will be restored from core
-                    # Check if we would skip as a known mod file
-                    in_filemap = rel_lower in filemap_lower
-                    in_modindex = rel_lower in modindex_lower
-                    if in_filemap or in_modindex:
-                        # xEdit orphan check: if staging source is missing, rescue the
-                        # edited file (e.g. xEdit deleted original from staging on close)
-                        if _staging and _strip:
-                            mods_to_check: list[str] = []
-                            if in_filemap:
-                                m = filemap_rel_to_mod.get(rel_lower)
-                                if m:
-                                    mods_to_check.append(m)
-                            if in_modindex:
-                                for m in modindex_rel_to_mods.get(rel_lower, []):
-                                    if m and m not in mods_to_check:
-                                        mods_to_check.append(m)
-                            staging_path: Path | None = None
-                            target_mod: str | None = None
-                            for mod_name in mods_to_check:
-                                if mod_name == _OVERWRITE_NAME:
-                                    mod_root = overwrite_dir
-                                else:
-                                    mod_root = _staging / mod_name
-                                found = _get_staging_source_path(mod_root, rel_str, _strip)
-                                if found is not None:
-                                    staging_path = found
-                                    target_mod = mod_name
-                                    break
-                            if staging_path is not None and target_mod is not None:
-                                staging_path.parent.mkdir(parents=True, exist_ok=True)
-                                shutil.move(src_str, str(staging_path))
-                                rescued += 1
-                                rescued_to_mod += 1
+                        for rel_key in _normal.keys():
+                            modindex_lower.add(rel_key)
+                            modindex_rel_to_mods.setdefault(rel_key, []).append(_mod_name)
+            except Exception:
+                pass
+            _strip = {p.lower() for p in (strip_prefixes or set())}
+            _staging = staging_root
+            rescued = 0
+            rescued_to_mod = 0
+            rescued_to_overwrite = 0
+            rescued_edited_vanilla = 0
+            # Track rel_strs rescued to overwrite/ so we can update modindex.bin
+            # by appending entries instead of re-walking the entire overwrite tree.
+            rescued_overwrite_rels: list[str] = []
+            _deploy_str = str(deploy_dir)
+            _deploy_plen = len(_deploy_str) + 1
+            _overwrite_str = str(overwrite_dir)
+            _staging_str = str(_staging) if _staging else ""
+            _lstat = os.lstat
+            # Use os.scandir-based walk: DirEntry.is_symlink() and is_file() use
+            # d_type from readdir on Linux — no extra syscall.  Only non-symlink
+            # regular files need a real lstat() to check st_nlink.
+            _scandir = os.scandir
+            _walk_stack = [_deploy_str]
+            while _walk_stack:
+                _cur_dir = _walk_stack.pop()
+                try:
+                    _scan_it = _scandir(_cur_dir)
+                except OSError:
+                    continue
+                with _scan_it:
+                    for _de in _scan_it:
+                        if _de.is_dir(follow_symlinks=False):
+                            _walk_stack.append(_de.path)
+                            continue
+                        if _de.is_symlink():
+                            continue  # deployed mod symlink — free check via d_type
+                        if not _de.is_file(follow_symlinks=False):
+                            continue
+                        src_str = _de.path
+                        try:
+                            st = _lstat(src_str)
+                        except OSError:
+                            continue
+                        if st.st_nlink > 1:
+                            continue  # deployed mod hardlink
+                        rel_str = src_str[_deploy_plen:]
+                        rel_lower = rel_str.lower()
+                        if rel_lower in core_lower:
+                            # Vanilla path — but the file might have been replaced by
+                            # an external tool (e.g. xEdit Quick Auto Clean deletes
+                            # the symlink/hardlink and writes a fresh file).  If the
+                            # on-disk file no longer matches the core backup by inode
+                            # or by (size, mtime), overwrite the core copy with the
+                            # edited file so the rmtree+rename below restores the
+                            # edited vanilla plugin back into Data/.
+                            _cs = core_stat.get(rel_lower)
+                            if _cs is not None:
+                                _core_ino, _core_sz, _core_mt = _cs
+                                if (st.st_ino == _core_ino or
+                                    (st.st_size == _core_sz and st.st_mtime_ns == _core_mt)):
+                                    continue  # untouched vanilla — restore from core
+                                core_dst = core_path.get(rel_lower)
+                                if core_dst is not None:
+                                    try:
+                                        os.replace(src_str, core_dst)
+                                        rescued += 1
+                                        rescued_edited_vanilla += 1
+                                    except OSError:
+                                        pass
                                 continue
-                            # xEdit orphan: staging missing — put file back in original mod or overwrite
-                            target_mod = (
-                                filemap_rel_to_mod.get(rel_lower)
-                                or (modindex_rel_to_mods.get(rel_lower) or [None])[0]
-                            )
-                            if target_mod:
-                                if target_mod == _OVERWRITE_NAME:
-                                    dst_str = _overwrite_str + "/" + rel_str
-                                    rescued_to_overwrite += 1
-                                    rescued_overwrite_rels.append(rel_str)
-                                else:
-                                    dst_str = _staging_str + "/" + target_mod + "/" + rel_str
+                            continue  # vanilla file — will be restored from core
+                        # Check if we would skip as a known mod file
+                        in_filemap = rel_lower in filemap_lower
+                        in_modindex = rel_lower in modindex_lower
+                        if in_filemap or in_modindex:
+                            # xEdit orphan check: if staging source is missing, rescue the
+                            # edited file (e.g. xEdit deleted original from staging on close)
+                            if _staging and _strip:
+                                mods_to_check: list[str] = []
+                                if in_filemap:
+                                    m = filemap_rel_to_mod.get(rel_lower)
+                                    if m:
+                                        mods_to_check.append(m)
+                                if in_modindex:
+                                    for m in modindex_rel_to_mods.get(rel_lower, []):
+                                        if m and m not in mods_to_check:
+                                            mods_to_check.append(m)
+                                staging_path: Path | None = None
+                                target_mod: str | None = None
+                                for mod_name in mods_to_check:
+                                    if mod_name == _OVERWRITE_NAME:
+                                        mod_root = overwrite_dir
+                                    else:
+                                        mod_root = _staging / mod_name
+                                    found = _get_staging_source_path(mod_root, rel_str, _strip)
+                                    if found is not None:
+                                        staging_path = found
+                                        target_mod = mod_name
+                                        break
+                                if staging_path is not None and target_mod is not None:
+                                    staging_path.parent.mkdir(parents=True, exist_ok=True)
+                                    shutil.move(src_str, str(staging_path))
+                                    rescued += 1
                                     rescued_to_mod += 1
-                                os.makedirs(os.path.dirname(dst_str), exist_ok=True)
-                                shutil.move(src_str, dst_str)
-                                rescued += 1
-                                continue
-                        else:
-                            continue  # no staging check — skip as before
-                    # Genuine runtime-generated file (never in a mod) — goes to overwrite
-                    dst_str = _overwrite_str + "/" + rel_str
-                    os.makedirs(os.path.dirname(dst_str), exist_ok=True)
-                    shutil.move(src_str, dst_str)
-                    rescued += 1
-                    rescued_to_overwrite += 1
-                    rescued_overwrite_rels.append(rel_str)
-        if rescued:
-            if rescued_to_mod:
-                _log(f"  Rescued {rescued_to_mod} file(s) back to mod folder(s).")
-            if rescued_to_overwrite:
-                _log(f"  Rescued {rescued_to_overwrite} runtime-created file(s) → overwrite/.")
-            if rescued_edited_vanilla:
-                _log(f"  Preserved {rescued_edited_vanilla} edited vanilla file(s) (e.g. xEdit-cleaned).")
-            # Update modindex.bin so the next build_filemap call immediately
-            # sees the rescued files under [Overwrite] without a full rescan.
-            # We append the rel_strs we recorded as we rescued — far cheaper
-            # than rglob-ing the entire overwrite tree.
-            if rescued_overwrite_rels:
-                try:
-                    from Utils.filemap import update_mod_index, read_mod_index
-                    index_path = overwrite_dir.parent / "modindex.bin"
-                    existing = read_mod_index(index_path) or {}
-                    existing_normal, existing_root = existing.get(_OVERWRITE_NAME, ({}, {}))
-                    new_normal: dict[str, str] = dict(existing_normal)
-                    for _rel_str in rescued_overwrite_rels:
-                        # Normalise separators for cross-platform safety
-                        _rel_posix = _rel_str.replace("\\", "/")
-                        new_normal[_rel_posix.lower()] = _rel_posix
-                    update_mod_index(index_path, _OVERWRITE_NAME, new_normal, existing_root)
-                except Exception:
-                    pass
-        print(f"  [TIMER] restore — rescue walk: {_time.perf_counter() - _t_rescue_start:.3f}s")
+                                    continue
+                                # xEdit orphan: staging missing — put file back in original mod or overwrite
+                                target_mod = (
+                                    filemap_rel_to_mod.get(rel_lower)
+                                    or (modindex_rel_to_mods.get(rel_lower) or [None])[0]
+                                )
+                                if target_mod:
+                                    if target_mod == _OVERWRITE_NAME:
+                                        dst_str = _overwrite_str + "/" + rel_str
+                                        rescued_to_overwrite += 1
+                                        rescued_overwrite_rels.append(rel_str)
+                                    else:
+                                        dst_str = _staging_str + "/" + target_mod + "/" + rel_str
+                                        rescued_to_mod += 1
+                                    os.makedirs(os.path.dirname(dst_str), exist_ok=True)
+                                    shutil.move(src_str, dst_str)
+                                    rescued += 1
+                                    continue
+                            else:
+                                continue  # no staging check — skip as before
+                        # Genuine runtime-generated file (never in a mod) — goes to overwrite
+                        dst_str = _overwrite_str + "/" + rel_str
+                        os.makedirs(os.path.dirname(dst_str), exist_ok=True)
+                        shutil.move(src_str, dst_str)
+                        rescued += 1
+                        rescued_to_overwrite += 1
+                        rescued_overwrite_rels.append(rel_str)
+            if rescued:
+                if rescued_to_mod:
+                    _log(f"  Rescued {rescued_to_mod} file(s) back to mod folder(s).")
+                if rescued_to_overwrite:
+                    _log(f"  Rescued {rescued_to_overwrite} runtime-created file(s) → overwrite/.")
+                if rescued_edited_vanilla:
+                    _log(f"  Preserved {rescued_edited_vanilla} edited vanilla file(s) (e.g. xEdit-cleaned).")
+                # Update modindex.bin so the next build_filemap call immediately
+                # sees the rescued files under [Overwrite] without a full rescan.
+                # We append the rel_strs we recorded as we rescued — far cheaper
+                # than rglob-ing the entire overwrite tree.
+                if rescued_overwrite_rels:
+                    try:
+                        from Utils.filemap import update_mod_index, read_mod_index
+                        index_path = overwrite_dir.parent / "modindex.bin"
+                        existing = read_mod_index(index_path) or {}
+                        existing_normal, existing_root = existing.get(_OVERWRITE_NAME, ({}, {}))
+                        new_normal: dict[str, str] = dict(existing_normal)
+                        for _rel_str in rescued_overwrite_rels:
+                            # Normalise separators for cross-platform safety
+                            _rel_posix = _rel_str.replace("\\", "/")
+                            new_normal[_rel_posix.lower()] = _rel_posix
+                        update_mod_index(index_path, _OVERWRITE_NAME, new_normal, existing_root)
+                    except Exception:
+                        pass
         # core_path was populated by the rescue walk above — one entry per
         # core file, so len() is our return-value count without a second walk.
         restored = len(core_path)
@@ -664,7 +669,7 @@ def restore_data_core(
     # Fallback count walk — only runs when the rescue walk above was skipped
     # (overwrite_dir is None, or deploy_dir doesn't exist).
     if restored < 0:
-        with _timer("restore — count core files"):
+        with _timer("count core files"):
             _core_str2 = str(core_dir)
             restored = 0
             for _dp2, _dns2, _fns2 in os.walk(_core_str2):
@@ -672,7 +677,7 @@ def restore_data_core(
 
     # Wipe deploy_dir and rename core_dir in its place — single rmtree + O(1)
     # rename on the same filesystem.  No need to clear first then rmtree again.
-    with _timer("restore — rmtree + rename"):
+    with _timer("rmtree + rename"):
         if deploy_dir.is_dir():
             shutil.rmtree(deploy_dir)
         _log(f"  Cleared {deploy_dir.name}/.")
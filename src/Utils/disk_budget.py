@@ -0,0 +1,297 @@
+"""
+disk_budget.py
+Disk-space planner for the collection download → extract → stage pipeline.
+
+``ExtractionMemoryBudget`` only gates RAM.  During a collection install the
+downloaded archives, the scratch extraction folders and the staged copies all
+exist at the same time, so a large collection could fill the disk halfway
+through.  :class:`DiskSpaceBudget` tracks, per filesystem (``st_dev``), how
+many bytes the pipeline has committed and only admits a mod once its whole
+footprint fits:
+
+- **archive** — the download size, charged to the download cache filesystem.
+  Released when the archive is deleted after install (eager eviction), kept
+  otherwise.  Archives that are already on disk cost nothing.
+- **scratch** — the uncompressed size, charged to the staging filesystem
+  (the scratch dir lives in /tmp only when /tmp has room, otherwise next to
+  staging, so staging is the worst case).  Released after extraction.
+- **staged** — the uncompressed size again, charged to the staging
+  filesystem.  Permanent for the lifetime of the budget.
+
+The whole footprint is reserved at admission (before the download starts),
+so an admitted mod never waits for space later and downloads cannot starve
+extractions.  As with the memory budget, a mod whose footprint exceeds the
+remaining space is still admitted once nothing else is in flight, to avoid
+deadlocking on a single huge archive.
+
+Usage::
+
+    budget = DiskSpaceBudget(download_dir, staging_dir, evict_archives=True)
+    ticket = budget.admit("SkyUI", archive_bytes=12_000_000)
+    ... download ...
+    budget.set_extract_size(ticket, get_uncompressed_size(path))
+    ... extract + stage ...
+    budget.extracted(ticket)
+    budget.archive_removed(ticket)   # only if the archive was deleted
+    budget.finished(ticket)          # always, once the mod is done
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from Utils.app_log import app_log
+
+# Expansion ratio assumed before an archive is on disk and can be listed.
+# Refined with get_uncompressed_size() once the download finishes.
+DEFAULT_EXPANSION = 2.0
+
+_DEFAULT_SAFETY_MARGIN = 2 * 1024 ** 3   # keep 2 GB free on every filesystem
+
+
+def _existing_ancestor(path: Path) -> Path:
+    p = Path(path)
+    while not p.exists() and p != p.parent:
+        p = p.parent
+    return p
+
+
+def fs_key(path: Path) -> int:
+    """Return the device id of the filesystem holding *path* (or its nearest
+    existing ancestor)."""
+    try:
+        return os.stat(_existing_ancestor(path)).st_dev
+    except OSError:
+        return -1
+
+
+def fs_free_bytes(path: Path) -> int:
+    """Free bytes available to unprivileged users on *path*'s filesystem."""
+    try:
+        st = os.statvfs(_existing_ancestor(path))
+    except OSError:
+        return 0
+    return st.f_frsize * st.f_bavail
+
+
+@dataclass
+class DiskTicket:
+    """Reservation held by one mod moving through the pipeline."""
+    name: str
+    archive_bytes: int = 0
+    extract_bytes: int = 0
+    archive_held: bool = True
+    scratch_held: bool = True
+    # The mod is done but its archive stays on disk: still reserved, no
+    # longer counted as space that in-flight work will give back.
+    archive_kept: bool = False
+
+
+@dataclass
+class DiskPlan:
+    """Result of :meth:`DiskSpaceBudget.estimate` for one filesystem."""
+    path: Path
+    free_bytes: int
+    peak_bytes: int
+    fits: bool
+
+
+@dataclass
+class _FsState:
+    path: Path
+    capacity: int
+    reserved: int = 0
+    # Bytes that will be released when in-flight mods finish; when this is 0
+    # nothing can free space, so an oversized request is let through.
+    transient: int = 0
+
+
+class DiskSpaceBudget:
+    """Gate pipeline admissions by free space on the download and staging
+    filesystems (thread-safe)."""
+
+    def __init__(self, download_dir: Path, staging_dir: Path,
+                 evict_archives: bool = False,
+                 safety_margin_bytes: int = _DEFAULT_SAFETY_MARGIN):
+        self._download_dir = Path(download_dir)
+        self._staging_dir = Path(staging_dir)
+        self._dl_dev = fs_key(self._download_dir)
+        self._st_dev = fs_key(self._staging_dir)
+        self._margin = max(0, safety_margin_bytes)
+        self.evict_archives = evict_archives
+        self._cv = threading.Condition()
+        self._fs: dict[int, _FsState] = {}
+        for dev, path in ((self._dl_dev, self._download_dir),
+                          (self._st_dev, self._staging_dir)):
+            if dev not in self._fs:
+                self._fs[dev] = _FsState(
+                    path=path,
+                    capacity=max(0, fs_free_bytes(path) - self._margin),
+                )
+
+    # -- planning -----------------------------------------------------------
+
+    def estimate(self, items: Iterable[tuple[int, int]]) -> list[DiskPlan]:
+        """Peak usage per filesystem for installing *items* one at a time.
+
+        *items* are ``(archive_bytes, extract_bytes)`` pairs; ``archive_bytes``
+        is 0 for archives already on disk and ``extract_bytes`` may be 0 to
+        use :data:`DEFAULT_EXPANSION`.
+        """
+        need: dict[int, int] = {dev: 0 for dev in self._fs}
+        archives_total = 0
+        archive_peak = 0
+        staged_total = 0
+        scratch_peak = 0
+        for archive, extract in items:
+            extract = extract or int(archive * DEFAULT_EXPANSION)
+            archives_total += archive
+            archive_peak = max(archive_peak, archive)
+            staged_total += extract
+            scratch_peak = max(scratch_peak, extract)
+        need[self._dl_dev] += archive_peak if self.evict_archives else archives_total
+        need[self._st_dev] += staged_total + scratch_peak
+        plans = []
+        for dev, st in self._fs.items():
+            free = fs_free_bytes(st.path)
+            plans.append(DiskPlan(
+                path=st.path,
+                free_bytes=free,
+                peak_bytes=need[dev],
+                fits=need[dev] + self._margin <= free,
+            ))
+        return plans
+
+    # -- admission ----------------------------------------------------------
+
+    def _costs(self, ticket: DiskTicket) -> dict[int, tuple[int, int]]:
+        """Return {dev: (total, transient)} for *ticket*'s current holdings."""
+        out: dict[int, list[int]] = {}
+        if ticket.archive_held and ticket.archive_bytes:
+            c = out.setdefault(self._dl_dev, [0, 0])
+            c[0] += ticket.archive_bytes
+            if self.evict_archives and not ticket.archive_kept:
+                c[1] += ticket.archive_bytes
+        if ticket.extract_bytes:
+            c = out.setdefault(self._st_dev, [0, 0])
+            c[0] += ticket.extract_bytes
+            if ticket.scratch_held:
+                c[0] += ticket.extract_bytes
+                c[1] += ticket.extract_bytes
+        return {dev: (t, tr) for dev, (t, tr) in out.items()}
+
+    def _apply(self, ticket: DiskTicket, sign: int) -> None:
+        for dev, (total, transient) in self._costs(ticket).items():
+            st = self._fs[dev]
+            st.reserved = max(0, st.reserved + sign * total)
+            st.transient = max(0, st.transient + sign * transient)
+
+    def _fits(self, ticket: DiskTicket) -> bool:
+        for dev, (total, _transient) in self._costs(ticket).items():
+            st = self._fs[dev]
+            if st.reserved + total <= st.capacity or st.transient == 0:
+                continue
+            return False
+        return True
+
+    def admit(self, name: str, archive_bytes: int = 0, extract_bytes: int = 0,
+              cancel: Optional[threading.Event] = None) -> Optional[DiskTicket]:
+        """Block until the mod's full footprint fits, then reserve it.
+
+        Returns None if *cancel* is set while waiting.
+        """
+        archive_bytes = max(0, int(archive_bytes))
+        if extract_bytes <= 0:
+            extract_bytes = int(archive_bytes * DEFAULT_EXPANSION)
+        ticket = DiskTicket(name=name, archive_bytes=archive_bytes,
+                            extract_bytes=max(0, int(extract_bytes)))
+        waited = False
+        with self._cv:
+            while not self._fits(ticket):
+                if cancel is not None and cancel.is_set():
+                    return None
+                if not waited:
+                    app_log(f"Disk budget: waiting for space before '{name}'")
+                    waited = True
+                self._cv.wait(timeout=2.0)
+            for dev, (total, _t) in self._costs(ticket).items():
+                st = self._fs[dev]
+                if st.reserved + total > st.capacity:
+                    app_log(
+                        f"Disk budget: '{name}' needs {total // (1024 * 1024)} MB "
+                        f"on {st.path} but only "
+                        f"{max(0, st.capacity - st.reserved) // (1024 * 1024)} MB "
+                        f"is budgeted — admitting alone"
+                    )
+            self._apply(ticket, +1)
+        return ticket
+
+    def set_extract_size(self, ticket: DiskTicket, extract_bytes: int) -> None:
+        """Replace the pre-download estimate with the archive's real size.
+
+        Never blocks; a larger figure simply delays later admissions.
+        """
+        if extract_bytes <= 0:
+            return
+        with self._cv:
+            self._apply(ticket, -1)
+            ticket.extract_bytes = int(extract_bytes)
+            self._apply(ticket, +1)
+            self._cv.notify_all()
+
+    def set_archive_size(self, ticket: DiskTicket, archive_bytes: int) -> None:
+        """Correct the archive charge (e.g. 0 when a cached copy was reused)."""
+        with self._cv:
+            self._apply(ticket, -1)
+            ticket.archive_bytes = max(0, int(archive_bytes))
+            self._apply(ticket, +1)
+            self._cv.notify_all()
+
+    # -- release ------------------------------------------------------------
+
+    def extracted(self, ticket: DiskTicket) -> None:
+        """The scratch folder is gone; keep only the staged copy."""
+        with self._cv:
+            if not ticket.scratch_held:
+                return
+            self._apply(ticket, -1)
+            ticket.scratch_held = False
+            self._apply(ticket, +1)
+            self._cv.notify_all()
+
+    def archive_removed(self, ticket: DiskTicket) -> None:
+        """The downloaded archive was deleted after install."""
+        with self._cv:
+            if not ticket.archive_held:
+                return
+            self._apply(ticket, -1)
+            ticket.archive_held = False
+            self._apply(ticket, +1)
+            self._cv.notify_all()
+
+    def finished(self, ticket: DiskTicket) -> None:
+        """The mod has left the pipeline, successfully or not.
+
+        Releases a scratch reservation that was never settled and marks a
+        still-held archive as kept, so waiting admissions no longer expect
+        that space back.  Safe to call after any other release.
+        """
+        with self._cv:
+            self._apply(ticket, -1)
+            ticket.scratch_held = False
+            ticket.archive_kept = True
+            self._apply(ticket, +1)
+            self._cv.notify_all()
+
+    def abandon(self, ticket: DiskTicket) -> None:
+        """Drop every reservation for a mod that failed or was skipped."""
+        with self._cv:
+            self._apply(ticket, -1)
+            ticket.archive_held = False
+            ticket.scratch_held = False
+            ticket.extract_bytes = 0
+            self._cv.notify_all()
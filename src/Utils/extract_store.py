@@ -0,0 +1,295 @@
+"""
+extract_store.py
+Content-addressed store of extracted archives, keyed by archive md5.
+
+Reinstalling a mod, re-running a failed collection install or installing the
+same archive into a second staging root normally decompresses it again.  With
+the store enabled (``[filemap] extract_cache`` in amethyst.ini) the installer
+hardlinks a finished extraction into ``extract_cache/<md5>/`` and, the next
+time that archive is installed, links the tree back out instead of running an
+extractor — a repeat install costs one link per file.
+
+Hardlinks cannot cross filesystems, so when a staging folder lives on another
+drive than the config dir the store for it is ``.extract_cache/`` beside that
+staging folder instead (one store per filesystem, each with the full cap).
+
+Layout under ``~/.config/AmethystModManager/extract_cache/`` (or
+``<staging parent>/.extract_cache/``):
+    <md5>/           the archive's files, as extracted
+    .work/           scratch extraction folders on the store's filesystem
+    index.json       {"v": 1, "entries": {md5: {"bytes", "files", "used"}},
+                      "md5_by_stat": {stat_key: md5}}
+
+Entries are evicted least-recently-used first once their total size passes
+the configured cap.  Store files share inodes with staging, so a tool that
+edits a staged file in place edits the stored copy too; every checkout
+re-checks the file count and byte total and drops an entry that no longer
+matches.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from Utils.app_log import app_log
+from Utils.archive_listing import _stat_key
+from Utils.config_paths import get_extract_cache_dir
+from Utils.disk_budget import fs_key
+
+_INDEX_VERSION = 1
+_MAX_STAT_KEYS = 4096
+_WORK_DIR = ".work"
+_STAGING_STORE_DIR = ".extract_cache"
+
+LinkFn = Callable[[str, str], None]
+
+
+def _walk_files(root: str):
+    """Yield (rel_dir, dir_path, [file DirEntry]) for every directory under *root*."""
+    stack = [("", root)]
+    while stack:
+        rel, cur = stack.pop()
+        files = []
+        with os.scandir(cur) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((os.path.join(rel, entry.name), entry.path))
+                elif entry.is_file(follow_symlinks=False):
+                    files.append(entry)
+        yield rel, cur, files
+
+
+def _link_tree(src: str, dst: str, link_fn: LinkFn) -> tuple[int, int]:
+    """Place every file under *src* at the same path under *dst*.
+
+    Returns (files, bytes).  Directories are created as needed.
+    """
+    n_files = 0
+    n_bytes = 0
+    for rel, _cur, files in _walk_files(src):
+        target_dir = os.path.join(dst, rel)
+        os.makedirs(target_dir, exist_ok=True)
+        for entry in files:
+            link_fn(entry.path, os.path.join(target_dir, entry.name))
+            n_files += 1
+            n_bytes += entry.stat(follow_symlinks=False).st_size
+    return n_files, n_bytes
+
+
+class ExtractStore:
+    """The store under *root*, capped at *max_bytes*."""
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._index_path = root / "index.json"
+        self._lock = threading.Lock()
+        self._in_use: dict[str, int] = {}
+        self._entries: dict[str, dict] = {}
+        self._md5_by_stat: dict[str, str] = {}
+        self._copy_warned: set[int] = set()
+        try:
+            data = json.loads(self._index_path.read_text(encoding="utf-8"))
+            if isinstance(data, dict) and data.get("v") == _INDEX_VERSION:
+                self._entries = dict(data.get("entries", {}))
+                self._md5_by_stat = dict(data.get("md5_by_stat", {}))
+        except (OSError, ValueError):
+            pass
+
+    # -- index -------------------------------------------------------------
+
+    def _save_index(self) -> None:
+        """Write index.json atomically.  Caller holds the lock."""
+        if len(self._md5_by_stat) > _MAX_STAT_KEYS:
+            for key in list(self._md5_by_stat)[:len(self._md5_by_stat) - _MAX_STAT_KEYS]:
+                del self._md5_by_stat[key]
+        payload = {
+            "v": _INDEX_VERSION,
+            "entries": self._entries,
+            "md5_by_stat": self._md5_by_stat,
+        }
+        tmp = self._index_path.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            tmp.replace(self._index_path)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+    def _drop(self, md5: str) -> None:
+        """Forget *md5* and delete its tree.  Caller holds the lock."""
+        self._entries.pop(md5, None)
+        shutil.rmtree(self.root / md5, ignore_errors=True)
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until under the cap.  Caller holds the lock."""
+        total = sum(e.get("bytes", 0) for e in self._entries.values())
+        if total <= self.max_bytes:
+            return
+        for md5 in sorted(self._entries, key=lambda m: self._entries[m].get("used", 0)):
+            if total <= self.max_bytes:
+                break
+            if self._in_use.get(md5):
+                continue
+            total -= self._entries[md5].get("bytes", 0)
+            self._drop(md5)
+            app_log(f"Extract cache: evicted {md5}")
+
+    def _warn_if_copying(self, path: str) -> None:
+        """Log once per filesystem when *path* cannot share inodes with the store."""
+        dev = fs_key(Path(path))
+        if dev == fs_key(self.root) or dev in self._copy_warned:
+            return
+        self._copy_warned.add(dev)
+        app_log(f"Extract cache: {path} is on another filesystem than "
+                f"{self.root} — files will be copied, not hardlinked.")
+
+    # -- public ------------------------------------------------------------
+
+    def archive_md5(self, archive_path: str) -> str:
+        """Return the md5 of *archive_path*, hashing it only once per
+        (path, size, mtime)."""
+        stat = _stat_key(archive_path)
+        if stat is None:
+            return ""
+        key = stat[0]
+        with self._lock:
+            hit = self._md5_by_stat.get(key)
+        if hit:
+            return hit
+        h = hashlib.md5()
+        try:
+            with open(archive_path, "rb") as f:
+                for chunk in iter(lambda: f.read(4 * 1024 * 1024), b""):
+                    h.update(chunk)
+        except OSError:
+            return ""
+        md5 = h.hexdigest()
+        with self._lock:
+            self._md5_by_stat[key] = md5
+            self._save_index()
+        return md5
+
+    def has(self, md5: str) -> bool:
+        with self._lock:
+            return bool(md5) and md5.lower() in self._entries
+
+    def work_dir(self) -> Path:
+        """Scratch parent for extractions that should share the store's filesystem."""
+        d = self.root / _WORK_DIR
+        d.mkdir(parents=True, exist_ok=True)
+        return d
+
+    def checkout(self, md5: str, dest_dir: str, link_fn: LinkFn) -> bool:
+        """Link the stored tree for *md5* into *dest_dir*.
+
+        Returns False (leaving *dest_dir* to be cleaned by the caller) when
+        there is no entry or the stored tree no longer matches its record.
+        """
+        md5 = md5.lower()
+        with self._lock:
+            entry = self._entries.get(md5)
+            if entry is None:
+                return False
+            self._in_use[md5] = self._in_use.get(md5, 0) + 1
+        self._warn_if_copying(dest_dir)
+        try:
+            try:
+                files, nbytes = _link_tree(str(self.root / md5), dest_dir, link_fn)
+            except OSError:
+                files, nbytes = -1, -1
+            ok = files == entry.get("files") and nbytes == entry.get("bytes")
+            with self._lock:
+                if ok:
+                    entry["used"] = time.time()
+                else:
+                    app_log(f"Extract cache: entry {md5} changed on disk — discarding.")
+                    self._entries.pop(md5, None)
+                self._save_index()
+            return ok
+        finally:
+            with self._lock:
+                self._in_use[md5] -= 1
+                if not self._in_use[md5]:
+                    del self._in_use[md5]
+                    if md5 not in self._entries:
+                        self._drop(md5)
+
+    def add(self, md5: str, src_dir: str, link_fn: LinkFn) -> None:
+        """Store the extraction in *src_dir* under *md5* (no-op if present)."""
+        md5 = md5.lower()
+        if not md5 or self.has(md5):
+            return
+        self._warn_if_copying(src_dir)
+        partial = tempfile.mkdtemp(prefix=f"{md5}.", dir=self.work_dir())
+        try:
+            files, nbytes = _link_tree(src_dir, partial, link_fn)
+            if nbytes > self.max_bytes:
+                return
+            with self._lock:
+                if md5 in self._entries:
+                    return
+                final = self.root / md5
+                shutil.rmtree(final, ignore_errors=True)
+                os.rename(partial, final)
+                self._entries[md5] = {"bytes": nbytes, "files": files, "used": time.time()}
+                self._evict()
+                self._save_index()
+        except OSError as exc:
+            app_log(f"Extract cache: could not store {md5}: {exc}")
+        finally:
+            shutil.rmtree(partial, ignore_errors=True)
+
+
+_stores: dict[str, ExtractStore] = {}
+_store_lock = threading.Lock()
+
+
+def _store_root(staging: Optional[Path]) -> Path:
+    """Return the store folder for installs into *staging*: the config-dir
+    store when it shares *staging*'s filesystem, else one beside *staging*."""
+    default = get_extract_cache_dir()
+    if staging is None:
+        return default
+    dev = fs_key(staging)
+    if dev == fs_key(default):
+        return default
+    if fs_key(staging.parent) != dev:
+        return default
+    local = staging.parent / _STAGING_STORE_DIR
+    try:
+        local.mkdir(parents=True, exist_ok=True)
+    except OSError as exc:
+        app_log(f"Extract cache: cannot create {local} ({exc}); using {default}")
+        return default
+    return local
+
+
+def get_extract_store(staging: Optional[Path] = None) -> Optional[ExtractStore]:
+    """Return the store used for installs into *staging*, or None when the
+    extract cache is disabled.
+
+    The setting is read on every call so toggling it takes effect at once.
+    """
+    from Utils.ui_config import load_extract_cache_settings
+    settings = load_extract_cache_settings()
+    if not settings["enabled"]:
+        return None
+    max_bytes = settings["max_gb"] * 1024 ** 3
+    root = _store_root(staging)
+    with _store_lock:
+        store = _stores.get(str(root))
+        if store is None:
+            store = _stores[str(root)] = ExtractStore(root, max_bytes)
+        store.max_bytes = max_bytes
+        return store
@@ -41,6 +41,8 @@ from functools import lru_cache
 
 import msgpack
 
+from Utils import perf_trace as _trace
+from Utils.filemap_bin import bin_path_for, write_filemap_bin
 from Utils.modlist import read_modlist
 
 # Conflict status constants (returned per-mod in build_filemap result)
@@ -77,6 +79,82 @@ _filemap_winner_cache: dict[str, frozenset] = {}
 _filemap_winner_cache_lock = threading.Lock()
 
 
+def _sort_path_prefixes(strip_path_prefixes: list[str] | None) -> list[tuple[str, int]]:
+    """Pre-sort full strip prefixes once (longest match first) so they are not
+    re-sorted inside the per-file loop.  Each entry is (lowercase_prefix,
+    len_of_original_prefix) for O(1) strip-by-length."""
+    if not strip_path_prefixes:
+        return []
+    return sorted(((p.lower(), len(p)) for p in strip_path_prefixes), key=lambda t: -t[1])
+
+
+def _index_skips_dir(name: str, exclude_dirs: frozenset[str]) -> bool:
+    """True if a directory called *name* must not be walked for the index."""
+    if exclude_dirs and name.lower() in exclude_dirs:
+        return True
+    # Isolated Proton prefixes created next to a mod's exe
+    # (see _get_tool_prefix_env in dialogs.py) are runtime
+    # state, not mod content — never include them in the
+    # filemap so they don't get deployed into the game.
+    return name.startswith("prefix_")
+
+
+def _index_file(
+    result: dict[str, str],
+    rel_str: str,
+    name: str,
+    sorted_path_prefixes: list[tuple[str, int]],
+    strip_prefixes: frozenset[str],
+    allowed_extensions: frozenset[str],
+) -> None:
+    """Add the file at *rel_str* (basename *name*) to a mod's index entry.
+
+    Shared by _scan_dir() and walkers that index while doing other work
+    (e.g. the MO2 importer copying a mod), so both produce identical entries.
+    """
+    # Strip full path prefixes first (per-mod "ignore this folder" paths).
+    if sorted_path_prefixes:
+        rel_lower = rel_str.lower()
+        for p_lower, p_len in sorted_path_prefixes:
+            if rel_lower == p_lower or rel_lower.startswith(p_lower + "/"):
+                rel_str = rel_str[p_len:].lstrip("/")
+                break
+    # Strip leading wrapper folders declared by the game.
+    # Repeat until no more matching prefixes remain so that
+    # e.g. "bepinex/plugins/Mod/Mod.dll" → "Mod/Mod.dll"
+    # when strip_prefixes = {"bepinex", "plugins"}.
+    if strip_prefixes and "/" in rel_str:
+        while "/" in rel_str:
+            first_seg, remainder = rel_str.split("/", 1)
+            if first_seg.lower() in strip_prefixes:
+                rel_str = remainder
+            else:
+                break
+    # Extension filter — drop files not in the allowed set.
+    # Use suffix matching so multi-dot extensions like
+    # ".dekcns.json" are honoured (splitext only returns
+    # the last suffix).
+    if allowed_extensions:
+        name_lower = name.lower()
+        if not any(
+            name_lower.endswith(e) and len(name_lower) > len(e)
+            for e in allowed_extensions
+        ):
+            return
+    key = rel_str.lower()
+    if key in result:
+        # Two physical files map to the same case-insensitive path
+        # (e.g. Interface/ vs interface/).  Prefer the one whose
+        # folder segments have more uppercase characters.
+        existing = result[key]
+        ex_folders = "/".join(existing.split("/")[:-1])
+        new_folders = "/".join(rel_str.split("/")[:-1])
+        if _upper_count(new_folders) > _upper_count(ex_folders):
+            result[key] = rel_str
+    else:
+        result[key] = rel_str
+
+
 def _scan_dir(
     source_name: str,
     source_dir: str,
@@ -118,12 +196,7 @@ def _scan_dir(
     result: dict[str, str] = {}
     root_result: dict[str, str] = {}  # always empty; kept for tuple compat
     invalid_names: list[str] = []
-    # Pre-sort once (longest match first) so we don't re-sort inside the per-file loop.
-    # Each entry is (lowercase_prefix, len_of_original_prefix) for O(1) strip-by-length.
-    sorted_path_prefixes: list[tuple[str, int]] = (
-        sorted(((p.lower(), len(p)) for p in strip_path_prefixes), key=lambda t: -t[1])
-        if strip_path_prefixes else []
-    )
+    sorted_path_prefixes = _sort_path_prefixes(strip_path_prefixes)
     # Iterative scandir stack — avoids rglob/Pathlib per-entry object cost
     stack = [("", source_dir)]
     while stack:
@@ -132,13 +205,7 @@ def _scan_dir(
             with os.scandir(current) as it:
                 for entry in it:
                     if entry.is_dir(follow_symlinks=False):
-                        if exclude_dirs and entry.name.lower() in exclude_dirs:
-                            continue
-                        # Isolated Proton prefixes created next to a mod's exe
-                        # (see _get_tool_prefix_env in dialogs.py) are runtime
-                        # state, not mod content — never include them in the
-                        # filemap so they don't get deployed into the game.
-                        if entry.name.startswith("prefix_"):
+                        if _index_skips_dir(entry.name, exclude_dirs):
                             continue
                         if not _is_utf8_safe(entry.name):
                             invalid_names.append(prefix + entry.name + "/")
@@ -153,48 +220,10 @@ def _scan_dir(
                         if not _is_utf8_safe(entry.name):
                             invalid_names.append(prefix + entry.name)
                             continue
-                        rel_str = prefix + entry.name
-                        # Strip full path prefixes first (per-mod "ignore this folder" paths).
-                        if sorted_path_prefixes:
-                            rel_lower = rel_str.lower()
-                            for p_lower, p_len in sorted_path_prefixes:
-                                if rel_lower == p_lower or rel_lower.startswith(p_lower + "/"):
-                                    rel_str = rel_str[p_len:].lstrip("/")
-                                    break
-                        # Strip leading wrapper folders declared by the game.
-                        # Repeat until no more matching prefixes remain so that
-                        # e.g. "bepinex/plugins/Mod/Mod.dll" → "Mod/Mod.dll"
-                        # when strip_prefixes = {"bepinex", "plugins"}.
-                        if strip_prefixes and "/" in rel_str:
-                            while "/" in rel_str:
-                                first_seg, remainder = rel_str.split("/", 1)
-                                if first_seg.lower() in strip_prefixes:
-                                    rel_str = remainder
-                                else:
-                                    break
-                        # Extension filter — drop files not in the allowed set.
-                        # Use suffix matching so multi-dot extensions like
-                        # ".dekcns.json" are honoured (splitext only returns
-                        # the last suffix).
-                        if allowed_extensions:
-                            name_lower = entry.name.lower()
-                            if not any(
-                                name_lower.endswith(e) and len(name_lower) > len(e)
-                                for e in allowed_extensions
-                            ):
-                                continue
-                        key = rel_str.lower()
-                        if key in result:
-                            # Two physical files map to the same case-insensitive path
-                            # (e.g. Interface/ vs interface/).  Prefer the one whose
-                            # folder segments have more uppercase characters.
-                            existing = result[key]
-                            ex_folders = "/".join(existing.split("/")[:-1])
-                            new_folders = "/".join(rel_str.split("/")[:-1])
-                            if _upper_count(new_folders) > _upper_count(ex_folders):
-                                result[key] = rel_str
-                        else:
-                            result[key] = rel_str
+                        _index_file(
+                            result, prefix + entry.name, entry.name,
+                            sorted_path_prefixes, strip_prefixes, allowed_extensions,
+                        )
         except OSError:
             pass
     return source_name, result, root_result, invalid_names
@@ -563,6 +592,7 @@ def rename_in_mod_index(
     _write_mod_index(index_path, index, normalize_folder_case=normalize_folder_case)
 
 
+@_trace.traced("rebuild mod index")
 def rebuild_mod_index(
     index_path: Path,
     staging_root: Path,
@@ -634,6 +664,8 @@ def rebuild_mod_index(
                 )
             continue  # skip the entire mod
         index[name] = (normal, root)
+    _trace.count("mods", len(index))
+    _trace.count("files", sum(len(n) + len(r) for n, r in index.values()))
 
     _write_mod_index(index_path, index, normalize_folder_case=normalize_folder_case)
 
@@ -668,16 +700,19 @@ def _write_filemap(
     filemap: dict[str, tuple[str, str]],
     disabled_lower: dict[str, set[str]],
 ) -> int:
-    """Sort and write filemap.txt, returning the number of lines written."""
+    """Sort and write filemap.txt (plus its filemap_bin companion), returning
+    the number of lines written."""
     output_path.parent.mkdir(parents=True, exist_ok=True)
     sorted_keys = sorted(filemap)
     parts: list[str] = []
+    written: list[tuple[str, str]] = []
     for rel_key in sorted_keys:
         rel_str, mod_name = filemap[rel_key]
         # Skip root-level files that the user has disabled for this mod
         if disabled_lower and "/" not in rel_key and mod_name in disabled_lower:
             if rel_key in disabled_lower[mod_name]:
                 continue
+        written.append((rel_str, mod_name))
         parts.append(rel_str)
         parts.append("\t")
         parts.append(mod_name)
@@ -685,13 +720,15 @@ def _write_filemap(
     output = "".join(parts)
     with output_path.open("w", encoding="utf-8") as f:
         f.write(output)
-    return output.count("\n")
+    write_filemap_bin(output_path, written)
+    return len(written)
 
 
 # ---------------------------------------------------------------------------
 # Main filemap builder
 # ---------------------------------------------------------------------------
 
+@_trace.traced("filemap")
 def build_filemap(
     modlist_path: Path,
     staging_root: Path,
@@ -741,6 +778,7 @@ def build_filemap(
     Returns:
         (count, conflict_map, overrides, overridden_by)
     """
+    _trace.annotate(profile_dir=output_path.parent)
     entries = read_modlist(modlist_path)
 
     # Only enabled, non-separator mods
@@ -753,20 +791,21 @@ def build_filemap(
     priority_order = [e.name for e in enabled_low_to_high if e.name != ROOT_FOLDER_NAME] + [OVERWRITE_NAME]
 
     index_path = output_path.parent / "modindex.bin"
-    index = read_mod_index(index_path)
-
-    if index is None:
-        # Index missing or corrupt — fall back to full disk scan and rebuild it.
-        rebuild_mod_index(
-            index_path, staging_root,
-            strip_prefixes=strip_prefixes,
-            per_mod_strip_prefixes=per_mod_strip_prefixes,
-            allowed_extensions=allowed_extensions,
-            normalize_folder_case=normalize_folder_case,
-            exclude_dirs=exclude_dirs,
-            log_fn=log_fn,
-        )
-        index = read_mod_index(index_path) or {}
+    with _trace.span("read index"):
+        index = read_mod_index(index_path)
+
+        if index is None:
+            # Index missing or corrupt — fall back to full disk scan and rebuild it.
+            rebuild_mod_index(
+                index_path, staging_root,
+                strip_prefixes=strip_prefixes,
+                per_mod_strip_prefixes=per_mod_strip_prefixes,
+                allowed_extensions=allowed_extensions,
+                normalize_folder_case=normalize_folder_case,
+                exclude_dirs=exclude_dirs,
+                log_fn=log_fn,
+            )
+            index = read_mod_index(index_path) or {}
 
     # Pre-compile ignore patterns once into a single regex for O(1) matching.
     # `<name>.*` is expanded to also match the extensionless `<name>` so users
@@ -807,63 +846,66 @@ def build_filemap(
     # at the same game location are treated as conflicting even if their staged keys differ.
     conflict_winner: dict[str, str] = {}
 
-    for name in priority_order:
-        entry = index.get(name)
-        if not entry:
-            continue
-        normal, _ = entry
-        if not normal:
-            continue
-        # Guard against surrogate-encoded filenames left in an old modindex.bin.
-        # (Old scans ran before the _scan_dir surrogate-skip fix.)  Skip the
-        # entire mod and log it so the user knows to Refresh / reinstall it.
-        bad_names = [rs for rs in normal.values() if not _is_utf8_safe(rs)]
-        if bad_names:
-            if log_fn is not None:
-                log_fn(
-                    f"WARN: Mod \"{name}\" skipped \u2014 contains file(s) with "
-                    f"non-UTF-8 name(s): {', '.join(bad_names[:5])}"
-                )
-            continue
-        exc = _excluded.get(name)
-        had_file = False
-        _is_root_mod = bool(root_folder_mods and name in root_folder_mods)
-        # Pick which namespace this mod writes into.
-        _winner_ns = filemap_root_winner if _is_root_mod else filemap_winner
-        _map_ns    = filemap_root        if _is_root_mod else filemap
-        for rel_key, rel_str in normal.items():
-            if exc and rel_key in exc:
+    with _trace.span("merge"):
+        for name in priority_order:
+            entry = index.get(name)
+            if not entry:
                 continue
-            if _is_ignored(rel_key):
+            normal, _ = entry
+            if not normal:
                 continue
-            had_file = True
-            prev = _winner_ns.get(rel_key)
-            if prev is not None:
-                win_count[prev] = win_count.get(prev, 0) - 1
-                overrides[name].add(prev)
-                overridden_by[prev].add(name)
-            _winner_ns[rel_key] = name
-            _map_ns[rel_key] = (rel_str, name)
-            win_count[name] = win_count.get(name, 0) + 1
-            # Effective-deploy-path conflict detection only applies to normal mods.
-            # Root-flagged mods deploy verbatim to game_root, no conflict_key_fn transform.
-            if not _is_root_mod and conflict_key_fn is not None:
-                ck = conflict_key_fn(rel_key).lower()
-                prev_ck = conflict_winner.get(ck)
-                if prev_ck is not None and prev_ck != name:
-                    prev_staged = next(
-                        (k for k, v in filemap_winner.items() if v == prev_ck and conflict_key_fn(k) == ck),
-                        None,
+            # Guard against surrogate-encoded filenames left in an old modindex.bin.
+            # (Old scans ran before the _scan_dir surrogate-skip fix.)  Skip the
+            # entire mod and log it so the user knows to Refresh / reinstall it.
+            bad_names = [rs for rs in normal.values() if not _is_utf8_safe(rs)]
+            if bad_names:
+                if log_fn is not None:
+                    log_fn(
+                        f"WARN: Mod \"{name}\" skipped \u2014 contains file(s) with "
+                        f"non-UTF-8 name(s): {', '.join(bad_names[:5])}"
                     )
-                    if prev_staged is not None and prev_staged != rel_key:
-                        filemap_winner.pop(prev_staged, None)
-                        filemap.pop(prev_staged, None)
-                        win_count[prev_ck] = win_count.get(prev_ck, 0) - 1
-                    overrides[name].add(prev_ck)
-                    overridden_by[prev_ck].add(name)
-                conflict_winner[ck] = name
-        if had_file:
-            mods_with_files.add(name)
+                continue
+            exc = _excluded.get(name)
+            had_file = False
+            _is_root_mod = bool(root_folder_mods and name in root_folder_mods)
+            # Pick which namespace this mod writes into.
+            _winner_ns = filemap_root_winner if _is_root_mod else filemap_winner
+            _map_ns    = filemap_root        if _is_root_mod else filemap
+            for rel_key, rel_str in normal.items():
+                if exc and rel_key in exc:
+                    continue
+                if _is_ignored(rel_key):
+                    continue
+                had_file = True
+                prev = _winner_ns.get(rel_key)
+                if prev is not None:
+                    win_count[prev] = win_count.get(prev, 0) - 1
+                    overrides[name].add(prev)
+                    overridden_by[prev].add(name)
+                _winner_ns[rel_key] = name
+                _map_ns[rel_key] = (rel_str, name)
+                win_count[name] = win_count.get(name, 0) + 1
+                # Effective-deploy-path conflict detection only applies to normal mods.
+                # Root-flagged mods deploy verbatim to game_root, no conflict_key_fn transform.
+                if not _is_root_mod and conflict_key_fn is not None:
+                    ck = conflict_key_fn(rel_key).lower()
+                    prev_ck = conflict_winner.get(ck)
+                    if prev_ck is not None and prev_ck != name:
+                        prev_staged = next(
+                            (k for k, v in filemap_winner.items() if v == prev_ck and conflict_key_fn(k) == ck),
+                            None,
+                        )
+                        if prev_staged is not None and prev_staged != rel_key:
+                            filemap_winner.pop(prev_staged, None)
+                            filemap.pop(prev_staged, None)
+                            win_count[prev_ck] = win_count.get(prev_ck, 0) - 1
+                        overrides[name].add(prev_ck)
+                        overridden_by[prev_ck].add(name)
+                    conflict_winner[ck] = name
+            if had_file:
+                mods_with_files.add(name)
+        _trace.count("mods", len(mods_with_files))
+        _trace.count("files", len(filemap) + len(filemap_root))
 
     conflict_map = _compute_conflict_status(
         priority_order, overrides, overridden_by, win_count, mods_with_files,
@@ -881,23 +923,24 @@ def build_filemap(
     #   "force_lower"  — every folder/filename forced lowercase
     #   "force_upper"  — every folder/filename-stem forced uppercase (extension stays lower)
     if normalize_folder_case and (filemap or filemap_root):
-        _strategy = filemap_casing if filemap_casing in _VALID_FILEMAP_CASINGS else FILEMAP_CASING_UPPER
-        _norm_normal: dict[str, dict[str, str]] = {}
-        _norm_root: dict[str, dict[str, str]] = {}
-        for _rk, (_rs, _mn) in filemap.items():
-            _norm_normal.setdefault(_mn, {})[_rk] = _rs
-        for _rk, (_rs, _mn) in filemap_root.items():
-            _norm_root.setdefault(_mn, {})[_rk] = _rs
-        if _strategy in (FILEMAP_CASING_FORCE_LOWER, FILEMAP_CASING_FORCE_UPPER):
-            _apply_force_casing(_norm_normal, _norm_root, strategy=_strategy)
-        else:
-            _normalize_folder_cases(_norm_normal, _norm_root, strategy=_strategy)
-        for _mn, _files in _norm_normal.items():
-            for _rk, _rs in _files.items():
-                filemap[_rk] = (_rs, _mn)
-        for _mn, _files in _norm_root.items():
-            for _rk, _rs in _files.items():
-                filemap_root[_rk] = (_rs, _mn)
+        with _trace.span("normalize case"):
+            _strategy = filemap_casing if filemap_casing in _VALID_FILEMAP_CASINGS else FILEMAP_CASING_UPPER
+            _norm_normal: dict[str, dict[str, str]] = {}
+            _norm_root: dict[str, dict[str, str]] = {}
+            for _rk, (_rs, _mn) in filemap.items():
+                _norm_normal.setdefault(_mn, {})[_rk] = _rs
+            for _rk, (_rs, _mn) in filemap_root.items():
+                _norm_root.setdefault(_mn, {})[_rk] = _rs
+            if _strategy in (FILEMAP_CASING_FORCE_LOWER, FILEMAP_CASING_FORCE_UPPER):
+                _apply_force_casing(_norm_normal, _norm_root, strategy=_strategy)
+            else:
+                _normalize_folder_cases(_norm_normal, _norm_root, strategy=_strategy)
+            for _mn, _files in _norm_normal.items():
+                for _rk, _rs in _files.items():
+                    filemap[_rk] = (_rs, _mn)
+            for _mn, _files in _norm_root.items():
+                for _rk, _rs in _files.items():
+                    filemap_root[_rk] = (_rs, _mn)
 
     # Build per-mod disabled-plugin sets for fast lookup (lowercase filenames, root-level only)
     _disabled_lower: dict[str, set[str]] = {}
@@ -920,16 +963,20 @@ def build_filemap(
     if _unchanged and output_path.is_file():
         # Conflict data is still valid; file on disk is already correct.
         count = sum(1 for _ in filemap_winner)  # approx — disabled_plugins may trim a few
+        _trace.annotate(unchanged=True)
         return count, conflict_map, overrides, overridden_by
 
-    count = _write_filemap(output_path, filemap, _disabled_lower)
-
-    # Write filemap_root.txt for root-flagged mods.
-    _root_filemap_path = output_path.parent / "filemap_root.txt"
-    if filemap_root:
-        _write_filemap(_root_filemap_path, filemap_root, {})
-    elif _root_filemap_path.is_file():
-        _root_filemap_path.unlink(missing_ok=True)
+    with _trace.span("write"):
+        count = _write_filemap(output_path, filemap, _disabled_lower)
+
+        # Write filemap_root.txt for root-flagged mods.
+        _root_filemap_path = output_path.parent / "filemap_root.txt"
+        if filemap_root:
+            _write_filemap(_root_filemap_path, filemap_root, {})
+        elif _root_filemap_path.is_file():
+            _root_filemap_path.unlink(missing_ok=True)
+            bin_path_for(_root_filemap_path).unlink(missing_ok=True)
+        _trace.count("lines", count)
 
     with _filemap_winner_cache_lock:
         _filemap_winner_cache[_output_key] = _winner_snapshot
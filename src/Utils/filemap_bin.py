@@ -0,0 +1,275 @@
+"""
+filemap_bin.py
+Binary, memory-mapped companion of filemap.txt.
+
+filemap.txt stays the human-readable export ("rel_path<TAB>mod_name" per
+line).  Next to it build_filemap() writes filemap.bin holding the same
+entries in a form that is mapped, not parsed:
+
+    header   <4sBBHIIIIIIqq>  magic "AMFM", version, byte order (0 = little),
+                              pad, n_entries, n_mods, n_exts, paths_len,
+                              mods_len, exts_len, filemap.txt mtime_ns, size
+    offsets  uint32[n_entries + 1]  start of each path in the path blob
+    mod_ids  uint32[n_entries]      index into the mod table
+    ext_tab  uint32[2 * n_exts]     (first, count) into ext_idx per extension
+    ext_idx  uint32[n_entries]      entry numbers grouped by extension
+    paths    UTF-8, entries joined by "\n", sorted case-insensitively
+    mods     UTF-8 mod names joined by "\n"
+    exts     UTF-8 lowercase extensions (".esp", "" for none) joined by "\n"
+
+The header records the (mtime_ns, size) of the filemap.txt it mirrors.
+Game handlers that post-process filemap.txt (post_build_filemap) leave the
+.bin stale; open_filemap() notices, re-reads the text once and rewrites the
+.bin, so readers always see what filemap.txt says.
+
+Readers call open_filemap(path_to_filemap_txt) and query the view:
+iterate (rel, mod) pairs, look up one path, or select by prefix or by
+extension without decoding the rest.  Views are cached per file.
+"""
+
+from __future__ import annotations
+
+import bisect
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator
+
+_MAGIC = b"AMFM"
+_VERSION = 1
+_BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+_HEADER = struct.Struct("<4sBBHIIIIIIqq")
+
+
+def _ext_of(rel: str) -> str:
+    slash = max(rel.rfind("/"), rel.rfind("\\"))
+    dot = rel.rfind(".")
+    return rel[dot:].lower() if dot > slash + 1 else ""
+
+
+def _build(entries: Iterable[tuple[str, str]], src_key: tuple[int, int]) -> bytes:
+    """Serialise (rel, mod) pairs.  Entries are stably sorted by lowercase path."""
+    ordered = sorted(entries, key=lambda e: e[0].lower())
+    mod_ids: dict[str, int] = {}
+    ext_members: dict[str, list[int]] = {}
+    offsets = array("I", [0])
+    mids = array("I")
+    pos = 0
+    enc_paths = []
+    for i, (rel, mod) in enumerate(ordered):
+        b = rel.encode("utf-8")
+        enc_paths.append(b)
+        pos += len(b) + 1
+        offsets.append(pos)
+        mids.append(mod_ids.setdefault(mod, len(mod_ids)))
+        ext_members.setdefault(_ext_of(rel), []).append(i)
+    exts = sorted(ext_members)
+    ext_tab = array("I")
+    ext_idx = array("I")
+    for ext in exts:
+        ext_tab.extend((len(ext_idx), len(ext_members[ext])))
+        ext_idx.extend(ext_members[ext])
+    paths_blob = b"\n".join(enc_paths) + (b"\n" if enc_paths else b"")
+    mods_blob = "\n".join(mod_ids).encode("utf-8")
+    exts_blob = "\n".join(exts).encode("utf-8")
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, _BYTE_ORDER, 0, len(ordered), len(mod_ids), len(exts),
+        len(paths_blob), len(mods_blob), len(exts_blob), src_key[0], src_key[1],
+    )
+    return b"".join((header, offsets.tobytes(), mids.tobytes(), ext_tab.tobytes(),
+                     ext_idx.tobytes(), paths_blob, mods_blob, exts_blob))
+
+
+class FilemapView:
+    """Read-only view of one filemap; *buf* is an mmap or bytes object."""
+
+    def __init__(self, buf, src_key: tuple[int, int]):
+        (magic, version, order, _pad, n, n_mods, n_exts, paths_len, mods_len,
+         exts_len, mtime_ns, size) = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC or version != _VERSION or order != _BYTE_ORDER:
+            raise ValueError("not a filemap.bin of this version")
+        if (mtime_ns, size) != tuple(src_key):
+            raise ValueError("filemap.bin does not match filemap.txt")
+        mv = memoryview(buf)
+        pos = _HEADER.size
+
+        def _u32(count: int):
+            nonlocal pos
+            arr = mv[pos:pos + 4 * count].cast("I")
+            pos += 4 * count
+            return arr
+
+        self._buf = buf
+        self._n = n
+        self._offsets = _u32(n + 1)
+        self._mod_ids = _u32(n)
+        ext_tab = _u32(2 * n_exts)
+        self._ext_idx = _u32(n)
+        self._paths_at = pos
+        pos += paths_len
+        self.mods: list[str] = (bytes(mv[pos:pos + mods_len]).decode("utf-8").split("\n")
+                                if n_mods else [])
+        pos += mods_len
+        ext_names = bytes(mv[pos:pos + exts_len]).decode("utf-8").split("\n") if n_exts else []
+        self._exts = {e: (ext_tab[2 * k], ext_tab[2 * k + 1]) for k, e in enumerate(ext_names)}
+        self._paths_len = paths_len
+        self._all: list[str] | None = None
+
+    def __len__(self) -> int:
+        return self._n
+
+    def path(self, i: int) -> str:
+        a = self._paths_at + self._offsets[i]
+        b = self._paths_at + self._offsets[i + 1] - 1
+        return bytes(self._buf[a:b]).decode("utf-8")
+
+    def mod(self, i: int) -> str:
+        return self.mods[self._mod_ids[i]]
+
+    def paths(self) -> list[str]:
+        """Every path, in one decode of the path blob."""
+        if self._all is None:
+            blob = bytes(self._buf[self._paths_at:self._paths_at + self._paths_len])
+            self._all = blob.decode("utf-8").split("\n")[:self._n]
+        return self._all
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        mods, mids = self.mods, self._mod_ids
+        for i, rel in enumerate(self.paths()):
+            yield rel, mods[mids[i]]
+
+    def _lower_bound(self, key: str) -> int:
+        return bisect.bisect_left(range(self._n), key, key=lambda i: self.path(i).lower())
+
+    def get(self, rel: str) -> str | None:
+        """Mod that provides *rel* (case-insensitive), or None."""
+        key = rel.lower()
+        i = self._lower_bound(key)
+        if i < self._n and self.path(i).lower() == key:
+            return self.mod(i)
+        return None
+
+    def with_prefix(self, prefix: str) -> Iterator[tuple[str, str]]:
+        """(rel, mod) for paths starting with *prefix* (case-insensitive)."""
+        key = prefix.lower()
+        i = self._lower_bound(key)
+        while i < self._n:
+            rel = self.path(i)
+            if not rel.lower().startswith(key):
+                break
+            yield rel, self.mod(i)
+            i += 1
+
+    def with_extensions(self, exts: Iterable[str]) -> Iterator[tuple[str, str]]:
+        """(rel, mod) for paths whose extension is in *exts* (".esp", …), in path order."""
+        hits: list[int] = []
+        for ext in {e.lower() for e in exts}:
+            first, count = self._exts.get(ext, (0, 0))
+            hits.extend(self._ext_idx[first:first + count])
+        for i in sorted(hits):
+            yield self.path(i), self.mod(i)
+
+    def root_files(self, exts: Iterable[str] | None = None) -> Iterator[tuple[str, str]]:
+        """(rel, mod) for top-level files, optionally only those with *exts*."""
+        source = self.with_extensions(exts) if exts is not None else iter(self)
+        for rel, mod in source:
+            if "/" not in rel and "\\" not in rel:
+                yield rel, mod
+
+
+# ---------------------------------------------------------------------------
+# Reading / writing
+# ---------------------------------------------------------------------------
+
+_views: dict[str, tuple[tuple[int, int], FilemapView]] = {}
+_views_lock = threading.Lock()
+
+
+def bin_path_for(txt_path: Path) -> Path:
+    return txt_path.with_suffix(".bin")
+
+
+def _src_key(txt_path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(txt_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _write_atomic(path: Path, data: bytes) -> bool:
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        return True
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def write_filemap_bin(txt_path: Path, entries: Iterable[tuple[str, str]]) -> None:
+    """Write the .bin for *txt_path*, which must already hold *entries*."""
+    key = _src_key(txt_path)
+    if key is None:
+        return
+    data = _build(entries, key)
+    if _write_atomic(bin_path_for(txt_path), data):
+        with _views_lock:
+            _views[str(txt_path)] = (key, FilemapView(data, key))
+
+
+def _read_text(txt_path: Path) -> list[tuple[str, str]]:
+    entries = []
+    with txt_path.open(encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            tab = line.find("\t")
+            if tab >= 0:
+                entries.append((line[:tab], line[tab + 1:]))
+    return entries
+
+
+def _map(bin_path: Path, key: tuple[int, int]) -> FilemapView | None:
+    try:
+        with bin_path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                return None
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        return FilemapView(mm, key)
+    except (ValueError, struct.error, TypeError):
+        return None
+
+
+def open_filemap(txt_path: Path) -> FilemapView | None:
+    """Return a view of *txt_path* (filemap.txt / filemap_root.txt), or None
+    if it does not exist.  Maps the .bin when it matches the text, otherwise
+    parses the text once and rewrites the .bin."""
+    key = _src_key(txt_path)
+    if key is None:
+        return None
+    with _views_lock:
+        cached = _views.get(str(txt_path))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    view = _map(bin_path_for(txt_path), key)
+    if view is None:
+        try:
+            data = _build(_read_text(txt_path), key)
+        except OSError:
+            return None
+        _write_atomic(bin_path_for(txt_path), data)
+        view = FilemapView(data, key)
+    with _views_lock:
+        _views[str(txt_path)] = (key, view)
+    return view
@@ -0,0 +1,271 @@
+"""
+fomod_cache.py
+Remember parsed FOMOD installers per archive, and the file lists they resolved.
+
+Installing a FOMOD normally means extracting the archive (or at least its
+``fomod/`` folder), parsing ModuleConfig.xml and running resolve_files().
+For an archive seen before — reinstalls, collection updates and replays — all
+of that is already known:
+
+- the parsed :class:`ModuleConfig` (with the info.xml name applied), and
+- where the installer sits inside the archive (``prefix``: "" or "Wrapper/"),
+
+so the installer can decide to defer, apply saved choices, and extract just
+the selected members straight from the archive listing.
+
+Entries live under ``~/.config/AmethystModManager/fomod_cache/`` as msgpack,
+keyed like the archive listing cache:
+    stat-<sha1(path, size, mtime_ns)>.bin   always written
+    md5-<md5>.bin                          also written when the md5 is known
+Each holds ``{"v": 1, "size": int, "prefix": str, "config": {...},
+"files": {selection_key: [[src, dst, is_folder], ...]}}``.
+
+A *selection_key* covers the chosen options plus the state of every plugin
+the installer's file dependencies mention, so a cached file list is only
+reused when resolve_files() would produce the same result.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import msgpack
+
+from Utils.archive_listing import _prune_cache_dir, _stat_key
+from Utils.config_paths import get_fomod_cache_dir
+from Utils.fomod_parser import (
+    ConditionalInstallPattern, Dependency, FileInstall, Group, InstallStep,
+    ModuleConfig, Plugin, TypeDescriptor,
+)
+
+_CACHE_VERSION = 1
+_MEMORY_MAX_ENTRIES = 64
+_MAX_FILE_LISTS = 16
+
+FileList = list[tuple[str, str, bool]]
+
+
+@dataclass
+class CachedFomod:
+    """A cached installer: fresh objects on every lookup, safe to mutate."""
+    config: ModuleConfig
+    prefix: str
+    files: dict[str, FileList] = field(default_factory=dict)
+
+
+# ---------------------------------------------------------------------------
+# ModuleConfig <-> plain data
+# ---------------------------------------------------------------------------
+
+def _dep_from(d: dict) -> Dependency:
+    return Dependency(**{**d, "sub_deps": [_dep_from(s) for s in d["sub_deps"]]})
+
+
+def _files_from(items: list) -> list[FileInstall]:
+    return [FileInstall(**f) for f in items]
+
+
+def _plugin_from(d: dict) -> Plugin:
+    td = d["type_descriptor"]
+    return Plugin(**{
+        **d,
+        "files": _files_from(d["files"]),
+        "type_descriptor": TypeDescriptor(**{
+            **td, "patterns": [(_dep_from(dep), t) for dep, t in td["patterns"]],
+        }),
+    })
+
+
+def _step_from(d: dict) -> InstallStep:
+    vis = d["visible_condition"]
+    return InstallStep(
+        name=d["name"],
+        groups=[Group(**{**g, "plugins": [_plugin_from(p) for p in g["plugins"]]})
+                for g in d["groups"]],
+        visible_condition=_dep_from(vis) if vis else None,
+    )
+
+
+def config_from_dict(d: dict) -> ModuleConfig:
+    """Rebuild a ModuleConfig from ``dataclasses.asdict()`` output."""
+    mod_dep = d["module_dependency"]
+    return ModuleConfig(
+        name=d["name"],
+        module_image_path=d["module_image_path"],
+        steps=[_step_from(s) for s in d["steps"]],
+        required_files=_files_from(d["required_files"]),
+        conditional_file_installs=[
+            ConditionalInstallPattern(dependency=_dep_from(p["dependency"]),
+                                      files=_files_from(p["files"]))
+            for p in d["conditional_file_installs"]
+        ],
+        module_dependency=_dep_from(mod_dep) if mod_dep else None,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Selection keys
+# ---------------------------------------------------------------------------
+
+def _file_dependency_names(config: ModuleConfig) -> set[str]:
+    """Every plugin name a <fileDependency> in *config* refers to (lower-case)."""
+    names: set[str] = set()
+    stack: list[Dependency] = []
+    if config.module_dependency is not None:
+        stack.append(config.module_dependency)
+    for step in config.steps:
+        if step.visible_condition is not None:
+            stack.append(step.visible_condition)
+        for group in step.groups:
+            for plugin in group.plugins:
+                stack.extend(dep for dep, _t in plugin.type_descriptor.patterns)
+    stack.extend(p.dependency for p in config.conditional_file_installs)
+    while stack:
+        dep = stack.pop()
+        if dep.dep_type == "file":
+            names.add(dep.file_name.lower())
+        stack.extend(dep.sub_deps)
+    return names
+
+
+def selection_key(config: ModuleConfig, selections: dict,
+                  installed_files: set[str], active_files: set[str] | None) -> str:
+    """Hash of everything resolve_files() reads besides the config itself."""
+    states = {}
+    for name in sorted(_file_dependency_names(config)):
+        if active_files is not None and name in active_files:
+            states[name] = "active"
+        elif name in installed_files:
+            states[name] = "installed"
+        else:
+            states[name] = "missing"
+    raw = json.dumps([selections, states, active_files is None],
+                     sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Cache files
+# ---------------------------------------------------------------------------
+
+_mem_cache: dict[str, dict] = {}
+_mem_lock = threading.Lock()
+_saves_since_prune = 0
+
+
+def _keys(archive_path: str, md5: str) -> tuple[list[str], int]:
+    stat = _stat_key(archive_path)
+    if stat is None:
+        return [], 0
+    key, size = stat
+    keys = [key]
+    if md5:
+        keys.append(f"md5-{md5.lower()}")
+    return keys, size
+
+
+def _read(key: str, size: int) -> Optional[dict]:
+    with _mem_lock:
+        hit = _mem_cache.get(key)
+    if hit is not None:
+        return hit
+    try:
+        with (get_fomod_cache_dir() / f"{key}.bin").open("rb") as f:
+            data = msgpack.unpack(f, raw=False)
+    except Exception:
+        return None
+    if (not isinstance(data, dict) or data.get("v") != _CACHE_VERSION
+            or data.get("size") != size):
+        return None
+    _remember(key, data)
+    return data
+
+
+def _remember(key: str, data: dict) -> None:
+    with _mem_lock:
+        if key not in _mem_cache and len(_mem_cache) >= _MEMORY_MAX_ENTRIES:
+            _mem_cache.pop(next(iter(_mem_cache)))
+        _mem_cache[key] = data
+
+
+def _write(keys: list[str], data: dict) -> None:
+    global _saves_since_prune
+    cache_dir = get_fomod_cache_dir()
+    for key in keys:
+        _remember(key, data)
+    for key in keys:
+        path = cache_dir / f"{key}.bin"
+        tmp = cache_dir / f"{key}.{threading.get_ident()}.tmp"
+        try:
+            with tmp.open("wb") as f:
+                msgpack.pack(data, f, use_bin_type=True)
+            tmp.replace(path)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+    _saves_since_prune += 1
+    if _saves_since_prune >= 64:
+        _saves_since_prune = 0
+        _prune_cache_dir(cache_dir)
+
+
+def _load(archive_path: str | Path, md5: str) -> tuple[list[str], int, Optional[dict]]:
+    keys, size = _keys(os.fspath(archive_path), md5)
+    for key in keys:
+        data = _read(key, size)
+        if data is not None:
+            return keys, size, data
+    return keys, size, None
+
+
+def lookup(archive_path: str | Path, md5: str = "") -> Optional[CachedFomod]:
+    """Return the cached installer for *archive_path*, or None."""
+    _k, _size, data = _load(archive_path, md5)
+    if data is None:
+        return None
+    try:
+        return CachedFomod(
+            config=config_from_dict(data["config"]),
+            prefix=data["prefix"],
+            files={k: [(s, d, bool(f)) for s, d, f in v] for k, v in data["files"].items()},
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def store(archive_path: str | Path, config: ModuleConfig, prefix: str, md5: str = "") -> None:
+    """Remember the parsed *config* found at *prefix* inside *archive_path*."""
+    keys, size, data = _load(archive_path, md5)
+    if not keys:
+        return
+    files = data.get("files", {}) if data is not None else {}
+    _write(keys, {
+        "v": _CACHE_VERSION,
+        "size": size,
+        "prefix": prefix,
+        "config": dataclasses.asdict(config),
+        "files": files,
+    })
+
+
+def store_files(archive_path: str | Path, key: str, file_list: FileList,
+                md5: str = "") -> None:
+    """Remember the resolve_files() result for *key* (see selection_key())."""
+    keys, _size, data = _load(archive_path, md5)
+    if data is None:
+        return
+    files = dict(data.get("files", {}))
+    files.pop(key, None)
+    while len(files) >= _MAX_FILE_LISTS:
+        files.pop(next(iter(files)))
+    files[key] = [[s, d, f] for s, d, f in file_list]
+    _write(keys, {**data, "files": files})
@@ -9,19 +9,33 @@ files are silently skipped so one broken handler doesn't break the rest.
 Uses spec_from_file_location so folder names with spaces (e.g. "Stardew Valley")
 work without needing a valid dotted module path.
 
+Handlers are loaded lazily.  A manifest (game_manifest.json in the config
+dir) records each handler's display name, game_id, class name and module
+file, and is trusted while every handler file's mtime is unchanged; then
+discover_games() imports nothing and a handler module is only executed the
+first time its game is looked up.  When any file changed (or on first run)
+every handler is imported once, as before, and the manifest is rewritten.
+
 Usage:
     from Utils.game_loader import discover_games
-    games = discover_games()          # {game.name: BaseGame instance}
-    sse = games["Skyrim Special Edition"]
+    games = discover_games()          # GameRegistry: {game.name: BaseGame instance}
+    sse = games["Skyrim Special Edition"]      # imports Bethesda handlers on first use
+    names = games.configured_names()           # no imports needed
 """
 
 import importlib.util
 import inspect
+import json
 import os
 import sys
+import threading
+from collections.abc import Iterator, MutableMapping
 from pathlib import Path
 
 from Games.base_game import BaseGame
+from Utils.config_paths import get_game_config_path, get_game_manifest_path
+
+_MANIFEST_VERSION = 1
 
 _EXCLUDED_STEMS   = {"__init__", "base_game", "ue5_game", "custom_game"}
 _EXCLUDED_FOLDERS = {"Example", "Custom"}
@@ -164,29 +178,173 @@ def _find_games_dir() -> Path | None:
     return None
 
 
-def discover_games() -> dict[str, BaseGame]:
+def _handler_files(games_dir: Path) -> list[Path]:
+    return [
+        f for f in sorted(games_dir.glob("*/*.py"))
+        if f.stem not in _EXCLUDED_STEMS and f.parent.name not in _EXCLUDED_FOLDERS
+    ]
+
+
+def _file_mtimes(games_dir: Path, files: list[Path]) -> dict[str, int]:
+    """mtime_ns of every handler file plus the shared base modules."""
+    out: dict[str, int] = {}
+    for f in files + [games_dir / "base_game.py", games_dir / "ue5_game.py"]:
+        try:
+            out[f.relative_to(games_dir).as_posix()] = f.stat().st_mtime_ns
+        except OSError:
+            pass
+    return out
+
+
+def _load_module(py_file: Path):
+    """Execute *py_file* once as Games._loaded_<stem> and return the module."""
+    module_name = f"Games._loaded_{py_file.stem}"
+    module = sys.modules.get(module_name)
+    if module is not None and getattr(module, "__file__", None) == str(py_file):
+        return module
+    spec = importlib.util.spec_from_file_location(module_name, str(py_file))
+    if spec is None or spec.loader is None:
+        return None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _paths_say_configured(name: str) -> bool | None:
+    """Answer is_configured() from the game's paths.json without its handler.
+
+    Every handler's load_paths() reads game_path from this file, so a missing
+    file means "not configured".  Returns None when only the legacy in-tree
+    paths.json exists — the handler must run to migrate it.
     """
-    Scan Games/<GameFolder>/*.py, load each module from its file path, find
-    BaseGame subclasses, instantiate them, and return {game.name: instance}.
-    Also loads user-defined custom games from the config directory.
+    try:
+        path = get_game_config_path(name)
+        if not path.is_file():
+            games_dir = _games_dir_cache
+            if games_dir is not None and (games_dir / name / "paths.json").is_file():
+                return None
+            return False
+        raw = json.loads(path.read_text(encoding="utf-8")).get("game_path", "")
+    except (OSError, ValueError, AttributeError):
+        return None
+    return bool(raw) and Path(raw).exists()
+
+
+class GameRegistry(MutableMapping):
+    """{game name: BaseGame instance}, instantiating handlers on first access.
+
+    Iterating names, len() and ``in`` never import anything; ``[name]``,
+    ``get()``, ``values()`` and ``items()`` load the handlers they return.
+    Prefer configured_names() / configured_items() when only configured games
+    matter — they load nothing but those.
     """
-    games: dict[str, BaseGame] = {}
-    games_dir = _find_games_dir()
-    if games_dir is None:
-        return games
 
-    for py_file in sorted(games_dir.glob("*/*.py")):
-        if py_file.stem in _EXCLUDED_STEMS or py_file.parent.name in _EXCLUDED_FOLDERS:
-            continue
+    def __init__(self):
+        # name -> BaseGame instance, or its manifest entry (dict) until loaded
+        self._slots: dict[str, BaseGame | dict] = {}
+        self._lock = threading.RLock()
+
+    # -- mapping -----------------------------------------------------------
+
+    def __getitem__(self, name: str) -> BaseGame:
+        slot = self._slots[name]
+        if isinstance(slot, BaseGame):
+            return slot
+        with self._lock:
+            slot = self._slots[name]
+            if isinstance(slot, BaseGame):
+                return slot
+            game = _instantiate(slot)
+            if game is None:
+                del self._slots[name]
+                raise KeyError(name)
+            self._slots[name] = game
+            return game
+
+    def __setitem__(self, name: str, game: BaseGame) -> None:
+        with self._lock:
+            self._slots[name] = game
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            del self._slots[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._slots))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def replace(self, other: "GameRegistry") -> None:
+        """Take over *other*'s games (loaded or not) in place of ours."""
+        with self._lock:
+            self._slots = dict(other._slots)
+
+    # -- cheap queries -----------------------------------------------------
+
+    def is_loaded(self, name: str) -> bool:
+        return isinstance(self._slots.get(name), BaseGame)
 
-        module_name = f"Games._loaded_{py_file.stem}"
+    def info(self, name: str) -> dict:
+        """Manifest facts for *name* (name, game_id, steam_id, …) without loading it."""
+        slot = self._slots.get(name)
+        if isinstance(slot, BaseGame):
+            return _entry_for(slot, type(slot).__name__, "")
+        return dict(slot or {})
+
+    def is_configured(self, name: str) -> bool:
+        if isinstance(self._slots.get(name), dict):
+            answer = _paths_say_configured(name)
+            if answer is not None:
+                return answer
+        try:
+            return self[name].is_configured()
+        except KeyError:
+            return False
+
+    def configured_names(self) -> list[str]:
+        return [name for name in self if self.is_configured(name)]
+
+    def configured_items(self) -> list[tuple[str, BaseGame]]:
+        return [(name, self[name]) for name in self.configured_names()]
+
+
+def _entry_for(game: BaseGame, class_name: str, module_file: str) -> dict:
+    return {
+        "name": game.name,
+        "game_id": getattr(game, "game_id", ""),
+        "steam_id": str(getattr(game, "steam_id", "") or ""),
+        "loot_sort_enabled": bool(getattr(game, "loot_sort_enabled", False)),
+        "class": class_name,
+        "module": module_file,
+    }
+
+
+def _instantiate(entry: dict) -> BaseGame | None:
+    try:
+        module = _load_module(Path(entry["module"]))
+        cls = getattr(module, entry["class"], None) if module is not None else None
+        if cls is None:
+            return None
+        return cls()
+    except Exception:
+        return None
+
+
+def _import_all(files: list[Path]) -> tuple[dict[str, BaseGame], list[dict]]:
+    """Import every handler file; return instances and their manifest entries."""
+    games: dict[str, BaseGame] = {}
+    entries: dict[str, dict] = {}
+    for py_file in files:
         try:
-            spec = importlib.util.spec_from_file_location(module_name, str(py_file))
-            if spec is None or spec.loader is None:
+            module = _load_module(py_file)
+            if module is None:
                 continue
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
-            spec.loader.exec_module(module)
+            module_name = module.__name__
             for _, cls in inspect.getmembers(module, inspect.isclass):
                 if cls is BaseGame:
                     continue
@@ -199,16 +357,71 @@ def discover_games() -> dict[str, BaseGame]:
                 if in_this_module:
                     instance = cls()
                     games[instance.name] = instance
+                    entries[instance.name] = _entry_for(instance, cls.__name__, str(py_file))
         except Exception:
             pass
+    return games, list(entries.values())
+
+
+def _read_manifest(games_dir: Path, mtimes: dict[str, int]) -> list[dict] | None:
+    try:
+        data = json.loads(get_game_manifest_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (not isinstance(data, dict) or data.get("v") != _MANIFEST_VERSION
+            or data.get("games_dir") != str(games_dir) or data.get("files") != mtimes):
+        return None
+    games = data.get("games")
+    return games if isinstance(games, list) else None
+
+
+def _write_manifest(games_dir: Path, mtimes: dict[str, int], entries: list[dict]) -> None:
+    path = get_game_manifest_path()
+    tmp = path.with_suffix(".tmp")
+    payload = {"v": _MANIFEST_VERSION, "games_dir": str(games_dir),
+               "files": mtimes, "games": entries}
+    try:
+        tmp.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+        tmp.replace(path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def discover_games() -> GameRegistry:
+    """
+    Return {game.name: instance} for every BaseGame subclass under
+    Games/<GameFolder>/*.py, plus user-defined custom games from the config
+    directory.  Handlers listed in a valid manifest are not imported until
+    first use (see GameRegistry); otherwise all are imported and the
+    manifest is rebuilt.
+    """
+    registry = GameRegistry()
+    games_dir = _find_games_dir()
+    if games_dir is None:
+        return registry
+
+    files = _handler_files(games_dir)
+    mtimes = _file_mtimes(games_dir, files)
+    entries = _read_manifest(games_dir, mtimes)
+    if entries is not None:
+        for entry in entries:
+            if isinstance(entry, dict) and entry.get("name") and entry.get("class"):
+                registry._slots[entry["name"]] = entry
+    else:
+        games, entries = _import_all(files)
+        registry._slots.update(games)
+        _write_manifest(games_dir, mtimes, entries)
 
     # Merge user-defined custom games (JSON files in ~/.config/.../custom_games/)
     try:
         from Games.Custom.custom_game import load_all_custom_games
         for name, instance in load_all_custom_games().items():
-            if name not in games:          # built-in games take priority
-                games[name] = instance
+            if name not in registry:          # built-in games take priority
+                registry[name] = instance
     except Exception:
         pass
 
-    return games
+    return registry
@@ -13,8 +13,11 @@ from __future__ import annotations
 import json
 import os
 import shutil
+import threading
 from pathlib import Path
 
+from Utils.library_index import cached_parse
+
 _HOME = Path.home()
 _XDG_CONFIG = Path(os.environ.get("XDG_CONFIG_HOME", _HOME / ".config"))
 
@@ -113,23 +116,36 @@ def _find_heroic_config_roots() -> list[Path]:
 # Epic Games (Legendary backend)
 # ---------------------------------------------------------------------------
 
+# installed.json keys the lookups below use; the rest is not indexed.
+_EPIC_KEYS = ("install_path", "executable")
+_GOG_KEYS = ("appName", "app_name", "install_path", "path", "executable", "exe")
+
+
+def _parse_epic_installed(installed_json: Path) -> dict:
+    try:
+        data = json.loads(installed_json.read_text(encoding="utf-8", errors="replace"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        app_name: {k: entry[k] for k in _EPIC_KEYS if k in entry}
+        for app_name, entry in data.items()
+        if isinstance(entry, dict)
+    }
+
+
 def _load_epic_installed(heroic_root: Path) -> dict:
     """
     Parse legendaryConfig/legendary/installed.json from a Heroic config root.
-    Returns a dict keyed by appName, each value containing at least:
-      install_path, title
-    Returns an empty dict on any error.
+    Returns a dict keyed by appName, each value holding the entry's
+    install_path and executable.  Returns an empty dict on any error.
+    Cached (library_index) until installed.json changes.
     """
     installed_json = heroic_root / "legendaryConfig" / "legendary" / "installed.json"
     if not installed_json.is_file():
         return {}
-    try:
-        data = json.loads(installed_json.read_text(encoding="utf-8", errors="replace"))
-        if isinstance(data, dict):
-            return data
-    except (OSError, json.JSONDecodeError):
-        pass
-    return {}
+    return cached_parse("heroic_epic", installed_json, _parse_epic_installed)
 
 
 def _find_epic_game(heroic_root: Path, app_names: list[str]) -> Path | None:
@@ -154,26 +170,93 @@ def _find_epic_game(heroic_root: Path, app_names: list[str]) -> Path | None:
 # GOG (heroic-gogdl backend)
 # ---------------------------------------------------------------------------
 
+def _parse_gog_installed(installed_json: Path) -> list[dict]:
+    try:
+        data = json.loads(installed_json.read_text(encoding="utf-8", errors="replace"))
+    except (OSError, json.JSONDecodeError):
+        return []
+    entries = []
+    if isinstance(data, dict):
+        entries = data.get("installed", [])
+    elif isinstance(data, list):
+        entries = data
+    if not isinstance(entries, list):
+        return []
+    return [
+        {k: entry[k] for k in _GOG_KEYS if k in entry}
+        for entry in entries
+        if isinstance(entry, dict)
+    ]
+
+
 def _load_gog_installed(heroic_root: Path) -> list[dict]:
     """
     Parse gog_store/installed.json from a Heroic config root.
     The file has shape {"installed": [ {appName, install_path, executable, ...}, ... ]}.
     Returns the list of entries, or an empty list on any error.
+    Cached (library_index) until installed.json changes.
     """
     installed_json = heroic_root / "gog_store" / "installed.json"
     if not installed_json.is_file():
         return []
-    try:
-        data = json.loads(installed_json.read_text(encoding="utf-8", errors="replace"))
-        if isinstance(data, dict):
-            entries = data.get("installed", [])
-            if isinstance(entries, list):
-                return entries
-        if isinstance(data, list):
-            return data
-    except (OSError, json.JSONDecodeError):
-        pass
-    return []
+    return cached_parse("heroic_gog", installed_json, _parse_gog_installed)
+
+
+# install folder -> ({folder walked: mtime_ns}, lowercase names of every file under it)
+_install_files: dict[str, tuple[dict[str, int], frozenset[str]]] = {}
+_install_files_lock = threading.Lock()
+
+
+def _dirs_unchanged(dirs: dict[str, int]) -> bool:
+    for d, mtime in dirs.items():
+        try:
+            if os.stat(d).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _install_has_file(install_path: Path, name_lower: str) -> bool:
+    """True if a file named *name_lower* (case-insensitive) is anywhere under
+    *install_path*.
+
+    The walk stops at the first match.  A walk that finds nothing has seen
+    every file name, so those names are kept in memory with the mtime of
+    every folder walked and answer later probes (each handler's exe) while
+    no folder in the tree has gained, lost or renamed an entry."""
+    key = str(install_path)
+    with _install_files_lock:
+        cached = _install_files.get(key)
+    if cached is not None and _dirs_unchanged(cached[0]):
+        return name_lower in cached[1]
+    dirs: dict[str, int] = {}
+    names: set[str] = set()
+    stack = [key]
+    while stack:
+        cur = stack.pop()
+        try:
+            dirs[cur] = os.stat(cur).st_mtime_ns
+            it = os.scandir(cur)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        lower = entry.name.lower()
+                        if lower == name_lower:
+                            return True
+                        names.add(lower)
+                except OSError:
+                    continue
+    if not dirs:
+        return False
+    with _install_files_lock:
+        _install_files[key] = (dirs, frozenset(names))
+    return False
 
 
 def _find_gog_game(heroic_root: Path, app_names: list[str]) -> Path | None:
@@ -200,6 +283,36 @@ def _find_gog_game(heroic_root: Path, app_names: list[str]) -> Path | None:
 # Wine prefix lookup
 # ---------------------------------------------------------------------------
 
+def _parse_game_wine_prefix(game_cfg_file: Path) -> str:
+    """winePrefix from GamesConfig/<appName>.json, or "" if unset or unreadable."""
+    app_name = game_cfg_file.stem
+    try:
+        cfg = json.loads(game_cfg_file.read_text(encoding="utf-8", errors="replace"))
+        # Settings nested under appName key (Heroic format)
+        inner = cfg.get(app_name, cfg)
+        wine_prefix = (
+            inner.get("winePrefix", "")
+            or inner.get("wine_prefix", "")
+            or cfg.get("winePrefix", "")
+            or cfg.get("wine_prefix", "")
+        )
+    except (OSError, json.JSONDecodeError, AttributeError):
+        return ""
+    return wine_prefix if isinstance(wine_prefix, str) else ""
+
+
+def _parse_default_wine_prefix(global_cfg_file: Path) -> str:
+    """defaultWinePrefix from Heroic's config.json, or "" if unset or unreadable."""
+    try:
+        cfg = json.loads(global_cfg_file.read_text(encoding="utf-8", errors="replace"))
+        # Heroic nests settings inside a "defaultSettings" key
+        settings = cfg.get("defaultSettings", cfg)
+        folder = settings.get("defaultWinePrefix", "")
+    except (OSError, json.JSONDecodeError, AttributeError):
+        return ""
+    return folder if isinstance(folder, str) else ""
+
+
 def _find_heroic_prefix_for_app(heroic_root: Path, app_name: str) -> Path | None:
     """
     Look up the Wine prefix for a game in Heroic's GamesConfig/<appName>.json.
@@ -215,41 +328,25 @@ def _find_heroic_prefix_for_app(heroic_root: Path, app_name: str) -> Path | None
     games_config = heroic_root / "GamesConfig"
     game_cfg_file = games_config / f"{app_name}.json"
     if game_cfg_file.is_file():
-        try:
-            cfg = json.loads(game_cfg_file.read_text(encoding="utf-8", errors="replace"))
-            # Settings nested under appName key (Heroic format)
-            inner = cfg.get(app_name, cfg)
-            wine_prefix = (
-                inner.get("winePrefix", "")
-                or inner.get("wine_prefix", "")
-                or cfg.get("winePrefix", "")
-                or cfg.get("wine_prefix", "")
-            )
-            if wine_prefix:
-                p = Path(wine_prefix)
-                if (p / "pfx").is_dir():
-                    return p / "pfx"
-                if p.is_dir():
-                    return p
-        except (OSError, json.JSONDecodeError):
-            pass
+        wine_prefix = cached_parse("heroic_game_prefix", game_cfg_file, _parse_game_wine_prefix)
+        if wine_prefix:
+            p = Path(wine_prefix)
+            if (p / "pfx").is_dir():
+                return p / "pfx"
+            if p.is_dir():
+                return p
 
     # 2. Global default from config.json
     global_cfg_file = heroic_root / "config.json"
     if global_cfg_file.is_file():
-        try:
-            cfg = json.loads(global_cfg_file.read_text(encoding="utf-8", errors="replace"))
-            # Heroic nests settings inside a "defaultSettings" key
-            settings = cfg.get("defaultSettings", cfg)
-            default_prefix_folder = settings.get("defaultWinePrefix", "")
-            if default_prefix_folder:
-                p = Path(default_prefix_folder) / app_name
-                if (p / "pfx").is_dir():
-                    return p / "pfx"
-                if p.is_dir():
-                    return p
-        except (OSError, json.JSONDecodeError):
-            pass
+        default_prefix_folder = cached_parse(
+            "heroic_default_prefix", global_cfg_file, _parse_default_wine_prefix)
+        if default_prefix_folder:
+            p = Path(default_prefix_folder) / app_name
+            if (p / "pfx").is_dir():
+                return p / "pfx"
+            if p.is_dir():
+                return p
 
     # 3. Hard-coded conventional fallback
     fallback = _HOME / "Games" / "Heroic" / "Prefixes" / app_name
@@ -388,13 +485,7 @@ def find_heroic_game_info_by_exe(exe_name: str) -> "tuple[Path, Path | None, str
                 matched = True
             elif not stored_bare:
                 # Scan install_path for the exe (case-insensitive, recursive).
-                try:
-                    for candidate in install_path.rglob("*"):
-                        if candidate.is_file() and candidate.name.lower() == exe_lower:
-                            matched = True
-                            break
-                except OSError:
-                    pass
+                matched = _install_has_file(install_path, exe_lower)
 
             if not matched:
                 continue
@@ -0,0 +1,139 @@
+"""
+library_index.py
+Stat-validated cache of what steam_finder and heroic_finder parse.
+
+The finders answer "where is this game installed, which prefix and which
+Proton does it use" from launcher files: libraryfolders.vdf, the
+appmanifest_*.acf files of each library, CompatToolMapping in config.vdf,
+and Heroic's installed.json and GamesConfig/*.json.  The add-game dialog
+and the game picker ask that for every handler, so without a cache the
+same files are re-read and re-parsed dozens of times per scan.
+
+Every parsed result is stored against the (mtime_ns, size) of the file or
+folder it came from and reused until that changes.  A steamapps folder is
+indexed as a whole (app id -> installdir for all its manifests), keyed by
+the folder's own mtime, which changes whenever Steam adds, replaces or
+removes a manifest.  Only the parse is cached: whether a library, install
+folder or prefix exists right now is still checked on every call.
+
+The table lives in memory and in library_index.bin in the config folder,
+so the first scan after a restart only re-parses what changed meanwhile.
+New parses are written behind: a scan's misses are saved together shortly
+after the last one (and at exit), not once per miss.
+
+File format — msgpack, v1:
+    {"v": 1, "entries": {"<kind>:<path>": [mtime_ns, size, value], ...}}
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+import msgpack
+
+from Utils.config_paths import get_library_index_path
+
+_INDEX_VERSION = 1
+# Seconds a new parse waits before the table is written, to coalesce a scan.
+_FLUSH_DELAY = 0.5
+
+_entries: dict[str, list] | None = None
+_dirty = False
+_timer: threading.Timer | None = None
+_lock = threading.Lock()
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _load() -> dict[str, list]:
+    try:
+        with get_library_index_path().open("rb") as f:
+            data = msgpack.unpack(f, raw=False, strict_map_key=False)
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("v") != _INDEX_VERSION:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def _save(entries: dict[str, list]) -> None:
+    """Write the table atomically, dropping entries whose source is gone."""
+    live = {k: v for k, v in entries.items()
+            if os.path.exists(k.split(":", 1)[1])}
+    path = get_library_index_path()
+    tmp = path.with_suffix(".tmp")
+    try:
+        with tmp.open("wb") as f:
+            msgpack.pack({"v": _INDEX_VERSION, "entries": live}, f, use_bin_type=True)
+        tmp.replace(path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def cached_parse(kind: str, path: Path, parse: Callable[[Path], Any]) -> Any:
+    """Return parse(path), reusing the stored result while *path* keeps the
+    (mtime_ns, size) it had when parsed.  *kind* names the parser, so one
+    path can be indexed by more than one.  Results must be msgpack-able
+    (dicts, lists, strings, numbers); a missing path is parsed but not stored."""
+    global _entries, _dirty, _timer
+    key = _stat_key(path)
+    if key is None:
+        return parse(path)
+    slot = f"{kind}:{path}"
+    with _lock:
+        if _entries is None:
+            _entries = _load()
+        hit = _entries.get(slot)
+    if hit is not None and len(hit) == 3 and (hit[0], hit[1]) == key:
+        return hit[2]
+    value = parse(path)
+    with _lock:
+        _entries[slot] = [key[0], key[1], value]
+        _dirty = True
+        if _timer is None:
+            _timer = threading.Timer(_FLUSH_DELAY, flush_library_index)
+            _timer.daemon = True
+            _timer.start()
+    return value
+
+
+def flush_library_index() -> None:
+    """Write pending parses to disk now."""
+    global _dirty, _timer
+    with _lock:
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+        if not _dirty or _entries is None:
+            return
+        _save(_entries)
+        _dirty = False
+
+
+def invalidate_library_index() -> None:
+    """Forget every stored parse, in memory and on disk."""
+    global _entries, _dirty
+    with _lock:
+        _entries = {}
+        _dirty = False
+        try:
+            get_library_index_path().unlink()
+        except OSError:
+            pass
+
+
+atexit.register(flush_library_index)
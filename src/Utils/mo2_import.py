@@ -1,14 +1,55 @@
 """
 mo2_import.py — Import mods, overwrite, and profiles from a Mod Organizer 2 instance.
+
+Each top-level item (a mod folder, an overwrite entry, a profile) is placed
+with the cheapest method the two locations allow:
+
+- **rename** — MO2 and the staging folder are on the same filesystem and the
+  user chose to move: one ``os.rename`` per item, no data is copied.
+- **hardlink** — the user chose to keep MO2 intact: every file is hardlinked
+  into staging (zero copy, MO2 keeps working).  Files that cannot be linked
+  (other filesystem, no permission) are copied instead.  Profiles and each
+  mod's meta.ini are always copied — both managers rewrite them and a
+  shared inode would leak edits.
+- **copy** — cross-filesystem move: the tree is copied by a worker pool, one
+  item per worker, then the MO2 original is deleted.
+
+Copies and links are built under ``.mo2_import_partial/`` and renamed into
+place once complete, so a destination folder never holds half an item.
+Progress is journalled to ``.mo2_import.json`` in the staging root; running
+the same import again after an interruption skips finished items, finishes
+deleting moved sources and rebuilds only the item that was in flight.
+
+Mod folders are indexed while they are walked, and the entries are merged into
+``modindex.bin`` at the end, so the first filemap build after the import does
+not rescan them.
 """
 
 from __future__ import annotations
 
+import errno
+import json
+import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
 
 from Utils.app_log import app_log
 
+MO2_IMPORT_MOVE     = "move"
+MO2_IMPORT_HARDLINK = "hardlink"
+
+_JOURNAL_NAME = ".mo2_import.json"
+_PARTIAL_DIR  = ".mo2_import_partial"
+_JOURNAL_VERSION = 1
+_COPY_WORKERS = 4
+# Always copied, never hardlinked: write_meta / ensure_installed_stamp
+# rewrite them in place.
+_NO_LINK_NAMES = frozenset({"meta.ini"})
+_SUBDIRS = ("mods", "overwrite", "profiles")
+
 
 def validate_mo2_folder(mo2_path: Path) -> str | None:
     """Return an error string if *mo2_path* doesn't look like a valid MO2 folder,
@@ -28,8 +69,338 @@ def count_mo2_mods(mo2_path: Path) -> int:
     return sum(1 for p in mods_dir.iterdir() if p.is_dir())
 
 
+def same_filesystem(a: Path, b: Path) -> bool:
+    """True if *a* and *b* (or b's nearest existing parent) share a device."""
+    while not b.exists() and b != b.parent:
+        b = b.parent
+    try:
+        return os.stat(a).st_dev == os.stat(b).st_dev
+    except OSError:
+        return False
+
+
+def can_hardlink_mo2(mo2_path: Path, staging_root: Path) -> bool:
+    """True if a hardlink import of *mo2_path* into *staging_root* is zero-copy."""
+    return same_filesystem(mo2_path / "mods", staging_root)
+
+
+# ---------------------------------------------------------------------------
+# Journal
+# ---------------------------------------------------------------------------
+
+class _Journal:
+    """Finished items of one import, persisted after every item."""
+
+    def __init__(self, path: Path, source: Path, mode: str):
+        self._path = path
+        self._lock = threading.Lock()
+        self._done: set[tuple[str, str]] = set()
+        self.source = str(source)
+        self.mode = mode
+        self.resumed = False
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if (isinstance(data, dict) and data.get("v") == _JOURNAL_VERSION
+                and data.get("source") == self.source and data.get("mode") == mode):
+            self._done = {(sub, name) for sub, name in data.get("done", [])}
+            self.resumed = True
+
+    def is_done(self, sub: str, name: str) -> bool:
+        return (sub, name) in self._done
+
+    def mark_done(self, sub: str, name: str) -> None:
+        with self._lock:
+            self._done.add((sub, name))
+            self._save()
+
+    def _save(self) -> None:
+        payload = {
+            "v": _JOURNAL_VERSION,
+            "source": self.source,
+            "mode": self.mode,
+            "done": sorted(self._done),
+        }
+        tmp = self._path.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            tmp.replace(self._path)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+    def finish(self) -> None:
+        try:
+            self._path.unlink()
+        except OSError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Tree placement
+# ---------------------------------------------------------------------------
+
+class _Indexer:
+    """The game's index settings, applied to each imported mod folder."""
+
+    def __init__(self, strip_prefixes: frozenset[str], allowed_extensions: frozenset[str],
+                 exclude_dirs: frozenset[str]):
+        self.strip_prefixes = strip_prefixes
+        self.allowed_extensions = allowed_extensions
+        self.exclude_dirs = exclude_dirs
+
+    def scan(self, folder: Path) -> dict[str, str] | None:
+        """Index an already placed folder (used after a rename)."""
+        from Utils.filemap import _scan_dir
+        _name, files, _root, invalid = _scan_dir(
+            folder.name, str(folder), self.strip_prefixes,
+            self.allowed_extensions, exclude_dirs=self.exclude_dirs,
+        )
+        return None if invalid else files
+
+
+def _link_or_copy(src: str, dst: str, hardlink: bool) -> tuple[int, bool]:
+    """Place one file; return (bytes copied, linked)."""
+    if hardlink:
+        try:
+            os.link(src, dst)
+            return 0, True
+        except OSError as exc:
+            if exc.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                raise
+    shutil.copy2(src, dst)
+    return os.path.getsize(dst), False
+
+
+def _place_tree(src: Path, dst: Path, hardlink: bool, indexer: _Indexer | None):
+    """Copy or hardlink the tree at *src* into *dst* (which must not exist).
+    A top-level meta.ini is always copied (see _NO_LINK_NAMES).
+
+    Returns (bytes_copied, files_linked, index_files or None).  The index
+    entry is built from the same scandir walk; it is None when the tree holds
+    a non-UTF-8 name (build_filemap's own scan skips such mods too).
+    """
+    from Utils.filemap import _EXCLUDE_NAMES, _index_file, _index_skips_dir, _is_utf8_safe
+
+    copied = 0
+    linked = 0
+    files: dict[str, str] = {}
+    invalid = False
+    if src.is_file():
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        n, was_linked = _link_or_copy(str(src), str(dst), hardlink)
+        return n, int(was_linked), None
+
+    # (rel prefix, source dir, dest dir, indexed?)
+    stack = [("", str(src), str(dst), indexer is not None)]
+    while stack:
+        prefix, cur_src, cur_dst, indexed = stack.pop()
+        os.makedirs(cur_dst, exist_ok=True)
+        with os.scandir(cur_src) as it:
+            for entry in it:
+                target = os.path.join(cur_dst, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    sub_indexed = indexed and not _index_skips_dir(
+                        entry.name, indexer.exclude_dirs)
+                    if sub_indexed and not _is_utf8_safe(entry.name):
+                        invalid = True
+                        sub_indexed = False
+                    stack.append((prefix + entry.name + "/", entry.path, target, sub_indexed))
+                elif entry.is_symlink():
+                    os.symlink(os.readlink(entry.path), target)
+                else:
+                    link = hardlink and not (prefix == "" and entry.name.lower() in _NO_LINK_NAMES)
+                    n, was_linked = _link_or_copy(entry.path, target, link)
+                    copied += n
+                    linked += was_linked
+                    if indexed and entry.name not in _EXCLUDE_NAMES:
+                        if not _is_utf8_safe(entry.name):
+                            invalid = True
+                            continue
+                        _index_file(files, prefix + entry.name, entry.name,
+                                    [], indexer.strip_prefixes,
+                                    indexer.allowed_extensions)
+    if indexer is None or invalid:
+        return copied, linked, None
+    return copied, linked, files
+
+
+def _remove_item(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    else:
+        path.unlink()
+
+
+def _fmt_bytes(n: int) -> str:
+    if n < 1024 ** 3:
+        return f"{n / 1024 ** 2:.1f} MB"
+    return f"{n / 1024 ** 3:.2f} GB"
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+class _ImportRun:
+    def __init__(self, mo2_path: Path, staging_root: Path, mode: str, log,
+                 progress_fn, workers: int, indexer: _Indexer | None):
+        self.mo2_path = mo2_path
+        self.staging_root = staging_root
+        self.mode = mode
+        self.log = log
+        self.progress_fn = progress_fn
+        self.workers = max(1, workers)
+        self.indexer = indexer
+        self.partial_root = staging_root / _PARTIAL_DIR
+        self.journal = _Journal(staging_root / _JOURNAL_NAME, mo2_path, mode)
+        self.index_entries: dict[str, dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._linked = 0
+        self._done_items = 0
+        self._total_items = 0
+
+    # -- per item ----------------------------------------------------------
+
+    def _method(self, sub: str, src: Path, dst_dir: Path) -> str:
+        if self.mode == MO2_IMPORT_HARDLINK:
+            return "copy" if sub == "profiles" else "hardlink"
+        return "rename" if same_filesystem(src, dst_dir) else "copy"
+
+    def _place(self, sub: str, item: Path, target: Path, method: str) -> None:
+        index = self.indexer if sub == "mods" else None
+        files = None
+        if method == "rename":
+            os.rename(item, target)
+            self.journal.mark_done(sub, item.name)
+            if index is not None and target.is_dir():
+                files = index.scan(target)
+        else:
+            # A leftover partial is from an interrupted run of this item.
+            partial = self.partial_root / sub / target.name
+            if partial.exists() or partial.is_symlink():
+                _remove_item(partial)
+            copied, linked, files = _place_tree(item, partial, method == "hardlink", index)
+            os.rename(partial, target)
+            self.journal.mark_done(sub, item.name)
+            if self.mode == MO2_IMPORT_MOVE:
+                _remove_item(item)
+            with self._lock:
+                self._bytes += copied
+                self._linked += linked
+        with self._lock:
+            if files is not None:
+                self.index_entries[target.name] = files
+            self._done_items += 1
+            done, total, nbytes = self._done_items, self._total_items, self._bytes
+        if self.progress_fn is not None:
+            self.progress_fn(done, total, nbytes)
+        if nbytes and (done % 25 == 0 or done == total):
+            self.log(f"  {done}/{total} item(s) imported, {_fmt_bytes(nbytes)} copied")
+
+    # -- per folder --------------------------------------------------------
+
+    def plan(self, sub: str, src: Path, dst: Path, suffix: str):
+        """Yield (item, target, method) for the items still to import."""
+        skipped = 0
+        out = []
+        for item in sorted(src.iterdir()):
+            if sub == "mods" and not item.is_dir():
+                continue
+            target = dst / (item.name + suffix if suffix else item.name)
+            if self.journal.is_done(sub, item.name):
+                # Finished before an interruption; only the source delete of
+                # a move may be outstanding.
+                if self.mode == MO2_IMPORT_MOVE and target.exists():
+                    _remove_item(item)
+                continue
+            if target.exists():
+                if sub == "mods":
+                    self.log(f"  Skipped (already exists): {item.name}")
+                else:
+                    self.log(f"  Skipped {sub}/{item.name} (already exists)")
+                skipped += 1
+                continue
+            out.append((item, target, self._method(sub, item, dst)))
+        return out, skipped
+
+    def run(self, work: list[tuple[str, Path, Path, str]]) -> None:
+        """*work* is [(sub, src, dst, suffix)]."""
+        if self.journal.resumed:
+            self.log("Resuming interrupted MO2 import…")
+        plans = []
+        for sub, src, dst, suffix in work:
+            items, skipped = self.plan(sub, src, dst, suffix)
+            plans.append((sub, items, skipped))
+            self._total_items += len(items)
+
+        for sub, items, skipped in plans:
+            renames = [t for t in items if t[2] == "rename"]
+            others = [t for t in items if t[2] != "rename"]
+            if renames:
+                self.log(f"{sub}: {len(renames)} item(s) on the same filesystem — renaming.")
+            if others:
+                how = "hardlinking" if others[0][2] == "hardlink" else "copying"
+                self.log(f"{sub}: {how} {len(others)} item(s) with {self.workers} worker(s)…")
+            for item, target, method in renames:
+                self._place(sub, item, target, method)
+            if others:
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    futures = [pool.submit(self._place, sub, item, target, method)
+                               for item, target, method in others]
+                    for fut in futures:
+                        fut.result()
+            label = "Mods" if sub == "mods" else f"{sub.capitalize()} items"
+            verb = "imported" if self.mode == MO2_IMPORT_HARDLINK else "moved"
+            self.log(f"{label} {verb}: {len(items)}"
+                     + (f", skipped: {skipped}" if skipped else ""))
+
+        shutil.rmtree(self.partial_root, ignore_errors=True)
+        if self._linked:
+            self.log(f"Hardlinked {self._linked} file(s) (no data copied).")
+        if self._bytes:
+            self.log(f"Copied {_fmt_bytes(self._bytes)}.")
+
+
+def _effective_staging(game) -> Path | None:
+    try:
+        return Path(game.get_effective_mod_staging_path())
+    except Exception:
+        return None
+
+
+def _write_index_entries(staging_root: Path, entries: dict[str, dict[str, str]],
+                         indexer: _Indexer, normalize_folder_case: bool, log) -> None:
+    """Merge freshly walked mod entries (and a rescanned overwrite) into an
+    existing modindex.bin.  A missing index is left missing: build_filemap()
+    rebuilds it from a full scan anyway."""
+    from Utils.filemap import OVERWRITE_NAME, _write_mod_index, read_mod_index
+    index_path = staging_root / "modindex.bin"
+    index = read_mod_index(index_path)
+    if index is None:
+        return
+    for name, files in entries.items():
+        index[name] = (files, {})
+    overwrite_files = indexer.scan(staging_root / "overwrite")
+    if overwrite_files is not None:
+        index[OVERWRITE_NAME] = (overwrite_files, {})
+    try:
+        _write_mod_index(index_path, index, normalize_folder_case=normalize_folder_case)
+        log(f"Mod index updated with {len(entries)} imported mod(s).")
+    except OSError as exc:
+        log(f"Mod index update skipped: {exc}")
+
+
 def import_mo2(mo2_path: Path, staging_root: Path,
-               log_fn=None) -> None:
+               log_fn=None, *,
+               mode: str = MO2_IMPORT_MOVE,
+               game=None,
+               workers: int = _COPY_WORKERS,
+               progress_fn: Callable[[int, int, int], None] | None = None) -> None:
     """Move MO2 mods/, overwrite/, and profiles/ into *staging_root*.
 
     *staging_root* is the value of ``game.get_profile_root()`` — the directory
@@ -37,59 +408,46 @@ def import_mo2(mo2_path: Path, staging_root: Path,
 
     Existing items in the destination are **not** overwritten; conflicting mod
     folders are skipped with a warning.
+
+    *mode* is ``MO2_IMPORT_MOVE`` (MO2's folders are emptied) or
+    ``MO2_IMPORT_HARDLINK`` (MO2 is left intact; see the module docstring).
+    When *game* is given, imported mods are added to ``modindex.bin`` with
+    that game's strip prefixes and extension filter.  *progress_fn* receives
+    (items_done, items_total, bytes_copied) from worker threads.
     """
     log = log_fn or app_log
+    if mode not in (MO2_IMPORT_MOVE, MO2_IMPORT_HARDLINK):
+        raise ValueError(f"Unknown MO2 import mode: {mode}")
+
+    # The index lives next to the effective staging folder; only maintain it
+    # when that is the mods/ folder being imported into.
+    indexer = None
+    if game is not None and _effective_staging(game) == staging_root / "mods":
+        strip = (set(getattr(game, "mod_folder_strip_prefixes", None) or set())
+                 | set(getattr(game, "mod_folder_strip_prefixes_post", None) or set()))
+        indexer = _Indexer(
+            frozenset(s.lower() for s in strip),
+            frozenset(e.lower() for e in (getattr(game, "mod_install_extensions", None) or set())),
+            frozenset(getattr(game, "filemap_exclude_dirs", frozenset({"fomod"})) or frozenset()),
+        )
 
-    for sub in ("mods", "overwrite", "profiles"):
+    staging_root.mkdir(parents=True, exist_ok=True)
+    run = _ImportRun(mo2_path, staging_root, mode, log, progress_fn, workers, indexer)
+    work = []
+    for sub in _SUBDIRS:
         src = mo2_path / sub
         if not src.is_dir():
             log(f"MO2 {sub}/ not found — skipping.")
             continue
-
         dst = staging_root / sub
         dst.mkdir(parents=True, exist_ok=True)
+        work.append((sub, src, dst, " Mo2" if sub == "profiles" else ""))
 
-        if sub == "mods":
-            _move_mods(src, dst, log)
-        elif sub == "profiles":
-            _move_contents(src, dst, sub, log, suffix=" Mo2")
-        else:
-            _move_contents(src, dst, sub, log)
-
-    log("MO2 import complete.")
-
-
-def _move_mods(src: Path, dst: Path, log) -> None:
-    """Move each mod folder individually so we can skip conflicts."""
-    moved = 0
-    skipped = 0
-    for mod_dir in sorted(src.iterdir()):
-        if not mod_dir.is_dir():
-            continue
-        target = dst / mod_dir.name
-        if target.exists():
-            log(f"  Skipped (already exists): {mod_dir.name}")
-            skipped += 1
-            continue
-        shutil.move(str(mod_dir), str(target))
-        moved += 1
-    log(f"Mods moved: {moved}" + (f", skipped: {skipped}" if skipped else ""))
-
+    run.run(work)
+    run.journal.finish()
 
-def _move_contents(src: Path, dst: Path, label: str, log,
-                    suffix: str = "") -> None:
-    """Move contents of *src* into *dst* (for overwrite / profiles).
+    if indexer is not None and run.index_entries:
+        _write_index_entries(staging_root, run.index_entries, indexer,
+                             getattr(game, "normalize_folder_case", True), log)
 
-    If *suffix* is set, it is appended to each item's name on the
-    destination side (e.g. ``" Mo2"`` for imported profiles).
-    """
-    moved = 0
-    for item in sorted(src.iterdir()):
-        dest_name = item.name + suffix if suffix else item.name
-        target = dst / dest_name
-        if target.exists():
-            log(f"  Skipped {label}/{item.name} (already exists)")
-            continue
-        shutil.move(str(item), str(target))
-        moved += 1
-    log(f"{label.capitalize()} items moved: {moved}")
+    log("MO2 import complete.")
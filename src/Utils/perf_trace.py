@@ -0,0 +1,279 @@
+"""
+perf_trace.py
+Lightweight span tracing for deploy, restore, filemap rebuilds and installs.
+
+An *operation* is a top-level span (deploy, restore, filemap, install, …).
+Inside it, nested spans time phases and counters record work done:
+
+    @traced("deploy")
+    def deploy_filemap(...):
+        annotate(profile_dir=profile_dir)
+        with span("link files"):
+            ...
+            count("files", n_linked)
+            count("bytes", n_bytes)
+
+Each span records its wall time, the thread it ran on and its counters.
+Spans and counters attach to the innermost span open on the same thread, so
+operations running side by side on different threads never mix.  A thread
+with no span open (a pool worker) records nothing; workers hand their totals
+back and the submitting thread counts them.  A traced function called inside
+an operation becomes a child span instead of starting a new operation.
+
+When an operation finishes, its trace is written as JSON to
+``<profile_dir>/logs/traces/`` (when the operation was annotated with a
+profile_dir) or ``~/.config/AmethystModManager/logs/traces/``; the newest
+_MAX_TRACES files per folder are kept.  format_summary() renders a trace as
+a table (see ``cli.py --trace`` and ``cli.py show-trace``).
+
+Tracing is off unless MOD_MANAGER_TRACE=1 is set or enable() is called
+(``cli.py --trace``); while off, spans cost one check.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+_MAX_TRACES = 50
+_TRACES_SUBDIR = ("logs", "traces")
+
+
+_forced = False
+
+
+def _enabled() -> bool:
+    return _forced or os.environ.get("MOD_MANAGER_TRACE", "0") not in ("", "0")
+
+
+def enable() -> None:
+    """Turn tracing on for this process, whatever MOD_MANAGER_TRACE says."""
+    global _forced
+    _forced = True
+
+
+class Span:
+    """One timed phase; children and counters are filled in as it runs."""
+    __slots__ = ("name", "thread", "start", "end", "counters", "attrs", "children", "_lock")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.thread = threading.current_thread().name
+        self.start = time.perf_counter()
+        self.end: float | None = None
+        self.counters: dict[str, int] = {}
+        self.attrs: dict[str, str] = {}
+        self.children: list[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, key: str, n: int) -> None:
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def to_dict(self) -> dict:
+        end = self.end if self.end is not None else time.perf_counter()
+        out: dict = {"name": self.name, "thread": self.thread,
+                     "ms": round((end - self.start) * 1000, 3)}
+        if self.counters:
+            out["counters"] = dict(self.counters)
+        if self.attrs:
+            out["attrs"] = dict(self.attrs)
+        if self.children:
+            out["children"] = [c.to_dict() for c in list(self.children)]
+        return out
+
+
+_local = threading.local()
+_listeners: list[Callable[[dict], None]] = []
+
+
+def _stack() -> list[Span]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _current() -> Span | None:
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def operation(name: str, **attrs):
+    """Start an operation, or a child span if one is already running on this thread."""
+    if not _enabled():
+        yield None
+        return
+    stack = _stack()
+    if stack:
+        with span(name, **attrs) as s:
+            yield s
+        return
+    root = Span(name)
+    root.attrs.update({k: str(v) for k, v in attrs.items()})
+    stack.append(root)
+    try:
+        yield root
+    finally:
+        root.end = time.perf_counter()
+        stack.clear()
+        _finish(root)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time a phase under the current span (no-op outside any operation)."""
+    parent = _current() if _enabled() else None
+    if parent is None:
+        yield None
+        return
+    s = Span(name)
+    if attrs:
+        s.attrs.update({k: str(v) for k, v in attrs.items()})
+    with parent._lock:
+        parent.children.append(s)
+    stack = _stack()
+    depth = len(stack)
+    stack.append(s)
+    try:
+        yield s
+    finally:
+        s.end = time.perf_counter()
+        del stack[depth:]
+
+
+def count(key: str, n: int = 1) -> None:
+    """Add *n* to counter *key* (files, bytes, syscalls, …) on the current span."""
+    if not n:
+        return
+    s = _current() if _enabled() else None
+    if s is not None:
+        s.add(key, n)
+
+
+def annotate(**attrs) -> None:
+    """Attach attributes to the current span.  A ``profile_dir`` attribute
+    anywhere in a trace selects where it is written (the outermost wins)."""
+    stack = _stack()
+    if stack:
+        stack[-1].attrs.update({k: str(v) for k, v in attrs.items()})
+
+
+def traced(name: str):
+    """Decorator: run the function as operation *name*."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with operation(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def add_listener(fn: Callable[[dict], None]) -> None:
+    """Call *fn(trace_dict)* whenever an operation finishes."""
+    _listeners.append(fn)
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def _find_attr(root: Span, key: str) -> str | None:
+    """Breadth-first search for *key* in the attrs of *root* and its children."""
+    queue = [root]
+    while queue:
+        s = queue.pop(0)
+        if key in s.attrs:
+            return s.attrs[key]
+        queue.extend(s.children)
+    return None
+
+
+def _trace_dir(root: Span) -> Path:
+    profile_dir = _find_attr(root, "profile_dir")
+    if profile_dir:
+        return Path(profile_dir).joinpath(*_TRACES_SUBDIR)
+    from Utils.config_paths import get_logs_dir
+    return get_logs_dir() / _TRACES_SUBDIR[1]
+
+
+def _prune(trace_dir: Path) -> None:
+    try:
+        files = sorted(trace_dir.glob("*.json"))
+    except OSError:
+        return
+    for old in files[:-_MAX_TRACES]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+
+def _write(root: Span, data: dict) -> Path | None:
+    trace_dir = _trace_dir(root)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    path = trace_dir / f"{stamp}_{root.name.replace(' ', '_')}.json"
+    tmp = path.with_suffix(".tmp")
+    try:
+        trace_dir.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(data, indent=1), encoding="utf-8")
+        tmp.replace(path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return None
+    _prune(trace_dir)
+    return path
+
+
+def _finish(root: Span) -> None:
+    data = root.to_dict()
+    data["started"] = datetime.fromtimestamp(
+        time.time() - (root.end - root.start)).isoformat(timespec="seconds")
+    path = _write(root, data)
+    if path is not None:
+        data["file"] = str(path)
+    for fn in list(_listeners):
+        try:
+            fn(data)
+        except Exception:
+            pass
+
+
+def format_summary(trace: dict) -> str:
+    """Render a trace dict as an indented table of spans."""
+    total = trace.get("ms") or 1.0
+    rows: list[tuple[str, str, str, str, str]] = []
+
+    def walk(node: dict, depth: int) -> None:
+        counters = ", ".join(f"{k}={v:,}" for k, v in sorted(node.get("counters", {}).items()))
+        rows.append((
+            "  " * depth + node["name"],
+            f"{node['ms']:,.1f}",
+            f"{100 * node['ms'] / total:.0f}%",
+            node.get("thread", ""),
+            counters,
+        ))
+        for child in node.get("children", []):
+            walk(child, depth + 1)
+
+    walk(trace, 0)
+    headers = ("span", "ms", "%", "thread", "counters")
+    widths = [max(len(h), *(len(r[i]) for r in rows)) for i, h in enumerate(headers)]
+    lines = ["  ".join(h.ljust(w) for h, w in zip(headers, widths)).rstrip(),
+             "  ".join("-" * w for w in widths)]
+    for r in rows:
+        lines.append("  ".join([r[0].ljust(widths[0]), r[1].rjust(widths[1]),
+                                r[2].rjust(widths[2]), r[3].ljust(widths[3]), r[4]]).rstrip())
+    return "\n".join(lines)
@@ -25,6 +25,9 @@ import json
 from dataclasses import dataclass
 from pathlib import Path
 
+from Utils.filemap_bin import open_filemap
+
+
 @dataclass
 class PluginEntry:
     name: str
@@ -158,18 +161,10 @@ def prune_plugins_from_filemap(
 
     # Collect all root-level plugin filenames present in the current filemap
     in_filemap: set[str] = set()
-    if filemap_path.is_file():
-        with filemap_path.open(encoding="utf-8") as f:
-            for line in f:
-                line = line.rstrip("\n")
-                if "\t" not in line:
-                    continue
-                rel_path, _ = line.split("\t", 1)
-                rel_path = rel_path.replace("\\", "/")
-                if "/" in rel_path:
-                    continue
-                if Path(rel_path).suffix.lower() in exts_lower:
-                    in_filemap.add(rel_path.lower())
+    fm = open_filemap(filemap_path)
+    if fm is not None:
+        for rel_path, _ in fm.root_files(exts_lower):
+            in_filemap.add(rel_path.lower())
 
     # Also keep plugins that exist as vanilla files in the game's Data/ dir.
     # Prefer Data_Core/ when it exists — after deployment Data/ contains
@@ -320,30 +315,21 @@ def sync_plugins_from_filemap(
 
     new_entries: list[PluginEntry] = []
 
-    with filemap_path.open(encoding="utf-8") as f:
-        for line in f:
-            line = line.rstrip("\n")
-            if "\t" not in line:
-                continue
-            rel_path, mod_name = line.split("\t", 1)
-            rel_path = rel_path.replace("\\", "/")
-            if "/" in rel_path:
-                # Plugin is inside a subfolder — not a root-level plugin file
-                continue
-            filename = rel_path
-            if (Path(filename).suffix.lower() in exts_lower
-                    and filename.lower() not in known_lower):
-                if disabled_plugins:
-                    mod_disabled = {n.lower() for n in disabled_plugins.get(mod_name, [])}
-                    if filename.lower() in mod_disabled:
-                        continue
-                # Normalise extension to lowercase so case-sensitive filesystems
-                # (Linux) can locate the file on disk (e.g. .ESP → .esp).
-                stem = Path(filename).stem
-                ext  = Path(filename).suffix.lower()
-                normalised = stem + ext
-                new_entries.append(PluginEntry(name=normalised, enabled=True))
-                known_lower.add(normalised.lower())
+    fm = open_filemap(filemap_path)
+    # Only root-level files — plugins inside a subfolder are not loaded.
+    for filename, mod_name in (fm.root_files(exts_lower) if fm is not None else ()):
+        if filename.lower() not in known_lower:
+            if disabled_plugins:
+                mod_disabled = {n.lower() for n in disabled_plugins.get(mod_name, [])}
+                if filename.lower() in mod_disabled:
+                    continue
+            # Normalise extension to lowercase so case-sensitive filesystems
+            # (Linux) can locate the file on disk (e.g. .ESP → .esp).
+            stem = Path(filename).stem
+            ext  = Path(filename).suffix.lower()
+            normalised = stem + ext
+            new_entries.append(PluginEntry(name=normalised, enabled=True))
+            known_lower.add(normalised.lower())
 
     if new_entries:
         write_plugins(plugins_path, existing + new_entries, star_prefix=star_prefix)
@@ -377,26 +363,14 @@ def sync_plugins_from_filemap_combined(
     # --- 1. Collect root-level plugins present in the filemap, keyed by lower name.
     filemap_names: dict[str, str] = {}   # lower -> original-case filename
     filemap_mod_for: dict[str, str] = {} # lower -> owning mod name
-    if filemap_path.is_file():
-        with filemap_path.open(encoding="utf-8") as f:
-            for line in f:
-                line = line.rstrip("\n")
-                if "\t" not in line:
-                    continue
-                rel_path, mod_name = line.split("\t", 1)
-                rel_path = rel_path.replace("\\", "/")
-                if "/" in rel_path:
-                    continue
-                # Cheap suffix test — avoid Path() allocation per line.
-                dot = rel_path.rfind(".")
-                if dot < 0:
-                    continue
-                if rel_path[dot:].lower() not in exts_lower:
-                    continue
-                low = rel_path.lower()
-                if low not in filemap_names:
-                    filemap_names[low] = rel_path
-                    filemap_mod_for[low] = mod_name
+    fm = open_filemap(filemap_path)
+    if fm is not None:
+        # Extension index lookup — only the matching entries are decoded.
+        for rel_path, mod_name in fm.root_files(exts_lower):
+            low = rel_path.lower()
+            if low not in filemap_names:
+                filemap_names[low] = rel_path
+                filemap_mod_for[low] = mod_name
 
     # --- 2. Vanilla plugins in the game's Data dir are always kept.
     in_data_dir: set[str] = set()
@@ -1,23 +1,57 @@
 """
 profile_backup.py
 Backup and restore modlist.txt, plugins.txt, and related JSON state for a profile.
-Each backup is stored in its own folder under profile_dir/backups/<timestamp>/.
 Used before deploy (create_backup) and via Restore backup UI (list_backups, restore_backup).
+
+Backups are snapshots in a small content-addressed store under
+profile_dir/backups/:
+
+    objects/<sha1[:2]>/<sha1>   each distinct file content, stored once
+                                (zstd-compressed when zstandard is installed)
+    snapshots.json              {"v": 1, "snapshots": [
+                                    {"id": "20250225_143022",
+                                     "files": {name: sha1}, "kept": bool}, ...]}
+
+A snapshot is just its manifest, so backing up an unchanged profile writes
+no blobs, and a backup identical to the newest one is skipped.  Listing
+reads snapshots.json once instead of scanning folders.  Old snapshots are
+pruned by the retention policy in amethyst.ini ([backups] keep_last,
+keep_daily, keep_weekly); kept snapshots are never pruned.
+
+Backups from older versions (one profile_dir/backups/<timestamp>/ folder per
+backup) are imported into the store the first time it is opened.
+
+Callers refer to a snapshot by ``profile_dir/backups/<id>`` — the same paths
+list_backups() has always returned — even though no such folder exists.
 """
 
 from __future__ import annotations
 
+import difflib
+import hashlib
+import json
 import re
 import shutil
-from datetime import datetime
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from pathlib import Path
 
 from Utils.app_log import safe_log as _safe_log
+from Utils.profile_state import flush_profile_state
+
+try:
+    import zstandard as _zstd
+except ImportError:
+    _zstd = None  # type: ignore[assignment]
 
 _TIMESTAMP_FMT = "%Y%m%d_%H%M%S"
-_MAX_BACKUPS = 10
 _BACKUPS_SUBDIR = "backups"
+_OBJECTS_SUBDIR = "objects"
+_SNAPSHOTS_FILE = "snapshots.json"
+_STORE_VERSION = 1
 _TIMESTAMP_PATTERN = re.compile(r"^\d{8}_\d{6}$")
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
 
 # Files to backup/restore (in profile dir). Copy only if present.
 _BACKUP_FILES = [
@@ -34,13 +68,17 @@ _BACKUP_FILES = [
     "profile_settings.json",
 ]
 
+_KEEP_MARKER = ".keep"
+
+_store_lock = threading.RLock()
+
 
 def _timestamp_str() -> str:
     return datetime.now().strftime(_TIMESTAMP_FMT)
 
 
 def _parse_timestamp_from_dirname(name: str) -> datetime | None:
-    """Parse timestamp from a backup folder name like '20250225_143022'."""
+    """Parse timestamp from a backup id / folder name like '20250225_143022'."""
     if not _TIMESTAMP_PATTERN.fullmatch(name):
         return None
     try:
@@ -49,96 +87,348 @@ def _parse_timestamp_from_dirname(name: str) -> datetime | None:
         return None
 
 
-_KEEP_MARKER = ".keep"
+@dataclass
+class RetentionPolicy:
+    """Which unkept snapshots survive pruning (the union of all three rules)."""
+    keep_last: int = 10
+    keep_daily: int = 7
+    keep_weekly: int = 4
+
+    @classmethod
+    def from_settings(cls) -> "RetentionPolicy":
+        from Utils.ui_config import load_backup_settings
+        s = load_backup_settings()
+        return cls(s["keep_last"], s["keep_daily"], s["keep_weekly"])
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class _Store:
+    """The backup store of one profile.  Callers hold _store_lock."""
+
+    def __init__(self, profile_dir: Path):
+        self.root = profile_dir / _BACKUPS_SUBDIR
+        self.objects = self.root / _OBJECTS_SUBDIR
+        self.snapshots: list[dict] = []   # oldest first
+        try:
+            data = json.loads((self.root / _SNAPSHOTS_FILE).read_text(encoding="utf-8"))
+            if isinstance(data, dict) and data.get("v") == _STORE_VERSION:
+                self.snapshots = [s for s in data.get("snapshots", [])
+                                  if isinstance(s, dict) and "id" in s]
+        except (OSError, ValueError):
+            pass
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / _SNAPSHOTS_FILE
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"v": _STORE_VERSION, "snapshots": self.snapshots}),
+                       encoding="utf-8")
+        tmp.replace(path)
+
+    def find(self, snap_id: str) -> dict | None:
+        for snap in reversed(self.snapshots):
+            if snap["id"] == snap_id:
+                return snap
+        return None
+
+    # -- blobs -------------------------------------------------------------
+
+    def _blob_path(self, sha: str) -> Path:
+        return self.objects / sha[:2] / sha
+
+    def put(self, data: bytes, compress: bool) -> str:
+        sha = hashlib.sha1(data).hexdigest()
+        path = self._blob_path(sha)
+        if path.is_file():
+            return sha
+        payload = data
+        if compress and _zstd is not None:
+            payload = _zstd.ZstdCompressor(level=9).compress(data)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(payload)
+        tmp.replace(path)
+        return sha
+
+    def get(self, sha: str) -> bytes:
+        raw = self._blob_path(sha).read_bytes()
+        if raw[:4] == _ZSTD_MAGIC:
+            if _zstd is None:
+                raise RuntimeError(
+                    "This backup is zstd-compressed; install the 'zstandard' package to restore it."
+                )
+            return _zstd.ZstdDecompressor().decompress(raw)
+        return raw
+
+    def collect_garbage(self) -> int:
+        """Delete blobs no snapshot references; return how many went."""
+        live = {sha for snap in self.snapshots for sha in snap["files"].values()}
+        removed = 0
+        if not self.objects.is_dir():
+            return 0
+        for sub in self.objects.iterdir():
+            if not sub.is_dir():
+                continue
+            for blob in sub.iterdir():
+                if blob.name not in live:
+                    try:
+                        blob.unlink()
+                        removed += 1
+                    except OSError:
+                        pass
+        return removed
+
+    # -- legacy folders ----------------------------------------------------
+
+    def import_legacy(self, compress: bool) -> None:
+        """Move old per-backup folders into the store."""
+        if not self.root.is_dir():
+            return
+        legacy = sorted(
+            p for p in self.root.iterdir()
+            if p.is_dir() and _parse_timestamp_from_dirname(p.name) is not None
+        )
+        if not legacy:
+            return
+        known = {s["id"] for s in self.snapshots}
+        # Folders without modlist.txt were never valid backups; leave them
+        # alone rather than delete data the store does not hold.
+        stored = []
+        for folder in legacy:
+            if folder.name in known:
+                stored.append(folder)
+            elif (folder / "modlist.txt").is_file():
+                files = {}
+                for name in _BACKUP_FILES:
+                    src = folder / name
+                    if src.is_file():
+                        files[name] = self.put(src.read_bytes(), compress)
+                self.snapshots.append({"id": folder.name, "files": files,
+                                       "kept": (folder / _KEEP_MARKER).is_file()})
+                stored.append(folder)
+        if not stored:
+            return
+        self.snapshots.sort(key=lambda s: s["id"])
+        self.save()
+        for folder in stored:
+            shutil.rmtree(folder, ignore_errors=True)
+
+
+def _open_store(profile_dir: Path) -> _Store:
+    store = _Store(profile_dir)
+    store.import_legacy(_compress_enabled())
+    return store
+
 
+def _compress_enabled() -> bool:
+    from Utils.ui_config import load_backup_settings
+    return load_backup_settings()["compress"]
+
+
+def _snapshot_ref(backup_dir: Path) -> tuple[Path, str]:
+    """Split a list_backups() path into (profile_dir, snapshot id)."""
+    return backup_dir.parent.parent, backup_dir.name
+
+
+def _read_profile_files(profile_dir: Path) -> dict[str, bytes]:
+    out = {}
+    for name in _BACKUP_FILES:
+        try:
+            out[name] = (profile_dir / name).read_bytes()
+        except OSError:
+            continue
+    return out
+
+
+def _retained(snapshots: list[dict], policy: RetentionPolicy) -> set[str]:
+    """Ids of the snapshots *policy* keeps (kept ones are handled by the caller)."""
+    newest_first = sorted((s["id"] for s in snapshots), reverse=True)
+    keep = set(newest_first[:policy.keep_last])
+    for n, bucket in ((policy.keep_daily, lambda d: d.date()),
+                      (policy.keep_weekly, lambda d: d.isocalendar()[:2])):
+        seen: set = set()
+        for snap_id in newest_first:
+            if len(seen) >= n:
+                break
+            dt = _parse_timestamp_from_dirname(snap_id)
+            if dt is None:
+                continue
+            b = bucket(dt)
+            if b not in seen:
+                seen.add(b)
+                keep.add(snap_id)
+    return keep
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
 
 def is_backup_kept(backup_dir: Path) -> bool:
     """Return True if this backup is marked to be kept permanently."""
-    return (backup_dir / _KEEP_MARKER).is_file()
+    if backup_dir.is_dir():
+        return (backup_dir / _KEEP_MARKER).is_file()
+    profile_dir, snap_id = _snapshot_ref(backup_dir)
+    with _store_lock:
+        snap = _Store(profile_dir).find(snap_id)
+    return bool(snap and snap.get("kept"))
+
+
+def kept_backups(profile_dir: Path) -> set[Path]:
+    """Return the list_backups() paths of every kept backup, reading the
+    store once (for listing many backups; see is_backup_kept)."""
+    backups_dir = profile_dir / _BACKUPS_SUBDIR
+    if not backups_dir.is_dir():
+        return set()
+    with _store_lock:
+        store = _open_store(profile_dir)
+    return {backups_dir / s["id"] for s in store.snapshots if s.get("kept")}
 
 
 def set_backup_kept(backup_dir: Path, keep: bool) -> None:
     """Mark or unmark a backup to be kept permanently (skip pruning)."""
-    marker = backup_dir / _KEEP_MARKER
-    if keep:
-        marker.touch(exist_ok=True)
-    elif marker.is_file():
-        marker.unlink()
+    profile_dir, snap_id = _snapshot_ref(backup_dir)
+    with _store_lock:
+        store = _open_store(profile_dir)
+        snap = store.find(snap_id)
+        if snap is not None and bool(snap.get("kept")) != keep:
+            snap["kept"] = keep
+            store.save()
 
 
-def create_backup(profile_dir: Path, log_fn=None) -> None:
+def create_backup(profile_dir: Path, log_fn=None,
+                  policy: RetentionPolicy | None = None) -> None:
     """
-    Create a new backup in profile_dir/backups/<timestamp>/ containing
-    modlist.txt, plugins.txt, and (if present) profile_state.json.
-    Keep at most _MAX_BACKUPS backup folders; delete oldest when over limit.
-    Backups marked with .keep are never pruned.
+    Snapshot modlist.txt, plugins.txt, profile_state.json and the other
+    _BACKUP_FILES present in profile_dir, then prune by *policy* (default:
+    the amethyst.ini retention settings).  Only file contents the store has
+    not seen before are written.  Backups marked kept are never pruned.
     """
     _log = _safe_log(log_fn)
-    backups_dir = profile_dir / _BACKUPS_SUBDIR
-    backups_dir.mkdir(parents=True, exist_ok=True)
-    ts = _timestamp_str()
-    backup_folder = backups_dir / ts
-    backup_folder.mkdir(parents=True, exist_ok=True)
+    flush_profile_state(profile_dir)
+    files = _read_profile_files(profile_dir)
+    compress = _compress_enabled()
+    with _store_lock:
+        store = _open_store(profile_dir)
+        manifest = {name: store.put(data, compress) for name, data in files.items()}
+        newest = store.snapshots[-1] if store.snapshots else None
+        if newest is not None and newest["files"] == manifest:
+            _log(f"Backup: profile unchanged since {newest['id']} — skipped.")
+            return
+        snap_id = _timestamp_str()
+        if newest is not None and newest["id"] == snap_id and not newest.get("kept"):
+            # Same second as the previous backup: replace it.
+            store.snapshots.pop()
+        elif newest is not None and newest["id"] >= snap_id:
+            # A kept backup from this second, or the clock went back: file
+            # this one a second after the newest rather than replace anything.
+            prev = _parse_timestamp_from_dirname(newest["id"])
+            if prev is not None:
+                snap_id = (prev + timedelta(seconds=1)).strftime(_TIMESTAMP_FMT)
+        store.snapshots.append({"id": snap_id, "files": manifest, "kept": False})
+        _log(f"Backup: {', '.join(manifest)}")
 
-    for name in _BACKUP_FILES:
-        src = profile_dir / name
-        if src.is_file():
-            dst = backup_folder / name
-            shutil.copy2(src, dst)
-            _log(f"Backup: {name}")
-
-    # Prune to _MAX_BACKUPS: list subdirs by name (chronological order), remove oldest.
-    # Kept backups are excluded from pruning (and from the count).
-    def _prunable_backups():
-        dirs = [
-            p for p in backups_dir.iterdir()
-            if p.is_dir() and _parse_timestamp_from_dirname(p.name) is not None
-               and not is_backup_kept(p)
-        ]
-        dirs.sort(key=lambda p: p.name)
-        return dirs
-
-    subdirs = _prunable_backups()
-    while len(subdirs) > _MAX_BACKUPS:
-        oldest = subdirs.pop(0)
-        try:
-            shutil.rmtree(oldest)
-            _log(f"Backup: removed oldest {oldest.name}")
-        except OSError:
-            pass
-        subdirs = _prunable_backups()
+        keep = _retained(store.snapshots, policy or RetentionPolicy.from_settings())
+        before = len(store.snapshots)
+        store.snapshots = [s for s in store.snapshots if s.get("kept") or s["id"] in keep]
+        pruned = before - len(store.snapshots)
+        store.save()
+        if pruned:
+            store.collect_garbage()
+            _log(f"Backup: pruned {pruned} old backup(s)")
 
 
 def list_backups(profile_dir: Path) -> list[tuple[datetime, Path]]:
     """
-    List backup folders from profile_dir/backups/, newest first.
-    Returns list of (timestamp, backup_folder_path).
-    Only includes folders that contain modlist.txt (valid backup).
+    List backups of profile_dir, newest first.
+    Returns list of (timestamp, backup_path); pass backup_path to
+    restore_backup(), diff_backups() and the keep helpers.
+    Only includes backups that contain modlist.txt (valid backup).
     """
     backups_dir = profile_dir / _BACKUPS_SUBDIR
     if not backups_dir.is_dir():
         return []
-
+    with _store_lock:
+        store = _open_store(profile_dir)
     result: list[tuple[datetime, Path]] = []
-    for p in backups_dir.iterdir():
-        if not p.is_dir():
-            continue
-        dt = _parse_timestamp_from_dirname(p.name)
-        if dt is None:
-            continue
-        if (p / "modlist.txt").is_file():
-            result.append((dt, p))
+    for snap in store.snapshots:
+        dt = _parse_timestamp_from_dirname(snap["id"])
+        if dt is not None and "modlist.txt" in snap["files"]:
+            result.append((dt, backups_dir / snap["id"]))
     result.sort(key=lambda x: x[0], reverse=True)
     return result
 
 
 def restore_backup(profile_dir: Path, backup_dir: Path) -> None:
     """
-    Copy all backed-up files from backup_dir into profile_dir.
+    Write every file in the backup back into profile_dir.
     Overwrites modlist.txt, plugins.txt, and any of the JSON state files
-    that exist in the backup folder.
+    the backup holds.
     """
-    for name in _BACKUP_FILES:
-        src = backup_dir / name
-        if src.is_file():
-            shutil.copy2(src, profile_dir / name)
+    flush_profile_state(profile_dir)
+    if backup_dir.is_dir():
+        for name in _BACKUP_FILES:
+            src = backup_dir / name
+            if src.is_file():
+                shutil.copy2(src, profile_dir / name)
+        return
+    store_profile, snap_id = _snapshot_ref(backup_dir)
+    with _store_lock:
+        store = _Store(store_profile)
+        snap = store.find(snap_id)
+        if snap is None:
+            raise FileNotFoundError(f"Backup {snap_id} not found")
+        contents = {name: store.get(sha) for name, sha in snap["files"].items()}
+    for name, data in contents.items():
+        dst = profile_dir / name
+        tmp = dst.with_name(dst.name + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(dst)
+
+
+def diff_backups(old: Path, new: Path | None = None) -> dict[str, list[str]]:
+    """Unified diffs between two backups, or between *old* and the live
+    profile files when *new* is None.
+
+    Returns {file name: diff lines} for files that differ; only those
+    files' contents are read.
+    """
+    profile_dir, old_id = _snapshot_ref(old)
+    with _store_lock:
+        store = _Store(profile_dir)
+        old_snap = store.find(old_id)
+        if old_snap is None:
+            raise FileNotFoundError(f"Backup {old_id} not found")
+        old_files = old_snap["files"]
+        if new is not None:
+            new_snap = store.find(new.name)
+            if new_snap is None:
+                raise FileNotFoundError(f"Backup {new.name} not found")
+            new_files = new_snap["files"]
+            new_data: dict[str, bytes] = {}
+            new_label = new.name
+        else:
+            new_data = _read_profile_files(profile_dir)
+            new_files = {n: hashlib.sha1(d).hexdigest() for n, d in new_data.items()}
+            new_label = "current"
+
+        out: dict[str, list[str]] = {}
+        for name in sorted(set(old_files) | set(new_files)):
+            a_sha, b_sha = old_files.get(name), new_files.get(name)
+            if a_sha == b_sha:
+                continue
+            a = store.get(a_sha).decode("utf-8", "replace") if a_sha else ""
+            if b_sha is None:
+                b = ""
+            elif name in new_data:
+                b = new_data[name].decode("utf-8", "replace")
+            else:
+                b = store.get(b_sha).decode("utf-8", "replace")
+            out[name] = list(difflib.unified_diff(
+                a.splitlines(), b.splitlines(),
+                f"{old_id}/{name}", f"{new_label}/{name}", lineterm="",
+            ))
+    return out
@@ -0,0 +1,129 @@
+"""
+profile_session.py
+Per-profile snapshot of the derived state the modlist panel shows after a
+filemap rebuild, so switching back to a profile can render at once.
+
+Switching profiles re-reads the profile's files and rebuilds the filemap,
+the loose-file conflict maps and the BSA conflict sets before the conflict
+columns can be drawn.  After each successful rebuild the panel saves that
+result here; on the next switch to the profile it is loaded and shown
+immediately while the usual background rebuild (staging rescan included)
+runs and replaces it.  The snapshot's inputs cannot see edits inside the
+staging folders, so it only ever stands in until that rebuild finishes.
+
+A snapshot is valid only while every input it was built from still has the
+(mtime_ns, size) it had then — modlist.txt, plugins.txt and
+profile_state.json in the profile folder, modindex.bin and bsa_index.bin
+next to the staging folder — and the game settings that shape conflicts
+(strip prefixes, archive extensions, casing, …) are unchanged.
+
+File format — msgpack, v1, at ``<profile_dir>/session.bin``:
+    {"v": 1, "inputs": [[path, mtime_ns, size], ...], "config": [str, ...],
+     "state": {name: value}}
+Set-valued dicts in the state ({mod: set[str]}) are stored as lists and
+come back as sets.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterable
+
+import msgpack
+
+_SESSION_VERSION = 1
+_SESSION_NAME = "session.bin"
+
+# Profile files and staging-level indexes a snapshot depends on.
+_PROFILE_INPUTS = ("modlist.txt", "plugins.txt", "profile_state.json")
+_INDEX_INPUTS = ("modindex.bin", "bsa_index.bin")
+
+# State keys holding {mod: set[str]}; everything else is stored as-is.
+_SET_MAPS = ("overrides", "overridden_by", "bsa_overrides", "bsa_overridden_by",
+             "loose_over_bsa", "bsa_over_loose")
+
+
+def session_path(profile_dir: Path) -> Path:
+    return profile_dir / _SESSION_NAME
+
+
+def session_inputs(profile_dir: Path, index_dir: Path) -> list[Path]:
+    """The files a snapshot for *profile_dir* is validated against.
+    *index_dir* is the folder holding modindex.bin (the staging parent)."""
+    return ([profile_dir / n for n in _PROFILE_INPUTS]
+            + [index_dir / n for n in _INDEX_INPUTS])
+
+
+def fingerprint(paths: Iterable[Path]) -> list[list]:
+    """[[path, mtime_ns, size], ...] for *paths*; missing files get (0, -1)."""
+    out = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            out.append([str(p), st.st_mtime_ns, st.st_size])
+        except OSError:
+            out.append([str(p), 0, -1])
+    return out
+
+
+def settled_fingerprint(before: list[list], after: list[list]) -> list[list] | None:
+    """*after*, unless a profile file changed between the two fingerprints
+    (the indexes are rewritten by the rebuild itself, so only they may)."""
+    n = len(_PROFILE_INPUTS)
+    return after if before[:n] == after[:n] else None
+
+
+def _encode(state: dict) -> dict:
+    out = dict(state)
+    for key in _SET_MAPS:
+        if key in out:
+            out[key] = {k: sorted(v) for k, v in out[key].items()}
+    if "prertx_mods" in out:
+        out["prertx_mods"] = sorted(out["prertx_mods"])
+    return out
+
+
+def _decode(state: dict) -> dict:
+    for key in _SET_MAPS:
+        if key in state:
+            state[key] = {k: set(v) for k, v in state[key].items()}
+    if "prertx_mods" in state:
+        state["prertx_mods"] = set(state["prertx_mods"])
+    return state
+
+
+def save_session(profile_dir: Path, inputs: list[list], config: list[str], state: dict) -> None:
+    """Write the snapshot atomically.  *inputs* is the settled_fingerprint()
+    of the rebuild that produced *state*."""
+    path = session_path(profile_dir)
+    tmp = path.with_suffix(".tmp")
+    payload = {"v": _SESSION_VERSION, "inputs": inputs, "config": config,
+               "state": _encode(state)}
+    try:
+        with tmp.open("wb") as f:
+            msgpack.pack(payload, f, use_bin_type=True)
+        tmp.replace(path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def load_session(profile_dir: Path, inputs: list[Path], config: list[str]) -> dict | None:
+    """Return the saved state if it still matches *inputs* and *config*, else None."""
+    try:
+        with session_path(profile_dir).open("rb") as f:
+            data = msgpack.unpack(f, raw=False, strict_map_key=False)
+    except Exception:
+        return None
+    if not isinstance(data, dict) or data.get("v") != _SESSION_VERSION:
+        return None
+    if data.get("config") != list(config):
+        return None
+    if data.get("inputs") != fingerprint(inputs):
+        return None
+    state = data.get("state")
+    return _decode(state) if isinstance(state, dict) else None
+
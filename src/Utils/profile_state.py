@@ -23,20 +23,37 @@ exist, nothing is written (treated as a new / empty profile).
 While profile_state.json exists, read helpers still fall back to legacy files
 for any key missing from the JSON (for partially migrated folders). Saves go
 to profile_state.json only.
+
+Caching: each profile's state is parsed once and kept in memory.  Reads are
+served from that copy after a stat() confirms the file has not been changed
+by someone else (mtime_ns + size); an external edit is re-read.  The per-key
+writers only mark the key dirty and schedule a flush _FLUSH_DELAY seconds
+later, so a burst of edits (dragging separators, bulk plugin toggles) costs
+one atomic write.  Dirty keys are re-applied on top of the file if it changed
+on disk in the meantime.  flush_profile_state() forces pending writes out; it
+runs at exit and should be called before anything copies profile_state.json
+(backups, exports) or switches profile.
 """
 
 from __future__ import annotations
 
+import atexit
+import copy
 import json
+import os
 import threading
 from pathlib import Path
 
 _FILENAME = "profile_state.json"
 
+# Seconds a dirty key waits before being written, to coalesce bursts.
+_FLUSH_DELAY = 0.5
+
 # Guards read-modify-write cycles in _update_key against concurrent threads.
 # Keyed by resolved profile_dir to allow independent profiles to update in parallel.
 _profile_locks: dict[Path, threading.Lock] = {}
 _profile_locks_guard = threading.Lock()
+_resolved: dict[Path, Path] = {}
 
 # Legacy filenames used for migration fallback
 _LEGACY = {
@@ -56,6 +73,23 @@ _LEGACY = {
 _LEGACY_IGNORED_TXT = "ignored_missing_requirements.txt"
 
 
+def _resolve(profile_dir: Path) -> Path:
+    resolved = _resolved.get(profile_dir)
+    if resolved is None:
+        resolved = _resolved[profile_dir] = profile_dir.resolve()
+    return resolved
+
+
+def _lock_for(profile_dir: Path) -> threading.Lock:
+    resolved = _resolve(profile_dir)
+    with _profile_locks_guard:
+        lock = _profile_locks.get(resolved)
+        if lock is None:
+            lock = threading.Lock()
+            _profile_locks[resolved] = lock
+        return lock
+
+
 def _state_path(profile_dir: Path) -> Path:
     return profile_dir / _FILENAME
 
@@ -122,7 +156,7 @@ def _consolidate_legacy_profile_state(profile_dir: Path) -> None:
         return
 
     try:
-        write_profile_state(profile_dir, state)
+        _write_to_disk(profile_dir, state)
     except OSError:
         return
 
@@ -134,8 +168,8 @@ def _consolidate_legacy_profile_state(profile_dir: Path) -> None:
             pass
 
 
-def read_profile_state(profile_dir: Path) -> dict:
-    """Load profile_state.json. Returns {} if absent or corrupt."""
+def _load_from_disk(profile_dir: Path) -> dict:
+    """Parse profile_state.json. Returns {} if absent or corrupt."""
     path = _state_path(profile_dir)
     if not path.is_file():
         _consolidate_legacy_profile_state(profile_dir)
@@ -149,27 +183,161 @@ def read_profile_state(profile_dir: Path) -> dict:
     return {}
 
 
-def write_profile_state(profile_dir: Path, state: dict) -> None:
-    """Write profile_state.json atomically."""
+def _write_to_disk(profile_dir: Path, state: dict) -> tuple[int, int] | None:
+    """Write profile_state.json atomically; return its new stat signature."""
     profile_dir.mkdir(parents=True, exist_ok=True)
     path = _state_path(profile_dir)
     tmp = path.with_suffix(".tmp")
     tmp.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
     tmp.replace(path)
+    return _disk_sig(path)
+
+
+# ---------------------------------------------------------------------------
+# In-memory cache with write-behind
+# ---------------------------------------------------------------------------
+
+class _CachedState:
+    """One profile's parsed state plus the keys not yet written back."""
+    __slots__ = ("profile_dir", "data", "sig", "dirty", "timer")
+
+    def __init__(self, profile_dir: Path):
+        self.profile_dir = profile_dir
+        self.data: dict = {}
+        self.sig: tuple[int, int] | None = (-1, -1)  # not loaded yet
+        self.dirty: set[str] = set()
+        self.timer: threading.Timer | None = None
+
+
+_cache: dict[Path, _CachedState] = {}
+
+
+def _disk_sig(path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _cached(profile_dir: Path) -> _CachedState:
+    """Return the cache entry for *profile_dir*, re-reading the file if it
+    changed on disk.  Caller holds _lock_for(profile_dir)."""
+    key = _resolve(profile_dir)
+    entry = _cache.get(key)
+    sig = _disk_sig(_state_path(profile_dir))
+    if entry is not None and entry.sig == sig:
+        return entry
+    if entry is None:
+        entry = _cache[key] = _CachedState(profile_dir)
+    data = _load_from_disk(profile_dir)
+    for k in entry.dirty:
+        if k in entry.data:
+            data[k] = entry.data[k]
+        else:
+            data.pop(k, None)
+    entry.data = data
+    entry.sig = _disk_sig(_state_path(profile_dir))
+    return entry
+
+
+def _flush_entry(entry: _CachedState) -> None:
+    """Write *entry*'s dirty keys out.  Caller holds the profile's lock."""
+    if entry.timer is not None:
+        entry.timer.cancel()
+        entry.timer = None
+    if not entry.dirty:
+        return
+    if not entry.profile_dir.is_dir():
+        # Profile deleted or renamed since the edit — don't resurrect it.
+        entry.dirty.clear()
+        return
+    if _disk_sig(_state_path(entry.profile_dir)) != entry.sig:
+        entry = _cached(entry.profile_dir)
+    try:
+        entry.sig = _write_to_disk(entry.profile_dir, entry.data)
+    except OSError:
+        return
+    entry.dirty.clear()
+
+
+def _flush_later(profile_dir: Path) -> None:
+    with _lock_for(profile_dir):
+        entry = _cache.get(_resolve(profile_dir))
+        if entry is not None:
+            entry.timer = None
+            _flush_entry(entry)
+
+
+def _mark_dirty(entry: _CachedState, key: str) -> None:
+    entry.dirty.add(key)
+    if entry.timer is None:
+        entry.timer = threading.Timer(_FLUSH_DELAY, _flush_later, (entry.profile_dir,))
+        entry.timer.daemon = True
+        entry.timer.start()
+
+
+def flush_profile_state(profile_dir: Path | None = None) -> None:
+    """Write pending changes for *profile_dir* (or every profile) now."""
+    if profile_dir is not None:
+        entries = [_cache.get(_resolve(profile_dir))]
+    else:
+        entries = list(_cache.values())
+    for entry in entries:
+        if entry is None:
+            continue
+        with _lock_for(entry.profile_dir):
+            _flush_entry(entry)
+
+
+atexit.register(flush_profile_state)
+
+
+def read_profile_state(profile_dir: Path) -> dict:
+    """Return profile_state.json as a dict (a copy the caller may modify).
+    Returns {} if absent or corrupt."""
+    with _lock_for(profile_dir):
+        return copy.deepcopy(_cached(profile_dir).data)
+
+
+def write_profile_state(profile_dir: Path, state: dict) -> None:
+    """Replace the whole state and write profile_state.json atomically."""
+    with _lock_for(profile_dir):
+        entry = _cache.get(_resolve(profile_dir))
+        if entry is None:
+            entry = _cache[_resolve(profile_dir)] = _CachedState(profile_dir)
+        if entry.timer is not None:
+            entry.timer.cancel()
+            entry.timer = None
+        entry.dirty.clear()
+        entry.data = copy.deepcopy(state)
+        entry.sig = _write_to_disk(profile_dir, entry.data)
+
+
+_MISSING = object()
+
+
+def _cached_value(profile_dir: Path, key: str):
+    """Return a copy of the cached *key*, or _MISSING."""
+    with _lock_for(profile_dir):
+        data = _cached(profile_dir).data
+        if key not in data:
+            return _MISSING
+        return copy.deepcopy(data[key])
 
 
 def _read_key(profile_dir: Path, state: dict | None, key: str):
-    """Return state[key] if present in *state* snapshot, else current disk, else legacy file.
+    """Return state[key] if present in *state* snapshot, else the current state, else legacy file.
 
     If *state* is a stale in-memory snapshot (e.g. loaded at profile open) and a key was
-    written later only to profile_state.json, we must read from disk — otherwise callers
-    see {} and the next write drops other mods' data (e.g. disabled_plugins).
+    written later only to profile_state.json, we must read the current state — otherwise
+    callers see {} and the next write drops other mods' data (e.g. disabled_plugins).
     """
     if state is not None and key in state:
         return state[key]
-    disk = read_profile_state(profile_dir)
-    if key in disk:
-        return disk[key]
+    value = _cached_value(profile_dir, key)
+    if value is not _MISSING:
+        return value
     # Migration fallback: read old separate file
     legacy_name = _LEGACY.get(key)
     if legacy_name:
@@ -325,9 +493,8 @@ def read_ignored_missing_requirements(profile_dir: Path, state: dict | None = No
         if isinstance(raw, list):
             return {s for s in raw if isinstance(s, str)}
         return set()
-    disk = read_profile_state(profile_dir)
-    if "ignored_missing_requirements" in disk:
-        raw = disk["ignored_missing_requirements"]
+    raw = _cached_value(profile_dir, "ignored_missing_requirements")
+    if raw is not _MISSING:
         if isinstance(raw, list):
             return {s for s in raw if isinstance(s, str)}
         return set()
@@ -345,24 +512,23 @@ def read_ignored_missing_requirements(profile_dir: Path, state: dict | None = No
 
 
 # ---------------------------------------------------------------------------
-# Per-key writers — load current state, update one key, write back
+# Per-key writers — update one key in the cached state, write back later
 # ---------------------------------------------------------------------------
 
-def _lock_for(profile_dir: Path) -> threading.Lock:
-    resolved = profile_dir.resolve()
-    with _profile_locks_guard:
-        lock = _profile_locks.get(resolved)
-        if lock is None:
-            lock = threading.Lock()
-            _profile_locks[resolved] = lock
-        return lock
+def _update_key(profile_dir: Path, key: str, value) -> None:
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    with _lock_for(profile_dir):
+        entry = _cached(profile_dir)
+        entry.data[key] = copy.deepcopy(value)
+        _mark_dirty(entry, key)
 
 
-def _update_key(profile_dir: Path, key: str, value) -> None:
+def _remove_key(profile_dir: Path, key: str) -> None:
     with _lock_for(profile_dir):
-        state = read_profile_state(profile_dir)
-        state[key] = value
-        write_profile_state(profile_dir, state)
+        entry = _cached(profile_dir)
+        if key in entry.data:
+            del entry.data[key]
+            _mark_dirty(entry, key)
 
 
 def write_collapsed_seps(profile_dir: Path, value: set[str]) -> None:
@@ -399,9 +565,7 @@ def write_disabled_plugins(profile_dir: Path, value: dict[str, list[str]]) -> No
     if normalized:
         _update_key(profile_dir, "disabled_plugins", normalized)
     else:
-        state = read_profile_state(profile_dir)
-        state.pop("disabled_plugins", None)
-        write_profile_state(profile_dir, state)
+        _remove_key(profile_dir, "disabled_plugins")
 
 
 def write_excluded_mod_files(profile_dir: Path, value: dict[str, list[str]]) -> None:
@@ -410,9 +574,7 @@ def write_excluded_mod_files(profile_dir: Path, value: dict[str, list[str]]) ->
     if normalized:
         _update_key(profile_dir, "excluded_mod_files", normalized)
     else:
-        state = read_profile_state(profile_dir)
-        state.pop("excluded_mod_files", None)
-        write_profile_state(profile_dir, state)
+        _remove_key(profile_dir, "excluded_mod_files")
 
 
 def write_mod_notes(profile_dir: Path, value: dict[str, str]) -> None:
@@ -422,9 +584,7 @@ def write_mod_notes(profile_dir: Path, value: dict[str, str]) -> None:
     if cleaned:
         _update_key(profile_dir, "mod_notes", cleaned)
     else:
-        state = read_profile_state(profile_dir)
-        state.pop("mod_notes", None)
-        write_profile_state(profile_dir, state)
+        _remove_key(profile_dir, "mod_notes")
 
 
 def write_profile_settings(profile_dir: Path, value: dict) -> None:
@@ -432,9 +592,7 @@ def write_profile_settings(profile_dir: Path, value: dict) -> None:
     if value:
         _update_key(profile_dir, "profile_settings", dict(value))
     else:
-        state = read_profile_state(profile_dir)
-        state.pop("profile_settings", None)
-        write_profile_state(profile_dir, state)
+        _remove_key(profile_dir, "profile_settings")
 
 
 def merge_profile_settings(profile_dir: Path, updates: dict) -> None:
@@ -452,9 +610,7 @@ def write_ignored_missing_requirements(profile_dir: Path, value: set[str]) -> No
     if value:
         _update_key(profile_dir, "ignored_missing_requirements", sorted(value))
     else:
-        state = read_profile_state(profile_dir)
-        state.pop("ignored_missing_requirements", None)
-        write_profile_state(profile_dir, state)
+        _remove_key(profile_dir, "ignored_missing_requirements")
 
 
 def read_collection_optional_skipped(profile_dir: Path) -> set[int]:
@@ -471,9 +627,7 @@ def write_collection_optional_skipped(profile_dir: Path, skipped_fids: set[int])
     if skipped_fids:
         _update_key(profile_dir, "collection_optional_skipped_fids", sorted(skipped_fids))
     else:
-        state = read_profile_state(profile_dir)
-        state.pop("collection_optional_skipped_fids", None)
-        write_profile_state(profile_dir, state)
+        _remove_key(profile_dir, "collection_optional_skipped_fids")
 
 
 def read_collection_revision(profile_dir: Path) -> int | None:
@@ -493,9 +647,7 @@ def read_collection_revision(profile_dir: Path) -> int | None:
 def write_collection_revision(profile_dir: Path, revision_number: int | None) -> None:
     """Persist the installed collection revisionNumber. Pass None to clear it."""
     if revision_number is None:
-        state = read_profile_state(profile_dir)
-        state.pop("collection_revision_number", None)
-        write_profile_state(profile_dir, state)
+        _remove_key(profile_dir, "collection_revision_number")
     else:
         _update_key(profile_dir, "collection_revision_number", int(revision_number))
 
@@ -511,7 +663,4 @@ def write_collection_install_paused(profile_dir: Path, paused: bool) -> None:
     if paused:
         _update_key(profile_dir, "collection_install_paused", True)
     else:
-        state = read_profile_state(profile_dir)
-        if "collection_install_paused" in state:
-            state.pop("collection_install_paused", None)
-            write_profile_state(profile_dir, state)
+        _remove_key(profile_dir, "collection_install_paused")
@@ -0,0 +1,156 @@
+"""
+py7zr_pool.py
+Run py7zr extractions in a small pool of worker processes.
+
+py7zr drives liblzma, which is not safe to use from several threads at once
+(concurrent extractions can segfault), so the installer used to serialise
+every py7zr call behind one process-wide lock.  When the native 7z/bsdtar
+tools are missing or fail — common in the AppImage — collection installs then
+collapsed to one extraction at a time.
+
+Each extraction here runs in a separate process instead:
+
+- **Parallel** — up to ``_POOL_WORKERS`` archives decompress at once.
+- **Crash isolation** — a segfault inside liblzma kills only that worker;
+  the caller gets a RuntimeError and the next job starts a fresh worker.
+- **Memory limit** — every job applies ``RLIMIT_AS`` in its worker (see
+  ``ExtractionMemoryBudget.process_memory_limit``), so a runaway archive
+  raises MemoryError in the worker instead of pushing the GUI into OOM.
+
+Workers are plain ``python -m Utils.py7zr_worker`` processes talking pickle
+over pipes.  They are not multiprocessing children: spawn and forkserver
+both re-import the parent's main script in every child, which for gui.py
+means the whole GUI.  A worker imports py7zr and nothing else, is reused for
+``_TASKS_PER_WORKER`` jobs and then replaced.
+
+Listing a .7z (archive_listing's fallback when no 7z binary is found) goes
+through the same workers, since even a read-only py7zr call touches liblzma.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+from Utils.app_log import app_log
+
+_POOL_WORKERS = max(1, min(4, os.cpu_count() or 1))
+# Recycle workers now and then so fragmented heaps are handed back to the OS.
+_TASKS_PER_WORKER = 16
+
+# Folder holding the Utils package, put on the worker's sys.path.
+_SRC_DIR = str(Path(__file__).resolve().parent.parent)
+
+
+class _Worker:
+    """One worker process and its request/reply pipes."""
+
+    def __init__(self):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (_SRC_DIR, env.get("PYTHONPATH", "")) if p)
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "Utils.py7zr_worker"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            cwd=_SRC_DIR, env=env,
+        )
+        self.tasks = 0
+
+    def call(self, job: str, args: tuple) -> tuple[str, object]:
+        """Run *job* in the worker and return its ("ok" | "error", value)
+        reply.  Raises EOFError / OSError / UnpicklingError if the worker
+        died."""
+        pickle.dump((job, args), self.proc.stdin)
+        self.proc.stdin.flush()
+        reply = pickle.load(self.proc.stdout)
+        self.tasks += 1
+        return reply
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+        try:
+            self.proc.stdout.close()
+        except OSError:
+            pass
+
+    def kill(self) -> None:
+        try:
+            self.proc.kill()
+        except OSError:
+            pass
+        self.close()
+
+
+_slots = threading.BoundedSemaphore(_POOL_WORKERS)
+_idle: list[_Worker] = []
+_idle_lock = threading.Lock()
+
+
+def _run(job: str, *args):
+    with _slots:
+        with _idle_lock:
+            worker = _idle.pop() if _idle else None
+        if worker is None:
+            worker = _Worker()
+        try:
+            status, value = worker.call(job, args)
+        except (EOFError, OSError, pickle.UnpicklingError):
+            # The worker died mid-job (segfault / OOM kill).
+            worker.kill()
+            app_log(f"py7zr worker crashed while processing '{os.path.basename(args[0])}'")
+            raise RuntimeError("py7zr worker process crashed")
+        except BaseException:
+            # Interrupted mid-request: the pipes are out of step, drop it.
+            worker.kill()
+            raise
+        _release(worker)
+    if status == "error":
+        raise value
+    return value
+
+
+def _release(worker: _Worker) -> None:
+    if worker.tasks >= _TASKS_PER_WORKER or worker.proc.poll() is not None:
+        worker.close()
+        return
+    with _idle_lock:
+        _idle.append(worker)
+
+
+def extract(archive_path: str, dest_dir: str,
+            targets: Optional[list[str]] = None, memory_limit: int = 0) -> None:
+    """Extract *archive_path* (or just *targets*) into *dest_dir* in a worker.
+
+    Raises whatever py7zr raised in the worker, MemoryError if the job hit
+    *memory_limit* bytes of address space, or RuntimeError if the worker
+    crashed.
+    """
+    _run("extract", os.fspath(archive_path), os.fspath(dest_dir),
+         list(targets) if targets else None, int(memory_limit))
+
+
+def list_members(archive_path: str) -> list[tuple[str, int, bool, Optional[int]]]:
+    """Return ``(filename, size, is_dir, crc32)`` for every member of
+    *archive_path*, read in a worker.  Raises like :func:`extract`."""
+    return _run("list", os.fspath(archive_path))
+
+
+def shutdown() -> None:
+    """Stop the idle worker processes (called on application exit)."""
+    with _idle_lock:
+        workers = list(_idle)
+        _idle.clear()
+    for worker in workers:
+        worker.close()
@@ -0,0 +1,94 @@
+"""
+py7zr_worker.py
+Entry point of one py7zr worker process (see py7zr_pool).
+
+Started as ``python -m Utils.py7zr_worker`` so a worker imports this module
+and py7zr only.  multiprocessing's spawn would instead re-run the parent's
+entry script (gui.py: xrdb, customtkinter, every panel) in each worker.
+
+Protocol: the parent writes pickled ``(job_name, args)`` requests to stdin;
+each gets one pickled reply on stdout, ``("ok", result)`` or
+``("error", exception)``.  The worker exits when stdin closes.  Anything
+py7zr prints goes to stderr so it cannot corrupt the reply stream.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import sys
+from typing import Optional
+
+
+def _apply_memory_limit(limit: int):
+    """Lower the soft RLIMIT_AS to *limit*; return the previous limits."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    old = resource.getrlimit(resource.RLIMIT_AS)
+    if limit > 0:
+        hard = old[1]
+        soft = limit if hard == resource.RLIM_INFINITY else min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+    return old
+
+
+def _restore_memory_limit(old) -> None:
+    if old is None:
+        return
+    import resource
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, old)
+    except (ValueError, OSError):
+        pass
+
+
+def extract_job(archive_path: str, dest_dir: str,
+                targets: Optional[list[str]], memory_limit: int) -> None:
+    old = _apply_memory_limit(memory_limit)
+    try:
+        import py7zr
+        with py7zr.SevenZipFile(archive_path, "r") as z:
+            if targets:
+                z.extract(path=dest_dir, targets=targets)
+            else:
+                z.extractall(dest_dir)
+    finally:
+        _restore_memory_limit(old)
+
+
+def list_job(archive_path: str) -> list[tuple]:
+    import py7zr
+    with py7zr.SevenZipFile(archive_path, "r") as z:
+        return [(i.filename, i.uncompressed or 0, bool(i.is_directory), i.crc32)
+                for i in z.list()]
+
+
+_JOBS = {"extract": extract_job, "list": list_job}
+
+
+def main() -> int:
+    # Keep the real stdout for replies; point fd 1 at stderr for everything else.
+    replies = os.fdopen(os.dup(1), "wb")
+    os.dup2(2, 1)
+    requests = sys.stdin.buffer
+    while True:
+        try:
+            job, args = pickle.load(requests)
+        except EOFError:
+            return 0
+        try:
+            reply = ("ok", _JOBS[job](*args))
+        except BaseException as exc:  # noqa: BLE001 — handed back to the caller
+            reply = ("error", exc)
+        try:
+            data = pickle.dumps(reply)
+        except Exception:
+            data = pickle.dumps(("error", RuntimeError(repr(reply[1]))))
+        replies.write(data)
+        replies.flush()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
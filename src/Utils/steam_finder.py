@@ -10,6 +10,8 @@ import os
 import re
 from pathlib import Path
 
+from Utils.library_index import cached_parse
+
 # ---------------------------------------------------------------------------
 # Known Steam base directories for different install methods
 # ---------------------------------------------------------------------------
@@ -25,6 +27,12 @@ _STEAM_CANDIDATES: list[Path] = [
 _VDF_FILENAME = "libraryfolders.vdf"
 _COMMON_SUBDIR = Path("steamapps") / "common"
 
+_VDF_PATH_RE = re.compile(r'"path"\s+"([^"]+)"')
+_ACF_INSTALLDIR_RE = re.compile(r'"installdir"\s+"([^"]+)"')
+_ACF_NAME_RE = re.compile(r"appmanifest_(\d+)\.acf")
+# One CompatToolMapping entry: "<app id>" { ... "name" "<tool>" ... }
+_COMPAT_ENTRY_RE = re.compile(r'"(\d+)"\s*\{[^}]*?"name"\s*"([^"]+)"', re.DOTALL)
+
 
 def _normalize_tool_name(name: str) -> str:
     return "".join(ch for ch in name.lower() if ch.isalnum())
@@ -244,6 +252,15 @@ def _warn_vdf_library(raw: str, common: Path) -> None:
             )
 
 
+def _parse_vdf_paths(vdf_path: Path) -> list[str]:
+    """Every "path" value in a libraryfolders.vdf, or [] if it can't be read."""
+    try:
+        text = vdf_path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return []
+    return _VDF_PATH_RE.findall(text)
+
+
 def parse_vdf_libraries(vdf_path: Path) -> list[Path]:
     """
     Parse a libraryfolders.vdf file and return all steamapps/common paths
@@ -258,17 +275,12 @@ def parse_vdf_libraries(vdf_path: Path) -> list[Path]:
     disconnected USB, NAS offline) or mounted read-only are logged via
     app_log the first time we see them, so users get a clue when a game
     that used to work suddenly "vanishes" from the library list.
+
+    The parse is cached (library_index) until the VDF changes; whether each
+    library is reachable is checked on every call.
     """
     libraries: list[Path] = []
-    pattern = re.compile(r'"path"\s+"([^"]+)"')
-
-    try:
-        text = vdf_path.read_text(encoding="utf-8", errors="replace")
-    except OSError:
-        return libraries
-
-    for match in pattern.finditer(text):
-        raw = match.group(1)
+    for raw in cached_parse("vdf_libraries", vdf_path, _parse_vdf_paths):
         common = Path(raw) / "steamapps" / "common"
         _warn_vdf_library(raw, common)
         if common.is_dir():
@@ -329,6 +341,23 @@ def find_prefix(steam_id: str) -> Path | None:
     return None
 
 
+def _parse_compat_tool_mapping(vdf_path: Path) -> dict[str, str]:
+    """App id -> compat tool name from a config.vdf's CompatToolMapping.
+    Only text from the CompatToolMapping key onwards is searched; the first
+    entry for an id wins."""
+    try:
+        text = vdf_path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return {}
+    compat_idx = text.find("CompatToolMapping")
+    if compat_idx < 0:
+        return {}
+    mapping: dict[str, str] = {}
+    for m in _COMPAT_ENTRY_RE.finditer(text, compat_idx):
+        mapping.setdefault(m.group(1), m.group(2))
+    return mapping
+
+
 def find_proton_for_game(steam_id: str) -> Path | None:
     """
     Find the Proton launcher script assigned to a Steam game.
@@ -338,6 +367,7 @@ def find_proton_for_game(steam_id: str) -> Path | None:
 
     Steam rewrites config.vdf atomically, so the live file may temporarily lack
     CompatToolMapping — we also check .bak and .tmp variants of the file.
+    Each file's mapping is parsed once for all app ids (library_index).
 
     Returns the path to the 'proton' script, or None if the game's assigned
     Proton cannot be found (never falls back to an arbitrary version).
@@ -347,7 +377,6 @@ def find_proton_for_game(steam_id: str) -> Path | None:
         STEAM_COMPAT_CLIENT_INSTALL_PATH=<steam_root>
         python3 <proton_script> run <exe_path>
     """
-    import re as _re
     import glob as _glob
 
     _COMPAT_TOOL_NAMES: dict[str, str] = {
@@ -359,11 +388,6 @@ def find_proton_for_game(steam_id: str) -> Path | None:
         "proton_7":            "Proton 7.0",
     }
 
-    _ID_PATTERN = _re.compile(
-        r'"' + _re.escape(steam_id) + r'"\s*\{[^}]*?"name"\s*"([^"]+)"',
-        _re.DOTALL,
-    )
-
     if not steam_id:
         return None
 
@@ -382,17 +406,9 @@ def find_proton_for_game(steam_id: str) -> Path | None:
 
         tool_name: str | None = None
         for vdf_path in candidates_vdf:
-            try:
-                text = vdf_path.read_text(encoding="utf-8", errors="replace")
-            except OSError:
-                continue
-            # Only search inside the CompatToolMapping block
-            compat_idx = text.find("CompatToolMapping")
-            if compat_idx < 0:
-                continue
-            m = _ID_PATTERN.search(text, compat_idx)
-            if m:
-                tool_name = m.group(1)
+            mapping = cached_parse("compat_tools", vdf_path, _parse_compat_tool_mapping)
+            if steam_id in mapping:
+                tool_name = mapping[steam_id]
                 break
 
         if tool_name is None:
@@ -464,15 +480,40 @@ def find_proton_for_game(steam_id: str) -> Path | None:
 
 def _parse_acf_installdir(acf_path: Path) -> str | None:
     """Parse installdir from a Steam appmanifest_*.acf file. Returns None if not found."""
-    installdir_pattern = re.compile(r'"installdir"\s+"([^"]+)"')
     try:
         text = acf_path.read_text(encoding="utf-8", errors="replace")
-        m = installdir_pattern.search(text)
+        m = _ACF_INSTALLDIR_RE.search(text)
         return m.group(1) if m else None
     except OSError:
         return None
 
 
+def _parse_steamapps_manifests(steamapps: Path) -> dict[str, str]:
+    """App id -> installdir for every appmanifest_*.acf in a steamapps folder."""
+    apps: dict[str, str] = {}
+    try:
+        names = os.listdir(steamapps)
+    except OSError:
+        return apps
+    for name in names:
+        m = _ACF_NAME_RE.fullmatch(name)
+        if not m:
+            continue
+        installdir = _parse_acf_installdir(steamapps / name)
+        if installdir:
+            apps[m.group(1)] = installdir
+    return apps
+
+
+def steamapps_manifests(steamapps: Path) -> dict[str, str]:
+    """Installed apps of one library (app id -> installdir under common/).
+
+    All manifests are parsed in one pass and cached until the folder's
+    mtime changes, i.e. until a manifest is added, removed or replaced.
+    """
+    return cached_parse("steamapps", steamapps, _parse_steamapps_manifests)
+
+
 def find_game_by_steam_id(
     libraries: list[Path], steam_id: str, exe_name: str
 ) -> Path | None:
@@ -494,10 +535,7 @@ def find_game_by_steam_id(
 
     for common in libraries:
         steamapps = common.parent  # steamapps/common -> steamapps
-        acf = steamapps / f"appmanifest_{steam_id}.acf"
-        if not acf.is_file():
-            continue
-        installdir = _parse_acf_installdir(acf)
+        installdir = steamapps_manifests(steamapps).get(steam_id)
         if not installdir:
             continue
         game_dir = common / installdir
@@ -3,12 +3,22 @@ UI scaling configuration stored in ~/.config/AmethystModManager/amethyst.ini.
 
 Users can set ui_scale (e.g. 1.0, 1.25, 1.5, 2.0) for HiDPI displays.
 Set scale=auto to use automatic scaling based on screen size.
+
+The file is parsed once per process (see _IniStore): load_* helpers read the
+cached parser after a stat() confirms the file is unchanged, and save_*
+helpers edit it in memory and schedule one write shortly afterwards, so a
+Settings "Save" that stores a dozen values rewrites the INI once.  Call
+flush_ui_config() before anything that must see the file on disk (restart,
+another process reading it); it also runs at exit.
 """
 
+import atexit
 import configparser
+import contextlib
 import os
 import re as _re
 import subprocess
+import threading
 from pathlib import Path
 
 from Utils.config_paths import get_config_dir
@@ -32,6 +42,139 @@ def get_ui_config_path() -> Path:
     return get_config_dir() / "amethyst.ini"
 
 
+# Seconds an edit waits before being written, to coalesce bursts of saves.
+_FLUSH_DELAY = 0.5
+
+
+def _file_sig(path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _sections(parser: configparser.ConfigParser) -> dict[str, dict[str, str]]:
+    return {name: dict(parser.items(name, raw=True)) for name in parser.sections()}
+
+
+class _IniStore:
+    """amethyst.ini, parsed once and re-read when its mtime or size changes.
+
+    Edits are recorded per option so they can be re-applied if another
+    process rewrites the file before the pending write goes out.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._parser: configparser.ConfigParser | None = None
+        self._path: Path | None = None
+        self._path_env: tuple | None = None
+        self._sig: tuple[int, int] | None = None
+        # (section, option) -> value, or None to delete; option None = whole section
+        self._pending: dict[tuple[str, str | None], str | None] = {}
+        self._timer: threading.Timer | None = None
+
+    def _reload(self, path: Path) -> None:
+        parser = configparser.ConfigParser()
+        self._sig = _file_sig(path)
+        if self._sig is not None:
+            try:
+                parser.read(path)
+            except configparser.Error:
+                parser = configparser.ConfigParser()
+        for (section, option), value in self._pending.items():
+            if option is None:
+                parser.remove_section(section)
+            elif value is None:
+                if parser.has_section(section):
+                    parser.remove_option(section, option)
+            else:
+                if not parser.has_section(section):
+                    parser.add_section(section)
+                parser.set(section, option, value)
+        self._parser = parser
+        self._path = path
+
+    def parser(self) -> configparser.ConfigParser:
+        """Return the cached parser.  Treat it as read-only; use edit()."""
+        with self._lock:
+            # get_ui_config_path() mkdirs; only redo it if the env it reads changed.
+            env = (os.environ.get("XDG_CONFIG_HOME"), os.environ.get("HOME"))
+            if env == self._path_env and self._path is not None:
+                path = self._path
+            else:
+                path = get_ui_config_path()
+                self._path_env = env
+            if self._parser is None or path != self._path or _file_sig(path) != self._sig:
+                if self._path is not None and path != self._path:
+                    self.flush()
+                self._reload(path)
+            return self._parser
+
+    @contextlib.contextmanager
+    def edit(self):
+        """Yield the parser for modification; the changes are saved shortly."""
+        with self._lock:
+            parser = self.parser()
+            before = _sections(parser)
+            try:
+                yield parser
+            except BaseException:
+                self._parser = None     # discard the half-applied edit
+                raise
+            after = _sections(parser)
+            for section in before.keys() - after.keys():
+                self._pending[(section, None)] = None
+            for section, options in after.items():
+                old = before.get(section)
+                if old is None:
+                    self._pending.pop((section, None), None)
+                    old = {}
+                for option, value in options.items():
+                    if old.get(option) != value:
+                        self._pending[(section, option)] = value
+                for option in old.keys() - options.keys():
+                    self._pending[(section, option)] = None
+            if self._pending and self._timer is None:
+                self._timer = threading.Timer(_FLUSH_DELAY, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Write pending edits to disk now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending or self._path is None:
+                return
+            path = self._path
+            if _file_sig(path) != self._sig:
+                self._reload(path)
+            tmp = path.with_suffix(".tmp")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with tmp.open("w") as f:
+                    self._parser.write(f)
+                tmp.replace(path)
+            except OSError:
+                return
+            self._sig = _file_sig(path)
+            self._pending.clear()
+
+
+_ini = _IniStore()
+
+
+def flush_ui_config() -> None:
+    """Write any pending amethyst.ini changes to disk."""
+    _ini.flush()
+
+
+atexit.register(flush_ui_config)
+
+
 def _get_portal_scale() -> float:
     """Read the DE scale via the XDG Settings portal.
 
@@ -285,12 +428,12 @@ def load_ui_scale() -> float:
     path = get_ui_config_path()
     if not path.is_file():
         _ui_scale = detect_hidpi_scale()
-        _write_ini(path, _INI_AUTO)
-        _seed_first_run_defaults(path)
+        _write_ini(_INI_AUTO)
+        _seed_first_run_defaults()
+        _ini.flush()
         return _ui_scale
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         if parser.has_section(_INI_SECTION) and parser.has_option(_INI_SECTION, _INI_OPTION):
             raw = parser.get(_INI_SECTION, _INI_OPTION).strip().lower()
             if raw == _INI_AUTO:
@@ -304,39 +447,38 @@ def load_ui_scale() -> float:
     return _ui_scale
 
 
-def _write_ini(path: Path, scale_str: str) -> None:
+def _write_ini(scale_str: str) -> None:
     """Write the [ui] scale to amethyst.ini."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _INI_SECTION not in parser:
-        parser[_INI_SECTION] = {}
-    parser[_INI_SECTION][_INI_OPTION] = scale_str
-    with path.open("w") as f:
-        parser.write(f)
-
-
-def _seed_first_run_defaults(path: Path) -> None:
+    with _ini.edit() as parser:
+        if _INI_SECTION not in parser:
+            parser[_INI_SECTION] = {}
+        parser[_INI_SECTION][_INI_OPTION] = scale_str
+
+
+def load_ui_scale_setting() -> str:
+    """Return the raw [ui] scale value ("auto" or a number as saved)."""
+    try:
+        return _ini.parser().get(_INI_SECTION, _INI_OPTION, fallback=_INI_AUTO).strip().lower()
+    except Exception:
+        return _INI_AUTO
+
+
+def _seed_first_run_defaults() -> None:
     """Write first-run-only defaults for collections and hidden columns.
 
     Called exactly once, when the INI file is first created. Existing installs
     never run this code path so their behaviour is unchanged.
     """
     try:
-        parser = configparser.ConfigParser()
-        if path.is_file():
-            parser.read(path)
-        if _COLLECTIONS_SECTION not in parser:
-            parser[_COLLECTIONS_SECTION] = {}
-        parser[_COLLECTIONS_SECTION]["download_order"] = _FIRST_RUN_DOWNLOAD_ORDER
-        parser[_COLLECTIONS_SECTION]["max_concurrent"] = str(_FIRST_RUN_MAX_CONCURRENT)
-        parser[_COLLECTIONS_SECTION]["max_extract_workers"] = str(_FIRST_RUN_MAX_EXTRACT_WORKERS)
-        if _COLUMNS_SECTION not in parser:
-            parser[_COLUMNS_SECTION] = {}
-        parser[_COLUMNS_SECTION]["hidden"] = ",".join(str(x) for x in _FIRST_RUN_HIDDEN_COLUMNS)
-        with path.open("w") as f:
-            parser.write(f)
+        with _ini.edit() as parser:
+            if _COLLECTIONS_SECTION not in parser:
+                parser[_COLLECTIONS_SECTION] = {}
+            parser[_COLLECTIONS_SECTION]["download_order"] = _FIRST_RUN_DOWNLOAD_ORDER
+            parser[_COLLECTIONS_SECTION]["max_concurrent"] = str(_FIRST_RUN_MAX_CONCURRENT)
+            parser[_COLLECTIONS_SECTION]["max_extract_workers"] = str(_FIRST_RUN_MAX_EXTRACT_WORKERS)
+            if _COLUMNS_SECTION not in parser:
+                parser[_COLUMNS_SECTION] = {}
+            parser[_COLUMNS_SECTION]["hidden"] = ",".join(str(x) for x in _FIRST_RUN_HIDDEN_COLUMNS)
     except Exception:
         pass
 
@@ -350,7 +492,7 @@ def save_ui_scale(scale: float | str) -> None:
     else:
         _ui_scale = _clamp(float(scale))
         scale_str = str(_ui_scale)
-    _write_ini(get_ui_config_path(), scale_str)
+    _write_ini(scale_str)
 
 
 def get_ui_scale() -> float:
@@ -361,12 +503,8 @@ def get_ui_scale() -> float:
 def load_font_family() -> str:
     """Load font_family from INI. Returns the value, or the default if unset."""
     global _font_family
-    path = get_ui_config_path()
-    if not path.is_file():
-        return _font_family
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         value = parser.get(_INI_SECTION, _INI_FONT_OPTION, fallback="").strip()
         _font_family = value if value else _DEFAULT_FONT_FAMILY
     except Exception:
@@ -378,16 +516,10 @@ def save_font_family(family: str) -> None:
     """Persist font_family to amethyst.ini [ui] section."""
     global _font_family
     _font_family = family.strip() or _DEFAULT_FONT_FAMILY
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _INI_SECTION not in parser:
-        parser[_INI_SECTION] = {}
-    parser[_INI_SECTION][_INI_FONT_OPTION] = _font_family
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _INI_SECTION not in parser:
+            parser[_INI_SECTION] = {}
+        parser[_INI_SECTION][_INI_FONT_OPTION] = _font_family
 
 
 def get_font_family() -> str:
@@ -419,7 +551,6 @@ _FIRST_RUN_HIDDEN_COLUMNS = [2, 5]  # category, installed
 
 def load_collection_settings() -> dict:
     """Return collection settings dict with keys: download_order, max_concurrent, max_extract_workers, check_download_locations, clear_archive_after_install."""
-    path = get_ui_config_path()
     defaults = {
         "download_order": _DEFAULT_DOWNLOAD_ORDER,
         "max_concurrent": _DEFAULT_MAX_CONCURRENT,
@@ -427,11 +558,8 @@ def load_collection_settings() -> dict:
         "check_download_locations": True,
         "clear_archive_after_install": False,
     }
-    if not path.is_file():
-        return defaults
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         if not parser.has_section(_COLLECTIONS_SECTION):
             return defaults
         s = parser[_COLLECTIONS_SECTION]
@@ -460,20 +588,53 @@ def save_collection_settings(download_order: str, max_concurrent: int,
                               clear_archive_after_install: bool = False,
                               max_extract_workers: int = _DEFAULT_MAX_EXTRACT_WORKERS) -> None:
     """Persist collection settings to amethyst.ini."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _COLLECTIONS_SECTION not in parser:
-        parser[_COLLECTIONS_SECTION] = {}
-    parser[_COLLECTIONS_SECTION]["download_order"] = download_order
-    parser[_COLLECTIONS_SECTION]["max_concurrent"] = str(max(1, min(8, max_concurrent)))
-    parser[_COLLECTIONS_SECTION]["max_extract_workers"] = str(max(1, min(8, max_extract_workers)))
-    parser[_COLLECTIONS_SECTION]["check_download_locations"] = "true" if check_download_locations else "false"
-    parser[_COLLECTIONS_SECTION]["clear_archive_after_install"] = "true" if clear_archive_after_install else "false"
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _COLLECTIONS_SECTION not in parser:
+            parser[_COLLECTIONS_SECTION] = {}
+        parser[_COLLECTIONS_SECTION]["download_order"] = download_order
+        parser[_COLLECTIONS_SECTION]["max_concurrent"] = str(max(1, min(8, max_concurrent)))
+        parser[_COLLECTIONS_SECTION]["max_extract_workers"] = str(max(1, min(8, max_extract_workers)))
+        parser[_COLLECTIONS_SECTION]["check_download_locations"] = "true" if check_download_locations else "false"
+        parser[_COLLECTIONS_SECTION]["clear_archive_after_install"] = "true" if clear_archive_after_install else "false"
+
+
+# ---------------------------------------------------------------------------
+# Download scheduler settings (shared by every Nexus download)
+# ---------------------------------------------------------------------------
+_DOWNLOADS_SECTION = "downloads"
+
+_DEFAULT_MAX_CONNECTIONS = 8
+_DEFAULT_MAX_BANDWIDTH_KBPS = 0   # 0 = unlimited
+
+
+def load_download_scheduler_settings() -> dict:
+    """Return download scheduler settings dict with keys: max_connections, max_bandwidth_kbps."""
+    defaults = {
+        "max_connections": _DEFAULT_MAX_CONNECTIONS,
+        "max_bandwidth_kbps": _DEFAULT_MAX_BANDWIDTH_KBPS,
+    }
+    try:
+        parser = _ini.parser()
+        if not parser.has_section(_DOWNLOADS_SECTION):
+            return defaults
+        s = parser[_DOWNLOADS_SECTION]
+        max_connections = int(s.get("max_connections", str(_DEFAULT_MAX_CONNECTIONS)))
+        max_bandwidth_kbps = int(s.get("max_bandwidth_kbps", str(_DEFAULT_MAX_BANDWIDTH_KBPS)))
+        return {
+            "max_connections": max(1, min(16, max_connections)),
+            "max_bandwidth_kbps": max(0, max_bandwidth_kbps),
+        }
+    except Exception:
+        return defaults
+
+
+def save_download_scheduler_settings(max_connections: int, max_bandwidth_kbps: int) -> None:
+    """Persist download scheduler settings to amethyst.ini."""
+    with _ini.edit() as parser:
+        if _DOWNLOADS_SECTION not in parser:
+            parser[_DOWNLOADS_SECTION] = {}
+        parser[_DOWNLOADS_SECTION]["max_connections"] = str(max(1, min(16, max_connections)))
+        parser[_DOWNLOADS_SECTION]["max_bandwidth_kbps"] = str(max(0, max_bandwidth_kbps))
 
 
 # ---------------------------------------------------------------------------
@@ -484,12 +645,8 @@ _NEXUS_SECTION = "nexus"
 
 def load_nexus_show_adult() -> bool:
     """Return the persisted show_adult setting (default False)."""
-    path = get_ui_config_path()
-    if not path.is_file():
-        return False
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         return parser.getboolean(_NEXUS_SECTION, "show_adult", fallback=False)
     except Exception:
         return False
@@ -501,12 +658,8 @@ _WINDOW_SECTION = "window"
 
 def load_column_widths() -> dict[int, int]:
     """Load saved column width overrides from amethyst.ini. Returns {col_index: width}."""
-    path = get_ui_config_path()
-    if not path.is_file():
-        return {}
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         if _COLUMNS_SECTION not in parser:
             return {}
         result = {}
@@ -522,27 +675,21 @@ def load_column_widths() -> dict[int, int]:
 
 def save_column_widths(widths: dict[int, int]) -> None:
     """Persist column width overrides to amethyst.ini."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    # Preserve column order/hidden/sort keys across the section overwrite
-    existing_order = parser.get(_COLUMNS_SECTION, "order", fallback=None)
-    existing_hidden = parser.get(_COLUMNS_SECTION, "hidden", fallback=None)
-    existing_sort_col = parser.get(_COLUMNS_SECTION, "sort_column", fallback=None)
-    existing_sort_asc = parser.get(_COLUMNS_SECTION, "sort_ascending", fallback=None)
-    parser[_COLUMNS_SECTION] = {str(k): str(v) for k, v in widths.items()}
-    if existing_order:
-        parser[_COLUMNS_SECTION]["order"] = existing_order
-    if existing_hidden is not None:
-        parser[_COLUMNS_SECTION]["hidden"] = existing_hidden
-    if existing_sort_col is not None:
-        parser[_COLUMNS_SECTION]["sort_column"] = existing_sort_col
-    if existing_sort_asc is not None:
-        parser[_COLUMNS_SECTION]["sort_ascending"] = existing_sort_asc
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        # Preserve column order/hidden/sort keys across the section overwrite
+        existing_order = parser.get(_COLUMNS_SECTION, "order", fallback=None)
+        existing_hidden = parser.get(_COLUMNS_SECTION, "hidden", fallback=None)
+        existing_sort_col = parser.get(_COLUMNS_SECTION, "sort_column", fallback=None)
+        existing_sort_asc = parser.get(_COLUMNS_SECTION, "sort_ascending", fallback=None)
+        parser[_COLUMNS_SECTION] = {str(k): str(v) for k, v in widths.items()}
+        if existing_order:
+            parser[_COLUMNS_SECTION]["order"] = existing_order
+        if existing_hidden is not None:
+            parser[_COLUMNS_SECTION]["hidden"] = existing_hidden
+        if existing_sort_col is not None:
+            parser[_COLUMNS_SECTION]["sort_column"] = existing_sort_col
+        if existing_sort_asc is not None:
+            parser[_COLUMNS_SECTION]["sort_ascending"] = existing_sort_asc
 
 
 _DEFAULT_COL_ORDER = [2, 3, 4, 5, 6, 7]  # category, flags, conflicts, installed, priority, version
@@ -550,12 +697,8 @@ _DEFAULT_COL_ORDER = [2, 3, 4, 5, 6, 7]  # category, flags, conflicts, installed
 
 def load_column_order() -> list[int]:
     """Load saved column display order from amethyst.ini. Returns list of data col indices [2..6]."""
-    path = get_ui_config_path()
-    if not path.is_file():
-        return list(_DEFAULT_COL_ORDER)
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         raw = parser.get(_COLUMNS_SECTION, "order", fallback=None)
         if raw is None:
             return list(_DEFAULT_COL_ORDER)
@@ -578,26 +721,16 @@ def load_column_order() -> list[int]:
 
 def save_column_order(order: list[int]) -> None:
     """Persist column display order to amethyst.ini."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _COLUMNS_SECTION not in parser:
-        parser[_COLUMNS_SECTION] = {}
-    parser[_COLUMNS_SECTION]["order"] = ",".join(str(x) for x in order)
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _COLUMNS_SECTION not in parser:
+            parser[_COLUMNS_SECTION] = {}
+        parser[_COLUMNS_SECTION]["order"] = ",".join(str(x) for x in order)
 
 
 def load_column_hidden() -> set[int]:
     """Load hidden column indices from amethyst.ini. Returns set of data col indices."""
-    path = get_ui_config_path()
-    if not path.is_file():
-        return set()
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         raw = parser.get(_COLUMNS_SECTION, "hidden", fallback=None)
         if not raw:
             return set()
@@ -608,27 +741,17 @@ def load_column_hidden() -> set[int]:
 
 def save_column_hidden(hidden: set[int]) -> None:
     """Persist hidden column indices to amethyst.ini."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _COLUMNS_SECTION not in parser:
-        parser[_COLUMNS_SECTION] = {}
-    parser[_COLUMNS_SECTION]["hidden"] = ",".join(str(x) for x in sorted(hidden))
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _COLUMNS_SECTION not in parser:
+            parser[_COLUMNS_SECTION] = {}
+        parser[_COLUMNS_SECTION]["hidden"] = ",".join(str(x) for x in sorted(hidden))
 
 
 def load_sort_state() -> tuple[str | None, bool]:
     """Load saved sort column and direction from amethyst.ini.
     Returns (sort_column, ascending) where sort_column is None if no sort is active."""
-    path = get_ui_config_path()
-    if not path.is_file():
-        return None, True
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         col = parser.get(_COLUMNS_SECTION, "sort_column", fallback=None)
         if col == "none":
             col = None
@@ -640,27 +763,17 @@ def load_sort_state() -> tuple[str | None, bool]:
 
 def save_sort_state(sort_column: str | None, ascending: bool) -> None:
     """Persist sort column and direction to amethyst.ini."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _COLUMNS_SECTION not in parser:
-        parser[_COLUMNS_SECTION] = {}
-    parser[_COLUMNS_SECTION]["sort_column"] = sort_column if sort_column is not None else "none"
-    parser[_COLUMNS_SECTION]["sort_ascending"] = "true" if ascending else "false"
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _COLUMNS_SECTION not in parser:
+            parser[_COLUMNS_SECTION] = {}
+        parser[_COLUMNS_SECTION]["sort_column"] = sort_column if sort_column is not None else "none"
+        parser[_COLUMNS_SECTION]["sort_ascending"] = "true" if ascending else "false"
 
 
 def load_window_geometry() -> str | None:
     """Load saved window geometry string (WxH+X+Y) from amethyst.ini."""
-    path = get_ui_config_path()
-    if not path.is_file():
-        return None
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         return parser.get(_WINDOW_SECTION, "geometry", fallback=None)
     except Exception:
         return None
@@ -668,16 +781,10 @@ def load_window_geometry() -> str | None:
 
 def save_window_geometry(geometry: str) -> None:
     """Persist window geometry string to amethyst.ini."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _WINDOW_SECTION not in parser:
-        parser[_WINDOW_SECTION] = {}
-    parser[_WINDOW_SECTION]["geometry"] = geometry
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _WINDOW_SECTION not in parser:
+            parser[_WINDOW_SECTION] = {}
+        parser[_WINDOW_SECTION]["geometry"] = geometry
 
 
 # ---------------------------------------------------------------------------
@@ -688,12 +795,8 @@ _DEV_SECTION = "dev"
 
 def load_dev_mode() -> bool:
     """Return True if [dev] devmode = true is set in amethyst.ini."""
-    path = get_ui_config_path()
-    if not path.is_file():
-        return False
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         return parser.get(_DEV_SECTION, "devmode", fallback="false").strip().lower() == "true"
     except Exception:
         return False
@@ -705,12 +808,8 @@ def load_force_manual_install() -> bool:
     When True, collection installs use the non-premium manual-download flow
     regardless of the user's actual Nexus premium status.
     """
-    path = get_ui_config_path()
-    if not path.is_file():
-        return False
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         return parser.get(_DEV_SECTION, "force_manual_install", fallback="false").strip().lower() == "true"
     except Exception:
         return False
@@ -724,12 +823,8 @@ _FILEMAP_SECTION = "filemap"
 
 def load_normalize_folder_case() -> bool:
     """Return the global normalize_folder_case setting (default True)."""
-    path = get_ui_config_path()
-    if not path.is_file():
-        return True
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         return parser.getboolean(_FILEMAP_SECTION, "normalize_folder_case", fallback=True)
     except Exception:
         return True
@@ -737,16 +832,47 @@ def load_normalize_folder_case() -> bool:
 
 def save_normalize_folder_case(value: bool) -> None:
     """Persist the normalize_folder_case setting to amethyst.ini."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _FILEMAP_SECTION not in parser:
-        parser[_FILEMAP_SECTION] = {}
-    parser[_FILEMAP_SECTION]["normalize_folder_case"] = "true" if value else "false"
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _FILEMAP_SECTION not in parser:
+            parser[_FILEMAP_SECTION] = {}
+        parser[_FILEMAP_SECTION]["normalize_folder_case"] = "true" if value else "false"
+
+
+# ---------------------------------------------------------------------------
+# Profile backup retention
+# ---------------------------------------------------------------------------
+_BACKUPS_SECTION = "backups"
+_BACKUP_DEFAULTS = {"keep_last": 10, "keep_daily": 7, "keep_weekly": 4, "compress": True}
+
+
+def load_backup_settings() -> dict:
+    """Return profile backup settings: keep_last (newest N snapshots),
+    keep_daily / keep_weekly (newest snapshot of each of the last N days /
+    weeks that have one) and compress (zstd blobs when available)."""
+    try:
+        parser = _ini.parser()
+        out = {
+            key: max(0, parser.getint(_BACKUPS_SECTION, key, fallback=default))
+            for key, default in _BACKUP_DEFAULTS.items() if key != "compress"
+        }
+        out["keep_last"] = max(1, out["keep_last"])
+        out["compress"] = parser.getboolean(_BACKUPS_SECTION, "compress", fallback=True)
+        return out
+    except Exception:
+        return dict(_BACKUP_DEFAULTS)
+
+
+def save_backup_settings(keep_last: int, keep_daily: int, keep_weekly: int,
+                         compress: bool = True) -> None:
+    """Persist the profile backup settings to amethyst.ini."""
+    with _ini.edit() as parser:
+        if _BACKUPS_SECTION not in parser:
+            parser[_BACKUPS_SECTION] = {}
+        section = parser[_BACKUPS_SECTION]
+        section["keep_last"] = str(max(1, int(keep_last)))
+        section["keep_daily"] = str(max(0, int(keep_daily)))
+        section["keep_weekly"] = str(max(0, int(keep_weekly)))
+        section["compress"] = "true" if compress else "false"
 
 
 # ---------------------------------------------------------------------------
@@ -757,12 +883,8 @@ _UPDATES_SECTION = "updates"
 
 def load_allow_prerelease() -> bool:
     """Return the allow_prerelease setting (default False)."""
-    path = get_ui_config_path()
-    if not path.is_file():
-        return False
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         return parser.getboolean(_UPDATES_SECTION, "allow_prerelease", fallback=False)
     except Exception:
         return False
@@ -770,26 +892,16 @@ def load_allow_prerelease() -> bool:
 
 def save_allow_prerelease(value: bool) -> None:
     """Persist the allow_prerelease setting to amethyst.ini under [updates]."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _UPDATES_SECTION not in parser:
-        parser[_UPDATES_SECTION] = {}
-    parser[_UPDATES_SECTION]["allow_prerelease"] = "true" if value else "false"
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _UPDATES_SECTION not in parser:
+            parser[_UPDATES_SECTION] = {}
+        parser[_UPDATES_SECTION]["allow_prerelease"] = "true" if value else "false"
 
 
 def load_clear_archive_after_install() -> bool:
     """Return the clear_archive_after_install setting (default True)."""
-    path = get_ui_config_path()
-    if not path.is_file():
-        return True
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         return parser.getboolean(_FILEMAP_SECTION, "clear_archive_after_install", fallback=True)
     except Exception:
         return True
@@ -797,16 +909,63 @@ def load_clear_archive_after_install() -> bool:
 
 def save_clear_archive_after_install(value: bool) -> None:
     """Persist the clear_archive_after_install setting to amethyst.ini."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _FILEMAP_SECTION not in parser:
-        parser[_FILEMAP_SECTION] = {}
-    parser[_FILEMAP_SECTION]["clear_archive_after_install"] = "true" if value else "false"
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _FILEMAP_SECTION not in parser:
+            parser[_FILEMAP_SECTION] = {}
+        parser[_FILEMAP_SECTION]["clear_archive_after_install"] = "true" if value else "false"
+
+
+def load_direct_staging_extract() -> bool:
+    """Return the direct_staging_extract setting (default False).
+
+    When True, archives are extracted into a scratch folder next to the
+    staging directory and fresh installs are renamed into place instead of
+    being extracted to /tmp and copied file by file.
+    """
+    try:
+        parser = _ini.parser()
+        return parser.getboolean(_FILEMAP_SECTION, "direct_staging_extract", fallback=False)
+    except Exception:
+        return False
+
+
+def save_direct_staging_extract(value: bool) -> None:
+    """Persist the direct_staging_extract setting to amethyst.ini."""
+    with _ini.edit() as parser:
+        if _FILEMAP_SECTION not in parser:
+            parser[_FILEMAP_SECTION] = {}
+        parser[_FILEMAP_SECTION]["direct_staging_extract"] = "true" if value else "false"
+
+
+_DEFAULT_EXTRACT_CACHE_GB = 20
+
+
+def load_extract_cache_settings() -> dict:
+    """Return extract cache settings dict with keys: enabled (default False),
+    max_gb (default 20).
+
+    When enabled, extracted archives are kept in a content-addressed store
+    (keyed by archive md5) so installing the same archive again only
+    hardlinks the files instead of decompressing them.
+    """
+    defaults = {"enabled": False, "max_gb": _DEFAULT_EXTRACT_CACHE_GB}
+    try:
+        parser = _ini.parser()
+        enabled = parser.getboolean(_FILEMAP_SECTION, "extract_cache", fallback=False)
+        max_gb = parser.getint(_FILEMAP_SECTION, "extract_cache_max_gb",
+                               fallback=_DEFAULT_EXTRACT_CACHE_GB)
+        return {"enabled": enabled, "max_gb": max(1, max_gb)}
+    except Exception:
+        return defaults
+
+
+def save_extract_cache_settings(enabled: bool, max_gb: int = _DEFAULT_EXTRACT_CACHE_GB) -> None:
+    """Persist the extract cache settings to amethyst.ini."""
+    with _ini.edit() as parser:
+        if _FILEMAP_SECTION not in parser:
+            parser[_FILEMAP_SECTION] = {}
+        parser[_FILEMAP_SECTION]["extract_cache"] = "true" if enabled else "false"
+        parser[_FILEMAP_SECTION]["extract_cache_max_gb"] = str(max(1, int(max_gb)))
 
 
 def load_keep_fomod_archives() -> bool:
@@ -815,12 +974,8 @@ def load_keep_fomod_archives() -> bool:
     When True, archives of mods that use a FOMOD installer are always kept
     regardless of the clear_archive_after_install setting.
     """
-    path = get_ui_config_path()
-    if not path.is_file():
-        return False
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         return parser.getboolean(_FILEMAP_SECTION, "keep_fomod_archives", fallback=False)
     except Exception:
         return False
@@ -828,16 +983,10 @@ def load_keep_fomod_archives() -> bool:
 
 def save_keep_fomod_archives(value: bool) -> None:
     """Persist the keep_fomod_archives setting to amethyst.ini."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _FILEMAP_SECTION not in parser:
-        parser[_FILEMAP_SECTION] = {}
-    parser[_FILEMAP_SECTION]["keep_fomod_archives"] = "true" if value else "false"
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _FILEMAP_SECTION not in parser:
+            parser[_FILEMAP_SECTION] = {}
+        parser[_FILEMAP_SECTION]["keep_fomod_archives"] = "true" if value else "false"
 
 
 def load_rename_mod_after_install() -> bool:
@@ -845,12 +994,8 @@ def load_rename_mod_after_install() -> bool:
 
     When True, a rename prompt is shown after each (non-collection) mod install.
     """
-    path = get_ui_config_path()
-    if not path.is_file():
-        return False
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         return parser.getboolean(_FILEMAP_SECTION, "rename_mod_after_install", fallback=False)
     except Exception:
         return False
@@ -858,16 +1003,10 @@ def load_rename_mod_after_install() -> bool:
 
 def save_rename_mod_after_install(value: bool) -> None:
     """Persist the rename_mod_after_install setting to amethyst.ini."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _FILEMAP_SECTION not in parser:
-        parser[_FILEMAP_SECTION] = {}
-    parser[_FILEMAP_SECTION]["rename_mod_after_install"] = "true" if value else "false"
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _FILEMAP_SECTION not in parser:
+            parser[_FILEMAP_SECTION] = {}
+        parser[_FILEMAP_SECTION]["rename_mod_after_install"] = "true" if value else "false"
 
 
 def load_restore_on_close() -> bool:
@@ -876,12 +1015,8 @@ def load_restore_on_close() -> bool:
     When True, every configured game with active deployment is restored to
     vanilla when the application window is closed.
     """
-    path = get_ui_config_path()
-    if not path.is_file():
-        return False
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         return parser.getboolean(_FILEMAP_SECTION, "restore_on_close", fallback=False)
     except Exception:
         return False
@@ -889,30 +1024,18 @@ def load_restore_on_close() -> bool:
 
 def save_restore_on_close(value: bool) -> None:
     """Persist the restore_on_close setting to amethyst.ini."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _FILEMAP_SECTION not in parser:
-        parser[_FILEMAP_SECTION] = {}
-    parser[_FILEMAP_SECTION]["restore_on_close"] = "true" if value else "false"
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _FILEMAP_SECTION not in parser:
+            parser[_FILEMAP_SECTION] = {}
+        parser[_FILEMAP_SECTION]["restore_on_close"] = "true" if value else "false"
 
 
 def save_nexus_show_adult(value: bool) -> None:
     """Persist the show_adult setting to amethyst.ini."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _NEXUS_SECTION not in parser:
-        parser[_NEXUS_SECTION] = {}
-    parser[_NEXUS_SECTION]["show_adult"] = "true" if value else "false"
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _NEXUS_SECTION not in parser:
+            parser[_NEXUS_SECTION] = {}
+        parser[_NEXUS_SECTION]["show_adult"] = "true" if value else "false"
 
 
 # ---------------------------------------------------------------------------
@@ -923,12 +1046,8 @@ _PATHS_SECTION = "paths"
 
 def load_heroic_config_path() -> str:
     """Return the user-configured Heroic config directory path, or '' if unset."""
-    path = get_ui_config_path()
-    if not path.is_file():
-        return ""
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         return parser.get(_PATHS_SECTION, "heroic_config_path", fallback="").strip()
     except Exception:
         return ""
@@ -936,26 +1055,16 @@ def load_heroic_config_path() -> str:
 
 def save_heroic_config_path(value: str) -> None:
     """Persist the Heroic config directory path to amethyst.ini. Pass '' to clear."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _PATHS_SECTION not in parser:
-        parser[_PATHS_SECTION] = {}
-    parser[_PATHS_SECTION]["heroic_config_path"] = value.strip()
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _PATHS_SECTION not in parser:
+            parser[_PATHS_SECTION] = {}
+        parser[_PATHS_SECTION]["heroic_config_path"] = value.strip()
 
 
 def load_steam_libraries_vdf_path() -> str:
     """Return the user-configured path to Steam's libraryfolders.vdf, or '' if unset."""
-    path = get_ui_config_path()
-    if not path.is_file():
-        return ""
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         return parser.get(_PATHS_SECTION, "steam_libraries_vdf", fallback="").strip()
     except Exception:
         return ""
@@ -963,16 +1072,10 @@ def load_steam_libraries_vdf_path() -> str:
 
 def save_steam_libraries_vdf_path(value: str) -> None:
     """Persist the Steam libraryfolders.vdf path to amethyst.ini. Pass '' to clear."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _PATHS_SECTION not in parser:
-        parser[_PATHS_SECTION] = {}
-    parser[_PATHS_SECTION]["steam_libraries_vdf"] = value.strip()
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _PATHS_SECTION not in parser:
+            parser[_PATHS_SECTION] = {}
+        parser[_PATHS_SECTION]["steam_libraries_vdf"] = value.strip()
 
 
 def load_default_staging_path() -> str:
@@ -981,12 +1084,8 @@ def load_default_staging_path() -> str:
     When set, adding a new game uses ``<this>/<game_name>`` as its mod staging
     folder instead of the built-in default (~/.config/AmethystModManager/Profiles).
     """
-    path = get_ui_config_path()
-    if not path.is_file():
-        return ""
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         return parser.get(_PATHS_SECTION, "default_staging_path", fallback="").strip()
     except Exception:
         return ""
@@ -994,16 +1093,10 @@ def load_default_staging_path() -> str:
 
 def save_default_staging_path(value: str) -> None:
     """Persist the default mod staging folder to amethyst.ini. Pass '' to clear."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _PATHS_SECTION not in parser:
-        parser[_PATHS_SECTION] = {}
-    parser[_PATHS_SECTION]["default_staging_path"] = value.strip()
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _PATHS_SECTION not in parser:
+            parser[_PATHS_SECTION] = {}
+        parser[_PATHS_SECTION]["default_staging_path"] = value.strip()
 
 
 def load_download_cache_path() -> str:
@@ -1013,12 +1106,8 @@ def load_download_cache_path() -> str:
     ``<this>/<game name>/`` instead of the built-in default
     (~/.config/AmethystModManager/download_cache).
     """
-    path = get_ui_config_path()
-    if not path.is_file():
-        return ""
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         return parser.get(_PATHS_SECTION, "download_cache_path", fallback="").strip()
     except Exception:
         return ""
@@ -1026,16 +1115,10 @@ def load_download_cache_path() -> str:
 
 def save_download_cache_path(value: str) -> None:
     """Persist the download cache root to amethyst.ini. Pass '' to clear."""
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _PATHS_SECTION not in parser:
-        parser[_PATHS_SECTION] = {}
-    parser[_PATHS_SECTION]["download_cache_path"] = value.strip()
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _PATHS_SECTION not in parser:
+            parser[_PATHS_SECTION] = {}
+        parser[_PATHS_SECTION]["download_cache_path"] = value.strip()
 
 
 # ---------------------------------------------------------------------------
@@ -1109,22 +1192,19 @@ def load_theme_colors() -> dict[str, str]:
     overrides = _theme_defaults_override_for(mode)
     result = dict(THEME_DEFAULTS)
     result.update(overrides)
-    path = get_ui_config_path()
-    if path.is_file():
-        try:
-            parser = configparser.ConfigParser()
-            parser.read(path)
-            if parser.has_section(_THEME_SECTION):
-                for key in THEME_DEFAULTS:
-                    raw = parser.get(_THEME_SECTION, key, fallback="").strip()
-                    if not _valid_hex(raw):
-                        continue
-                    if (key in overrides
-                            and raw.lower() == THEME_DEFAULTS[key].lower()):
-                        continue
-                    result[key] = raw
-        except Exception:
-            pass
+    try:
+        parser = _ini.parser()
+        if parser.has_section(_THEME_SECTION):
+            for key in THEME_DEFAULTS:
+                raw = parser.get(_THEME_SECTION, key, fallback="").strip()
+                if not _valid_hex(raw):
+                    continue
+                if (key in overrides
+                        and raw.lower() == THEME_DEFAULTS[key].lower()):
+                    continue
+                result[key] = raw
+    except Exception:
+        pass
     _theme_colors = result
     return _theme_colors
 
@@ -1137,16 +1217,10 @@ def save_theme_color(key: str, value: str) -> None:
     if key not in THEME_DEFAULTS or not _valid_hex(value):
         return
     value = value.strip()
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _THEME_SECTION not in parser:
-        parser[_THEME_SECTION] = {}
-    parser[_THEME_SECTION][key] = value
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _THEME_SECTION not in parser:
+            parser[_THEME_SECTION] = {}
+        parser[_THEME_SECTION][key] = value
     _theme_colors[key] = value
 
 
@@ -1169,12 +1243,8 @@ _APPEARANCE_ID_RE = _re.compile(r"^[a-z0-9_][a-z0-9_-]*$")
 
 def get_appearance_mode() -> str:
     """Return the saved appearance-mode theme ID, defaulting to 'dark'."""
-    path = get_ui_config_path()
-    if not path.is_file():
-        return _APPEARANCE_DEFAULT
     try:
-        parser = configparser.ConfigParser()
-        parser.read(path)
+        parser = _ini.parser()
         raw = parser.get(_INI_SECTION, _APPEARANCE_OPTION, fallback=_APPEARANCE_DEFAULT).strip().lower()
         return raw if _APPEARANCE_ID_RE.match(raw) else _APPEARANCE_DEFAULT
     except Exception:
@@ -1188,13 +1258,7 @@ def save_appearance_mode(mode: str) -> None:
     mode = mode.strip().lower()
     if not _APPEARANCE_ID_RE.match(mode):
         return
-    path = get_ui_config_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    parser = configparser.ConfigParser()
-    if path.is_file():
-        parser.read(path)
-    if _INI_SECTION not in parser:
-        parser[_INI_SECTION] = {}
-    parser[_INI_SECTION][_APPEARANCE_OPTION] = mode
-    with path.open("w") as f:
-        parser.write(f)
+    with _ini.edit() as parser:
+        if _INI_SECTION not in parser:
+            parser[_INI_SECTION] = {}
+        parser[_INI_SECTION][_APPEARANCE_OPTION] = mode
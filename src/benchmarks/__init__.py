@@ -0,0 +1,8 @@
+"""
+benchmarks
+Stand-alone timing harnesses for Amethyst's hot paths.
+
+Each module is runnable on its own from src/:
+    python -m benchmarks.graphql_batch
+None of them need a display, a Nexus account or network access.
+"""
@@ -0,0 +1,262 @@
+"""
+collection_diff.py
+Check the indexed diff_collection() against the original nested-scan version.
+
+Builds synthetic collection revisions and staging trees (meta.ini per mod) —
+collection-owned, fallback-owned, user-installed and orphaned folders, plus
+updated, removed and newly added files — then runs both implementations over
+several seeds and asserts identical buckets.  Also times a large case, e.g.
+a collection update against 2,000 installed mods.  Run from src/:
+    python -m benchmarks.collection_diff --mods 2000 --seeds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import configparser
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+_SRC = Path(__file__).resolve().parent.parent
+if str(_SRC) not in sys.path:
+    sys.path.insert(0, str(_SRC))
+
+_SLUG = "bench-collection"
+
+
+@dataclass
+class _Mod:
+    mod_id: int
+    file_id: int
+    name: str = ""
+
+
+# ---------------------------------------------------------------------------
+# Reference: the pre-index implementation, kept verbatim for comparison
+# ---------------------------------------------------------------------------
+
+def _legacy_read_installed(staging_path: Path, installed_names_lower: set[str]):
+    out = []
+    for mod_dir in staging_path.iterdir():
+        if not mod_dir.is_dir() or mod_dir.name.lower() not in installed_names_lower:
+            continue
+        mod_id = file_id = 0
+        from_collection = ""
+        meta_ini = mod_dir / "meta.ini"
+        if meta_ini.is_file():
+            cp = configparser.ConfigParser()
+            try:
+                cp.read(str(meta_ini), encoding="utf-8")
+                if cp.has_section("General"):
+                    try:
+                        mod_id = int(cp.get("General", "modid", fallback="0") or "0")
+                    except ValueError:
+                        pass
+                    try:
+                        file_id = int(cp.get("General", "fileid", fallback="0") or "0")
+                    except ValueError:
+                        pass
+                    from_collection = cp.get("General", "fromCollection", fallback="").strip()
+            except Exception:
+                pass
+        out.append((mod_dir.name, mod_id, file_id, from_collection))
+    return out
+
+
+def _legacy_diff(*, old_manifest, new_mods, staging_path, installed_names_lower,
+                 collection_slug):
+    from Utils.collection_diff import CollectionDiff, _old_manifest_file_ids
+    old_fids = _old_manifest_file_ids(old_manifest)
+    new_fids_to_mod = {}
+    for m in new_mods:
+        fid = getattr(m, "file_id", 0) or 0
+        if fid > 0:
+            new_fids_to_mod[fid] = m
+    new_fids = set(new_fids_to_mod.keys())
+    installed = _legacy_read_installed(staging_path, installed_names_lower)
+    diff = CollectionDiff()
+    owned: set[str] = set()
+    for folder, mod_id, file_id, origin in installed:
+        is_owned = bool(origin) and origin == collection_slug
+        fallback = not origin and file_id > 0 and file_id in old_fids
+        if not (is_owned or fallback):
+            continue
+        owned.add(folder)
+        if mod_id <= 0 or file_id <= 0:
+            diff.orphans.append(folder)
+    for folder, mod_id, file_id, origin in installed:
+        if folder not in owned or mod_id <= 0 or file_id <= 0:
+            continue
+        if file_id in new_fids:
+            continue
+        matched = None
+        for nfid, nmod in new_fids_to_mod.items():
+            if getattr(nmod, "mod_id", 0) == mod_id:
+                matched = nfid
+                break
+        if matched is not None:
+            diff.to_update_old.append(folder)
+            diff.to_update_new_fids.append(matched)
+        else:
+            diff.to_remove.append(folder)
+    installed_fids = {fid for _, _, fid, _ in installed if fid > 0}
+    update_new_set = set(diff.to_update_new_fids)
+    for fid in new_fids:
+        if fid not in installed_fids and fid not in update_new_set:
+            diff.to_install_fids.append(fid)
+    return diff
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+def _write_meta(folder: Path, mod_id, file_id, origin: str | None) -> None:
+    folder.mkdir(parents=True)
+    lines = ["[General]"]
+    if mod_id is not None:
+        lines.append(f"modid={mod_id}")
+    if file_id is not None:
+        lines.append(f"fileid={file_id}")
+    if origin is not None:
+        lines.append(f"fromCollection={origin}")
+    (folder / "meta.ini").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _build_case(root: Path, mods: int, seed: int):
+    """Return the diff_collection() kwargs for one synthetic scenario."""
+    rng = random.Random(seed)
+    staging = root / f"seed{seed}" / "mods"
+    staging.mkdir(parents=True)
+    old_entries: list[dict] = []
+    new_mods: list[_Mod] = []
+    installed: set[str] = set()
+    next_fid = 1_000_000
+
+    for i in range(mods):
+        mod_id = 100 + i
+        file_id = 500_000 + i
+        folder = staging / f"Mod {i:05d}"
+        roll = rng.random()
+        in_old = roll < 0.85
+        if in_old:
+            old_entries.append({"source": {"fileId": file_id, "modId": mod_id}})
+        tag = rng.random()
+        if tag < 0.70:
+            origin = _SLUG
+        elif tag < 0.85:
+            origin = None                       # legacy, owned only via old manifest
+        elif tag < 0.95:
+            origin = "some-other-collection"
+        else:
+            origin = ""
+        if rng.random() < 0.03:
+            _write_meta(folder, None, None, origin)     # orphan: no ids
+        elif rng.random() < 0.02:
+            folder.mkdir(parents=True)                  # no meta.ini at all
+        else:
+            _write_meta(folder, mod_id, file_id, origin)
+        if rng.random() < 0.97:
+            installed.add(folder.name.lower())
+
+        fate = rng.random()
+        if fate < 0.75:
+            new_mods.append(_Mod(mod_id, file_id))                 # unchanged
+        elif fate < 0.90:
+            next_fid += 1
+            new_mods.append(_Mod(mod_id, next_fid))                # updated
+            if rng.random() < 0.1:
+                next_fid += 1
+                new_mods.append(_Mod(mod_id, next_fid))            # second file, same page
+        # else: removed from the new revision
+
+    for _ in range(mods // 20):
+        next_fid += 1
+        new_mods.append(_Mod(rng.randrange(100, 100 + mods * 2), next_fid))
+    new_mods.append(_Mod(0, 0))                                    # off-site entry
+    rng.shuffle(new_mods)
+    return {
+        "old_manifest": {"mods": old_entries},
+        "new_mods": new_mods,
+        "staging_path": staging,
+        "installed_names_lower": installed,
+        "collection_slug": _SLUG,
+    }
+
+
+def _as_dict(diff) -> dict:
+    return {
+        "to_remove": diff.to_remove,
+        "to_update_old": diff.to_update_old,
+        "to_update_new_fids": diff.to_update_new_fids,
+        # The legacy version emitted these in set order; compare as a set.
+        "to_install_fids": sorted(diff.to_install_fids),
+        "orphans": diff.orphans,
+    }
+
+
+def _reset_catalog(staging: Path) -> None:
+    from Nexus import meta_catalog
+    meta_catalog._catalogs.pop(str(staging.resolve()), None)
+    (staging.parent / "metacatalog.bin").unlink(missing_ok=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from Utils.collection_diff import diff_collection
+
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    ap.add_argument("--mods", type=int, default=2000,
+                    help="installed mods in the timed case")
+    ap.add_argument("--seeds", type=int, default=20,
+                    help="number of small randomised equivalence cases")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    work = Path(tempfile.mkdtemp(prefix="amethyst_bench_"))
+    try:
+        for seed in range(args.seeds):
+            case = _build_case(work, 40 + seed * 7, seed)
+            expected = _as_dict(_legacy_diff(**case))
+            got = _as_dict(diff_collection(**case))
+            if got != expected:
+                print(json.dumps({"seed": seed, "expected": expected, "got": got}, indent=2))
+                return 1
+
+        case = _build_case(work, args.mods, 12345)
+        staging = case["staging_path"]
+        timings: dict[str, list[float]] = {"legacy": [], "indexed_cold": [], "indexed_warm": []}
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            expected = _legacy_diff(**case)
+            timings["legacy"].append(time.perf_counter() - t0)
+            _reset_catalog(staging)
+            t0 = time.perf_counter()
+            got = diff_collection(**case)
+            timings["indexed_cold"].append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            diff_collection(**case)
+            timings["indexed_warm"].append(time.perf_counter() - t0)
+            if _as_dict(got) != _as_dict(expected):
+                print("mismatch in timed case")
+                return 1
+        best = {k: round(min(v), 4) for k, v in timings.items()}
+        print(json.dumps({
+            "equivalence_seeds": args.seeds,
+            "mods": args.mods,
+            "buckets": {k: len(v) for k, v in _as_dict(expected).items()},
+            "best_s": best,
+            "speedup_warm": round(best["legacy"] / max(best["indexed_warm"], 1e-9), 1),
+        }, indent=2))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+"""
+direct_staging.py
+Benchmark direct staging-side extraction against the /tmp + copy install path.
+
+Builds a synthetic texture-mod style zip (one wrapper folder, many files),
+then times both install strategies used by install_mod_from_archive():
+
+- copy:   extract into /tmp, then _copy_file_list() into the staging folder
+          (hardlinks only help when /tmp and staging share a filesystem);
+- direct: extract into a scratch folder beside staging, then
+          _move_file_list() renames the tree into place.
+
+The wrapper folder is stripped in both cases, as the installer's auto-strip
+would do.  Run from src/:
+    python -m benchmarks.direct_staging --files 2000 --size-kb 512 --workdir ~/bench
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+_SRC = Path(__file__).resolve().parent.parent
+if str(_SRC) not in sys.path:
+    sys.path.insert(0, str(_SRC))
+
+
+def _build_archive(path: Path, files: int, size_kb: int) -> None:
+    payload = os.urandom(size_kb * 1024)
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as z:
+        for i in range(files):
+            z.writestr(f"Wrapper/textures/set{i % 20:02d}/tex{i:05d}.dds", payload)
+
+
+def _extract(archive: Path, parent: str | None) -> str:
+    extract_dir = tempfile.mkdtemp(prefix="modmgr_", dir=parent)
+    with zipfile.ZipFile(archive) as z:
+        z.extractall(extract_dir)
+    return extract_dir
+
+
+def _stripped_file_list(extract_dir: str) -> list[tuple[str, str, bool]]:
+    from gui.install_mod import _resolve_direct_files
+    return [(s, s.split("/", 1)[1], False) for s, _d, _f in _resolve_direct_files(extract_dir)]
+
+
+def _run(mode: str, archive: Path, staging: Path) -> dict:
+    from gui.install_mod import _copy_file_list, _move_file_list
+    dest = staging / f"bench_{mode}"
+    shutil.rmtree(dest, ignore_errors=True)
+    t0 = time.perf_counter()
+    extract_dir = _extract(archive, None if mode == "copy" else str(staging.parent))
+    t1 = time.perf_counter()
+    try:
+        file_list = _stripped_file_list(extract_dir)
+        if mode == "copy" or not _move_file_list(file_list, extract_dir, dest, lambda _m: None):
+            _copy_file_list(file_list, extract_dir, dest, lambda _m: None)
+        t2 = time.perf_counter()
+    finally:
+        shutil.rmtree(extract_dir, ignore_errors=True)
+    t3 = time.perf_counter()
+    shutil.rmtree(dest, ignore_errors=True)
+    return {
+        "mode": mode,
+        "extract_s": round(t1 - t0, 3),
+        "place_s": round(t2 - t1, 3),
+        "cleanup_s": round(t3 - t2, 3),
+        "total_s": round(t3 - t0, 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    ap.add_argument("--files", type=int, default=2000)
+    ap.add_argument("--size-kb", type=int, default=256)
+    ap.add_argument("--workdir", default=".",
+                    help="directory that will hold the staging folder (use a real disk)")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    work = Path(tempfile.mkdtemp(prefix="amethyst_bench_",
+                                 dir=os.path.expanduser(args.workdir)))
+    try:
+        staging = work / "mods"
+        staging.mkdir()
+        archive = work / "bench.zip"
+        _build_archive(archive, args.files, args.size_kb)
+        results = [
+            _run(mode, archive, staging)
+            for _ in range(args.repeat)
+            for mode in ("copy", "direct")
+        ]
+        best = {
+            mode: min((r for r in results if r["mode"] == mode), key=lambda r: r["total_s"])
+            for mode in ("copy", "direct")
+        }
+        print(json.dumps({
+            "files": args.files,
+            "size_kb": args.size_kb,
+            "workdir": str(work),
+            "best": best,
+            "speedup": round(best["copy"]["total_s"] / max(best["direct"]["total_s"], 1e-9), 2),
+        }, indent=2))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
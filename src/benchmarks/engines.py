@@ -0,0 +1,259 @@
+"""
+engines.py
+Time the filemap, deploy, restore, BSA index and plugin sync engines on a synthetic profile.
+
+Generates a profile with benchmarks.synthetic_profile (deterministic for a
+given spec and seed) in a scratch folder, then runs each engine through the
+same entry points the GUI calls:
+
+- filemap_cold:  build_filemap() with no modindex.bin (full staging scan)
+- filemap_warm:  build_filemap() from the index (the enable/reorder path)
+- bsa_cold:      rebuild_bsa_index() with no bsa_index.bin
+- bsa_warm:      rebuild_bsa_index() reusing unchanged archives
+- bsa_conflicts: build_bsa_conflicts() against the loose-file index
+- plugins_sync:  sync_plugins_from_filemap_combined() from a fixed plugins.txt
+- deploy:        move_to_core() + deploy_filemap() + deploy_core()
+- restore:       restore_data_core() with runtime-file rescue
+
+Each engine runs --repeat times; the JSON report holds every run time, the
+best and median, and the span breakdown (perf_trace) of the fastest run.
+Reports share one schema, so two of them can be compared with --compare.
+Run from src/:
+    python -m benchmarks.engines --mods 500 --files-per-mod 200 --output new.json
+    python -m benchmarks.engines --mods 500 --files-per-mod 200 --compare new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable
+
+_SRC = Path(__file__).resolve().parent.parent
+if str(_SRC) not in sys.path:
+    sys.path.insert(0, str(_SRC))
+
+from benchmarks.synthetic_profile import ProfileSpec, SyntheticProfile, build_profile  # noqa: E402
+
+_SCHEMA = 1
+_ARCHIVE_EXTS = frozenset({".bsa"})
+_PLUGIN_EXTS = [".esp", ".esm", ".esl"]
+ENGINES = ["filemap_cold", "filemap_warm", "bsa_cold", "bsa_warm", "bsa_conflicts",
+           "plugins_sync", "deploy", "restore"]
+
+
+def _flatten(node: dict, prefix: str = "") -> dict[str, dict]:
+    """{"deploy/deploy filemap/transfer": {"ms": .., "counters": {..}}, ...}"""
+    path = f"{prefix}/{node['name']}" if prefix else node["name"]
+    out = {path: {"ms": node["ms"], **({"counters": node["counters"]} if "counters" in node else {})}}
+    for child in node.get("children", []):
+        out.update(_flatten(child, path))
+    return out
+
+
+class _Runner:
+    """Runs one engine at a time and keeps its timings and traces."""
+
+    def __init__(self, prof: SyntheticProfile, repeat: int, mode: str):
+        from Utils import perf_trace
+        from Utils.deploy import LinkMode
+        self.prof = prof
+        self.repeat = repeat
+        self.mode = LinkMode[mode.upper()]
+        self._traces: list[dict] = []
+        perf_trace.enable()
+        perf_trace.add_listener(self._traces.append)
+
+    def time(self, name: str, body: Callable[[], object],
+             setup: Callable[[], None] | None = None) -> dict:
+        from Utils import perf_trace
+        runs: list[float] = []
+        spans: list[dict] = []
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            self._traces.clear()
+            with perf_trace.operation(name):
+                t0 = time.perf_counter()
+                body()
+                runs.append(time.perf_counter() - t0)
+            spans.append(_flatten(self._traces[-1]) if self._traces else {})
+        best = min(range(len(runs)), key=runs.__getitem__)
+        return {
+            "runs_s": [round(r, 4) for r in runs],
+            "best_s": round(runs[best], 4),
+            "median_s": round(sorted(runs)[len(runs) // 2], 4),
+            "spans": spans[best],
+        }
+
+    # -- engines -----------------------------------------------------------
+
+    def _build_filemap(self):
+        from Utils.filemap import build_filemap
+        return build_filemap(self.prof.modlist, self.prof.staging, self.prof.filemap)
+
+    def _drop_filemap_snapshot(self):
+        from Utils.filemap import invalidate_filemap_cache
+        invalidate_filemap_cache(self.prof.filemap)
+
+    def filemap_cold(self) -> dict:
+        def setup():
+            self.prof.mod_index.unlink(missing_ok=True)
+            self._drop_filemap_snapshot()
+        return self.time("filemap_cold", self._build_filemap, setup)
+
+    def filemap_warm(self) -> dict:
+        if not self.prof.mod_index.is_file():
+            self._build_filemap()
+        return self.time("filemap_warm", self._build_filemap, self._drop_filemap_snapshot)
+
+    def _rebuild_bsa(self):
+        from Utils.bsa_filemap import rebuild_bsa_index
+        rebuild_bsa_index(self.prof.bsa_index, self.prof.staging, _ARCHIVE_EXTS)
+
+    def bsa_cold(self) -> dict:
+        return self.time("bsa_cold", self._rebuild_bsa,
+                         lambda: self.prof.bsa_index.unlink(missing_ok=True))
+
+    def bsa_warm(self) -> dict:
+        if not self.prof.bsa_index.is_file():
+            self._rebuild_bsa()
+        return self.time("bsa_warm", self._rebuild_bsa)
+
+    def bsa_conflicts(self) -> dict:
+        from Utils.bsa_filemap import build_bsa_conflicts
+        if not self.prof.bsa_index.is_file():
+            self._rebuild_bsa()
+        if not self.prof.mod_index.is_file():
+            self._build_filemap()
+        return self.time("bsa_conflicts", lambda: build_bsa_conflicts(
+            self.prof.modlist, self.prof.bsa_index, _ARCHIVE_EXTS,
+            loose_index_path=self.prof.mod_index,
+        ))
+
+    def plugins_sync(self) -> dict:
+        from Utils.plugins import sync_plugins_from_filemap_combined
+        if not self.prof.filemap.is_file():
+            self._build_filemap()
+        return self.time(
+            "plugins_sync",
+            lambda: sync_plugins_from_filemap_combined(
+                self.prof.filemap, self.prof.plugins, _PLUGIN_EXTS,
+                data_dir=self.prof.data_dir,
+            ),
+            lambda: self.prof.plugins.write_text(self.prof.plugins_baseline, encoding="utf-8"),
+        )
+
+    def _deploy(self):
+        from Utils.deploy import deploy_core, deploy_filemap, move_to_core
+        move_to_core(self.prof.data_dir)
+        _count, placed = deploy_filemap(self.prof.filemap, self.prof.data_dir,
+                                        self.prof.staging, mode=self.mode)
+        deploy_core(self.prof.data_dir, placed, mode=self.mode)
+
+    def _restore(self):
+        from Utils.deploy import restore_data_core
+        restore_data_core(self.prof.data_dir, overwrite_dir=self.prof.overwrite,
+                          staging_root=self.prof.staging)
+
+    def _deployed(self) -> bool:
+        return (self.prof.data_dir.parent / (self.prof.data_dir.name + "_Core")).is_dir()
+
+    def deploy(self) -> dict:
+        if not self.prof.filemap.is_file():
+            self._build_filemap()
+
+        def setup():
+            if self._deployed():
+                self._restore()
+        return self.time("deploy", self._deploy, setup)
+
+    def restore(self) -> dict:
+        if not self.prof.filemap.is_file():
+            self._build_filemap()
+
+        def setup():
+            if not self._deployed():
+                self._deploy()
+        return self.time("restore", self._restore, setup)
+
+
+def _compare(base: dict, new: dict) -> str:
+    """Table of best times, base vs new."""
+    lines = [f"{'engine':<14} {'base s':>9} {'new s':>9} {'new/base':>9}"]
+    for name, res in new["results"].items():
+        old = base.get("results", {}).get(name)
+        if old is None:
+            lines.append(f"{name:<14} {'-':>9} {res['best_s']:>9.4f}")
+            continue
+        ratio = res["best_s"] / old["best_s"] if old["best_s"] else float("inf")
+        lines.append(f"{name:<14} {old['best_s']:>9.4f} {res['best_s']:>9.4f} {ratio:>8.2f}x")
+    if base.get("spec") != new.get("spec"):
+        lines.append("warning: the two reports were made with different specs")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    for field_name, default in asdict(ProfileSpec()).items():
+        ap.add_argument("--" + field_name.replace("_", "-"), type=type(default), default=default)
+    ap.add_argument("--engines", nargs="*", default=ENGINES, choices=ENGINES)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--mode", default="hardlink", choices=["hardlink", "symlink", "copy"],
+                    help="deploy link mode")
+    ap.add_argument("--workdir", default=None,
+                    help="folder for the synthetic profile (default: system temp; use a real disk)")
+    ap.add_argument("--output", metavar="JSON", help="also write the report here")
+    ap.add_argument("--compare", metavar="JSON", help="print best times against an earlier report")
+    ap.add_argument("--keep", action="store_true", help="leave the synthetic profile on disk")
+    args = ap.parse_args(argv)
+
+    spec = ProfileSpec(**{k: getattr(args, k) for k in asdict(ProfileSpec())})
+    work = Path(tempfile.mkdtemp(prefix="amethyst_engines_",
+                                 dir=os.path.expanduser(args.workdir) if args.workdir else None))
+    # Keep the app's own settings and caches out of the user's config folder.
+    os.environ["XDG_CONFIG_HOME"] = str(work / "config")
+    try:
+        t0 = time.perf_counter()
+        prof = build_profile(spec, work / "profile")
+        gen_s = time.perf_counter() - t0
+        runner = _Runner(prof, args.repeat, args.mode)
+        results = {name: getattr(runner, name)() for name in args.engines}
+        report = {
+            "schema": _SCHEMA,
+            "spec": asdict(spec),
+            "env": {
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "deploy_mode": args.mode,
+                "repeat": args.repeat,
+            },
+            "generate_s": round(gen_s, 3),
+            "results": results,
+        }
+        text = json.dumps(report, indent=2)
+        print(text)
+        if args.output:
+            Path(args.output).write_text(text + "\n", encoding="utf-8")
+        if args.compare:
+            base = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+            print(_compare(base, report), file=sys.stderr)
+    finally:
+        if args.keep:
+            print(f"profile kept at {work}", file=sys.stderr)
+        else:
+            shutil.rmtree(work, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,123 @@
+"""
+graphql_batch.py
+Benchmark the pipelined GraphQL batch methods against a local fake endpoint.
+
+Starts a threaded HTTP server on 127.0.0.1 that answers the queries issued
+by NexusAPI.graphql_mod_update_info_batch / graphql_file_sizes_batch after an
+artificial delay, then times the same call with concurrency 1 (the old serial
+behaviour) and with the default concurrency cap.  Optionally fails a fraction
+of requests to exercise per-chunk retries.
+
+Usage (from src/):
+    python -m benchmarks.graphql_batch --mods 2000 --latency 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+_SRC = Path(__file__).resolve().parent.parent
+if str(_SRC) not in sys.path:
+    sys.path.insert(0, str(_SRC))
+
+
+def _make_handler(latency: float, fail_rate: float, seed: int):
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class _FakeGraphQL(BaseHTTPRequestHandler):
+        def log_message(self, *_args):  # keep the benchmark output readable
+            pass
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            time.sleep(latency)
+            with lock:
+                fail = rng.random() < fail_rate
+            if fail:
+                self.send_response(502)
+                self.end_headers()
+                return
+            query = body.get("query", "")
+            if "game(domainName" in query:
+                data = {"game": {"id": 1704}}
+            elif "legacyModsByDomain" in query:
+                ids = (body.get("variables") or {}).get("ids") or []
+                data = {"legacyModsByDomain": {"nodes": [
+                    {"modId": e["modId"], "name": f"Mod {e['modId']}",
+                     "version": "1.0", "updatedAt": "2026-01-01T00:00:00Z",
+                     "game": {"domainName": e["gameDomain"]}}
+                    for e in ids
+                ]}}
+            else:
+                data = {
+                    f"m{mid}": [{"fileId": int(mid) * 10, "sizeInBytes": 1024}]
+                    for mid in re.findall(r"\bm(\d+):", query)
+                }
+            out = json.dumps({"data": data}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+
+    return _FakeGraphQL
+
+
+def run(mods: int, latency: float, fail_rate: float, seed: int = 0) -> dict:
+    """Run both batch methods serially and pipelined; return timings in seconds."""
+    import Nexus.nexus_api as nexus_api
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0),
+                                 _make_handler(latency, fail_rate, seed))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    nexus_api.GRAPHQL_BASE = f"http://127.0.0.1:{server.server_port}/graphql"
+    try:
+        api = nexus_api.NexusAPI(api_key="benchmark")
+        ids = [("skyrimspecialedition", mid) for mid in range(1, mods + 1)]
+        pairs = [(mid, mid * 10) for mid in range(1, mods + 1)]
+        results: dict = {"mods": mods, "latency": latency, "fail_rate": fail_rate}
+        default_cap = nexus_api.NexusAPI._GRAPHQL_CONCURRENCY
+        for label, cap in (("serial", 1), ("pipelined", default_cap)):
+            api._GRAPHQL_CONCURRENCY = cap
+            t0 = time.perf_counter()
+            info = api.graphql_mod_update_info_batch(ids)
+            t1 = time.perf_counter()
+            sizes = api.graphql_file_sizes_batch("skyrimspecialedition", pairs)
+            t2 = time.perf_counter()
+            results[label] = {
+                "concurrency": cap,
+                "update_info_s": round(t1 - t0, 3),
+                "update_info_found": len(info),
+                "file_sizes_s": round(t2 - t1, 3),
+                "file_sizes_found": len(sizes),
+            }
+        return results
+    finally:
+        server.shutdown()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument("--mods", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.2,
+                        help="artificial per-request latency in seconds")
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="fraction of requests answered with HTTP 502")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.mods, args.latency, args.fail_rate, args.seed), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+startup.py
+Time the phases of application startup, each in a fresh interpreter.
+
+Phases:
+- interpreter:        bare ``python -c pass``
+- import_game_loader: import Utils.game_loader (pulls in Games.base_game)
+- discover_cold:      discover_games() with no handler manifest — imports
+                      every handler under Games/ and writes the manifest
+- discover_warm:      discover_games() with a valid manifest — no handler
+                      imports
+- first_game:         warm discovery plus loading the selected game's handler
+- gui.<module>:       importing each listed GUI module on its own
+
+Children run with XDG_CONFIG_HOME pointed at a scratch folder so the
+user's manifest and settings are left alone (--real-config to use them).
+With --importtime, the slowest modules (self time, from ``-X importtime``)
+of the gui.py import are listed too.  Run from src/:
+    python -m benchmarks.startup --repeat 5 --importtime 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_SRC = Path(__file__).resolve().parent.parent
+if str(_SRC) not in sys.path:
+    sys.path.insert(0, str(_SRC))
+
+_GUI_MODULES = [
+    "gui.theme",
+    "gui.game_helpers",
+    "gui.install_mod",
+    "gui.modlist_panel",
+    "gui.plugin_panel",
+    "gui.top_bar",
+    "gui.status_bar",
+    "gui.collections_dialog",
+]
+
+# Child snippets print the seconds spent in the timed part on their last line.
+_PRELUDE = "import time, sys\nt0 = time.perf_counter()\n"
+_EPILOGUE = "\nprint(time.perf_counter() - t0)\n"
+
+_PHASES = {
+    "import_game_loader": "import Utils.game_loader",
+    "discover_cold": (
+        "from Utils.config_paths import get_game_manifest_path\n"
+        "get_game_manifest_path().unlink(missing_ok=True)\n"
+        "t0 = time.perf_counter()\n"
+        "from Utils.game_loader import discover_games\n"
+        "discover_games()"
+    ),
+    "discover_warm": "from Utils.game_loader import discover_games\ndiscover_games()",
+    "first_game": (
+        "from Utils.game_loader import discover_games\n"
+        "discover_games()[{game!r}].name"
+    ),
+}
+
+
+def _run(code: str, env: dict, extra_args: list[str] | None = None) -> tuple[float | None, str]:
+    """Run *code* in a fresh interpreter; return (timed seconds, error text)."""
+    proc = subprocess.run(
+        [sys.executable, *(extra_args or []), "-c", code],
+        cwd=_SRC, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        return None, lines[-1] if lines else f"exit {proc.returncode}"
+    try:
+        return float(proc.stdout.strip().splitlines()[-1]), ""
+    except (ValueError, IndexError):
+        return None, "no timing printed"
+
+
+def _best(code: str, env: dict, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        secs, err = _run(code, env)
+        if secs is None:
+            return {"error": err}
+        times.append(secs)
+    return {"best_s": round(min(times), 4), "median_s": round(sorted(times)[len(times) // 2], 4)}
+
+
+def _interpreter(env: dict, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], cwd=_SRC, env=env, check=False)
+        times.append(time.perf_counter() - t0)
+    return {"best_s": round(min(times), 4)}
+
+
+def _importtime_top(module: str, env: dict, n: int) -> list[dict]:
+    """Slowest imports (self time) seen while importing *module*."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_SRC, env=env, capture_output=True, text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cum_us, name = (p.strip() for p in line[len("import time:"):].split("|"))
+            rows.append({"module": name.strip(), "self_ms": int(self_us) / 1000,
+                         "cumulative_ms": int(cum_us) / 1000})
+        except ValueError:
+            continue
+    rows.sort(key=lambda r: r["self_ms"], reverse=True)
+    return rows[:n]
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--game", default="Skyrim Special Edition",
+                    help="handler loaded in the first_game phase")
+    ap.add_argument("--gui-modules", nargs="*", default=_GUI_MODULES)
+    ap.add_argument("--importtime", type=int, default=0, metavar="N",
+                    help="also list the N slowest imports under gui.py's imports")
+    ap.add_argument("--real-config", action="store_true",
+                    help="use the real config dir instead of a scratch one")
+    args = ap.parse_args(argv)
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(_SRC), env.get("PYTHONPATH", "")]))
+    scratch = None
+    if not args.real_config:
+        scratch = tempfile.TemporaryDirectory(prefix="amethyst_startup_")
+        env["XDG_CONFIG_HOME"] = scratch.name
+
+    try:
+        results: dict[str, dict] = {"interpreter": _interpreter(env, args.repeat)}
+        for phase, body in _PHASES.items():
+            code = _PRELUDE + body.format(game=args.game) + _EPILOGUE
+            results[phase] = _best(code, env, args.repeat)
+        for module in args.gui_modules:
+            results[f"gui.{module.removeprefix('gui.')}"] = _best(
+                _PRELUDE + f"import {module}" + _EPILOGUE, env, args.repeat)
+        out: dict = {"python": sys.version.split()[0], "phases": results}
+        if args.importtime:
+            out["slowest_imports"] = _importtime_top(
+                " ,".join(args.gui_modules).replace(" ,", ", "), env, args.importtime)
+        print(json.dumps(out, indent=2))
+    finally:
+        if scratch is not None:
+            scratch.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
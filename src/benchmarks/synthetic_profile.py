@@ -0,0 +1,205 @@
+"""
+synthetic_profile.py
+Generate deterministic synthetic mod profiles for the engine benchmarks.
+
+build_profile(spec, root) lays out the same folders the app uses:
+
+    <root>/Profiles/<game>/mods/<mod>/...       staged mod files
+    <root>/Profiles/<game>/overwrite/
+    <root>/Profiles/<game>/profiles/default/    modlist.txt, plugins.txt
+    <root>/Game/Data/                           vanilla files and plugins
+
+Every mod gets ``files_per_mod`` loose files.  ``conflict_ratio`` of them are
+drawn from a shared pool of paths so mods override each other, and
+``case_collision_ratio`` of those shared paths are written with different
+folder casing (``Textures/Armor`` vs ``textures/armor``) the way real mods
+disagree.  ``bsa_mods`` mods also ship a BSA (v104 TOC, no file data) with
+``files_per_bsa`` entries overlapping the loose pool, and ``plugins`` .esp
+files are spread across the mods.  The same spec and seed always produce the
+same tree, so results from two checkouts or two machines are comparable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import struct
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+_SRC = Path(__file__).resolve().parent.parent
+if str(_SRC) not in sys.path:
+    sys.path.insert(0, str(_SRC))
+
+_FOLDERS = ["textures", "meshes", "scripts", "sound/fx", "interface", "seq",
+            "textures/armor", "meshes/actors/character", "materials", "skse/plugins"]
+_EXTS = {"textures": ".dds", "meshes": ".nif", "scripts": ".pex", "sound/fx": ".wav",
+         "interface": ".swf", "seq": ".seq", "textures/armor": ".dds",
+         "meshes/actors/character": ".hkx", "materials": ".bgsm", "skse/plugins": ".dll"}
+_VANILLA_PLUGINS = ["Skyrim.esm", "Update.esm", "Dawnguard.esm", "HearthFires.esm", "Dragonborn.esm"]
+
+
+@dataclass(frozen=True)
+class ProfileSpec:
+    """Shape of a synthetic profile; see the module docstring."""
+    mods: int = 200
+    files_per_mod: int = 100
+    conflict_ratio: float = 0.2
+    case_collision_ratio: float = 0.1
+    bsa_mods: int = 40
+    files_per_bsa: int = 200
+    plugins: int = 150
+    vanilla_files: int = 500
+    file_bytes: int = 16
+    seed: int = 1
+    game: str = "BenchGame"
+
+
+@dataclass
+class SyntheticProfile:
+    """Paths of a generated profile."""
+    spec: ProfileSpec
+    root: Path
+    game_root: Path          # Profiles/<game>
+    staging: Path            # Profiles/<game>/mods
+    overwrite: Path
+    profile_dir: Path        # Profiles/<game>/profiles/default
+    modlist: Path
+    plugins: Path
+    filemap: Path
+    data_dir: Path           # Game/Data
+    mod_names: list[str]
+    plugins_baseline: str    # plugins.txt as generated; restored before each sync run
+
+    @property
+    def mod_index(self) -> Path:
+        return self.game_root / "modindex.bin"
+
+    @property
+    def bsa_index(self) -> Path:
+        return self.game_root / "bsa_index.bin"
+
+
+def _case_variant(rel: str, rng: random.Random) -> str:
+    """Re-case the folder part of *rel* (file name left alone)."""
+    folder, _, name = rel.rpartition("/")
+    parts = []
+    for seg in folder.split("/"):
+        style = rng.randrange(3)
+        parts.append(seg.upper() if style == 0 else seg.capitalize() if style == 1 else seg.title())
+    return "/".join(parts) + "/" + name
+
+
+def write_bsa(path: Path, rel_paths: list[str]) -> None:
+    """Write a v104 BSA holding only a TOC for *rel_paths* (no file data)."""
+    folders: dict[str, list[str]] = {}
+    for rel in rel_paths:
+        folder, _, name = rel.replace("/", "\\").rpartition("\\")
+        folders.setdefault(folder or ".", []).append(name)
+    names = [n for files in folders.values() for n in files]
+    folder_block = b"".join(
+        bytes([len(f) + 1]) + f.encode("ascii") + b"\x00" + b"\x00" * (16 * len(files))
+        for f, files in folders.items()
+    )
+    name_block = b"".join(n.encode("ascii") + b"\x00" for n in names)
+    header = b"BSA\x00" + struct.pack(
+        "<IIIIIIII", 104, 36, 0x3, len(folders), len(names),
+        sum(len(f) + 1 for f in folders), len(name_block), 0,
+    )
+    records = b"".join(struct.pack("<QII", i, len(files), 0)
+                       for i, files in enumerate(folders.values()))
+    path.write_bytes(header + records + folder_block + name_block)
+
+
+def build_profile(spec: ProfileSpec, root: Path) -> SyntheticProfile:
+    """Write the profile described by *spec* under *root* (must be empty)."""
+    rng = random.Random(spec.seed)
+    payload = b"x" * spec.file_bytes
+    game_root = root / "Profiles" / spec.game
+    staging = game_root / "mods"
+    overwrite = game_root / "overwrite"
+    profile_dir = game_root / "profiles" / "default"
+    data_dir = root / "Game" / "Data"
+    for d in (staging, overwrite, profile_dir, data_dir):
+        d.mkdir(parents=True, exist_ok=True)
+
+    # Paths several mods ship; conflicting files are drawn from here.
+    pool_size = max(1, int(spec.files_per_mod * spec.mods * spec.conflict_ratio / 4))
+    pool = [f"{rng.choice(_FOLDERS)}/shared_{i:06d}" for i in range(pool_size)]
+    pool = [p + _EXTS[p.rsplit("/", 1)[0]] for p in pool]
+
+    dirs_made: set[Path] = set()
+
+    def _write(path: Path) -> None:
+        if path.parent not in dirs_made:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            dirs_made.add(path.parent)
+        path.write_bytes(payload)
+
+    mod_names = [f"Bench Mod {i:05d}" for i in range(spec.mods)]
+    bsa_owners = set(rng.sample(range(spec.mods), min(spec.bsa_mods, spec.mods)))
+    plugin_owner = [rng.randrange(spec.mods) for _ in range(spec.plugins)] if spec.mods else []
+    for m, name in enumerate(mod_names):
+        mod_dir = staging / name
+        n_shared = int(spec.files_per_mod * spec.conflict_ratio)
+        rels = rng.sample(pool, min(n_shared, len(pool)))
+        rels = [_case_variant(r, rng) if rng.random() < spec.case_collision_ratio else r
+                for r in rels]
+        for i in range(spec.files_per_mod - len(rels)):
+            folder = rng.choice(_FOLDERS)
+            rels.append(f"{folder}/m{m:05d}_{i:05d}{_EXTS[folder]}")
+        for rel in rels:
+            _write(mod_dir / rel)
+        if m in bsa_owners:
+            bsa_rels = rng.sample(pool, min(spec.files_per_bsa // 2, len(pool)))
+            bsa_rels += [f"textures/bsa{m:05d}/t{i:05d}.dds"
+                         for i in range(spec.files_per_bsa - len(bsa_rels))]
+            mod_dir.mkdir(parents=True, exist_ok=True)
+            write_bsa(mod_dir / f"BenchMod{m:05d}.bsa", bsa_rels)
+            _write(mod_dir / f"BenchMod{m:05d}.esp")
+    plugin_names = []
+    for p, owner in enumerate(plugin_owner):
+        plugin = f"BenchPlugin{p:05d}.esp"
+        plugin_names.append(plugin)
+        _write(staging / mod_names[owner] / plugin)
+
+    for plugin in _VANILLA_PLUGINS:
+        _write(data_dir / plugin)
+    for i in range(spec.vanilla_files):
+        folder = rng.choice(_FOLDERS)
+        _write(data_dir / f"{folder}/vanilla_{i:06d}{_EXTS[folder]}")
+
+    modlist = profile_dir / "modlist.txt"
+    modlist.write_text("".join(f"+{n}\n" for n in reversed(mod_names)), encoding="utf-8")
+    # plugins.txt starts half in sync, with a few stale entries to prune.
+    listed = plugin_names[: len(plugin_names) // 2]
+    stale = [f"Removed{i:04d}.esp" for i in range(max(1, len(plugin_names) // 20))]
+    plugins_baseline = "".join(f"*{p}\n" for p in listed + stale)
+    plugins = profile_dir / "plugins.txt"
+    plugins.write_text(plugins_baseline, encoding="utf-8")
+
+    return SyntheticProfile(
+        spec=spec, root=root, game_root=game_root, staging=staging,
+        overwrite=overwrite, profile_dir=profile_dir, modlist=modlist,
+        plugins=plugins, filemap=game_root / "filemap.txt", data_dir=data_dir,
+        mod_names=mod_names, plugins_baseline=plugins_baseline,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    for field_name, default in asdict(ProfileSpec()).items():
+        ap.add_argument("--" + field_name.replace("_", "-"), type=type(default), default=default)
+    ap.add_argument("root", help="empty directory to write the profile into")
+    args = ap.parse_args(argv)
+    spec = ProfileSpec(**{k: getattr(args, k) for k in asdict(ProfileSpec())})
+    prof = build_profile(spec, Path(args.root))
+    files = sum(1 for p in prof.root.rglob("*") if p.is_file())
+    print(json.dumps({"spec": asdict(spec), "root": str(prof.root), "files": files}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
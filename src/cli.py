@@ -4,11 +4,20 @@ cli.py
 Command-line interface for Amethyst Mod Manager.
 
 Usage:
-    python cli.py --deploy <game_id_or_name> <profile_name>
-    python cli.py --restore <game_id_or_name>
-    python cli.py --list-games
-    python cli.py --list-profiles <game_id_or_name>
-    python cli.py --clear-credentials
+    python cli.py deploy <game_id_or_name> <profile_name>
+    python cli.py restore <game_id_or_name>
+    python cli.py list-games
+    python cli.py list-profiles <game_id_or_name>
+    python cli.py clear-credentials
+    python cli.py plan-collection <game_id_or_name> <profile_name> <collection.json> <archives_dir> [--output plan.json]
+    python cli.py install-collection <game_id_or_name> <profile_name> <collection.json> <archives_dir> [--plan plan.json]
+    python cli.py --trace deploy <game_id_or_name> <profile_name>
+    python cli.py show-trace [trace.json] [--game <game_id_or_name> [--profile <profile_name>]]
+
+--trace turns tracing on and prints a span/counter table for every deploy,
+restore, filemap build and install the command runs; traces are also saved
+as JSON under the profile's logs/traces/ folder, which show-trace renders.
+Tracing is off otherwise unless MOD_MANAGER_TRACE=1 is set.
 
 game_id_or_name can be either the game's game_id (e.g. 'skyrim_se') or its
 full display name (e.g. 'Skyrim Special Edition').  Matching is case-insensitive.
@@ -17,9 +26,14 @@ full display name (e.g. 'Skyrim Special Edition').  Matching is case-insensitive
 from __future__ import annotations
 
 import argparse
+import json
 import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from Utils.game_loader import GameRegistry
 
 
 def _setup_path():
@@ -35,17 +49,17 @@ def _setup_path():
             os.environ["MOD_MANAGER_GAMES"] = str(games_dir)
 
 
-def _find_game(games: dict, key: str):
+def _find_game(games: GameRegistry, key: str):
     """Return a game instance matching key by name, game_id, or Steam app ID (case-insensitive)."""
     key_lower = key.lower()
     # Exact name match first
-    for name, game in games.items():
+    for name in games:
         if name.lower() == key_lower:
-            return game
-    # game_id match
-    for game in games.values():
-        if getattr(game, "game_id", "").lower() == key_lower:
-            return game
+            return games[name]
+    # game_id match (from the handler manifest — no handler imports needed)
+    for name in games:
+        if games.info(name).get("game_id", "").lower() == key_lower:
+            return games[name]
     # Steam ID match (primary + alts)
     for game in games.values():
         sid = getattr(game, "steam_id", "")
@@ -59,15 +73,15 @@ def _log(msg: str):
     print(msg, flush=True)
 
 
-def cmd_list_games(games: dict):
+def cmd_list_games(games: GameRegistry):
     if not games:
         print("No games discovered.")
         return
     print(f"{'Game Name':<40} {'game_id':<30} {'Configured'}")
     print("-" * 80)
-    for name, game in sorted(games.items()):
-        configured = "yes" if game.is_configured() else "no"
-        gid = getattr(game, "game_id", "")
+    for name in sorted(games):
+        configured = "yes" if games.is_configured(name) else "no"
+        gid = games.info(name).get("game_id", "")
         print(f"{name:<40} {gid:<30} {configured}")
 
 
@@ -212,6 +226,163 @@ def cmd_clear_credentials():
     print("Nexus credentials cleared.")
 
 
+def _load_collection_args(games: dict, key: str, manifest_path: str, archives_dir: str):
+    """Validate the shared collection arguments; return (game, schema, archives)."""
+    game = _find_game(games, key)
+    if game is None:
+        print(f"Error: game '{key}' not found.", file=sys.stderr)
+        sys.exit(1)
+    if not game.is_configured():
+        print(f"Error: game '{game.name}' is not configured (game path not set).", file=sys.stderr)
+        sys.exit(1)
+    archives = Path(archives_dir).expanduser()
+    if not archives.is_dir():
+        print(f"Error: archive directory '{archives}' does not exist.", file=sys.stderr)
+        sys.exit(1)
+
+    from Utils.collection_engine import load_collection_manifest
+    try:
+        schema = load_collection_manifest(Path(manifest_path).expanduser())
+    except (OSError, ValueError) as exc:
+        print(f"Error: could not read '{manifest_path}': {exc}", file=sys.stderr)
+        sys.exit(1)
+    return game, schema, archives
+
+
+def cmd_plan_collection(games: dict, key: str, profile: str, manifest_path: str,
+                        archives_dir: str, output: str | None):
+    """Report what installing a collection would take, without installing."""
+    game, schema, archives = _load_collection_args(games, key, manifest_path, archives_dir)
+    from Utils.collection_plan import plan_collection_install
+
+    profile_dir = game.get_profile_root() / "profiles" / profile
+    plan = plan_collection_install(schema, game, profile_dir, [archives],
+                                   log_fn=lambda _m: None)
+    for line in plan.summary_lines():
+        print(line)
+    if output:
+        plan.save(Path(output).expanduser())
+        print(f"Plan written to {output}")
+    if not plan.fits:
+        sys.exit(2)
+
+
+def cmd_install_collection(games: dict, key: str, profile: str, manifest_path: str,
+                           archives_dir: str, fetch_workers: int, install_workers: int,
+                           overwrite: bool, plan_path: str | None = None):
+    """Install a collection from a local collection.json and a folder of
+    archives, with no display and no network access.  With *plan_path*, run
+    the plan written by plan-collection instead of installing every mod."""
+    game, schema, archives = _load_collection_args(games, key, manifest_path, archives_dir)
+    from Utils.collection_engine import (
+        CollectionPipeline, PipelineCallbacks, collection_mods_from_manifest,
+        local_archive_fetch, parse_collection_manifest,
+        write_collection_modlist, write_collection_plugins,
+    )
+
+    plan = None
+    if plan_path:
+        from Utils.collection_plan import CollectionPlan, check_plan
+        try:
+            plan = CollectionPlan.load(Path(plan_path).expanduser())
+            check_plan(plan, schema)
+        except (OSError, ValueError, TypeError) as exc:
+            print(f"Error: cannot use plan '{plan_path}': {exc}", file=sys.stderr)
+            sys.exit(1)
+
+    profile_dir = game.get_profile_root() / "profiles" / profile
+    if not profile_dir.is_dir():
+        profile_dir.mkdir(parents=True)
+        _log(f"Created profile '{profile}' at {profile_dir}")
+    game.set_active_profile_dir(profile_dir)
+
+    manifest = parse_collection_manifest(schema)
+    mods, offsite = collection_mods_from_manifest(schema)
+    for name, url in offsite:
+        _log(f"Skipping off-site mod '{name}' — download it manually: {url}")
+    bundled = [m for m in mods if m.source_type == "bundle"]
+    if bundled:
+        _log(f"Skipping {len(bundled)} bundled mod(s) — they ship inside the collection archive.")
+    mods = [m for m in mods if m.source_type != "bundle" and m.file_id]
+    fetch = local_archive_fetch([archives])
+    staging = game.get_effective_mod_staging_path()
+    to_install = mods
+    parked: dict[str, Path] = {}
+    if plan is not None:
+        from Utils.collection_plan import (
+            apply_plan_removals, park_plan_removals, planned_fetch, planned_mods,
+            restore_plan_removals,
+        )
+        to_install = planned_mods(plan, mods)
+        fetch = planned_fetch(plan, fetch)
+        # Replaced folders are only set aside here and deleted once the
+        # install has succeeded.
+        parked = park_plan_removals(plan, staging, log_fn=_log)
+    name = (schema.get("info") or {}).get("name") or Path(manifest_path).stem
+    _log(f"Installing '{name}': {len(to_install)} mod(s) from {archives}")
+
+    pipeline = CollectionPipeline(
+        manifest, game, profile_dir, fetch,
+        log_fn=_log,
+        fetch_workers=fetch_workers,
+        install_workers=install_workers,
+        download_dir=archives,
+        archive_policy=lambda _was_fomod: False,
+        overwrite_existing=True if overwrite else None,
+        callbacks=PipelineCallbacks(status=_log),
+    )
+    try:
+        result = pipeline.run(to_install)
+    except BaseException:
+        if parked:
+            restore_plan_removals(parked, staging, log_fn=_log)
+        raise
+
+    # Mods the plan found already installed keep their existing folders, so
+    # the modlist and plugins.txt still cover the whole collection.
+    kept: dict[int, str] = {}
+    if plan is not None:
+        kept = {pm.file_id: pm.folder for pm in plan.mods
+                if pm.action == "installed" and pm.folder and (staging / pm.folder).is_dir()}
+    install_order = []
+    for m in mods:
+        folder = result.install_results.get(m.file_id) or kept.get(m.file_id)
+        if folder:
+            install_order.append((manifest.sort_key(m), folder))
+    if result.skipped:
+        if plan is not None:
+            restore_plan_removals(parked, staging, log_fn=_log)
+    else:
+        # Only now that every mod is in place: drop what the plan replaces,
+        # and keep the manifest with the profile, as the GUI does, so later
+        # plan-collection runs diff against it.
+        if plan is not None:
+            apply_plan_removals(plan, staging, profile_dir / "modlist.txt",
+                                log_fn=_log, parked=parked)
+        (profile_dir / "collection.json").write_text(json.dumps(schema, indent=2),
+                                                     encoding="utf-8")
+    if install_order:
+        count = write_collection_modlist(profile_dir / "modlist.txt", install_order)
+        _log(f"Wrote modlist.txt ({count} entries)")
+        count = write_collection_plugins(game, profile_dir, schema,
+                                         (folder for _key, folder in install_order))
+        if count:
+            _log(f"Wrote plugins.txt ({count} plugins, collection order — not LOOT sorted)")
+
+    rate = result.bytes_fetched / max(result.total_seconds, 1e-9) / (1024 * 1024)
+    _log(
+        f"Collection install complete: {result.installed} installed, "
+        f"{result.skipped} skipped in {result.total_seconds:.1f}s "
+        f"(archives located in {result.fetch_seconds:.1f}s, "
+        f"{result.bytes_fetched / 1024 ** 3:.2f} GB, {rate:.1f} MB/s)"
+    )
+    if result.unresolved_fomods:
+        _log(f"{len(result.unresolved_fomods)} FOMOD mod(s) need the installer wizard — "
+             "install them from the GUI.")
+    if result.skipped:
+        sys.exit(2)
+
+
 def cmd_restore(games: dict, key: str):
     game = _find_game(games, key)
     if game is None:
@@ -242,6 +413,50 @@ def cmd_restore(games: dict, key: str):
     _log(f"Restore complete: {game.name}")
 
 
+def _trace_dirs(games: dict | None, key: str | None, profile: str | None) -> list[Path]:
+    """Folders perf_trace writes to: the config logs folder and, for *key*,
+    the game's profile root and its profile folder(s)."""
+    from Utils.config_paths import get_logs_dir
+
+    dirs = [get_logs_dir() / "traces"]
+    if key is None:
+        return dirs
+    game = _find_game(games, key)
+    if game is None:
+        print(f"Error: game '{key}' not found.", file=sys.stderr)
+        sys.exit(1)
+    root = game.get_profile_root()
+    dirs.append(root / "logs" / "traces")
+    if profile:
+        profile_dirs = [root / "profiles" / profile]
+    else:
+        profile_dirs = sorted(p for p in (root / "profiles").glob("*") if p.is_dir())
+    dirs.extend(p / "logs" / "traces" for p in profile_dirs)
+    return dirs
+
+
+def cmd_show_trace(path: str | None, games: dict | None = None,
+                   key: str | None = None, profile: str | None = None):
+    from Utils.perf_trace import format_summary
+
+    if path is None:
+        # Trace file names start with their timestamp.
+        traces = sorted((t for d in _trace_dirs(games, key, profile) for t in d.glob("*.json")),
+                        key=lambda t: t.name)
+        if not traces:
+            hint = "" if key else " or --game/--profile to search a profile"
+            print(f"No traces found; pass the path of a trace file{hint}.", file=sys.stderr)
+            sys.exit(1)
+        path = str(traces[-1])
+    try:
+        trace = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"Error: could not read trace '{path}': {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"{path}  ({trace.get('started', '?')})")
+    print(format_summary(trace))
+
+
 def main():
     _setup_path()
 
@@ -249,6 +464,8 @@ def main():
         prog="amethyst",
         description="Amethyst Mod Manager — CLI",
     )
+    parser.add_argument("--trace", action="store_true",
+                        help="Print a timing summary after each traced operation")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     subparsers.add_parser("list-games", help="List all discovered games and whether they are configured")
@@ -265,23 +482,76 @@ def main():
 
     subparsers.add_parser("clear-credentials", help="Remove stored Nexus Mods API key and OAuth tokens")
 
+    ic = subparsers.add_parser("install-collection",
+                               help="Install a collection from a local collection.json and a folder of archives")
+    ic.add_argument("game", help="game_id or display name (case-insensitive)")
+    ic.add_argument("profile", help="Profile name (created if missing)")
+    ic.add_argument("manifest", help="Path to the collection's collection.json")
+    ic.add_argument("archives", help="Directory holding the collection's mod archives")
+    ic.add_argument("--fetch-workers", type=int, default=4,
+                    help="Threads locating archives (default: 4)")
+    ic.add_argument("--install-workers", type=int, default=4,
+                    help="Threads extracting and staging archives (default: 4)")
+    ic.add_argument("--overwrite", action="store_true",
+                    help="Reinstall mods whose staging folder already exists")
+    ic.add_argument("--plan", metavar="PLAN_JSON",
+                    help="Execute a plan written by plan-collection --output")
+
+    pc = subparsers.add_parser("plan-collection",
+                               help="Dry run: report downloads, disk use, FOMODs and time for a collection")
+    pc.add_argument("game", help="game_id or display name (case-insensitive)")
+    pc.add_argument("profile", help="Profile name")
+    pc.add_argument("manifest", help="Path to the collection's collection.json")
+    pc.add_argument("archives", help="Directory searched for archives already on disk")
+    pc.add_argument("--output", metavar="PLAN_JSON",
+                    help="Write the machine-readable plan for install-collection --plan")
+
+    st = subparsers.add_parser("show-trace", help="Print a saved performance trace as a table")
+    st.add_argument("file", nargs="?",
+                    help="Trace JSON (default: the newest saved trace)")
+    st.add_argument("--game", help="Also search this game's profile logs/traces folders")
+    st.add_argument("--profile", help="Only search this profile of --game")
+
     args = parser.parse_args()
 
+    from Utils import perf_trace
+    if args.trace:
+        perf_trace.enable()
+        perf_trace.add_listener(
+            lambda trace: print(f"\n{trace.get('file', '(trace not saved)')}\n"
+                                f"{perf_trace.format_summary(trace)}", file=sys.stderr, flush=True))
+
     if args.command == "clear-credentials":
         cmd_clear_credentials()
         return
+    if args.command == "show-trace" and (args.file or not args.game):
+        cmd_show_trace(args.file)
+        return
 
     from Utils.game_loader import discover_games
     games = discover_games()
 
+    if args.command == "show-trace":
+        cmd_show_trace(None, games, args.game, args.profile)
+        return
+
     if args.command == "list-games":
         cmd_list_games(games)
     elif args.command == "list-profiles":
         cmd_list_profiles(games, args.game)
     elif args.command == "deploy":
-        cmd_deploy(games, args.game, args.profile)
+        with perf_trace.operation("deploy", game=args.game, profile=args.profile):
+            cmd_deploy(games, args.game, args.profile)
     elif args.command == "restore":
-        cmd_restore(games, args.game)
+        with perf_trace.operation("restore", game=args.game):
+            cmd_restore(games, args.game)
+    elif args.command == "install-collection":
+        cmd_install_collection(games, args.game, args.profile, args.manifest, args.archives,
+                               args.fetch_workers, args.install_workers, args.overwrite,
+                               args.plan)
+    elif args.command == "plan-collection":
+        cmd_plan_collection(games, args.game, args.profile, args.manifest, args.archives,
+                            args.output)
 
 
 if __name__ == "__main__":
@@ -305,7 +305,7 @@ class App(ctk.CTk):
         self._build_layout()
         self._startup_log()
         # Show onboarding if no games are configured yet
-        configured = sum(1 for g in _GAMES.values() if g.is_configured())
+        configured = len(_GAMES.configured_names())
         if configured == 0:
             self.after(200, self._show_onboarding)
             # No game configured → no filemap rebuild will fire; dismiss splash after layout.
@@ -750,8 +750,8 @@ class App(ctk.CTk):
         if stay_on_current:
             matched_game = (current_name, current_game)
         else:
-            for name, game in _GAMES.items():
-                if game.nexus_game_domain == link.game_domain and game.is_configured():
+            for name, game in _GAMES.configured_items():
+                if game.nexus_game_domain == link.game_domain:
                     matched_game = (name, game)
                     break
 
@@ -829,8 +829,8 @@ class App(ctk.CTk):
         if stay_on_current:
             matched_game = (current_name, current_game)
         else:
-            for name, game in _GAMES.items():
-                if game.nexus_game_domain == coll_link.game_domain and game.is_configured():
+            for name, game in _GAMES.configured_items():
+                if game.nexus_game_domain == coll_link.game_domain:
                     matched_game = (name, game)
                     break
 
@@ -2170,7 +2170,7 @@ class App(ctk.CTk):
         self._status.log(
             f"Display: {w}x{h}, HiDPI detected={detected}, scale={get_ui_scale()}"
         )
-        configured = sum(1 for g in _GAMES.values() if g.is_configured())
+        configured = len(_GAMES.configured_names())
         total = len(_GAMES)
         self._status.log(f"Mod Manager ready. {configured}/{total} games configured.")
         self._status.log("Linux mode active. Using CustomTkinter UI framework.")
@@ -2207,8 +2207,8 @@ if __name__ == "__main__":
         """Synchronously restore every configured game that has an active deployment."""
         from Utils.deploy import restore_root_folder
 
-        games = [g for g in _GAMES.values()
-                 if g.is_configured() and g.get_deploy_active()
+        games = [g for _n, g in _GAMES.configured_items()
+                 if g.get_deploy_active()
                  and getattr(g, "restore_on_close_eligible", True)]
         if not games:
             return
@@ -2256,10 +2256,22 @@ if __name__ == "__main__":
                 _restore_all_on_close()
         except Exception:
             pass
+        try:
+            from Utils.profile_state import flush_profile_state
+            flush_profile_state()
+            from Utils.ui_config import flush_ui_config
+            flush_ui_config()
+        except Exception:
+            pass
         try:
             NxmIPC.shutdown()
         except Exception:
             pass
+        try:
+            from Utils import py7zr_pool
+            py7zr_pool.shutdown()
+        except Exception:
+            pass
 
     def _on_app_close():
         _run_shutdown()
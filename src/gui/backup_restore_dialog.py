@@ -1,6 +1,7 @@
 """
 backup_restore_dialog.py
-Dialog to list profile backups (modlist/plugins) and restore a selected one.
+Dialog to list profile backups (modlist/plugins), show what changed since a
+selected one, and restore it.
 """
 
 from __future__ import annotations
@@ -14,11 +15,13 @@ import tkinter as tk
 import gui.theme as _theme
 from gui.theme import (
     ACCENT, ACCENT_HOV, BG_DEEP, BG_HEADER, BG_PANEL, BORDER,
-    TEXT_DIM, TEXT_MAIN,
+    TEXT_DIM, TEXT_MAIN, TEXT_OK, TEXT_ERR, FONT_MONO,
     scaled,
     TEXT_ON_ACCENT,
 )
-from Utils.profile_backup import list_backups, restore_backup, is_backup_kept, set_backup_kept
+from Utils.profile_backup import (
+    list_backups, restore_backup, kept_backups, set_backup_kept, diff_backups,
+)
 
 _BG_HOVER_BTN = "#3e3e40"  # subtle grey hover for buttons (not the blue selection hover)
 _KEEP_BG      = "#1a3a1a"  # dark green background for kept backups
@@ -50,6 +53,7 @@ class BackupRestorePanel(ctk.CTkFrame):
         self._on_restored  = on_restored or (lambda: None)
         self._on_done      = on_done or (lambda p: None)
         self._backups      = list_backups(profile_dir)
+        self._kept         = kept_backups(profile_dir)
 
         # Title bar
         title_bar = ctk.CTkFrame(self, fg_color=BG_PANEL, corner_radius=0, height=scaled(36))
@@ -111,7 +115,7 @@ class BackupRestorePanel(ctk.CTkFrame):
 
             for i, (dt, bdir) in enumerate(self._backups):
                 label = dt.strftime("%Y-%m-%d %H:%M:%S")
-                if is_backup_kept(bdir):
+                if bdir in self._kept:
                     label += "  [kept]"
                 self._listbox.insert("end", label)
             self._apply_keep_colors()
@@ -119,6 +123,17 @@ class BackupRestorePanel(ctk.CTkFrame):
             self._listbox.bind("<<ListboxSelect>>", self._on_selection)
             self._listbox.selection_clear(0, "end")
 
+            # Filled by "Changes": unified diff of the selected backup
+            # against the profile's current files.
+            self._diff_box = ctk.CTkTextbox(
+                list_frame, font=FONT_MONO, fg_color=BG_PANEL, text_color=TEXT_MAIN,
+                height=scaled(150), wrap="none", state="disabled",
+            )
+            inner = self._diff_box._textbox
+            inner.tag_configure("add", foreground=TEXT_OK)
+            inner.tag_configure("del", foreground=TEXT_ERR)
+            inner.tag_configure("head", foreground=TEXT_DIM)
+
         btn_frame = ctk.CTkFrame(self, fg_color="transparent")
         btn_frame.pack(fill="x", padx=16, pady=(8, 16))
 
@@ -136,6 +151,13 @@ class BackupRestorePanel(ctk.CTkFrame):
         )
         self._keep_btn.pack(side="right", padx=(8, 0))
 
+        self._diff_btn = ctk.CTkButton(
+            btn_frame, text="Changes", width=90, height=32,
+            font=_font_normal(), fg_color=BG_HEADER, hover_color=BORDER,
+            text_color=TEXT_MAIN, command=self._on_diff, state="disabled",
+        )
+        self._diff_btn.pack(side="right", padx=(8, 0))
+
         ctk.CTkButton(
             btn_frame, text="Cancel", width=100, height=32,
             font=_font_normal(), fg_color=BG_HEADER, hover_color=BORDER,
@@ -147,18 +169,19 @@ class BackupRestorePanel(ctk.CTkFrame):
             sel = self._listbox.curselection()
             has_sel = bool(sel)
             self._restore_btn.configure(state="normal" if has_sel else "disabled")
+            self._diff_btn.configure(state="normal" if has_sel else "disabled")
             if hasattr(self, "_keep_btn"):
                 self._keep_btn.configure(state="normal" if has_sel else "disabled")
                 if has_sel:
                     _, bdir = self._backups[int(sel[0])]
                     self._keep_btn.configure(
-                        text="Unkeep" if is_backup_kept(bdir) else "Keep"
+                        text="Unkeep" if bdir in self._kept else "Keep"
                     )
 
     def _apply_keep_colors(self):
         """Colour kept backups green in the listbox."""
         for i, (_dt, bdir) in enumerate(self._backups):
-            if is_backup_kept(bdir):
+            if bdir in self._kept:
                 self._listbox.itemconfig(i, bg=_KEEP_BG, fg=_KEEP_FG)
             else:
                 self._listbox.itemconfig(i, bg=BG_PANEL, fg=TEXT_MAIN)
@@ -171,8 +194,12 @@ class BackupRestorePanel(ctk.CTkFrame):
             return
         idx = int(sel[0])
         dt, bdir = self._backups[idx]
-        kept = is_backup_kept(bdir)
+        kept = bdir in self._kept
         set_backup_kept(bdir, not kept)
+        if kept:
+            self._kept.discard(bdir)
+        else:
+            self._kept.add(bdir)
         # Update listbox text
         label = dt.strftime("%Y-%m-%d %H:%M:%S")
         if not kept:
@@ -183,6 +210,44 @@ class BackupRestorePanel(ctk.CTkFrame):
         self._apply_keep_colors()
         self._keep_btn.configure(text="Unkeep" if not kept else "Keep")
 
+    def _on_diff(self):
+        if not self._backups or not hasattr(self, "_listbox"):
+            return
+        sel = self._listbox.curselection()
+        if not sel:
+            return
+        _dt, backup_dir = self._backups[int(sel[0])]
+        try:
+            diffs = diff_backups(backup_dir)
+        except (OSError, ValueError) as exc:
+            diffs = None
+            error = f"Could not compare backup: {exc}"
+        box = self._diff_box
+        box.configure(state="normal")
+        box.delete("1.0", "end")
+        inner = box._textbox
+        if diffs is None:
+            inner.insert("end", error, "del")
+        elif not diffs:
+            inner.insert("end", "No changes since this backup.", "head")
+        else:
+            for lines in diffs.values():
+                for i, line in enumerate(lines):
+                    # modlist entries start with +/-, so only the first two
+                    # lines are file headers.
+                    if i < 2 or line.startswith("@@"):
+                        tag = "head"
+                    elif line.startswith("+"):
+                        tag = "add"
+                    elif line.startswith("-"):
+                        tag = "del"
+                    else:
+                        tag = ""
+                    inner.insert("end", line + "\n", tag)
+        box.configure(state="disabled")
+        if not box.winfo_ismapped():
+            box.pack(fill="x", pady=(8, 0))
+
     def _on_restore(self):
         if not self._backups or not hasattr(self, "_listbox"):
             return
@@ -201,8 +266,8 @@ class BackupRestorePanel(ctk.CTkFrame):
 class BackupRestoreDialog(ctk.CTkToplevel):
     """Modal window wrapper around BackupRestorePanel."""
 
-    WIDTH  = 380
-    HEIGHT = 400
+    WIDTH  = 520
+    HEIGHT = 560
 
     def __init__(
         self,
@@ -47,7 +47,16 @@ from Utils.profile_state import (
     read_collection_install_paused,
     write_collection_install_paused,
 )
-from gui.install_mod import install_mod_from_archive, FOMOD_DEFERRED, ExtractionMemoryBudget, get_uncompressed_size
+from gui.install_mod import install_mod_from_archive
+from Utils.collection_engine import (
+    CollectionPipeline,
+    PipelineCallbacks,
+    collection_mods_from_manifest,
+    find_local_archive,
+    fomod_choices_from_collection as _fomod_choices_from_collection,
+    parse_collection_manifest,
+    topo_sort_collection as _topo_sort_collection,
+)
 from gui.mod_card import CARD_PAD, make_placeholder_image
 from gui.tk_tooltip import TkTooltip
 from gui.wheel_compat import LEGACY_WHEEL_REDUNDANT
@@ -56,12 +65,13 @@ from gui.mod_name_utils import _suggest_mod_names
 from Utils.modlist import write_modlist, read_modlist, ModEntry
 from Utils.filemap import rebuild_mod_index
 from Utils.config_paths import get_download_cache_dir, get_download_cache_dir_for_game, list_all_cache_dirs
-from Nexus.nexus_download import delete_archive_and_sidecar, DownloadResult, _find_cached_archive, _get_downloads_dir
+from Nexus.nexus_download import _get_downloads_dir
+from Nexus.download_scheduler import PRIORITY_LOW, get_download_scheduler
 from gui.download_locations_overlay import (
     is_default_downloads_disabled,
     load_extra_download_locations,
 )
-from Utils.ui_config import load_clear_archive_after_install, load_keep_fomod_archives, load_collection_settings, load_force_manual_install
+from Utils.ui_config import load_clear_archive_after_install, load_keep_fomod_archives, load_force_manual_install
 from Nexus.nexus_meta import build_meta_from_download
 from Utils.xdg import open_url
 from Utils.plugins import PluginEntry, write_plugins, write_loadorder
@@ -160,93 +170,6 @@ _PAUSED_INSTALLS: dict[str, dict] = {}
 #   force_manual_install = true
 
 
-def _topo_sort_collection(schema_mods: list[dict], mod_rules: list[dict]) -> dict[int, int]:
-    """Return file_id → priority-position dict respecting modRules before/after constraints.
-
-    Position 0 = highest priority (wins conflicts), higher number = lower priority.
-    Falls back to the mods-array order for any mod not constrained by rules.
-    Cycles are broken by ignoring the offending edge (Kahn's algorithm skips them naturally).
-    """
-    # Build logical_name → file_id map from the mods array
-    logical_to_fid: dict[str, int] = {}
-    fid_order: list[int] = []  # original mods-array order, used as topo fallback
-    for m in schema_mods:
-        src = m.get("source") or {}
-        fid = src.get("fileId")
-        if fid is None:
-            continue
-        fid = int(fid)
-        logical = (src.get("logicalFilename") or m.get("name") or "").strip()
-        if logical:
-            logical_to_fid[logical] = fid
-        if fid not in fid_order:
-            fid_order.append(fid)
-
-    # Reverse so that mods[-1] (last installed = highest priority in collection.json)
-    # gets position 0 → top of modlist.txt (highest priority in the manager).
-    # Without this, mods[0] (lowest priority) would incorrectly end up at the top.
-    fid_order = list(reversed(fid_order))
-
-    all_fids: set[int] = set(fid_order)
-
-    # edges: higher_priority_fid → {lower_priority_fids}
-    # "source after reference"  → reference has higher priority than source
-    # "source before reference" → source has higher priority than reference
-    higher_than: dict[int, set[int]] = {f: set() for f in all_fids}  # fid → fids it beats
-    in_degree: dict[int, int] = {f: 0 for f in all_fids}
-
-    def _resolve(name: str) -> int | None:
-        return logical_to_fid.get(name)
-
-    for rule in mod_rules:
-        rtype = rule.get("type")
-        if rtype not in ("before", "after"):
-            continue
-        ref_name = (rule.get("reference") or {}).get("logicalFileName", "")
-        src_name = (rule.get("source") or {}).get("logicalFileName", "")
-        ref_fid = _resolve(ref_name)
-        src_fid = _resolve(src_name)
-        if ref_fid is None or src_fid is None or ref_fid == src_fid:
-            continue
-
-        if rtype == "after":
-            # source loads after reference → source wins (loads on top of reference)
-            winner, loser = src_fid, ref_fid
-        else:  # "before"
-            # source loads before reference → reference wins
-            winner, loser = ref_fid, src_fid
-
-        if loser not in higher_than[winner]:
-            higher_than[winner].add(loser)
-            in_degree[loser] += 1
-
-    # Kahn's topological sort — highest priority first
-    from collections import deque
-    queue = deque(f for f in fid_order if in_degree[f] == 0)
-    sorted_fids: list[int] = []
-    remaining = set(fid_order)
-
-    while queue:
-        fid = queue.popleft()
-        if fid not in remaining:
-            continue
-        remaining.discard(fid)
-        sorted_fids.append(fid)
-        # Process dependents in original-array order for determinism
-        for dep in sorted(higher_than[fid], key=lambda f: fid_order.index(f) if f in fid_order else 999999):
-            in_degree[dep] -= 1
-            if in_degree[dep] == 0:
-                queue.append(dep)
-
-    # Append any fids not reached (cycle members) in original order
-    for fid in fid_order:
-        if fid in remaining:
-            sorted_fids.append(fid)
-
-    # sorted_fids[0] = highest priority → position 0
-    return {fid: pos for pos, fid in enumerate(sorted_fids)}
-
-
 def _fmt_size(n_bytes: int) -> str:
     """Human-readable file size."""
     if n_bytes <= 0:
@@ -271,51 +194,6 @@ def _get_dir_size(path: Path) -> int:
     return total
 
 
-def _fomod_choices_from_collection(choices: dict) -> "dict[str, dict[str, list[str]]]":
-    """Convert a collection.json FOMOD choices block to the saved_selections
-    format that ``resolve_files()`` / ``FomodDialog`` expect.
-
-    Collection format::
-
-        {
-          "type": "fomod",
-          "options": [
-            {
-              "name": "<step_name>",
-              "groups": [
-                {
-                  "name": "<group_name>",
-                  "choices": [{"name": "<plugin_name>", "idx": 0}, ...]
-                },
-                ...
-              ]
-            },
-            ...
-          ]
-        }
-
-    Saved-selections format::
-
-        {
-          "<step_name>": {
-            "<group_name>": ["<plugin_name>", ...]
-          },
-          ...
-        }
-    """
-    result: dict = {}
-    for step_idx, step in enumerate(choices.get("options", [])):
-        groups: dict = {}
-        for group in step.get("groups", []):
-            group_name = group.get("name", "")
-            plugin_names = [c["name"] for c in group.get("choices", []) if c.get("name")]
-            if plugin_names:
-                groups[group_name] = plugin_names
-        if groups:
-            result[str(step_idx)] = groups
-    return result
-
-
 # ---------------------------------------------------------------------------
 # Collection groups helper
 # ---------------------------------------------------------------------------
@@ -1077,7 +955,6 @@ class CollectionDetailDialog(tk.Frame):
     def _fetch_from_local_manifest(self):
         """Populate the detail panel from a local manifest.json file (no API needed)."""
         import json as _json
-        from Nexus.nexus_api import NexusCollectionMod as _NCM
         try:
             manifest_path = self._local_manifest_path
             cj = _json.loads(open(manifest_path, encoding="utf-8").read())
@@ -1087,59 +964,14 @@ class CollectionDetailDialog(tk.Frame):
 
         self._collection_schema_cache = cj
 
-        schema_mods: list[dict] = cj.get("mods", [])
-        mods: list = []
+        mods, offsite = collection_mods_from_manifest(cj)
         total_size = 0
         schema_order: dict[int, int] = {}
-        offsite: list[tuple[str, str]] = []
-
-        for pos, m in enumerate(schema_mods):
+        for pos, m in enumerate(cj.get("mods", [])):
             src = m.get("source") or {}
-            src_type = (src.get("type") or "nexus").lower()
-            mod_name = m.get("name") or ""
-            fid_raw = src.get("fileId")
-            fid = int(fid_raw) if fid_raw is not None else 0
-            mid_raw = src.get("modId")
-            mid = int(mid_raw) if mid_raw is not None else 0
-            file_size = int(src.get("fileSize") or 0)
-            total_size += file_size
-            if fid:
-                schema_order[fid] = pos
-
-            if src_type in ("browse", "direct"):
-                url = src.get("url") or src.get("fileUrl") or ""
-                if url:
-                    offsite.append((mod_name, url))
-                continue
-            if src_type == "bundle":
-                mods.append(_NCM(
-                    mod_name=mod_name,
-                    file_name=src.get("fileExpression") or mod_name,
-                    source_type="bundle",
-                ))
-                continue
-
-            details = m.get("details") or {}
-            cat = m.get("category") or {}
-            # collection.json stores the category as a string under
-            # details.category; fall back to the older object-shaped field.
-            cat_name = (details.get("category") or cat.get("name") or "").strip()
-            cat_id = int(cat.get("id") or 0)
-            mods.append(_NCM(
-                mod_id=mid,
-                file_id=fid,
-                mod_name=mod_name,
-                file_name=src.get("logicalFilename") or src.get("fileExpression") or mod_name,
-                size_bytes=file_size,
-                optional=bool(m.get("optional", False)),
-                source_type="nexus",
-                version=m.get("version") or "",
-                category_id=cat_id,
-                category_name=cat_name,
-                install_type=(details.get("type") or "").strip(),
-                md5=(src.get("md5") or "").strip().lower(),
-                domain_name=(m.get("domainName") or "").strip(),
-            ))
+            total_size += int(src.get("fileSize") or 0)
+            if src.get("fileId") is not None and int(src["fileId"]):
+                schema_order[int(src["fileId"])] = pos
 
         self._offsite_mods = offsite
         try:
@@ -2292,64 +2124,13 @@ class CollectionDetailDialog(tk.Frame):
                 self._log(f"Collection install: could not save manifest: {_exc}")
 
         # Build a mapping from file_id → priority position (0 = highest priority)
-        # respecting modRules before/after constraints via topological sort.
+        # respecting modRules before/after constraints via topological sort,
+        # plus the per-file folder names, phases and FOMOD choices.
+        _manifest = parse_collection_manifest(collection_schema)
         schema_mods: list[dict] = collection_schema.get("mods", [])
-        mod_rules: list[dict] = collection_schema.get("modRules", [])
-        schema_file_id_to_pos: dict[int, int] = _topo_sort_collection(schema_mods, mod_rules)
-        schema_pos_to_name: dict[int, str] = {}  # collection.json logical name
-        schema_file_id_to_logical: dict[int, str] = {}  # file_id → logicalFilename
-        schema_file_id_to_mod_id: dict[int, int] = {}   # file_id → mod_id from collection.json
-        schema_file_id_to_install_type: dict[int, str] = {}  # file_id → details.type (e.g. "dinput")
-        schema_file_id_to_phase: dict[int, int] = {}    # file_id → phase (0 = earliest)
-        fomod_by_file_id: dict[int, dict] = {}   # file_id → saved_selections dict
-        # First pass: collect raw logicalFilename values to detect duplicates
-        _raw_logical: dict[int, str] = {}   # file_id → raw logicalFilename from source
-        _raw_name: dict[int, str] = {}      # file_id → schema mod name
-        for schema_mod in schema_mods:
-            src = schema_mod.get("source") or {}
-            fid = src.get("fileId")
-            if fid is not None:
-                fid = int(fid)
-                _raw_logical[fid] = src.get("logicalFilename") or ""
-                _raw_name[fid] = schema_mod.get("name") or ""
-        # Count how many file_ids share each logicalFilename
-        _logical_counts: dict[str, int] = {}
-        for raw in _raw_logical.values():
-            if raw:
-                _logical_counts[raw] = _logical_counts.get(raw, 0) + 1
-
-        for pos, schema_mod in enumerate(schema_mods):
-            src = schema_mod.get("source") or {}
-            fid = src.get("fileId")
-            if fid is not None:
-                fid = int(fid)
-                topo_pos = schema_file_id_to_pos.get(fid, pos)
-                schema_pos_to_name[topo_pos] = schema_mod.get("name") or ""
-                raw_logical = _raw_logical.get(fid, "")
-                schema_name = _raw_name.get(fid, "")
-                # If multiple entries share the same logicalFilename, fall back to
-                # the more specific schema name to avoid folder-name collisions
-                # (e.g. "Capital Whiterun Expansion" shared by main mod + meshes patch).
-                if raw_logical and _logical_counts.get(raw_logical, 0) > 1:
-                    logical = schema_name or raw_logical
-                else:
-                    logical = raw_logical or schema_name
-                schema_file_id_to_logical[fid] = logical
-                mid = src.get("modId")
-                if mid:
-                    schema_file_id_to_mod_id[fid] = int(mid)
-                _det_type = ((schema_mod.get("details") or {}).get("type") or "").strip()
-                if _det_type:
-                    schema_file_id_to_install_type[fid] = _det_type
-                try:
-                    schema_file_id_to_phase[fid] = int(schema_mod.get("phase") or 0)
-                except (TypeError, ValueError):
-                    schema_file_id_to_phase[fid] = 0
-                choices = schema_mod.get("choices") or {}
-                if choices.get("type") == "fomod":
-                    fomod_by_file_id[fid] = _fomod_choices_from_collection(choices)
-                elif choices.get("type") == "fomod_selections":
-                    fomod_by_file_id[fid] = choices["selections"]
+        schema_file_id_to_pos = _manifest.file_id_to_pos
+        schema_pos_to_name = _manifest.pos_to_name
+        schema_file_id_to_logical = _manifest.file_id_to_logical
 
         # Sort the mods list by topo position (0 = highest priority);
         # mods without a position come last (preserving their original order).
@@ -2518,41 +2299,35 @@ class CollectionDetailDialog(tk.Frame):
         # Downloads and installs run as a producer-consumer pipeline so
         # install workers begin extracting archives as soon as each
         # download finishes, rather than waiting for ALL downloads first.
-        # A bounded queue provides back-pressure: when _PIPELINE_QUEUE_SIZE
-        # archives are downloaded-but-not-yet-installed, download threads
-        # block — preventing disk/memory exhaustion.
+        # A bounded queue provides back-pressure: when it is full, download
+        # threads block — preventing disk/memory exhaustion.
         # ------------------------------------------------------------------
-        import concurrent.futures as _cf
-        import queue as _queue
         from Utils.ui_config import load_collection_settings as _load_col_cfg
         _col_cfg = _load_col_cfg()
 
-        _DL_WORKERS = _col_cfg["max_concurrent"]
-        _INSTALL_WORKERS = _col_cfg.get("max_extract_workers", 4)
-        _PIPELINE_QUEUE_SIZE = max(_INSTALL_WORKERS + 1, 5)
-        _DONE_SENTINEL = None  # pushed once per install consumer to signal shutdown
+        # Fill in sizes the manifest didn't carry so the global download
+        # scheduler can order this batch shortest-job-first.
+        _unsized = [
+            (m.mod_id, m.file_id) for m in to_download
+            if not (getattr(m, "size_bytes", 0) or 0) and m.mod_id and m.file_id
+        ]
+        if _unsized:
+            get_download_scheduler().prime_sizes(
+                getattr(app, "_nexus_api", None), self._game_domain, _unsized)
 
-        # file_id → (DownloadResult, effective_game_domain) — kept for post-install order tracking
-        _dl_results: dict[int, tuple] = {}
-        _dl_lock = threading.Lock()
-        _dl_done = 0
         _dl_total = len(to_download)
-        mod_panel = getattr(app, "_mod_panel", None)
 
         # --- Single collection-wide progress bar ---
         _to_download_fids = {getattr(m, "file_id", None) for m in to_download}
         _total_bytes = sum(getattr(m, "size_bytes", 0) or 0 for m in ordered_mods)
-        _dl_bytes_done = sum(
+        _precredit_bytes = sum(
             getattr(m, "size_bytes", 0) or 0
             for m in ordered_mods
             if getattr(m, "file_id", None) not in _to_download_fids
         )  # pre-credit already-installed/skipped mods
-        _per_mod_prev: dict[int, int] = {}  # file_id → last reported bytes (for delta tracking)
         _col_cancel = threading.Event()
         _col_pause = threading.Event()   # set to pause after current items finish
         _col_stop = threading.Event()    # set by both pause & cancel to abort in-flight ops immediately
-        _dl_finished = threading.Event()   # set when all downloads are done
-        _pipeline_finished = threading.Event()  # set when downloads AND installs are done
 
         # Register pause/cancel events so the UI button can trigger them
         if _slug:
@@ -2560,625 +2335,158 @@ class CollectionDetailDialog(tk.Frame):
             _ACTIVE_INSTALLS[_slug]["pause"] = _col_pause
             _ACTIVE_INSTALLS[_slug]["stop"] = _col_stop
 
-        # Memory-budget gated extraction: each worker reserves the estimated
-        # uncompressed size (×1.5 spike factor) before extracting.  The budget
-        # is based on available RAM at pipeline start minus a 1 GB safety
-        # margin.  If the estimate exceeds the total budget the archive is
-        # still allowed through once all other extractions have finished
-        # (prevents deadlock on single huge archives).  A live /proc/meminfo
-        # check adds a second safety net against actual OOM.
-        _mem_budget = ExtractionMemoryBudget(max_workers=_INSTALL_WORKERS)
-
-        # Archive-use counting built incrementally as downloads complete.
-        # Two mods can reference the same cached archive (same file_id, or
-        # different file_ids whose cache lookup resolved to the same file).
-        _archive_use_count: dict[str, int] = {}
-
-        # Paths of archives sourced from the system downloads folder or a
-        # user-defined custom location (not the internal download cache).
-        # These are never deleted after install regardless of the
-        # "remove archive after install" setting.
-        _external_archive_paths: set[str] = set()
-
-        _install_lock = threading.Lock()
-        _install_counters = {"installed": 0, "skipped": 0, "done": 0}
-        _install_results: dict[int, str] = {}  # file_id → installed folder name
-        _fomod_deferred: list = []  # (mod, result, effective_domain) tuples deferred for post-install
-
-        def _extracting_push(fid: int, name: str):
-            try:
-                self.after(0, lambda f=fid, n=name:
-                           self._overlay_extracting_add(f, n))
-            except Exception:
-                pass
-
-        def _extracting_pop(fid: int):
-            try:
-                self.after(0, lambda f=fid: self._overlay_extracting_remove(f))
-            except Exception:
-                pass
-
-        # Bounded queue: download producers → install consumers.
-        # Items are (mod, DownloadResult, effective_domain) or _DONE_SENTINEL.
-        _install_queue: _queue.Queue = _queue.Queue(maxsize=_PIPELINE_QUEUE_SIZE)
-
-        # ------------------------------------------------------------------
-        # Download worker (producer) — pushes each result onto the queue
-        # ------------------------------------------------------------------
-        def _download_one(mod):
-            nonlocal _dl_done, _dl_bytes_done
-
-            # Per-mod domain from collection.json (e.g. Skyrim mods inside an
-            # Enderal collection); fall back to the collection's own domain.
-            mod_domain = (getattr(mod, "domain_name", "") or "").strip() or self._game_domain
-
-            # If paused or cancelled, skip this download (push None so install queue drains)
-            if _col_stop.is_set():
-                with _dl_lock:
-                    _dl_done += 1
-                _install_queue.put((mod, None, mod_domain))
-                return
-
-            def _progress_cb(cur: int, tot: int, _fid=mod.file_id, _mod=mod):
-                nonlocal _dl_bytes_done
-                with _dl_lock:
-                    prev = _per_mod_prev.get(_fid, 0)
-                    delta = max(cur - prev, 0)
-                    _per_mod_prev[_fid] = cur
-                    _dl_bytes_done += delta
-                    is_first = prev == 0 and cur > 0
-                if is_first:
-                    _nm = _mod.mod_name or _mod.file_name or ""
-                    _sz = getattr(_mod, "size_bytes", 0) or 0
-                    try:
-                        self.after(0, lambda f=_fid, n=_nm, s=_sz:
-                                   self._overlay_dl_mod_start(f, n, s))
-                    except Exception:
-                        pass
-                try:
-                    self.after(0, lambda f=_fid, c=cur, t=tot:
-                               self._overlay_dl_mod_update(f, c, t))
-                except Exception:
-                    pass
-
-            result = None
-            effective_domain = mod_domain
-
-            # ------------------------------------------------------------------
-            # Check system downloads folder and custom locations before downloading.
-            # If the archive is already present there, use it in place and skip
-            # the network download entirely.  These paths are never auto-deleted
-            # after install so the user's copy is preserved.
-            # Only runs when the "Check downloads locations" setting is enabled.
-            # ------------------------------------------------------------------
-            # Always include every cache directory (active game folder, root,
-            # and any sibling game subfolders) so archives shared between
-            # games (e.g. SkyrimSE → Enderal SE) get reused.
-            _ext_dirs: list[Path] = list(
-                list_all_cache_dirs(getattr(self._game, "name", "") or "")
-            )
-            _ext_seen: set = {p.resolve() for p in _ext_dirs}
-            if _col_cfg.get("check_download_locations", True):
-                if not is_default_downloads_disabled():
-                    _sys_dl = _get_downloads_dir()
-                    if _sys_dl.resolve() not in _ext_seen and _sys_dl.is_dir():
-                        _ext_dirs.append(_sys_dl)
-                        _ext_seen.add(_sys_dl.resolve())
-                for _xl in load_extra_download_locations():
-                    _xp = Path(_xl).expanduser().resolve()
-                    if _xp not in _ext_seen and Path(_xl).is_dir():
-                        _ext_dirs.append(Path(_xl).expanduser())
-                        _ext_seen.add(_xp)
-            for _ext_dir in _ext_dirs:
-                _ext_found, _ext_complete = _find_cached_archive(
-                    _ext_dir,
-                    mod.file_name or mod.mod_name or "",
-                    getattr(mod, "size_bytes", 0) or 0,
-                    mod.mod_id,
-                    mod.file_id,
-                    expected_md5=getattr(mod, "md5", "") or "",
-                )
-                if _ext_found and _ext_complete:
-                    self._log(
-                        f"Collection install: '{mod.mod_name}' found in "
-                        f"{_ext_dir} — using local copy, skipping download"
-                    )
-                    result = DownloadResult(
-                        success=True,
-                        file_path=_ext_found,
-                        file_name=_ext_found.name,
-                        bytes_downloaded=_ext_found.stat().st_size,
-                        game_domain=mod_domain,
-                        mod_id=mod.mod_id,
-                        file_id=mod.file_id,
-                    )
-                    with _install_lock:
-                        _external_archive_paths.add(str(_ext_found))
-                    break
-
-            try:
-                if result is None:
-                    result = downloader.download_file(
-                        game_domain=mod_domain,
-                        mod_id=mod.mod_id,
-                        file_id=mod.file_id,
-                        progress_cb=_progress_cb,
-                        cancel=_col_stop,
-                        known_file_name=mod.file_name or "",
-                        expected_size_bytes=getattr(mod, "size_bytes", 0) or 0,
-                        dest_dir=get_download_cache_dir_for_game(getattr(self._game, "name", "") or ""),
-                    )
-            except Exception as exc:
-                import traceback as _tb
+        # Archives already in the system downloads folder or a custom
+        # location are used in place and never deleted after install.
+        # Every cache directory (active game folder, root, and any sibling
+        # game subfolders) is always searched so archives shared between
+        # games (e.g. SkyrimSE → Enderal SE) get reused.
+        _ext_dirs: list[Path] = list(
+            list_all_cache_dirs(getattr(self._game, "name", "") or "")
+        )
+        _ext_seen: set = {p.resolve() for p in _ext_dirs}
+        if _col_cfg.get("check_download_locations", True):
+            if not is_default_downloads_disabled():
+                _sys_dl = _get_downloads_dir()
+                if _sys_dl.resolve() not in _ext_seen and _sys_dl.is_dir():
+                    _ext_dirs.append(_sys_dl)
+                    _ext_seen.add(_sys_dl.resolve())
+            for _xl in load_extra_download_locations():
+                _xp = Path(_xl).expanduser().resolve()
+                if _xp not in _ext_seen and Path(_xl).is_dir():
+                    _ext_dirs.append(Path(_xl).expanduser())
+                    _ext_seen.add(_xp)
+        _dl_cache_dir = get_download_cache_dir_for_game(getattr(self._game, "name", "") or "")
+
+        def _fetch(mod, mod_domain, progress_cb, cancel):
+            local = find_local_archive(mod, _ext_dirs, mod_domain)
+            if local is not None:
                 self._log(
-                    f"Collection install: download exception for '{mod.mod_name}' "
-                    f"(mod_id={mod.mod_id}, file_id={mod.file_id}): {exc}\n{_tb.format_exc()}"
+                    f"Collection install: '{mod.mod_name}' found in "
+                    f"{local.file_path.parent} — using local copy, skipping download"
                 )
-
-            # If progress_cb was never called (cached archive skip), advance by full mod size
-            mod_size = getattr(mod, "size_bytes", 0) or 0
-            if mod_size > 0 and _per_mod_prev.get(mod.file_id, 0) == 0:
-                _progress_cb(mod_size, mod_size)
-
-            with _dl_lock:
-                _dl_done += 1
-                _dl_results[mod.file_id] = (result, effective_domain)
-                done = _dl_done
-
-            # Increment archive use count under _install_lock (same lock used
-            # by consumers to decrement) to prevent a race when two mods
-            # share the same cached archive path.
-            with _install_lock:
-                if result and result.success and result.file_path:
-                    _akey = str(result.file_path)
-                    _archive_use_count[_akey] = _archive_use_count.get(_akey, 0) + 1
-                _inst_done = _install_counters["done"]
-            _set_status(f"Downloaded {done}/{_dl_total}, installed {_inst_done}/{_dl_total}\u2026")
-
-            # Remove this mod's per-mod download row from the overlay.
+                return local, True
+            return downloader.download_file(
+                game_domain=mod_domain,
+                mod_id=mod.mod_id,
+                file_id=mod.file_id,
+                progress_cb=progress_cb,
+                cancel=cancel,
+                known_file_name=mod.file_name or "",
+                expected_size_bytes=getattr(mod, "size_bytes", 0) or 0,
+                dest_dir=_dl_cache_dir,
+                priority=PRIORITY_LOW,
+            ), False
+
+        # --- Overlay / row updates, marshalled onto the Tk thread ---
+        _dl_started: set[int] = set()
+
+        def _after(fn) -> None:
             try:
-                self.after(0, lambda f=mod.file_id: self._overlay_dl_mod_finish(f))
+                self.after(0, fn)
             except Exception:
                 pass
 
-            # Mark as queued for extraction (shows in orange until a worker picks it up).
+        def _on_dl_progress(mod, cur: int, tot: int) -> None:
+            _fid = mod.file_id
+            if cur > 0 and _fid not in _dl_started:
+                _dl_started.add(_fid)
+                _nm = mod.mod_name or mod.file_name or ""
+                _sz = getattr(mod, "size_bytes", 0) or 0
+                _after(lambda f=_fid, n=_nm, s=_sz: self._overlay_dl_mod_start(f, n, s))
+            _after(lambda f=_fid, c=cur, t=tot: self._overlay_dl_mod_update(f, c, t))
+
+        def _on_dl_finished(mod, result) -> None:
+            # Remove this mod's per-mod download row from the overlay, then
+            # mark it queued for extraction (orange until a worker picks it up).
+            _after(lambda f=mod.file_id: self._overlay_dl_mod_finish(f))
             if result and result.success and result.file_path:
                 _q_name = mod.mod_name or mod.file_name or ""
-                try:
-                    self.after(0, lambda f=mod.file_id, n=_q_name:
-                               self._overlay_extracting_queue(f, n))
-                except Exception:
-                    pass
-
-            # Push onto the bounded install queue (blocks if queue is full,
-            # providing back-pressure so archives don't pile up on disk).
-            _install_queue.put((mod, result, effective_domain))
-
-        # ------------------------------------------------------------------
-        # Install worker (consumer) — pulls from queue until sentinel
-        # ------------------------------------------------------------------
-        def _install_one(mod, result, effective_domain):
-            """Install a single downloaded mod archive."""
-            if _col_stop.is_set():
-                with _install_lock:
-                    _install_counters["skipped"] += 1
-                    _install_counters["done"] += 1
-                try:
-                    self.after(0, lambda f=mod.file_id:
-                               self._overlay_extracting_remove(f))
-                except Exception:
-                    pass
-                return
-
-            if result is None or not result.success or not result.file_path:
-                _reason = ""
-                if result is None:
-                    _reason = "no result (exception during download)"
-                elif not result.success:
-                    _reason = (result.error or "unknown error").strip() or "unknown error"
-                    if not result.file_path:
-                        _reason += " (no file_path)"
-                else:
-                    _reason = "success but no file_path"
-                self._log(
-                    f"Collection install: download failed for '{mod.mod_name}' "
-                    f"(mod_id={mod.mod_id}, file_id={mod.file_id}): {_reason}"
-                )
-                with _install_lock:
-                    _install_counters["skipped"] += 1
-                    _install_counters["done"] += 1
-                try:
-                    self.after(0, lambda f=mod.file_id:
-                               self._overlay_extracting_remove(f))
-                except Exception:
-                    pass
-                return
-
-            archive_path = str(result.file_path)
-            auto_fomod = fomod_by_file_id.get(mod.file_id)
-
-            # Build prebuilt metadata so no extra API calls are needed.
-            # Prefer the mod_id from collection.json (source.modId) over the
-            # GraphQL API value, which can be wrong when Nexus associates a
-            # file with the wrong mod page.
-            try:
-                _effective_mod_id = schema_file_id_to_mod_id.get(mod.file_id, 0) or mod.mod_id
-                _pmeta = build_meta_from_download(
-                    game_domain=effective_domain,
-                    mod_id=_effective_mod_id,
-                    file_id=mod.file_id,
-                    archive_name=mod.file_name or "",
-                    from_collection=self._collection.slug or "",
-                )
-                _pmeta.nexus_name = mod.mod_name or ""
-                _pmeta.author = mod.mod_author or ""
-                _pmeta.version = mod.version or ""
-                if mod.category_id:
-                    _pmeta.category_id = mod.category_id
-                if mod.category_name:
-                    _pmeta.category_name = mod.category_name
-                if schema_file_id_to_install_type.get(mod.file_id, "").lower() == "dinput":
-                    _pmeta.root_folder = True
-            except Exception:
-                _pmeta = None
-
-            # Preferred folder name: logicalFilename from collection.json is
-            # the most specific, then schema name, then Nexus mod page name.
-            _logical = schema_file_id_to_logical.get(mod.file_id, "") or ""
-            _schema_name = schema_pos_to_name.get(
-                schema_file_id_to_pos.get(mod.file_id, -1), "") or ""
-            _preferred = _logical or _schema_name or mod.mod_name or ""
-
-            # Estimate uncompressed size and acquire memory budget before extracting.
-            # This gates concurrency by real memory pressure rather than a fixed limit.
-            _extract_est = get_uncompressed_size(archive_path)
-            _mem_budget.acquire(_extract_est)
-            _fomod_flag = {"value": False}
-            def _capture_fomod(is_fomod: bool = False):
-                _fomod_flag["value"] = is_fomod
-            _extract_display = _preferred or (mod.mod_name or mod.file_name or "")
-            _extracting_push(mod.file_id, _extract_display)
-            try:
-                folder_name = install_mod_from_archive(
-                    archive_path, self, self._log, self._game,
-                    fomod_auto_selections=auto_fomod,
-                    prebuilt_meta=_pmeta,
-                    profile_dir=profile_dir,
-                    headless=True,
-                    preferred_name=_preferred,
-                    skip_index_update=True,
-                    overwrite_existing=overwrite_existing,
-                    defer_interactive_fomod=(auto_fomod is None),
-                    on_installed=_capture_fomod,
-                )
-            finally:
-                _mem_budget.release(_extract_est)
-                _extracting_pop(mod.file_id)
-            _installed_was_fomod = _fomod_flag["value"]
-
-            if folder_name == FOMOD_DEFERRED:
-                # FOMOD with no auto-selections — queue for after all other mods install.
-                with _install_lock:
-                    _fomod_deferred.append((mod, result, effective_domain))
-                    _install_counters["done"] += 1
-                return
+                _after(lambda f=mod.file_id, n=_q_name: self._overlay_extracting_queue(f, n))
+
+        def _on_installed(mod, folder: str) -> None:
+            _install_state["installed_fids"].add(mod.file_id)
+            _after(lambda fid=mod.file_id: self._mark_row_installed(fid))
+
+        # Download producers feed a bounded queue drained by install
+        # consumers, gated by the memory and disk budgets — see
+        # Utils/collection_engine.py.
+        _pipeline = CollectionPipeline(
+            _manifest, self._game, profile_dir, _fetch,
+            log_fn=self._log,
+            game_domain=self._game_domain,
+            fetch_workers=_col_cfg["max_concurrent"],
+            install_workers=_col_cfg.get("max_extract_workers", 4),
+            download_dir=_dl_cache_dir,
+            evict_archives=(_col_cfg.get("clear_archive_after_install", False)
+                            or load_clear_archive_after_install()),
+            from_collection=self._collection.slug or "",
+            overwrite_existing=overwrite_existing,
+            parent_window=self,
+            interactive_fomods=True,
+            download_order=_col_cfg["download_order"],
+            callbacks=PipelineCallbacks(
+                status=_set_status,
+                progress=_set_progress,
+                download_progress=_on_dl_progress,
+                download_finished=_on_dl_finished,
+                extract_started=lambda m, n: _after(
+                    lambda f=m.file_id, n=n: self._overlay_extracting_add(f, n)),
+                extract_finished=lambda m: _after(
+                    lambda f=m.file_id: self._overlay_extracting_remove(f)),
+                installed=_on_installed,
+            ),
+            stop=_col_stop,
+        )
 
-            with _install_lock:
-                if folder_name:
-                    _install_results[mod.file_id] = folder_name
-                    _install_counters["installed"] += 1
-                else:
-                    _install_counters["skipped"] += 1
-                _install_counters["done"] += 1
-                done_so_far = _install_counters["done"]
-
-                # Delete archive and .fileid sidecar once all consumers of this path are done.
-                # Never delete archives that came from the user's downloads folder or
-                # a custom scan location — those belong to the user, not the cache.
-                if archive_path in _archive_use_count:
-                    _archive_use_count[archive_path] -= 1
-                    # Collection-specific "Clear archive after install" overrides
-                    # both Downloads settings (clear_archive_after_install +
-                    # keep_fomod_archives). External archives are never touched.
-                    _col_force_clear = load_collection_settings().get(
-                        "clear_archive_after_install", False)
-                    _keep_for_fomod = (
-                        not _col_force_clear
-                        and _installed_was_fomod
-                        and load_keep_fomod_archives()
-                    )
-                    _should_clear = (
-                        _col_force_clear
-                        or (load_clear_archive_after_install() and not _keep_for_fomod)
-                    )
-                    if (
-                        _archive_use_count[archive_path] == 0
-                        and _should_clear
-                        and archive_path not in _external_archive_paths
-                    ):
-                        try:
-                            delete_archive_and_sidecar(Path(archive_path))
-                        except Exception as _del_exc:
-                            self._log(
-                                f"Collection install: could not remove archive "
-                                f"'{archive_path}': {_del_exc}"
-                            )
+        # --- Show download progress inside the install overlay ---
+        if to_download and _total_bytes > 0:
+            tot_gb = _total_bytes / (1024 ** 3)
+            lbl = f"Downloading & installing {_dl_total} mod(s)  ({tot_gb:.1f} GB)"
+            _ol_ready = threading.Event()
 
-            # Update progress and mark row green — also write to registry for reconnect.
-            with _dl_lock:
-                dl_done_now = _dl_done
-            _set_status(f"Downloaded {dl_done_now}/{_dl_total}, installed {done_so_far}/{_dl_total}\u2026")
-            _set_progress(done_so_far / _dl_total if _dl_total else 1.0)
-            if mod.file_id and folder_name:
-                _install_state["installed_fids"].add(mod.file_id)
+            def _init_overlay_dl():
                 try:
-                    self.after(0, lambda fid=mod.file_id: self._mark_row_installed(fid))
+                    self._show_overlay_download(lbl)
                 except Exception:
                     pass
-
-        def _install_consumer():
-            """Long-lived consumer thread: pull items from the queue and install."""
-            while True:
-                item = _install_queue.get()
-                if item is _DONE_SENTINEL:
-                    _install_queue.task_done()
-                    break
-                mod, result, effective_domain = item
-                try:
-                    _install_one(mod, result, effective_domain)
-                except Exception as exc:
-                    self._log(f"Collection install: unexpected error installing '{mod.mod_name}': {exc}")
-                    with _install_lock:
-                        _install_counters["skipped"] += 1
-                        _install_counters["done"] += 1
                 finally:
-                    _install_queue.task_done()
-
-        # ------------------------------------------------------------------
-        # Launch the pipeline: install consumers first, then download producers.
-        # ------------------------------------------------------------------
-        if to_download:
-            _set_status(f"Downloading & installing {_dl_total} mod(s)\u2026")
-            _set_progress(0.0)
-            _to_download_sorted = sorted(
-                to_download,
-                key=lambda m: getattr(m, "size_bytes", 0) or 0,
-                reverse=(_col_cfg["download_order"] == "largest"),
-            )
-
-            # --- Show download progress inside the install overlay ---
-            if _total_bytes > 0:
-                tot_gb = _total_bytes / (1024 ** 3)
-                lbl = f"Downloading & installing {_dl_total} mod(s)  ({tot_gb:.1f} GB)"
-                _ol_ready = threading.Event()
-
-                def _init_overlay_dl():
-                    try:
-                        self._show_overlay_download(lbl)
-                    except Exception:
-                        pass
-                    finally:
-                        _ol_ready.set()
-
-                try:
-                    self.after(0, _init_overlay_dl)
-                except Exception:
                     _ol_ready.set()
-                _ol_ready.wait(timeout=5)
 
-                import time as _time_mod
-                _speed_state = {"prev_bytes": 0, "prev_time": _time_mod.monotonic()}
+            try:
+                self.after(0, _init_overlay_dl)
+            except Exception:
+                _ol_ready.set()
+            _ol_ready.wait(timeout=5)
 
-                def _poll_overlay_dl():
-                    if _dl_finished.is_set():
-                        self._update_overlay_download(_total_bytes, _total_bytes, 0.0)
-                        self.after(500, self._hide_overlay_download)
-                        return
-                    now = _time_mod.monotonic()
-                    with _dl_lock:
-                        agg = _dl_bytes_done
-                    dt = now - _speed_state["prev_time"]
-                    if dt >= 0.5:
-                        speed = (agg - _speed_state["prev_bytes"]) / dt
-                        _speed_state["prev_bytes"] = agg
-                        _speed_state["prev_time"] = now
-                        _speed_state["speed"] = speed
-                    speed_mbs = _speed_state.get("speed", 0.0) / (1024 * 1024)
-                    self._update_overlay_download(agg, _total_bytes, speed_mbs)
-                    self.after(200, _poll_overlay_dl)
+            import time as _time_mod
+            _speed_state = {"prev_bytes": 0, "prev_time": _time_mod.monotonic()}
 
-                try:
-                    self.after(200, _poll_overlay_dl)
-                except Exception:
-                    pass
+            def _poll_overlay_dl():
+                if _pipeline.downloads_finished.is_set():
+                    self._update_overlay_download(_total_bytes, _total_bytes, 0.0)
+                    self.after(500, self._hide_overlay_download)
+                    return
+                now = _time_mod.monotonic()
+                agg = _precredit_bytes + _pipeline.downloaded_bytes()
+                dt = now - _speed_state["prev_time"]
+                if dt >= 0.5:
+                    speed = (agg - _speed_state["prev_bytes"]) / dt
+                    _speed_state["prev_bytes"] = agg
+                    _speed_state["prev_time"] = now
+                    _speed_state["speed"] = speed
+                speed_mbs = _speed_state.get("speed", 0.0) / (1024 * 1024)
+                self._update_overlay_download(agg, _total_bytes, speed_mbs)
+                self.after(200, _poll_overlay_dl)
 
-            # Start install consumer threads first so they're ready for work.
-            _consumer_threads: list[threading.Thread] = []
-            for _ci in range(_INSTALL_WORKERS):
-                t = threading.Thread(target=_install_consumer, daemon=True,
-                                     name=f"col-install-{_ci}")
-                t.start()
-                _consumer_threads.append(t)
-
-            # Run download producers — each pushes results onto the queue as
-            # they finish so install consumers start working immediately.
-            with _cf.ThreadPoolExecutor(max_workers=_DL_WORKERS) as _pool:
-                list(_pool.map(_download_one, _to_download_sorted))
-
-            # All downloads done — dismiss the download progress bar.
-            _dl_finished.set()
-
-            # Signal each install consumer to shut down after draining the queue.
-            for _ in range(_INSTALL_WORKERS):
-                _install_queue.put(_DONE_SENTINEL)
-
-            # Wait for all install consumers to finish.
-            for t in _consumer_threads:
-                t.join()
-
-            # Writes a preliminary plugins.txt listing every .esp/.esm/.esl that
-            # has landed in staging so far. Called once before the first FOMOD
-            # and again between phases so later-phase FOMOD XML conditions can
-            # see plugins produced by earlier phases (Vortex-equivalent behaviour).
-            def _write_preliminary_plugins_txt(label: str) -> None:
-                try:
-                    import os as _os
-                    _plugin_exts = (".esm", ".esl", ".esp")
-                    _pre_plugins: list = []
-                    _seen_plugins: set = set()
-                    _pre_staging = self._game.get_effective_mod_staging_path()
-                    for _fid, _fname in _install_results.items():
-                        _mod_dir = _pre_staging / _fname
-                        if not _mod_dir.is_dir():
-                            continue
-                        for _root, _dirs, _files in _os.walk(str(_mod_dir)):
-                            for _fn in _files:
-                                if _fn.lower().endswith(_plugin_exts):
-                                    _pname_low = _fn.lower()
-                                    if _pname_low not in _seen_plugins:
-                                        _seen_plugins.add(_pname_low)
-                                        _pre_plugins.append(
-                                            PluginEntry(name=_fn, enabled=True)
-                                        )
-                    if _pre_plugins:
-                        _star_pre = getattr(self._game, "plugins_use_star_prefix", True)
-                        write_plugins(profile_dir / "plugins.txt", _pre_plugins,
-                                      star_prefix=_star_pre)
-                        write_loadorder(profile_dir / "loadorder.txt", _pre_plugins)
-                        self._log(
-                            f"Collection install: wrote preliminary plugins.txt "
-                            f"({len(_pre_plugins)} plugin(s)) — {label}."
-                        )
-                except Exception as _pre_exc:
-                    self._log(f"Collection install: preliminary plugins.txt skipped — {_pre_exc}")
-
-            # Before processing deferred FOMODs, write a preliminary plugins.txt
-            # so that fomod conditions can see plugins from already-installed mods.
-            if _fomod_deferred and not _col_stop.is_set():
-                _write_preliminary_plugins_txt("pre-FOMOD")
-
-            # Process deferred FOMOD mods (those without auto-selections) now that
-            # all other mods are installed so their dependencies are available.
-            # Sort by (phase, topo_pos) so lower-phase FOMODs run first — matches
-            # Vortex's phase semantics where phase N FOMODs can see files from
-            # phase N-1. Between phases, re-emit plugins.txt so XML conditions
-            # in the next phase's FOMODs see plugins produced by the previous.
-            if _fomod_deferred and not _col_stop.is_set():
-                _fomod_deferred.sort(key=lambda t: (
-                    schema_file_id_to_phase.get(t[0].file_id, 0),
-                    schema_file_id_to_pos.get(t[0].file_id, len(schema_mods)),
-                ))
-                _phase_counts: dict[int, int] = {}
-                for _t in _fomod_deferred:
-                    _ph = schema_file_id_to_phase.get(_t[0].file_id, 0)
-                    _phase_counts[_ph] = _phase_counts.get(_ph, 0) + 1
-                _phase_summary = ", ".join(
-                    f"phase {p}: {_phase_counts[p]}" for p in sorted(_phase_counts)
-                )
-                self._log(f"Installing {len(_fomod_deferred)} deferred FOMOD mod(s) ({_phase_summary})…")
-                _set_status(f"Installing {len(_fomod_deferred)} deferred FOMOD mod(s)…")
-                _current_phase: int | None = None
-                for _def_mod, _def_result, _def_domain in _fomod_deferred:
-                    _this_phase = schema_file_id_to_phase.get(_def_mod.file_id, 0)
-                    if _current_phase is not None and _this_phase != _current_phase:
-                        _write_preliminary_plugins_txt(
-                            f"phase {_current_phase} → {_this_phase}"
-                        )
-                    _current_phase = _this_phase
-                    _def_archive = str(_def_result.file_path)
-                    _def_auto_fomod = fomod_by_file_id.get(_def_mod.file_id)
-                    try:
-                        _def_mod_id = schema_file_id_to_mod_id.get(_def_mod.file_id, 0) or _def_mod.mod_id
-                        _def_pmeta = build_meta_from_download(
-                            game_domain=_def_domain,
-                            mod_id=_def_mod_id,
-                            file_id=_def_mod.file_id,
-                            archive_name=_def_mod.file_name or "",
-                            from_collection=self._collection.slug or "",
-                        )
-                        _def_pmeta.nexus_name = _def_mod.mod_name or ""
-                        _def_pmeta.author = _def_mod.mod_author or ""
-                        _def_pmeta.version = _def_mod.version or ""
-                        if _def_mod.category_id:
-                            _def_pmeta.category_id = _def_mod.category_id
-                        if _def_mod.category_name:
-                            _def_pmeta.category_name = _def_mod.category_name
-                        if schema_file_id_to_install_type.get(_def_mod.file_id, "").lower() == "dinput":
-                            _def_pmeta.root_folder = True
-                    except Exception:
-                        _def_pmeta = None
-                    _def_logical = schema_file_id_to_logical.get(_def_mod.file_id, "") or ""
-                    _def_schema_name = schema_pos_to_name.get(
-                        schema_file_id_to_pos.get(_def_mod.file_id, -1), "") or ""
-                    _def_preferred = _def_logical or _def_schema_name or _def_mod.mod_name or ""
-                    try:
-                        _def_folder = install_mod_from_archive(
-                            _def_archive, self, self._log, self._game,
-                            fomod_auto_selections=_def_auto_fomod,
-                            prebuilt_meta=_def_pmeta,
-                            profile_dir=profile_dir,
-                            headless=True,
-                            preferred_name=_def_preferred,
-                            skip_index_update=True,
-                            overwrite_existing=overwrite_existing,
-                        )
-                    except Exception as _def_exc:
-                        self._log(f"Collection install: failed to install deferred FOMOD '{_def_mod.mod_name}': {_def_exc}")
-                        _def_folder = None
-                    with _install_lock:
-                        if _def_folder:
-                            _install_results[_def_mod.file_id] = _def_folder
-                            _install_counters["installed"] += 1
-                        else:
-                            _install_counters["skipped"] += 1
-                    if _def_folder and _def_mod.file_id:
-                        _install_state["installed_fids"].add(_def_mod.file_id)
-                        try:
-                            self.after(0, lambda fid=_def_mod.file_id: self._mark_row_installed(fid))
-                        except Exception:
-                            pass
-                    # Clean up archive (decrement use count, delete when it hits zero).
-                    # Skip deletion for archives sourced from user download locations.
-                    with _install_lock:
-                        if _def_archive in _archive_use_count:
-                            _archive_use_count[_def_archive] -= 1
-                            _col_force_clear = load_collection_settings().get(
-                                "clear_archive_after_install", False)
-                            _should_clear = _col_force_clear or (
-                                load_clear_archive_after_install()
-                                and not load_keep_fomod_archives()
-                            )
-                            if (
-                                _archive_use_count[_def_archive] == 0
-                                and _should_clear
-                                and _def_archive not in _external_archive_paths
-                            ):
-                                try:
-                                    delete_archive_and_sidecar(Path(_def_archive))
-                                except Exception:
-                                    pass
-
-            _pipeline_finished.set()
-
-        installed += _install_counters["installed"]
-        skipped  += _install_counters["skipped"]
-
-        # Rebuild the mod index once for all newly installed mods rather than
-        # updating it per-mod inside the workers (which caused lock contention).
-        if _install_counters["installed"] > 0:
             try:
-                self._log("Updating mod index…")
-                _idx_path = profile_dir / "modindex.bin"
-                rebuild_mod_index(
-                    _idx_path,
-                    self._game.get_effective_mod_staging_path(),
-                    strip_prefixes=set(getattr(self._game, "strip_prefixes", None) or []),
-                    allowed_extensions=set(getattr(self._game, "install_extensions", None) or []),
-                    root_deploy_folders=set(getattr(self._game, "root_deploy_folders", None) or []),
-                    normalize_folder_case=getattr(self._game, "normalize_folder_case", True),
-                )
-            except Exception as _idx_exc:
-                self._log(f"Mod index rebuild skipped: {_idx_exc}")
+                self.after(200, _poll_overlay_dl)
+            except Exception:
+                pass
+
+        _pipeline_result = _pipeline.run(to_download)
+        _install_results = _pipeline_result.install_results
+        installed += _pipeline_result.installed
+        skipped += _pipeline_result.skipped
 
         # Build install_order from parallel results.
         for mod in to_download:
@@ -6201,8 +5509,8 @@ class CollectionsDialog(tk.Frame):
         if manifest_domain:
             from gui.game_helpers import _GAMES as _GH_GAMES
             matched = None
-            for _name, _g in _GH_GAMES.items():
-                if _g.nexus_game_domain == manifest_domain and _g.is_configured():
+            for _name, _g in _GH_GAMES.configured_items():
+                if _g.nexus_game_domain == manifest_domain:
                     matched = (_name, _g)
                     break
             if not matched:
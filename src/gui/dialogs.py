@@ -72,6 +72,7 @@ import gui.theme as _theme
 from gui.path_utils import _to_wine_path
 from Utils.config_paths import get_exe_args_path, get_profile_exe_args_path, get_custom_game_images_dir, get_vcredist_cache_path, get_dotnet_cache_dir, get_custom_games_dir
 from Utils.exe_args_builder import EXE_PROFILES
+from Utils.filemap_bin import open_filemap
 from gui.ctk_components import CTkAlert, CTkLoader, ICON_PATH
 from gui.tk_tooltip import TkTooltip
 from gui.wheel_compat import LEGACY_WHEEL_REDUNDANT
@@ -235,14 +236,11 @@ def confirm_cet_symlink(parent, game) -> bool:
         return True
     found = False
     try:
-        with Path(filemap_path).open(encoding="utf-8") as f:
-            for line in f:
-                if "\t" not in line:
-                    continue
-                rel_str, _ = line.rstrip("\n").split("\t", 1)
-                if rel_str.lower().endswith("cyber_engine_tweaks.asi"):
-                    found = True
-                    break
+        fm = open_filemap(Path(filemap_path))
+        found = fm is not None and any(
+            rel_str.lower().endswith("cyber_engine_tweaks.asi")
+            for rel_str, _ in fm.with_extensions([".asi"])
+        )
     except Exception:
         return True
     if not found:
@@ -7,9 +7,9 @@ import json
 import shutil
 from pathlib import Path
 
-from Games.base_game import BaseGame
+from Utils.filemap_bin import open_filemap
 from Utils.config_paths import get_config_dir, get_profiles_dir, get_last_game_path, get_loot_game_dir
-from Utils.game_loader import discover_games
+from Utils.game_loader import GameRegistry, discover_games
 from Utils.plugin_loader import discover_plugins
 from Utils.profile_state import (
     merge_profile_settings,
@@ -17,8 +17,9 @@ from Utils.profile_state import (
     write_profile_settings,
 )
 
-# Game handlers — populated by _load_games() when first called
-_GAMES: dict[str, BaseGame] = {}
+# Game handlers — populated by _load_games() when first called.  Handlers are
+# imported on first lookup; see Utils.game_loader.GameRegistry.
+_GAMES: GameRegistry = GameRegistry()
 
 
 def _vanilla_plugins_cache_path(game) -> Path | None:
@@ -84,18 +85,11 @@ def _vanilla_plugins_for_game(game) -> dict[str, str]:
         profiles_root = game.get_profile_root() / "profiles"
         if profiles_root.is_dir():
             for profile_dir in profiles_root.iterdir():
-                fm = profile_dir / "filemap.txt"
-                if not fm.is_file():
+                fm = open_filemap(profile_dir / "filemap.txt")
+                if fm is None:
                     continue
-                with fm.open(encoding="utf-8") as f:
-                    for line in f:
-                        line = line.rstrip("\n")
-                        if "\t" not in line:
-                            continue
-                        rel, _ = line.split("\t", 1)
-                        fname = rel.replace("\\", "/").rsplit("/", 1)[-1].lower()
-                        if Path(fname).suffix.lower() in exts:
-                            mod_plugin_names.add(fname)
+                for rel, _ in fm.with_extensions(exts):
+                    mod_plugin_names.add(rel.replace("\\", "/").rsplit("/", 1)[-1].lower())
         vanilla_only = {k: v for k, v in all_plugins.items() if k not in mod_plugin_names}
         # Only write the cache if we ended up with a non-empty vanilla set.
         # If mod_plugin_names is empty (nothing deployed yet) vanilla_only ==
@@ -118,15 +112,13 @@ def _vanilla_plugins_for_game(game) -> dict[str, str]:
 
 def _load_games() -> list[str]:
     """Discover game handlers and return sorted display names (configured games only)."""
-    global _GAMES
-    new_games = discover_games()
-    _GAMES.clear()
-    _GAMES.update(new_games)
+    _GAMES.replace(discover_games())
     discover_plugins()
-    for game in _GAMES.values():
-        if getattr(game, "loot_sort_enabled", False) and getattr(game, "game_id", None):
-            get_loot_game_dir(game.game_id)
-    names = sorted(name for name, game in _GAMES.items() if game.is_configured())
+    for name in _GAMES:
+        info = _GAMES.info(name)
+        if info.get("loot_sort_enabled") and info.get("game_id"):
+            get_loot_game_dir(info["game_id"])
+    names = sorted(_GAMES.configured_names())
     return names if names else ["No games configured"]
 
 
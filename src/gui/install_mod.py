@@ -29,49 +29,25 @@ _tmp_space_lock = threading.Lock()
 _tmp_space_reserved: int = 0  # bytes currently claimed by in-flight extractions
 
 
-def get_uncompressed_size(path: str, compressed_size: int = 0) -> int:
+def get_uncompressed_size(path: str, compressed_size: int = 0, md5: str = "") -> int:
     """Return best-effort total uncompressed size of the archive in bytes.
 
-    Tries archive metadata first (zipfile headers, ``7z l -slt``), then falls
-    back to a 15× multiplier of *compressed_size* (handles extreme texture
-    packs).  If *compressed_size* is 0, the on-disk file size is used instead.
+    Uses the cached archive listing (``get_archive_listing``, which reads
+    zip headers or ``7z l -slt`` once per archive and remembers the result),
+    then falls back to a 15× multiplier of *compressed_size* (handles extreme
+    texture packs).  If *compressed_size* is 0, the on-disk file size is used
+    instead.  *md5*, when known, lets a moved copy reuse a cached listing.
     """
     if compressed_size <= 0:
         try:
             compressed_size = os.path.getsize(path)
         except OSError:
             compressed_size = 0
-    _ext = path.lower()
-    # ZIP: fast metadata read via zipfile
-    if _ext.endswith(".zip"):
-        try:
-            with zipfile.ZipFile(path, "r") as _zf:
-                _total = sum(m.file_size for m in _zf.infolist())
-            if _total > 0:
-                return _total
-        except Exception:
-            pass
-    # 7z/rar/zip fallback: use `7z l -slt` which prints Size: per entry
-    _7z_bin = shutil.which("7zzs") or shutil.which("7zz") or shutil.which("7z") or shutil.which("7za")
-    if _7z_bin:
-        try:
-            import subprocess
-            _res = subprocess.run(
-                [_7z_bin, "l", "-slt", path],
-                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
-                text=True, timeout=30,
-            )
-            _total = 0
-            for _line in _res.stdout.splitlines():
-                if _line.startswith("Size = "):
-                    try:
-                        _total += int(_line.split("=", 1)[1].strip())
-                    except ValueError:
-                        pass
-            if _total > 0:
-                return _total
-        except Exception:
-            pass
+    _entries = get_archive_listing(path, md5=md5)
+    if _entries:
+        _total = listing_uncompressed_size(_entries)
+        if _total > 0:
+            return _total
     # Fallback: assume a generous 15× expansion (handles extreme texture packs)
     return compressed_size * 15
 
@@ -157,14 +133,21 @@ class ExtractionMemoryBudget:
             self._cv.notify_all()
         self._semaphore.release()
 
-# py7zr / liblzma is not safe to run in multiple threads simultaneously —
-# concurrent extractions can segfault.  Serialize all py7zr calls globally.
-_py7zr_lock = threading.Lock()
+    # Address space granted to a py7zr worker on top of the spike-scaled
+    # estimate: interpreter, py7zr buffers and up to a 1.5 GB LZMA dictionary.
+    PROCESS_BASE_BYTES = 2 * 1024 * 1024 * 1024
+
+    @classmethod
+    def process_memory_limit(cls, estimated_bytes: int) -> int:
+        """Return the RLIMIT_AS for a worker process extracting an archive
+        of *estimated_bytes* uncompressed — the same spike-scaled cost that
+        ``acquire`` reserves, capped by the RAM actually available."""
+        want = int(estimated_bytes * cls.SPIKE_FACTOR) + cls.PROCESS_BASE_BYTES
+        return min(want, _get_available_memory_bytes() + cls.PROCESS_BASE_BYTES)
+
 from pathlib import Path
 from datetime import datetime
 
-import py7zr
-
 from gui.dialogs import (
     _ReplaceModDialog,
     _SelectFilesDialog,
@@ -175,14 +158,27 @@ from gui.fomod_dialog import FomodDialog
 from gui.mod_name_utils import _strip_title_metadata, _suggest_mod_names
 from Utils.fomod_parser import detect_fomod, parse_module_config, parse_mod_info
 from Utils.fomod_installer import resolve_files, check_module_dependencies
-from Utils.ui_config import load_dev_mode, load_rename_mod_after_install
+from Utils import fomod_cache
+from Utils import perf_trace
+from Utils import py7zr_pool
+from Utils.archive_listing import (
+    ArchiveEntry,
+    TAR_SUFFIXES,
+    get_archive_listing,
+    listing_uncompressed_size,
+    normalize_member_path,
+)
+from Utils.ui_config import load_dev_mode, load_rename_mod_after_install, load_direct_staging_extract
+from Utils.disk_budget import fs_key
 from Utils.config_paths import get_fomod_selections_path
+from Utils.extract_store import get_extract_store
 from Utils.plugins import read_plugins, append_plugin, read_loadorder, write_loadorder, PluginEntry
 from Utils.modlist import prepend_mod, ensure_mod_preserving_position, read_modlist, write_modlist, ModEntry
 from Utils.profile_state import read_separator_locks, write_separator_locks
 from Utils.filemap import _scan_dir, update_mod_index
 from Utils.bsa_filemap import update_bsa_index
 from Nexus.nexus_meta import write_meta, resolve_nexus_meta_for_archive
+from Nexus.meta_catalog import refresh_catalog_entries
 from gui.ctk_components import CTkNotification
 
 
@@ -583,6 +579,151 @@ def _resolve_direct_files(extract_dir: str) -> list[tuple[str, str, bool]]:
     return result
 
 
+# FOMOD archives at least this large are installed in two phases: the
+# installer files first, then only what the wizard selected.  Below it a
+# single full extraction is cheaper than the extra listing/extract passes.
+_SELECTIVE_FOMOD_MIN_BYTES = 64 * 1024 * 1024
+_FOMOD_IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp")
+_FOMOD_CONFIG_SUFFIX = "fomod/moduleconfig.xml"
+
+
+def _plan_fomod_preview(entries: list[ArchiveEntry]) -> tuple[str, list[str]] | None:
+    """
+    From an archive listing, return (mod_root_prefix, members) for the first
+    phase of a selective FOMOD install: everything under the ``fomod/``
+    folder plus every image the wizard might show.  *mod_root_prefix* is the
+    archive path of the folder containing ``fomod/`` ("" or "Wrapper/").
+
+    Returns None unless the archive holds exactly one ModuleConfig.xml.
+    """
+    configs = [
+        e.path for e in entries
+        if not e.is_dir
+        and e.path.lower().endswith(_FOMOD_CONFIG_SUFFIX)
+        and (len(e.path) == len(_FOMOD_CONFIG_SUFFIX)
+             or e.path[-len(_FOMOD_CONFIG_SUFFIX) - 1] == "/")
+    ]
+    if len(configs) != 1:
+        return None
+    prefix = configs[0][:-len(_FOMOD_CONFIG_SUFFIX)]
+    fomod_dir = configs[0][:-len("moduleconfig.xml")].lower()
+    prefix_lower = prefix.lower()
+    members = [
+        e.path for e in entries
+        if not e.is_dir and (
+            e.path.lower().startswith(fomod_dir)
+            or (e.path.lower().startswith(prefix_lower)
+                and e.path.lower().endswith(_FOMOD_IMAGE_EXTS))
+        )
+    ]
+    return prefix, members
+
+
+def _select_fomod_members(entries: list[ArchiveEntry], prefix: str,
+                          file_list: list[tuple[str, str, bool]]) -> list[str]:
+    """
+    Map ``resolve_files()`` sources (relative to the FOMOD mod root, any
+    case) onto the archive members that have to be extracted for them.
+    """
+    files: dict[str, str] = {}  # lower path relative to mod root -> member path
+    plen = len(prefix)
+    prefix_lower = prefix.lower()
+    for e in entries:
+        if not e.is_dir and e.path.lower().startswith(prefix_lower):
+            files[e.path[plen:].lower()] = e.path
+    wanted: set[str] = set()
+    for src, _dst, is_folder in file_list:
+        key = src.replace("\\", "/").strip("/").lower()
+        if not key:
+            return sorted(files.values())
+        if not is_folder:
+            member = files.get(key)
+            if member is not None:
+                wanted.add(member)
+            continue
+        folder = key + "/"
+        wanted.update(m for rel, m in files.items() if rel.startswith(folder))
+    return sorted(wanted)
+
+
+def _extract_selected(archive_path: str, extract_dir: str,
+                      members: list[str], log_fn) -> bool:
+    """
+    Extract only *members* (archive paths as returned by ``list_archive``)
+    into *extract_dir*, keeping their archive-relative layout.
+
+    Tries unrar (RAR only), 7z and bsdtar with a list file, then the matching
+    pure-Python reader.  Returns True once every member is on disk.
+    """
+    import subprocess
+    if not members:
+        return True
+    lower = archive_path.lower()
+    is_tarball = lower.endswith(TAR_SUFFIXES)
+
+    def _complete() -> bool:
+        return all(os.path.isfile(os.path.join(extract_dir, m)) for m in members)
+
+    attempts: list[tuple[str, list[str]]] = []
+    fd, list_path = tempfile.mkstemp(prefix="modmgr_list_", suffix=".txt")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("\n".join(members) + "\n")
+        if lower.endswith(".rar") and shutil.which("unrar"):
+            attempts.append(("unrar", ["unrar", "x", "-y", archive_path,
+                                       f"@{list_path}", extract_dir + os.sep]))
+        _7z_bin = shutil.which("7zzs") or shutil.which("7zz") or shutil.which("7z") or shutil.which("7za")
+        # 7z needs two passes for compressed tarballs — leave those to bsdtar.
+        if _7z_bin and (not is_tarball or lower.endswith(".tar")):
+            # -spd: list entries are literal names, not wildcards.
+            attempts.append(("7z", [_7z_bin, "x", archive_path, f"-o{extract_dir}",
+                                    "-y", "-mmt=on", "-spd", "-scsUTF-8",
+                                    f"@{list_path}"]))
+        _bsdtar_bin = shutil.which("bsdtar")
+        if _bsdtar_bin:
+            attempts.append(("bsdtar", [_bsdtar_bin, "-xf", archive_path,
+                                        "-C", extract_dir, "-T", list_path]))
+        for label, cmd in attempts:
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE, text=True)
+            if result.returncode == 0 and _complete():
+                log_fn(f"Extracted {len(members)} file(s) with {label}.")
+                return True
+            log_fn(f"{label} selective extraction failed ({result.stderr.strip()[:200]}).")
+    finally:
+        try:
+            os.unlink(list_path)
+        except OSError:
+            pass
+
+    wanted = set(members)
+    try:
+        if lower.endswith(".zip"):
+            with zipfile.ZipFile(archive_path, "r") as z:
+                infos = [i for i in z.infolist()
+                         if normalize_member_path(i.filename) in wanted]
+                for i in infos:
+                    i.filename = i.filename.replace("\\", "/")
+                z.extractall(extract_dir, infos)
+        elif lower.endswith(".7z"):
+            py7zr_pool.extract(archive_path, extract_dir, targets=list(members))
+        elif is_tarball:
+            with tarfile.open(archive_path, "r:*") as t:
+                t.extractall(extract_dir, members=[
+                    m for m in t.getmembers() if normalize_member_path(m.name) in wanted
+                ], filter="fully_trusted")
+        elif lower.endswith(".rar"):
+            import rarfile
+            with rarfile.RarFile(archive_path, "r") as r:
+                r.extractall(extract_dir, [
+                    i for i in r.infolist() if normalize_member_path(i.filename) in wanted
+                ])
+    except Exception as exc:
+        log_fn(f"Selective extraction failed ({exc}).")
+        return False
+    return _complete()
+
+
 def _resolve_src_case(src_root: Path, src_rel: str,
                       _cache: "dict[Path, dict[str, str]] | None" = None) -> Path:
     """
@@ -784,6 +925,97 @@ def _copy_file_list(file_list: list[tuple[str, str, bool]],
     log_fn(f"Copied {copied} item(s) to staging area.")
 
 
+def _fold_dst_case(dsts: list[str]) -> list[str]:
+    """
+    Spell every destination directory the way it first appears in *dsts*,
+    so 'Textures/a.dds' and 'textures/b.dds' land in one 'Textures' folder —
+    the in-list counterpart of _resolve_dst_case() for a dest_root that does
+    not exist yet.  File names keep their own spelling.
+    """
+    spelled: dict[str, str] = {}   # lowercase dir path -> first spelling
+    out: list[str] = []
+    for d in dsts:
+        parts = d.split("/")
+        cur = ""
+        for part in parts[:-1]:
+            path = f"{cur}/{part}" if cur else part
+            cur = spelled.setdefault(path.lower(), path)
+        out.append(f"{cur}/{parts[-1]}" if cur else parts[-1])
+    return out
+
+
+def _move_file_list(file_list: list[tuple[str, str, bool]],
+                    src_root: str, dest_root: Path, log_fn) -> bool:
+    """
+    Rename each (source, destination, False) entry from src_root into a
+    dest_root that does not exist yet — a metadata-only install for archives
+    extracted on the staging filesystem.
+
+    Destinations get the same case handling as _copy_file_list(): folders
+    that differ only in case are merged (_fold_dst_case) and, of several
+    entries with the same case-insensitive destination, the last one wins.
+
+    When the list maps one extracted folder onto dest_root unchanged (the
+    usual result of prefix stripping) and nothing needed case folding, that
+    folder is renamed in one call.  Otherwise files are renamed one by one;
+    if a rename fails part-way (e.g. EXDEV) the remaining entries are copied
+    with _copy_file_list().
+
+    Returns False without touching anything when the list is not eligible
+    (dest_root exists, folder entries, or a source used twice).
+    """
+    if dest_root.exists() or not file_list:
+        return False
+    srcs = [s.replace("\\", "/") for s, _d, _f in file_list]
+    if any(f for _s, _d, f in file_list) or len(set(srcs)) != len(srcs):
+        return False
+    raw_dsts = [d.replace("\\", "/") for _s, d, _f in file_list]
+    if any(not d or d.endswith("/") for d in raw_dsts):
+        return False
+    dsts = _fold_dst_case(raw_dsts)
+    # Later entries win a case-insensitive destination (FOMOD priority).
+    last: dict[str, int] = {d.lower(): i for i, d in enumerate(dsts)}
+    folded = dsts != raw_dsts or len(last) != len(dsts)
+
+    root = Path(src_root)
+    dest_root.parent.mkdir(parents=True, exist_ok=True)
+
+    # Whole-tree fast path: src == prefix + dst for every entry and nothing
+    # else lives under prefix.
+    prefix = srcs[0][:-len(dsts[0])] if srcs[0].endswith(dsts[0]) else None
+    if not folded and prefix is not None and (not prefix or prefix.endswith("/")) and all(
+        s == prefix + d for s, d in zip(srcs, dsts)
+    ):
+        tree = root / prefix if prefix else root
+        on_disk = sum(len(files) for _r, _dirs, files in os.walk(tree))
+        if on_disk == len(srcs):
+            try:
+                os.rename(tree, dest_root)
+                log_fn(f"Moved {len(srcs)} item(s) to staging area.")
+                return True
+            except OSError:
+                pass
+
+    entries = [(srcs[i], dsts[i]) for i in sorted(last.values())]
+    moved = 0
+    made: set[Path] = set()
+    for i, (src, dst) in enumerate(entries):
+        src_path = root / src
+        dst_path = dest_root / dst
+        try:
+            if dst_path.parent not in made:
+                dst_path.parent.mkdir(parents=True, exist_ok=True)
+                made.add(dst_path.parent)
+            os.rename(src_path, dst_path)
+        except OSError:
+            _copy_file_list([(s, d, False) for s, d in entries[i:]],
+                            src_root, dest_root, log_fn)
+            break
+        moved += 1
+    log_fn(f"Moved {moved} item(s) to staging area.")
+    return True
+
+
 FOMOD_DEFERRED = "__FOMOD_DEFERRED__"
 
 
@@ -828,6 +1060,7 @@ def _maybe_queue_rename_after_install(parent_window, mod_panel, headless: bool,
         pass
 
 
+@perf_trace.traced("install")
 def install_mod_from_archive(archive_path: str, parent_window, log_fn,
                              game, mod_panel=None,
                              on_installed=None,
@@ -841,7 +1074,8 @@ def install_mod_from_archive(archive_path: str, parent_window, log_fn,
                              overwrite_existing: "bool | None" = None,
                              progress_fn=None,
                              clear_progress_fn=None,
-                             defer_interactive_fomod: bool = False) -> None:
+                             defer_interactive_fomod: bool = False,
+                             archive_md5: str = "") -> None:
     """
     Extract archive to a temp directory, detect FOMOD, run the wizard if
     present, then copy the resolved files into the game's mod staging area.
@@ -867,6 +1101,11 @@ def install_mod_from_archive(archive_path: str, parent_window, log_fn,
         into the mod staging folder (inside a folder named after the archive
         stem) instead of being extracted.  Useful for games that expect mods
         to remain in zip/archive format.
+
+    archive_md5 : str
+        The archive's md5 when already known (e.g. from a collection
+        manifest).  Lets the listing and FOMOD caches recognise a moved or
+        re-downloaded copy of the same file.
     """
     ext = archive_path.lower()
     raw_stem = os.path.splitext(os.path.basename(archive_path))[0]
@@ -989,15 +1228,48 @@ def install_mod_from_archive(archive_path: str, parent_window, log_fn,
     except OSError:
         _archive_size = 0
 
+    perf_trace.annotate(archive=os.path.basename(archive_path))
+    perf_trace.count("bytes", _archive_size)
     _extract_size_estimate = get_uncompressed_size(archive_path, _archive_size)
     _staging = game.get_effective_mod_staging_path()
+    # Same profile the modlist is written to below.
+    if mod_panel is not None and mod_panel._modlist_path is not None:
+        _trace_profile = mod_panel._modlist_path.parent
+    elif profile_dir is not None:
+        _trace_profile = profile_dir
+    else:
+        _trace_profile = getattr(game, "_active_profile_dir", None)
+    if _trace_profile:
+        perf_trace.annotate(profile_dir=_trace_profile)
     _tmp_claimed = False
+    # Direct mode: extract into a scratch folder beside staging (same
+    # filesystem) so a fresh install can be renamed into place instead of
+    # copied out of /tmp — see _move_file_list().
+    _direct_staging = bool(
+        _staging
+        and load_direct_staging_extract()
+        and fs_key(_staging.parent) == fs_key(_staging)
+    )
+    # Extract cache: archives are extracted inside the store's own folder so
+    # a finished extraction can be hardlinked into it, and a stored one
+    # linked back out, without copying.  The store shares staging's
+    # filesystem so the later move into staging links too.
+    _extract_store = get_extract_store(_staging)
+    _store_md5 = ""
+    if _extract_store is not None:
+        _store_md5 = (archive_md5 or _extract_store.archive_md5(archive_path)).lower()
+        if not _store_md5:
+            _extract_store = None
     with _tmp_space_lock:
         try:
             _tmp_stat = os.statvfs("/tmp")
             _tmp_free = _tmp_stat.f_frsize * _tmp_stat.f_bavail
             _tmp_headroom = 512 * 1024 * 1024  # keep 512 MB free in /tmp
-            _use_tmp = _extract_size_estimate + _tmp_headroom + _tmp_space_reserved < _tmp_free
+            _use_tmp = (
+                not _direct_staging
+                and _extract_store is None
+                and _extract_size_estimate + _tmp_headroom + _tmp_space_reserved < _tmp_free
+            )
         except OSError:
             _use_tmp = False
         if _use_tmp:
@@ -1005,6 +1277,8 @@ def install_mod_from_archive(archive_path: str, parent_window, log_fn,
             _tmp_claimed = True
     if _use_tmp:
         _tmp_parent = None  # let mkdtemp use the default /tmp
+    elif _extract_store is not None:
+        _tmp_parent = _extract_store.work_dir()
     else:
         _tmp_parent = _staging.parent if _staging else None
     try:
@@ -1021,170 +1295,93 @@ def install_mod_from_archive(archive_path: str, parent_window, log_fn,
                 f"'{os.path.basename(archive_path)}'"
             )
 
-        if ext.endswith(".zip"):
-            import subprocess
-            _zip_done = False
-            # For large ZIPs, prefer native tools (7z or bsdtar) over Python's
-            # single-threaded zipfile — they use C/multi-threaded extraction.
-            _archive_mb = os.path.getsize(archive_path) / (1024 * 1024)
-            _7z_bin = shutil.which("7zzs") or shutil.which("7zz") or shutil.which("7z") or shutil.which("7za")
-            _bsdtar_bin = shutil.which("bsdtar")
-            _has_native = _7z_bin or _bsdtar_bin
-            # Python's zipfile is pure-Python and single-threaded, so use it
-            # only for very small archives (where native-tool subprocess
-            # overhead dominates) or when no native tool is available.
-            _use_python_zip = _archive_mb < 10 or not _has_native
-            if _use_python_zip:
-                try:
-                    log_fn("Extracting with zipfile…")
-                    with zipfile.ZipFile(archive_path, "r") as z:
-                        members = z.infolist()
-                        # Normalise Windows backslash paths so Linux extractors
-                        # create the correct folder hierarchy instead of treating
-                        # the whole path as a single filename.
-                        _has_backslash = any("\\" in m.filename for m in members)
-                        if _has_backslash:
-                            for m in members:
-                                m.filename = m.filename.replace("\\", "/")
-                        if progress_fn is not None:
-                            progress_fn(0, 0, "Extracting…")
-                        z.extractall(extract_dir, members)
-                    _zip_done = True
-                except Exception as e_zip:
-                    log_fn(f"zipfile failed ({e_zip}), retrying with native tools…")
-            if not _zip_done and _7z_bin:
-                shutil.rmtree(extract_dir, ignore_errors=True)
-                os.makedirs(extract_dir, exist_ok=True)
-                if progress_fn is not None:
-                    progress_fn(0, 0, "Extracting…")
-                result = subprocess.run(
-                    [_7z_bin, "x", archive_path, f"-o{extract_dir}", "-y", "-mmt=on"],
-                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
-                )
-                if result.returncode == 0:
-                    _zip_done = True
-                    log_fn("Extracted with 7z.")
-                else:
-                    log_fn(f"7z failed ({result.stderr.strip()}), retrying with bsdtar…")
-            if not _zip_done and _bsdtar_bin:
+        # The same archive was extracted by an earlier install: link the
+        # stored tree out instead of running an extractor.
+        _from_store = False
+        if _extract_store is not None and _extract_store.has(_store_md5):
+            if _extract_store.checkout(_store_md5, extract_dir, _link_or_copy):
+                _from_store = True
+                log_fn("Archive found in the extract cache — skipping extraction.")
+            else:
                 shutil.rmtree(extract_dir, ignore_errors=True)
                 os.makedirs(extract_dir, exist_ok=True)
+
+        # A FOMOD installer parsed from this archive before: when its choices
+        # are already decided (collection replay) or the install is going to
+        # be deferred, nothing needs extracting up front — resolve_files()
+        # runs on the cached config and only the selected members are pulled
+        # out of the archive.
+        _fomod_listing: list[ArchiveEntry] | None = None
+        _fomod_prefix = ""
+        _cached_fomod = fomod_cache.lookup(archive_path, archive_md5)
+        _fomod_from_cache = False
+        if not _from_store and _cached_fomod is not None and (fomod_auto_selections is not None
+                                          or defer_interactive_fomod):
+            _fomod_listing = get_archive_listing(archive_path, md5=archive_md5)
+            if _fomod_listing is not None:
+                _fomod_prefix = _cached_fomod.prefix
+                _fomod_from_cache = True
+                log_fn("FOMOD installer known from a previous install — skipping extraction.")
+
+        # Large FOMOD archives: extract only fomod/ and the option images now,
+        # run the wizard, then extract just the selected files once
+        # resolve_files() has picked them.  Anything unexpected falls back to
+        # the full extraction below.
+        if (not _fomod_from_cache and not _from_store
+                and _archive_size >= _SELECTIVE_FOMOD_MIN_BYTES):
+            _entries = get_archive_listing(archive_path, md5=archive_md5)
+            _preview = _plan_fomod_preview(_entries) if _entries else None
+            if _preview is not None:
+                _fomod_prefix, _preview_members = _preview
+                log_fn(f"FOMOD archive — extracting installer files only "
+                       f"({len(_preview_members)} of {len(_entries)} entries)…")
                 if progress_fn is not None:
                     progress_fn(0, 0, "Extracting…")
-                result = subprocess.run(
-                    [_bsdtar_bin, "-xf", archive_path, "-C", extract_dir],
-                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
-                )
-                if result.returncode == 0:
-                    _zip_done = True
-                    log_fn("Extracted with bsdtar.")
-                else:
-                    log_fn(f"bsdtar failed ({result.stderr.strip()}).")
-            if not _zip_done:
-                # Last resort: Python zipfile if native tools failed or weren't tried
-                try:
+                if _extract_selected(archive_path, extract_dir, _preview_members, log_fn):
+                    _hit = detect_fomod(extract_dir)
+                    if _hit and os.path.normpath(_hit[0]) == os.path.normpath(
+                            os.path.join(extract_dir, _fomod_prefix)):
+                        _fomod_listing = _entries
+                if _fomod_listing is None:
+                    log_fn("Partial FOMOD extraction unavailable — extracting the whole archive.")
                     shutil.rmtree(extract_dir, ignore_errors=True)
                     os.makedirs(extract_dir, exist_ok=True)
-                    log_fn("Extracting with zipfile (fallback)…")
-                    with zipfile.ZipFile(archive_path, "r") as z:
-                        members = z.infolist()
-                        if any("\\" in m.filename for m in members):
-                            for m in members:
-                                m.filename = m.filename.replace("\\", "/")
-                        if progress_fn is not None:
-                            progress_fn(0, 0, "Extracting…")
-                        z.extractall(extract_dir, members)
-                    _zip_done = True
-                except Exception as e_zip2:
-                    raise RuntimeError(
-                        f"All extraction methods failed for ZIP: {e_zip2}\n"
-                        "The archive may use a compression method (e.g. "
-                        "deflate64) that requires the '7z' binary. Install "
-                        "the 'p7zip' package or use the Flatpak build."
-                    )
-        elif ext.endswith(".7z"):
-            import subprocess
-            _7z_done = False
-            _archive_bytes = os.path.getsize(archive_path)
-            _archive_mb = _archive_bytes / (1024 * 1024)
-            # Prefer native 7z binary (multi-threaded) or bsdtar (native C)
-            # over py7zr which is single-threaded and globally serialized.
-            _7z_bin = shutil.which("7zzs") or shutil.which("7zz") or shutil.which("7z") or shutil.which("7za")
-            _bsdtar_bin = shutil.which("bsdtar")
-            if _7z_bin:
-                if progress_fn is not None:
-                    progress_fn(0, 0, "Extracting…")
-                result = subprocess.run(
-                    [_7z_bin, "x", archive_path, f"-o{extract_dir}", "-y", "-mmt=on"],
-                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
-                )
-                if result.returncode == 0:
-                    _7z_done = True
-                    log_fn("Extracted with 7z.")
-                else:
-                    log_fn(f"7z failed ({result.stderr.strip()}), trying next method…")
-            if not _7z_done and _bsdtar_bin:
-                shutil.rmtree(extract_dir, ignore_errors=True)
-                os.makedirs(extract_dir, exist_ok=True)
-                if progress_fn is not None:
-                    progress_fn(0, 0, "Extracting…")
-                result = subprocess.run(
-                    [_bsdtar_bin, "-xf", archive_path, "-C", extract_dir],
-                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
-                )
-                if result.returncode == 0:
-                    _7z_done = True
-                    log_fn("Extracted with bsdtar.")
-                else:
-                    log_fn(f"bsdtar failed ({result.stderr.strip()}), trying py7zr…")
-            if not _7z_done:
-                # Fallback to py7zr — single-threaded and serialized, but works
-                # when no native tools are available.
-                # Check available RAM; keep a 512 MB safety margin.
-                _avail_mb = _get_available_memory_bytes() / (1024 * 1024)
-                _py7zr_safe = _archive_mb < (_avail_mb - 512)
-                if _py7zr_safe:
+
+        with perf_trace.span("extract"):
+            if _fomod_listing is not None or _from_store:
+                pass
+            elif ext.endswith(".zip"):
+                import subprocess
+                _zip_done = False
+                # For large ZIPs, prefer native tools (7z or bsdtar) over Python's
+                # single-threaded zipfile — they use C/multi-threaded extraction.
+                _archive_mb = os.path.getsize(archive_path) / (1024 * 1024)
+                _7z_bin = shutil.which("7zzs") or shutil.which("7zz") or shutil.which("7z") or shutil.which("7za")
+                _bsdtar_bin = shutil.which("bsdtar")
+                _has_native = _7z_bin or _bsdtar_bin
+                # Python's zipfile is pure-Python and single-threaded, so use it
+                # only for very small archives (where native-tool subprocess
+                # overhead dominates) or when no native tool is available.
+                _use_python_zip = _archive_mb < 10 or not _has_native
+                if _use_python_zip:
                     try:
-                        log_fn("Extracting with py7zr…")
-                        if progress_fn is not None:
-                            progress_fn(0, 0, "Extracting…")
-                        with _py7zr_lock:
-                            with py7zr.SevenZipFile(archive_path, "r") as z:
-                                z.extractall(extract_dir)
-                        _7z_done = True
-                    except Exception as e7:
-                        log_fn(f"py7zr failed ({e7}).")
-                else:
-                    log_fn(f"Archive is {_archive_mb:.0f} MB, only {_avail_mb:.0f} MB RAM available — skipping py7zr to avoid OOM.")
-            if not _7z_done:
-                raise RuntimeError(f"All extraction methods failed for 7z archive.")
-        elif any(ext.endswith(s) for s in (".tar.gz", ".tar.bz2", ".tar.xz", ".tar")):
-            import subprocess
-            _tar_done = False
-            # Prefer native multi-threaded tools over Python's single-threaded
-            # tarfile module — especially important for .tar.xz which is slow
-            # to decompress in pure Python.
-            _7z_bin = shutil.which("7zzs") or shutil.which("7zz") or shutil.which("7z") or shutil.which("7za")
-            _bsdtar_bin = shutil.which("bsdtar")
-            if _bsdtar_bin:
-                # bsdtar handles every tar variant natively and is the fastest
-                # option for streaming tar decompression.
-                log_fn("Extracting with bsdtar…")
-                if progress_fn is not None:
-                    progress_fn(0, 0, "Extracting…")
-                result = subprocess.run(
-                    [_bsdtar_bin, "-xf", archive_path, "-C", extract_dir],
-                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
-                )
-                if result.returncode == 0:
-                    _tar_done = True
-                    log_fn("Extracted with bsdtar.")
-                else:
-                    log_fn(f"bsdtar failed ({result.stderr.strip()}), trying 7z…")
-            if not _tar_done and _7z_bin:
-                # 7z needs two passes for .tar.gz/.tar.xz/.tar.bz2 (decompress,
-                # then untar).  For a plain .tar a single pass suffices.
-                if ext.endswith(".tar"):
+                        log_fn("Extracting with zipfile…")
+                        with zipfile.ZipFile(archive_path, "r") as z:
+                            members = z.infolist()
+                            # Normalise Windows backslash paths so Linux extractors
+                            # create the correct folder hierarchy instead of treating
+                            # the whole path as a single filename.
+                            _has_backslash = any("\\" in m.filename for m in members)
+                            if _has_backslash:
+                                for m in members:
+                                    m.filename = m.filename.replace("\\", "/")
+                            if progress_fn is not None:
+                                progress_fn(0, 0, "Extracting…")
+                            z.extractall(extract_dir, members)
+                        _zip_done = True
+                    except Exception as e_zip:
+                        log_fn(f"zipfile failed ({e_zip}), retrying with native tools…")
+                if not _zip_done and _7z_bin:
                     shutil.rmtree(extract_dir, ignore_errors=True)
                     os.makedirs(extract_dir, exist_ok=True)
                     if progress_fn is not None:
@@ -1194,128 +1391,281 @@ def install_mod_from_archive(archive_path: str, parent_window, log_fn,
                         stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
                     )
                     if result.returncode == 0:
-                        _tar_done = True
+                        _zip_done = True
                         log_fn("Extracted with 7z.")
                     else:
-                        log_fn(f"7z failed ({result.stderr.strip()}), trying tarfile…")
-                else:
-                    # Decompress to an intermediate .tar inside extract_dir,
-                    # then untar that into extract_dir and remove the .tar.
+                        log_fn(f"7z failed ({result.stderr.strip()}), retrying with bsdtar…")
+                if not _zip_done and _bsdtar_bin:
                     shutil.rmtree(extract_dir, ignore_errors=True)
                     os.makedirs(extract_dir, exist_ok=True)
                     if progress_fn is not None:
                         progress_fn(0, 0, "Extracting…")
-                    _stage_dir = tempfile.mkdtemp(prefix="modmgr_tar_",
-                                                  dir=os.path.dirname(extract_dir) or None)
+                    result = subprocess.run(
+                        [_bsdtar_bin, "-xf", archive_path, "-C", extract_dir],
+                        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                    )
+                    if result.returncode == 0:
+                        _zip_done = True
+                        log_fn("Extracted with bsdtar.")
+                    else:
+                        log_fn(f"bsdtar failed ({result.stderr.strip()}).")
+                if not _zip_done:
+                    # Last resort: Python zipfile if native tools failed or weren't tried
                     try:
-                        r1 = subprocess.run(
-                            [_7z_bin, "x", archive_path, f"-o{_stage_dir}", "-y", "-mmt=on"],
+                        shutil.rmtree(extract_dir, ignore_errors=True)
+                        os.makedirs(extract_dir, exist_ok=True)
+                        log_fn("Extracting with zipfile (fallback)…")
+                        with zipfile.ZipFile(archive_path, "r") as z:
+                            members = z.infolist()
+                            if any("\\" in m.filename for m in members):
+                                for m in members:
+                                    m.filename = m.filename.replace("\\", "/")
+                            if progress_fn is not None:
+                                progress_fn(0, 0, "Extracting…")
+                            z.extractall(extract_dir, members)
+                        _zip_done = True
+                    except Exception as e_zip2:
+                        raise RuntimeError(
+                            f"All extraction methods failed for ZIP: {e_zip2}\n"
+                            "The archive may use a compression method (e.g. "
+                            "deflate64) that requires the '7z' binary. Install "
+                            "the 'p7zip' package or use the Flatpak build."
+                        )
+            elif ext.endswith(".7z"):
+                import subprocess
+                _7z_done = False
+                _archive_bytes = os.path.getsize(archive_path)
+                _archive_mb = _archive_bytes / (1024 * 1024)
+                # Prefer native 7z binary (multi-threaded) or bsdtar (native C)
+                # over py7zr which is single-threaded and runs out of process.
+                _7z_bin = shutil.which("7zzs") or shutil.which("7zz") or shutil.which("7z") or shutil.which("7za")
+                _bsdtar_bin = shutil.which("bsdtar")
+                if _7z_bin:
+                    if progress_fn is not None:
+                        progress_fn(0, 0, "Extracting…")
+                    result = subprocess.run(
+                        [_7z_bin, "x", archive_path, f"-o{extract_dir}", "-y", "-mmt=on"],
+                        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                    )
+                    if result.returncode == 0:
+                        _7z_done = True
+                        log_fn("Extracted with 7z.")
+                    else:
+                        log_fn(f"7z failed ({result.stderr.strip()}), trying next method…")
+                if not _7z_done and _bsdtar_bin:
+                    shutil.rmtree(extract_dir, ignore_errors=True)
+                    os.makedirs(extract_dir, exist_ok=True)
+                    if progress_fn is not None:
+                        progress_fn(0, 0, "Extracting…")
+                    result = subprocess.run(
+                        [_bsdtar_bin, "-xf", archive_path, "-C", extract_dir],
+                        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                    )
+                    if result.returncode == 0:
+                        _7z_done = True
+                        log_fn("Extracted with bsdtar.")
+                    else:
+                        log_fn(f"bsdtar failed ({result.stderr.strip()}), trying py7zr…")
+                if not _7z_done:
+                    # Fallback to py7zr — single-threaded per archive, run in a
+                    # worker process (see Utils/py7zr_pool.py) so several
+                    # extractions proceed in parallel and a liblzma crash cannot
+                    # take down the app.  Works when no native tools are available.
+                    # Check available RAM; keep a 512 MB safety margin.
+                    _avail_mb = _get_available_memory_bytes() / (1024 * 1024)
+                    _py7zr_safe = _archive_mb < (_avail_mb - 512)
+                    if _py7zr_safe:
+                        try:
+                            log_fn("Extracting with py7zr…")
+                            if progress_fn is not None:
+                                progress_fn(0, 0, "Extracting…")
+                            py7zr_pool.extract(
+                                archive_path, extract_dir,
+                                memory_limit=ExtractionMemoryBudget.process_memory_limit(
+                                    _extract_size_estimate),
+                            )
+                            _7z_done = True
+                        except Exception as e7:
+                            log_fn(f"py7zr failed ({e7}).")
+                    else:
+                        log_fn(f"Archive is {_archive_mb:.0f} MB, only {_avail_mb:.0f} MB RAM available — skipping py7zr to avoid OOM.")
+                if not _7z_done:
+                    raise RuntimeError(f"All extraction methods failed for 7z archive.")
+            elif any(ext.endswith(s) for s in (".tar.gz", ".tar.bz2", ".tar.xz", ".tar")):
+                import subprocess
+                _tar_done = False
+                # Prefer native multi-threaded tools over Python's single-threaded
+                # tarfile module — especially important for .tar.xz which is slow
+                # to decompress in pure Python.
+                _7z_bin = shutil.which("7zzs") or shutil.which("7zz") or shutil.which("7z") or shutil.which("7za")
+                _bsdtar_bin = shutil.which("bsdtar")
+                if _bsdtar_bin:
+                    # bsdtar handles every tar variant natively and is the fastest
+                    # option for streaming tar decompression.
+                    log_fn("Extracting with bsdtar…")
+                    if progress_fn is not None:
+                        progress_fn(0, 0, "Extracting…")
+                    result = subprocess.run(
+                        [_bsdtar_bin, "-xf", archive_path, "-C", extract_dir],
+                        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                    )
+                    if result.returncode == 0:
+                        _tar_done = True
+                        log_fn("Extracted with bsdtar.")
+                    else:
+                        log_fn(f"bsdtar failed ({result.stderr.strip()}), trying 7z…")
+                if not _tar_done and _7z_bin:
+                    # 7z needs two passes for .tar.gz/.tar.xz/.tar.bz2 (decompress,
+                    # then untar).  For a plain .tar a single pass suffices.
+                    if ext.endswith(".tar"):
+                        shutil.rmtree(extract_dir, ignore_errors=True)
+                        os.makedirs(extract_dir, exist_ok=True)
+                        if progress_fn is not None:
+                            progress_fn(0, 0, "Extracting…")
+                        result = subprocess.run(
+                            [_7z_bin, "x", archive_path, f"-o{extract_dir}", "-y", "-mmt=on"],
                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
                         )
-                        if r1.returncode != 0:
-                            log_fn(f"7z decompress failed ({r1.stderr.strip()}), trying tarfile…")
+                        if result.returncode == 0:
+                            _tar_done = True
+                            log_fn("Extracted with 7z.")
                         else:
-                            _inner_tar = None
-                            for _n in os.listdir(_stage_dir):
-                                if _n.lower().endswith(".tar"):
-                                    _inner_tar = os.path.join(_stage_dir, _n)
-                                    break
-                            if _inner_tar:
-                                r2 = subprocess.run(
-                                    [_7z_bin, "x", _inner_tar, f"-o{extract_dir}", "-y", "-mmt=on"],
-                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
-                                )
-                                if r2.returncode == 0:
-                                    _tar_done = True
-                                    log_fn("Extracted with 7z.")
-                                else:
-                                    log_fn(f"7z untar failed ({r2.stderr.strip()}), trying tarfile…")
-                    finally:
-                        shutil.rmtree(_stage_dir, ignore_errors=True)
-            if not _tar_done:
-                shutil.rmtree(extract_dir, ignore_errors=True)
-                os.makedirs(extract_dir, exist_ok=True)
-                log_fn("Extracting with tarfile (fallback)…")
-                if progress_fn is not None:
-                    progress_fn(0, 0, "Extracting…")
-                with tarfile.open(archive_path, "r:*") as t:
-                    t.extractall(extract_dir, filter="fully_trusted")
-        elif ext.endswith(".rar"):
-            import subprocess
-            # Prefer native unrar — bsdtar/libarchive cannot handle RAR5
-            # ("Declared dictionary size is not supported") and rarfile
-            # delegates to whatever backend it finds, which on sandboxed
-            # installs is often bsdtar.  Native unrar handles every RAR
-            # variant, so try it first.
-            _rar_done = False
-            if shutil.which("unrar"):
-                log_fn("Extracting with unrar…")
-                if progress_fn is not None:
-                    progress_fn(0, 0, "Extracting…")
-                result = subprocess.run(
-                    ["unrar", "x", "-y", archive_path, extract_dir + os.sep],
-                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
-                )
-                if result.returncode != 0:
-                    log_fn(f"unrar failed ({result.stderr.strip()}), trying rarfile…")
-                else:
-                    _rar_done = True
-            if not _rar_done:
-                try:
-                    import rarfile
-                    log_fn("Extracting with rarfile…")
+                            log_fn(f"7z failed ({result.stderr.strip()}), trying tarfile…")
+                    else:
+                        # Decompress to an intermediate .tar inside extract_dir,
+                        # then untar that into extract_dir and remove the .tar.
+                        shutil.rmtree(extract_dir, ignore_errors=True)
+                        os.makedirs(extract_dir, exist_ok=True)
+                        if progress_fn is not None:
+                            progress_fn(0, 0, "Extracting…")
+                        _stage_dir = tempfile.mkdtemp(prefix="modmgr_tar_",
+                                                      dir=os.path.dirname(extract_dir) or None)
+                        try:
+                            r1 = subprocess.run(
+                                [_7z_bin, "x", archive_path, f"-o{_stage_dir}", "-y", "-mmt=on"],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                            )
+                            if r1.returncode != 0:
+                                log_fn(f"7z decompress failed ({r1.stderr.strip()}), trying tarfile…")
+                            else:
+                                _inner_tar = None
+                                for _n in os.listdir(_stage_dir):
+                                    if _n.lower().endswith(".tar"):
+                                        _inner_tar = os.path.join(_stage_dir, _n)
+                                        break
+                                if _inner_tar:
+                                    r2 = subprocess.run(
+                                        [_7z_bin, "x", _inner_tar, f"-o{extract_dir}", "-y", "-mmt=on"],
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                                    )
+                                    if r2.returncode == 0:
+                                        _tar_done = True
+                                        log_fn("Extracted with 7z.")
+                                    else:
+                                        log_fn(f"7z untar failed ({r2.stderr.strip()}), trying tarfile…")
+                        finally:
+                            shutil.rmtree(_stage_dir, ignore_errors=True)
+                if not _tar_done:
+                    shutil.rmtree(extract_dir, ignore_errors=True)
+                    os.makedirs(extract_dir, exist_ok=True)
+                    log_fn("Extracting with tarfile (fallback)…")
                     if progress_fn is not None:
                         progress_fn(0, 0, "Extracting…")
-                    with rarfile.RarFile(archive_path, "r") as r:
-                        r.extractall(extract_dir)
-                    _rar_done = True
-                except ImportError:
-                    pass
-                except Exception as e_rar:
-                    log_fn(f"rarfile failed ({e_rar}), trying bsdtar…")
-            if not _rar_done:
-                log_fn("Extracting with bsdtar…")
-                if progress_fn is not None:
-                    progress_fn(0, 0, "Extracting…")
-                result = subprocess.run(
-                    ["bsdtar", "-xf", archive_path, "-C", extract_dir],
-                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
-                )
-                if result.returncode != 0:
+                    with tarfile.open(archive_path, "r:*") as t:
+                        t.extractall(extract_dir, filter="fully_trusted")
+            elif ext.endswith(".rar"):
+                import subprocess
+                # Prefer native unrar — bsdtar/libarchive cannot handle RAR5
+                # ("Declared dictionary size is not supported") and rarfile
+                # delegates to whatever backend it finds, which on sandboxed
+                # installs is often bsdtar.  Native unrar handles every RAR
+                # variant, so try it first.
+                _rar_done = False
+                if shutil.which("unrar"):
+                    log_fn("Extracting with unrar…")
+                    if progress_fn is not None:
+                        progress_fn(0, 0, "Extracting…")
+                    result = subprocess.run(
+                        ["unrar", "x", "-y", archive_path, extract_dir + os.sep],
+                        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                    )
+                    if result.returncode != 0:
+                        log_fn(f"unrar failed ({result.stderr.strip()}), trying rarfile…")
+                    else:
+                        _rar_done = True
+                if not _rar_done:
+                    try:
+                        import rarfile
+                        log_fn("Extracting with rarfile…")
+                        if progress_fn is not None:
+                            progress_fn(0, 0, "Extracting…")
+                        with rarfile.RarFile(archive_path, "r") as r:
+                            r.extractall(extract_dir)
+                        _rar_done = True
+                    except ImportError:
+                        pass
+                    except Exception as e_rar:
+                        log_fn(f"rarfile failed ({e_rar}), trying bsdtar…")
+                if not _rar_done:
+                    log_fn("Extracting with bsdtar…")
+                    if progress_fn is not None:
+                        progress_fn(0, 0, "Extracting…")
+                    result = subprocess.run(
+                        ["bsdtar", "-xf", archive_path, "-C", extract_dir],
+                        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                    )
+                    if result.returncode != 0:
+                        raise RuntimeError(
+                            f"bsdtar failed: {result.stderr.strip()}\n"
+                            "This archive likely requires 'unrar' to extract. "
+                            "Install the 'unrar' package or use the Flatpak build."
+                        )
+                    log_fn("Extracted with bsdtar.")
+                # Sanity check: an extractor returning success with an empty
+                # output directory means it silently skipped unsupported
+                # entries (libarchive's RAR5 behaviour).  Treat as failure so
+                # the caller doesn't delete the source archive.
+                if not any(os.scandir(extract_dir)):
                     raise RuntimeError(
-                        f"bsdtar failed: {result.stderr.strip()}\n"
-                        "This archive likely requires 'unrar' to extract. "
-                        "Install the 'unrar' package or use the Flatpak build."
+                        f"RAR extraction produced no files — the archive "
+                        f"format may be unsupported. Install 'unrar' and retry."
                     )
-                log_fn("Extracted with bsdtar.")
-            # Sanity check: an extractor returning success with an empty
-            # output directory means it silently skipped unsupported
-            # entries (libarchive's RAR5 behaviour).  Treat as failure so
-            # the caller doesn't delete the source archive.
-            if not any(os.scandir(extract_dir)):
-                raise RuntimeError(
-                    f"RAR extraction produced no files — the archive "
-                    f"format may be unsupported. Install 'unrar' and retry."
-                )
-        else:
-            log_fn(f"Unsupported archive format: {os.path.basename(archive_path)}")
-            log_fn("Supported formats: .zip, .7z, .rar, .tar.gz")
-            return None
+            else:
+                log_fn(f"Unsupported archive format: {os.path.basename(archive_path)}")
+                log_fn("Supported formats: .zip, .7z, .rar, .tar.gz")
+                return None
+
+        # Keep a full extraction for next time (not a partial FOMOD one).
+        if _extract_store is not None and not _from_store and _fomod_listing is None:
+            _extract_store.add(_store_md5, extract_dir, _link_or_copy)
 
         is_fomod_install = False
-        fomod_result = detect_fomod(extract_dir)
+        if _fomod_from_cache:
+            fomod_result = (os.path.normpath(os.path.join(extract_dir, _fomod_prefix)), "")
+            os.makedirs(fomod_result[0], exist_ok=True)
+        else:
+            fomod_result = detect_fomod(extract_dir)
         if fomod_result:
             mod_root, config_path = fomod_result
-            config = parse_module_config(config_path)
+            _rel_root = os.path.relpath(mod_root, extract_dir).replace(os.sep, "/")
+            _rel_root = "" if _rel_root == "." else _rel_root + "/"
+            if _cached_fomod is not None and _cached_fomod.prefix != _rel_root:
+                _cached_fomod = None
+            if _cached_fomod is not None:
+                config = _cached_fomod.config
+            else:
+                config = parse_module_config(config_path)
 
-            # info.xml <Name> is set by the mod author to the specific variant
-            # name and is more reliable than ModuleConfig.xml <moduleName>,
-            # which mod authors sometimes copy from a sibling variant and forget
-            # to update.  Prefer info.xml when it exists and differs.
-            _info_path = str(Path(config_path).parent / "info.xml")
-            _mod_info = parse_mod_info(_info_path)
-            if _mod_info.name and _mod_info.name != config.name:
-                config.name = _mod_info.name
+                # info.xml <Name> is set by the mod author to the specific variant
+                # name and is more reliable than ModuleConfig.xml <moduleName>,
+                # which mod authors sometimes copy from a sibling variant and forget
+                # to update.  Prefer info.xml when it exists and differs.
+                _info_path = str(Path(config_path).parent / "info.xml")
+                _mod_info = parse_mod_info(_info_path)
+                if _mod_info.name and _mod_info.name != config.name:
+                    config.name = _mod_info.name
+
+                fomod_cache.store(archive_path, config, _rel_root, md5=archive_md5)
 
             if config.name:
                 fomod_clean = _strip_title_metadata(config.name)
@@ -1514,8 +1864,22 @@ def install_mod_from_archive(archive_path: str, parent_window, log_fn,
 
                 final_selections = dialog_result
 
-            file_list = resolve_files(config, final_selections, installed_files, active_files)
+            _sel_key = fomod_cache.selection_key(config, final_selections,
+                                                 installed_files, active_files)
+            file_list = _cached_fomod.files.get(_sel_key) if _cached_fomod is not None else None
+            if file_list is None:
+                with perf_trace.span("fomod resolve"):
+                    file_list = resolve_files(config, final_selections, installed_files, active_files)
+                fomod_cache.store_files(archive_path, _sel_key, file_list, md5=archive_md5)
             is_fomod_install = True
+            if _fomod_listing is not None:
+                _selected = _select_fomod_members(_fomod_listing, _fomod_prefix, file_list)
+                log_fn(f"Extracting {len(_selected)} selected file(s) of "
+                       f"{len(_fomod_listing)} in the archive…")
+                if progress_fn is not None:
+                    progress_fn(0, 0, "Extracting…")
+                if not _extract_selected(archive_path, extract_dir, _selected, log_fn):
+                    raise RuntimeError("Could not extract the selected FOMOD files.")
             log_fn(f"FOMOD complete — {len(file_list)} file(s) to install.")
 
             if load_dev_mode():
@@ -1923,7 +2287,11 @@ def install_mod_from_archive(archive_path: str, parent_window, log_fn,
                 func(path)
             shutil.rmtree(dest_root, onexc=_force_remove)
             log_fn(f"Cleared existing mod folder for clean reinstall.")
-        _copy_file_list(file_list, mod_root, dest_root, log_fn)
+        with perf_trace.span("copy"):
+            if not (_direct_staging and not is_fomod_install
+                    and _move_file_list(file_list, mod_root, dest_root, log_fn)):
+                _copy_file_list(file_list, mod_root, dest_root, log_fn)
+            perf_trace.count("entries", len(file_list))
         log_fn(f"Installed '{mod_name}' → {dest_root}")
 
         if is_fomod_install and load_dev_mode():
@@ -1977,29 +2345,30 @@ def install_mod_from_archive(archive_path: str, parent_window, log_fn,
         # collection does one bulk rebuild_mod_index after all mods are done,
         # which is far faster than N concurrent read→merge→write passes.
         if not skip_index_update:
-            try:
-                _strip = frozenset(s.lower() for s in (getattr(game, "strip_prefixes", None) or []))
-                _exts  = frozenset(e.lower() for e in (getattr(game, "install_extensions", None) or []))
-                _root  = frozenset(s.lower() for s in (getattr(game, "root_deploy_folders", None) or []))
-                _, normal_files, root_files = _scan_dir(
-                    mod_name, str(dest_root), _strip, _exts, _root,
-                )
-                if mod_panel is not None and mod_panel._modlist_path is not None:
-                    _ml = mod_panel._modlist_path
-                else:
-                    _ml = game.get_profile_root() / "profiles" / "default" / "modlist.txt"
-                _index_path = _ml.parent / "modindex.bin"
-                _norm_case = getattr(game, "normalize_folder_case", True)
-                update_mod_index(_index_path, mod_name, normal_files, root_files,
-                                 normalize_folder_case=_norm_case)
-                # Incrementally update the BSA index too (Bethesda games only).
-                _archive_exts = frozenset(getattr(game, "archive_extensions", frozenset()) or frozenset())
-                if _archive_exts:
-                    update_bsa_index(
-                        _ml.parent / "bsa_index.bin", mod_name, dest_root, _archive_exts,
+            with perf_trace.span("index update"):
+                try:
+                    _strip = frozenset(s.lower() for s in (getattr(game, "strip_prefixes", None) or []))
+                    _exts  = frozenset(e.lower() for e in (getattr(game, "install_extensions", None) or []))
+                    _root  = frozenset(s.lower() for s in (getattr(game, "root_deploy_folders", None) or []))
+                    _, normal_files, root_files = _scan_dir(
+                        mod_name, str(dest_root), _strip, _exts, _root,
                     )
-            except (OSError, ValueError, KeyError):
-                pass  # non-fatal — next rebuild will fall back to a full rescan
+                    if mod_panel is not None and mod_panel._modlist_path is not None:
+                        _ml = mod_panel._modlist_path
+                    else:
+                        _ml = game.get_profile_root() / "profiles" / "default" / "modlist.txt"
+                    _index_path = _ml.parent / "modindex.bin"
+                    _norm_case = getattr(game, "normalize_folder_case", True)
+                    update_mod_index(_index_path, mod_name, normal_files, root_files,
+                                     normalize_folder_case=_norm_case)
+                    # Incrementally update the BSA index too (Bethesda games only).
+                    _archive_exts = frozenset(getattr(game, "archive_extensions", frozenset()) or frozenset())
+                    if _archive_exts:
+                        update_bsa_index(
+                            _ml.parent / "bsa_index.bin", mod_name, dest_root, _archive_exts,
+                        )
+                except (OSError, ValueError, KeyError):
+                    pass  # non-fatal — next rebuild will fall back to a full rescan
 
         plugin_exts = getattr(game, "plugin_extensions", [])
         if plugin_exts and mod_panel is not None and mod_panel._modlist_path is not None:
@@ -2073,6 +2442,9 @@ def install_mod_from_archive(archive_path: str, parent_window, log_fn,
                 except Exception:
                     pass
             threading.Thread(target=_detect_meta, daemon=True).start()
+        # Background metadata detection is picked up later via the catalog's
+        # mtime check; the stamp/prebuilt meta is recorded now.
+        refresh_catalog_entries(dest_root.parent, [mod_name])
 
         if not headless:
             _show_mod_notification(parent_window, f"Installed: {mod_name}")
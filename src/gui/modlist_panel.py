@@ -101,6 +101,7 @@ from Utils.filemap import (
     OVERWRITE_NAME,
     ROOT_FOLDER_NAME,
 )
+from Utils.filemap_bin import open_filemap
 from Utils.bsa_filemap import (
     build_bsa_conflicts,
     rebuild_bsa_index,
@@ -120,6 +121,7 @@ from Utils.plugins import (
     read_loadorder, write_loadorder,
 )
 from Utils.profile_backup import create_backup
+from Utils.profile_session import fingerprint, load_session, save_session, session_inputs, settled_fingerprint
 from Utils.profile_state import (
     read_profile_state,
     read_collapsed_seps,
@@ -150,6 +152,7 @@ from gui.nexus_browser_overlay import NexusBrowserOverlay
 from gui.changelog_overlay import ChangelogOverlay
 from gui.mod_files_overlay import ModFilesOverlay
 from Nexus.nexus_meta import build_meta_from_download, ensure_installed_stamp, read_meta, write_meta
+from Nexus.meta_catalog import get_meta_catalog, remove_from_meta_catalog, rename_in_meta_catalog
 from Nexus.nexus_download import delete_archive_and_sidecar
 from Utils.config_paths import get_download_cache_dir, get_download_cache_dir_for_game, list_all_cache_dirs
 from Utils.ui_config import load_column_widths, save_column_widths, load_column_order, save_column_order, load_normalize_folder_case, load_sort_state, save_sort_state, load_column_hidden, save_column_hidden
@@ -183,16 +186,16 @@ def _scan_meta_flags_impl(entries: list, mods_dir: Path) -> dict:
     fomod_mods: set[str] = set()
     root_folder_mods: set[str] = set()
     today = datetime.now().date()
+    catalog = get_meta_catalog(mods_dir)
     for entry in entries:
         if entry.is_separator:
             continue
-        meta_path = mods_dir / entry.name / "meta.ini"
-        if not meta_path.is_file():
-            continue
         try:
-            meta = read_meta(meta_path)
-            if not meta.installed and ensure_installed_stamp(meta_path):
-                meta = read_meta(meta_path)
+            meta = catalog.get(entry.name)
+            if meta is None:
+                continue
+            if not meta.installed and ensure_installed_stamp(mods_dir / entry.name / "meta.ini"):
+                meta = catalog.get(entry.name) or meta
             if meta.has_update and not meta.ignore_update:
                 update_mods.add(entry.name)
             if meta.missing_requirements:
@@ -224,6 +227,7 @@ def _scan_meta_flags_impl(entries: list, mods_dir: Path) -> dict:
                 root_folder_mods.add(entry.name)
         except Exception:
             pass
+    catalog.save()
     return {
         "update_mods": update_mods,
         "missing_reqs": missing_reqs,
@@ -612,7 +616,7 @@ class ModListPanel(ctk.CTkFrame):
         # Load profile_state.json once; individual loaders pull from it
         self.__profile_state = read_profile_state(profile_dir)
         self._ignored_missing_reqs = read_ignored_missing_requirements(profile_dir, self.__profile_state)
-        self._reload()
+        self._reload(from_session=True)
         if hasattr(self, "_restore_backup_btn"):
             self._restore_backup_btn.configure(state="normal")
         # If the collections panel was open, re-open it for the new game
@@ -1853,7 +1857,10 @@ class ModListPanel(ctk.CTkFrame):
 
         return max(lo, min(insert_at, hi))
 
-    def _reload(self):
+    def _reload(self, from_session: bool = False):
+        """Re-read the profile and rebuild the filemap.  *from_session* (a
+        profile switch) first shows the profile's saved session snapshot
+        when it is still valid; see Utils.profile_session."""
         self._sel_idx = -1
         self._sel_set = set()
         self._drag_idx = -1
@@ -1909,12 +1916,57 @@ class ModListPanel(ctk.CTkFrame):
         # Defer meta scan to background so the window appears sooner
         self._scan_meta_flags_async()
         self._rebuild_check_widgets()  # also calls _compute_bundle_groups()
-        # Refresh always rescans all mod folders to rebuild the index from scratch.
+        # Every reload rescans all mod folders to rebuild the index from
+        # scratch — staging may have changed while the app was closed.  A
+        # profile switch whose session snapshot still matches its inputs
+        # draws that conflict state now, while the rescan runs behind it.
+        if from_session:
+            self._apply_session_snapshot()
         self._filemap_rescan_index = True
         self._rebuild_filemap()
         self._redraw()
         self._update_info()
 
+    def _session_config(self) -> list[str]:
+        """Game settings that shape the conflict maps; a session snapshot
+        saved under different settings is ignored."""
+        game = getattr(self, "_game", None)
+        return [
+            str(getattr(game, "name", "")),
+            repr(sorted(self._strip_prefixes or ())),
+            repr(sorted(self._install_extensions or ())),
+            repr(sorted(self._conflict_ignore_filenames or ())),
+            repr(sorted(self._filemap_exclude_dirs or ())),
+            repr(sorted(getattr(game, "archive_extensions", None) or ())),
+            str(self._normalize_folder_case),
+            self._filemap_casing,
+        ]
+
+    def _apply_session_snapshot(self) -> bool:
+        """Load the profile's saved conflict state if none of its inputs
+        changed since it was saved.  Returns True when it was applied."""
+        if self._modlist_path is None or self._filemap_path is None:
+            return False
+        profile_dir = self._modlist_path.parent
+        state = load_session(profile_dir,
+                             session_inputs(profile_dir, self._filemap_path.parent),
+                             self._session_config())
+        if state is None:
+            return False
+        try:
+            self._conflict_map_base  = state["conflict_map"]
+            self._overrides_base     = state["overrides"]
+            self._overridden_by_base = state["overridden_by"]
+            self._bsa_conflict_map   = state["bsa_conflict_map"]
+            self._bsa_overrides      = state["bsa_overrides"]
+            self._bsa_overridden_by  = state["bsa_overridden_by"]
+            self._prertx_mods        = state["prertx_mods"]
+            self._apply_loose_bsa_fold(state["loose_over_bsa"], state["bsa_over_loose"])
+        except (KeyError, TypeError, AttributeError):
+            return False
+        self._vis_dirty = True
+        return True
+
     def _on_refresh_clicked(self):
         """Refresh button handler: reload and show a notification."""
         self._reload()
@@ -5505,6 +5557,7 @@ class ModListPanel(ctk.CTkFrame):
                     shutil.rmtree(staging)
                 removed_names.append(rem_entry.name)
             remove_from_mod_index(index_path, all_names)
+            remove_from_meta_catalog(self._staging_root, all_names)
             # Also drop from the BSA index if the game uses archive conflicts.
             remove_from_bsa_index(index_path.parent / "bsa_index.bin", all_names)
         # Remove from lists (highest index first to keep lower indices stable)
@@ -5692,6 +5745,7 @@ class ModListPanel(ctk.CTkFrame):
                 if staging.is_dir():
                     shutil.rmtree(staging)
             remove_from_mod_index(index_path, removed_names)
+            remove_from_meta_catalog(staging_root, removed_names)
             # Also drop from the BSA index if the game uses archive conflicts.
             remove_from_bsa_index(index_path.parent / "bsa_index.bin", removed_names)
         self._sel_idx = -1
@@ -5767,6 +5821,7 @@ class ModListPanel(ctk.CTkFrame):
                 old_name, new_name,
                 normalize_folder_case=self._normalize_folder_case,
             )
+            rename_in_meta_catalog(self._staging_root, old_name, new_name)
 
         # 2. Transient in-memory flags (no disk representation of their own;
         # rebuilt on reload, so just migrate the current snapshot).
@@ -7087,15 +7142,11 @@ class ModListPanel(ctk.CTkFrame):
             # Build winner map from filemap.txt, keyed by deploy path (or staged path).
             # When _ckfn is set (UE5), remap via routing so cross-path conflicts are found.
             winning_map: dict[str, tuple[str, str]] = {}
-            if filemap_path.is_file():
-                with filemap_path.open(encoding="utf-8") as f:
-                    for line in f:
-                        line = line.rstrip("\n")
-                        if "\t" not in line:
-                            continue
-                        rel_path, winner = line.split("\t", 1)
-                        key = _ckfn(rel_path) if _ckfn else rel_path.lower()
-                        winning_map[key] = (rel_path, winner)
+            _fm = open_filemap(filemap_path)
+            if _fm is not None:
+                for rel_path, winner in _fm:
+                    key = _ckfn(rel_path) if _ckfn else rel_path.lower()
+                    winning_map[key] = (rel_path, winner)
 
             # Collect this mod's files. Prefer modindex.bin (already normalized
             # with the same strip logic filemap.py uses, so keys match filemap.txt
@@ -8151,12 +8202,16 @@ class ModListPanel(ctk.CTkFrame):
                 f"Filemap: excluding {n} file(s) (profile_state excluded_mod_files)"))
         # Snapshot of root-flagged mods at the time of this rebuild (thread-safe copy)
         root_folder_mods_snap = set(self._root_folder_mods) if self._root_folder_mods else None
+        session_profile = modlist_path.parent
+        session_files   = session_inputs(session_profile, output.parent)
+        session_config  = self._session_config()
 
         def _log_thread_safe(msg: str) -> None:
             self.after(0, lambda m=msg: self._log(m))
 
         def _worker():
             nonlocal rescan_index
+            session_before = fingerprint(session_files)
             try:
                 if staging_requires_subdir:
                     fixed = fix_flat_staging_folders(staging)
@@ -8236,6 +8291,19 @@ class ModListPanel(ctk.CTkFrame):
                 base_conflict_map  = dict(conflict_map)
                 base_overrides     = {k: set(v) for k, v in overrides.items()}
                 base_overridden_by = {k: set(v) for k, v in overridden_by.items()}
+                session_fp = settled_fingerprint(session_before, fingerprint(session_files))
+                if session_fp is not None:
+                    save_session(session_profile, session_fp, session_config, {
+                        "conflict_map": base_conflict_map,
+                        "overrides": base_overrides,
+                        "overridden_by": base_overridden_by,
+                        "bsa_conflict_map": bsa_conflict_map,
+                        "bsa_overrides": bsa_overrides,
+                        "bsa_overridden_by": bsa_overridden_by,
+                        "loose_over_bsa": loose_over_bsa,
+                        "bsa_over_loose": bsa_over_loose,
+                        "prertx_mods": prertx_mods,
+                    })
                 self.after(0, lambda: _done(count,
                                              base_conflict_map, base_overrides, base_overridden_by,
                                              bsa_conflict_map, bsa_overrides, bsa_overridden_by,
@@ -99,6 +99,7 @@ from Utils.plugins import (
     sync_plugins_from_filemap,
     prune_plugins_from_filemap,
 )
+from Utils.filemap_bin import open_filemap
 from Utils.plugin_parser import check_missing_masters, check_late_masters, check_version_mismatched_masters, read_masters, is_esl_flagged, set_esl_flag, check_esl_eligible
 from LOOT.loot_sorter import (
     sort_plugins as loot_sort,
@@ -684,17 +685,11 @@ class PluginPanel(ctk.CTkFrame):
 
                 # 1. Scan filemap for .exe/.bat files — resolve from the mods staging folder
                 if staging is not None and staging.is_dir():
-                    filemap_path = staging.parent / "filemap.txt"
-                    if filemap_path.is_file():
+                    _fm = open_filemap(staging.parent / "filemap.txt")
+                    if _fm is not None:
                         try:
-                            for line in filemap_path.read_text(encoding="utf-8").splitlines():
-                                line = line.strip()
-                                if not line or "\t" not in line:
-                                    continue
-                                rel_path, mod_name = line.split("\t", 1)
+                            for rel_path, mod_name in _fm.with_extensions(self._EXE_SCAN_EXTENSIONS):
                                 rel = Path(rel_path)
-                                if rel.suffix.lower() not in self._EXE_SCAN_EXTENSIONS:
-                                    continue
                                 # Exes that require the Data folder are only shown
                                 # if they have been deployed there.
                                 if rel.name in _all_data_folder_exes:
@@ -2344,12 +2339,9 @@ class PluginPanel(ctk.CTkFrame):
             return
         self._ini_files_status = None
 
-        entries = self._parse_filemap(filemap_path)
+        entries = self._parse_filemap(filemap_path, self._INI_JSON_EXTENSIONS)
         ini_entries: list[tuple[str, str, Path]] = []
         for rel_path, mod_name in entries:
-            ext = Path(rel_path).suffix.lower()
-            if ext not in self._INI_JSON_EXTENSIONS:
-                continue
             full_path = self._resolve_ini_file_path(rel_path, mod_name)
             if full_path is None:
                 continue
@@ -2508,10 +2500,8 @@ class PluginPanel(ctk.CTkFrame):
         if filemap_path_str and self._staging_root:
             filemap_path = Path(filemap_path_str)
             if filemap_path.is_file():
-                for rel_path, mod_name in self._parse_filemap(filemap_path):
-                    ext = Path(rel_path).suffix.lower()
-                    if ext not in self._INI_CONTENT_SEARCH_EXTENSIONS:
-                        continue
+                for rel_path, mod_name in self._parse_filemap(
+                        filemap_path, self._INI_CONTENT_SEARCH_EXTENSIONS):
                     key = (rel_path, mod_name)
                     if key in seen:
                         continue
@@ -3097,14 +3087,12 @@ class PluginPanel(ctk.CTkFrame):
             return cached[1], cached[2]
 
         filemap_winner: dict[str, str] = {}
-        if fm_path.is_file():
-            try:
-                for _line in fm_path.read_text(encoding="utf-8").splitlines():
-                    if "\t" in _line:
-                        _rk, _mn = _line.split("\t", 1)
-                        filemap_winner[_rk.lower()] = _mn
-            except Exception:
-                pass
+        try:
+            _fm = open_filemap(fm_path)
+            if _fm is not None:
+                filemap_winner = {_rk.lower(): _mn for _rk, _mn in _fm}
+        except Exception:
+            pass
 
         contested_keys: set[str] = set()
         if full_index is None:
@@ -3637,12 +3625,11 @@ class PluginPanel(ctk.CTkFrame):
                             path_counts[fp] = path_counts.get(fp, 0) + 1
 
         loose_winner: dict[str, str] = {}
-        if fm_path and fm_path.is_file():
+        if fm_path:
             try:
-                for line in fm_path.read_text(encoding="utf-8").splitlines():
-                    if "\t" in line:
-                        rk, mn = line.split("\t", 1)
-                        loose_winner[rk.lower()] = mn
+                _fm = open_filemap(fm_path)
+                if _fm is not None:
+                    loose_winner = {rk.lower(): mn for rk, mn in _fm}
             except Exception:
                 pass
 
@@ -4214,17 +4201,15 @@ class PluginPanel(ctk.CTkFrame):
         return resolved
 
     @staticmethod
-    def _parse_filemap(filemap_path: Path):
-        """Parse filemap.txt and return a list of (rel_path, mod_name) tuples."""
-        entries = []
-        with filemap_path.open(encoding="utf-8") as f:
-            for line in f:
-                line = line.rstrip("\n")
-                if "\t" not in line:
-                    continue
-                rel_path, mod_name = line.split("\t", 1)
-                entries.append((rel_path, mod_name))
-        return entries
+    def _parse_filemap(filemap_path: Path, extensions=None):
+        """Return filemap.txt as a list of (rel_path, mod_name) tuples,
+        optionally only the files with one of *extensions* (".ini", …)."""
+        fm = open_filemap(filemap_path)
+        if fm is None:
+            raise FileNotFoundError(f"Filemap not found: {filemap_path}")
+        if extensions is not None:
+            return list(fm.with_extensions(extensions))
+        return list(fm)
 
     def _build_data_tree_from_entries(self, entries, contested_keys: "set[str] | None" = None):
         """Build the tree hierarchy from a list of (rel_path, mod_name) entries."""
@@ -5970,17 +5955,9 @@ class PluginPanel(ctk.CTkFrame):
             return cached
         paths: set[str] = set()
         if self._staging_root is not None and self._staging_root.is_dir():
-            filemap_path = self._staging_root.parent / "filemap.txt"
-            if filemap_path.is_file():
-                try:
-                    for line in filemap_path.read_text(encoding="utf-8").splitlines():
-                        if not line.strip():
-                            continue
-                        rel = line.split("\t", 1)[0].strip()
-                        if rel:
-                            paths.add(rel.replace("\\", "/").lower())
-                except OSError:
-                    pass
+            _fm = open_filemap(self._staging_root.parent / "filemap.txt")
+            if _fm is not None:
+                paths = {rel.replace("\\", "/").lower() for rel in _fm.paths() if rel}
         self._staged_paths_cache = paths
         return paths
 
@@ -7077,35 +7054,25 @@ class PluginPanel(ctk.CTkFrame):
 
         # 1. Map plugins from filemap.txt → staging mods (and overwrite)
         overwrite_dir = self._staging_root.parent / "overwrite" if self._staging_root else None
-        if filemap_path_str and self._staging_root:
-            filemap_path = Path(filemap_path_str)
-            if filemap_path.is_file():
-                with filemap_path.open(encoding="utf-8") as f:
-                    for line in f:
-                        line = line.rstrip("\n")
-                        if "\t" not in line:
-                            continue
-                        rel_path, mod_name = line.split("\t", 1)
-                        rel_path = rel_path.replace("\\", "/")
-                        if "/" in rel_path:
-                            continue
-                        if Path(rel_path).suffix.lower() in exts_lower:
-                            if mod_name == _OVERWRITE_NAME and overwrite_dir:
-                                plugin_paths[rel_path.lower()] = overwrite_dir / rel_path
-                            else:
-                                direct = self._staging_root / mod_name / rel_path
-                                if direct.is_file():
-                                    plugin_paths[rel_path.lower()] = direct
-                                else:
-                                    # File may live under a strip-prefix subfolder in staging
-                                    # (e.g. staging/mod/Data Files/plugin.esp).
-                                    # Search the mod dir for a matching filename.
-                                    found = self._find_plugin_in_mod_dir(
-                                        self._staging_root / mod_name, rel_path
-                                    )
-                                    plugin_paths[rel_path.lower()] = found or direct
-                            # Map plugin filename → mod folder name
-                            plugin_mod_map[rel_path.lower()] = mod_name
+        _fm = open_filemap(Path(filemap_path_str)) if filemap_path_str and self._staging_root else None
+        if _fm is not None:
+            for rel_path, mod_name in _fm.root_files(exts_lower):
+                if mod_name == _OVERWRITE_NAME and overwrite_dir:
+                    plugin_paths[rel_path.lower()] = overwrite_dir / rel_path
+                else:
+                    direct = self._staging_root / mod_name / rel_path
+                    if direct.is_file():
+                        plugin_paths[rel_path.lower()] = direct
+                    else:
+                        # File may live under a strip-prefix subfolder in staging
+                        # (e.g. staging/mod/Data Files/plugin.esp).
+                        # Search the mod dir for a matching filename.
+                        found = self._find_plugin_in_mod_dir(
+                            self._staging_root / mod_name, rel_path
+                        )
+                        plugin_paths[rel_path.lower()] = found or direct
+                # Map plugin filename → mod folder name
+                plugin_mod_map[rel_path.lower()] = mod_name
 
         # 2. Plugins in overwrite that may not be in filemap yet (added by sync, index stale)
         if overwrite_dir and overwrite_dir.is_dir():
@@ -35,9 +35,12 @@ from gui.theme import (
 )
 from gui import game_helpers as _gh
 from gui.game_helpers import _profiles_for_game
-from Utils.profile_state import merge_profile_settings, read_profile_settings
+from Utils.profile_state import flush_profile_state, merge_profile_settings, read_profile_settings
 from gui.ctk_components import CTkAlert
-from Utils.mo2_import import validate_mo2_folder, count_mo2_mods, import_mo2
+from Utils.mo2_import import (
+    validate_mo2_folder, count_mo2_mods, import_mo2, can_hardlink_mo2,
+    MO2_IMPORT_MOVE, MO2_IMPORT_HARDLINK,
+)
 
 
 class ProfileSettingsOverlay(tk.Frame):
@@ -357,6 +360,7 @@ class ProfileSettingsOverlay(tk.Frame):
         profile_dir = self._get_profile_dir(old_name)
         new_dir = profile_dir.parent / new_name
         was_original_default = old_name == "default" or self._is_original_default_dir(profile_dir)
+        flush_profile_state(profile_dir)
         try:
             profile_dir.rename(new_dir)
         except OSError as e:
@@ -538,7 +542,7 @@ class ProfileSettingsOverlay(tk.Frame):
             state="warning",
             title="Import from MO2",
             body_text=(
-                f"This will move the following from:\n{folder}\n\n"
+                f"This will import the following from:\n{folder}\n\n"
                 f"• {', '.join(parts)}\n\n"
                 "into this game's staging directory.\n\n"
                 "Are you sure?"
@@ -558,11 +562,34 @@ class ProfileSettingsOverlay(tk.Frame):
             return
 
         staging_root = game.get_profile_root()
+        mode = MO2_IMPORT_MOVE
+        if can_hardlink_mo2(folder, staging_root):
+            link_alert = CTkAlert(
+                state="info",
+                title="Keep MO2 Intact?",
+                body_text=(
+                    "The MO2 folder is on the same drive as the staging folder.\n\n"
+                    "Hardlink: mods are linked into staging without copying any "
+                    "data, and MO2 keeps working.\n\n"
+                    "Move: mods are moved out of MO2."
+                ),
+                btn1="Hardlink",
+                btn2="Move",
+                parent=self.winfo_toplevel(),
+                width=500,
+                height=280,
+            )
+            choice = link_alert.get()
+            if choice == "Hardlink":
+                mode = MO2_IMPORT_HARDLINK
+            elif choice != "Move":
+                # Closed without choosing: cancel rather than fall back to Move.
+                return
         self._log(f"Importing MO2 mods from {folder} …")
 
         def _do():
             try:
-                import_mo2(folder, staging_root, log_fn=self._log)
+                import_mo2(folder, staging_root, log_fn=self._log, mode=mode, game=game)
                 self.after(0, self._mo2_import_done)
             except Exception as exc:
                 self._log(f"MO2 import failed: {exc}")
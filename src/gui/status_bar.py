@@ -28,6 +28,9 @@ from Utils.ui_config import (
     load_normalize_folder_case, save_normalize_folder_case,
     load_clear_archive_after_install, save_clear_archive_after_install,
     load_keep_fomod_archives, save_keep_fomod_archives,
+    load_direct_staging_extract, save_direct_staging_extract,
+    load_extract_cache_settings, save_extract_cache_settings,
+    load_backup_settings, save_backup_settings,
     load_rename_mod_after_install, save_rename_mod_after_install,
     load_restore_on_close, save_restore_on_close,
     load_allow_prerelease, save_allow_prerelease,
@@ -36,11 +39,13 @@ from Utils.ui_config import (
     load_steam_libraries_vdf_path, save_steam_libraries_vdf_path,
     load_default_staging_path, save_default_staging_path,
     load_download_cache_path, save_download_cache_path,
+    load_download_scheduler_settings, save_download_scheduler_settings,
     load_font_family, save_font_family, get_font_family,
     THEME_DEFAULTS, get_theme_color, save_theme_color,
     get_appearance_mode, save_appearance_mode,
+    load_ui_scale_setting, flush_ui_config,
 )
-from gui.ctk_components import CTkProgressPopup, CTkAlert, CTkNotification
+from gui.ctk_components import CTkProgressPopup, CTkAlert, CTkNotification, CTkPopupMenu
 from gui.version_check import is_appimage, is_flatpak
 from gui.wheel_compat import LEGACY_WHEEL_REDUNDANT
 from gui.theme import (
@@ -273,6 +278,17 @@ class StatusBar(ctk.CTkFrame):
         self._rate_limit_label.bind("<Leave>", _rl_leave, add="+")
         self._schedule_rate_limit_refresh()
 
+        # Aggregate download throughput from the global download scheduler;
+        # empty while nothing is downloading.  Click to see the queue.
+        self._download_label = ctk.CTkLabel(
+            label_bar, text="", font=FONT_SMALL, text_color=TEXT_DIM,
+            cursor="hand2",
+        )
+        self._download_label.pack(side="right", padx=(0, 8), pady=2)
+        self._download_label.bind("<Button-1>", lambda _e: self._show_download_queue())
+        self._download_queue_menu: CTkPopupMenu | None = None
+        self._schedule_download_metrics_refresh()
+
         self._progress_popup: CTkProgressPopup | None = None
         self._progress_bind_id: str | None = None
 
@@ -309,6 +325,60 @@ class StatusBar(ctk.CTkFrame):
         except tk.TclError:
             pass
 
+    def _schedule_download_metrics_refresh(self):
+        """Refresh the download throughput label once a second."""
+        self._refresh_download_metrics_label()
+        try:
+            self.after(1000, self._schedule_download_metrics_refresh)
+        except tk.TclError:
+            pass
+
+    def _refresh_download_metrics_label(self):
+        label = getattr(self, "_download_label", None)
+        if label is None or not label.winfo_exists():
+            return
+        from Nexus.download_scheduler import get_download_scheduler
+        m = get_download_scheduler().metrics()
+        if not m.active and not m.queued:
+            label.configure(text="")
+            return
+        text = f"↓ {_fmt_size(int(m.bytes_per_sec))}/s  {m.active}/{m.max_connections}"
+        if m.queued:
+            text += f" (+{m.queued} queued)"
+        label.configure(text=text)
+
+    def _show_download_queue(self):
+        """Popup listing scheduler jobs; picking a queued one downloads it next."""
+        from Nexus.download_scheduler import get_download_scheduler, PRIORITY_HIGH
+        sched = get_download_scheduler()
+        jobs = sched.jobs()
+        if not jobs:
+            return
+        # Reuse one popup — see ModListPanel._show_column_menu.
+        menu = self._download_queue_menu
+        if menu is None or not menu.winfo_exists():
+            menu = CTkPopupMenu(self.winfo_toplevel(), width=320, title="")
+            self._download_queue_menu = menu
+        else:
+            menu.clear()
+        for job in jobs:
+            if job.started_at:
+                if job.size_bytes > 0:
+                    pct = min(100, job.bytes_done * 100 // job.size_bytes)
+                    menu.add_command(f"↓  {job.name}  ({pct}%)")
+                else:
+                    menu.add_command(f"↓  {job.name}  ({_fmt_size(job.bytes_done)})")
+        queued = [j for j in jobs if not j.started_at]
+        if queued:
+            menu.add_separator()
+            for job in queued:
+                menu.add_command(
+                    f"⏫  Download next: {job.name}",
+                    lambda jid=job.job_id: sched.set_priority(jid, PRIORITY_HIGH),
+                )
+        label = self._download_label
+        menu.popup(label.winfo_rootx(), label.winfo_rooty())
+
     def _refresh_rate_limit_label(self):
         try:
             label = self._rate_limit_label
@@ -894,6 +964,82 @@ class SettingsPanel(ctk.CTkFrame):
             font=FONT_SMALL, text_color=TEXT_DIM, anchor="w", justify="left",
         ).pack(anchor="w", pady=(2, 0))
 
+        self._direct_staging_var = tk.BooleanVar(value=load_direct_staging_extract())
+        ctk.CTkCheckBox(
+            dl_sec, text="Extract directly into staging", variable=self._direct_staging_var,
+            font=FONT_NORMAL, text_color=TEXT_MAIN,
+        ).pack(anchor="w", pady=(10, 0))
+        ctk.CTkLabel(
+            dl_sec,
+            text="Extract archives beside the staging folder instead of /tmp, so fresh\n"
+                 "installs are moved into place rather than copied. Uses disk space\n"
+                 "on the staging drive while an install runs.",
+            font=FONT_SMALL, text_color=TEXT_DIM, anchor="w", justify="left",
+        ).pack(anchor="w", pady=(2, 0))
+
+        _cache_cfg = load_extract_cache_settings()
+        self._extract_cache_var = tk.BooleanVar(value=_cache_cfg["enabled"])
+        extract_cache_row = ctk.CTkFrame(dl_sec, fg_color="transparent")
+        extract_cache_row.pack(anchor="w", pady=(10, 0))
+        ctk.CTkCheckBox(
+            extract_cache_row, text="Keep extracted archives, up to",
+            variable=self._extract_cache_var,
+            font=FONT_NORMAL, text_color=TEXT_MAIN,
+        ).pack(side="left")
+        self._extract_cache_gb_var = tk.StringVar(value=str(_cache_cfg["max_gb"]))
+        ctk.CTkEntry(
+            extract_cache_row, textvariable=self._extract_cache_gb_var,
+            width=scaled(60), font=FONT_NORMAL,
+        ).pack(side="left", padx=(6, 6))
+        ctk.CTkLabel(extract_cache_row, text="GB", font=FONT_NORMAL, text_color=TEXT_MAIN,
+                     ).pack(side="left")
+        ctk.CTkLabel(
+            dl_sec,
+            text="Reinstalling an archive links its stored files instead of extracting\n"
+                 "it again. The cache is kept on the same drive as staging.",
+            font=FONT_SMALL, text_color=TEXT_DIM, anchor="w", justify="left",
+        ).pack(anchor="w", pady=(2, 0))
+
+        _sched_cfg = load_download_scheduler_settings()
+
+        conn_row = ctk.CTkFrame(dl_sec, fg_color="transparent")
+        conn_row.pack(anchor="w", pady=(10, 0))
+
+        ctk.CTkLabel(conn_row, text="Max connections:", font=FONT_NORMAL, text_color=TEXT_MAIN,
+                     ).pack(side="left", padx=(0, 8))
+
+        self._max_connections_var = tk.DoubleVar(value=float(_sched_cfg["max_connections"]))
+        ctk.CTkSlider(
+            conn_row, from_=1, to=16, number_of_steps=15,
+            variable=self._max_connections_var,
+            width=scaled(200),
+            command=lambda _v: self._max_connections_lbl.configure(
+                text=str(int(round(self._max_connections_var.get())))),
+        ).pack(side="left")
+
+        self._max_connections_lbl = ctk.CTkLabel(
+            conn_row, text=str(_sched_cfg["max_connections"]),
+            font=FONT_NORMAL, text_color=TEXT_MAIN, width=scaled(20))
+        self._max_connections_lbl.pack(side="left", padx=(6, 0))
+
+        bw_row = ctk.CTkFrame(dl_sec, fg_color="transparent")
+        bw_row.pack(anchor="w", pady=(6, 0))
+
+        ctk.CTkLabel(bw_row, text="Bandwidth limit (KB/s):", font=FONT_NORMAL, text_color=TEXT_MAIN,
+                     ).pack(side="left", padx=(0, 8))
+
+        self._max_bandwidth_var = tk.StringVar(value=str(_sched_cfg["max_bandwidth_kbps"]))
+        ctk.CTkEntry(
+            bw_row, textvariable=self._max_bandwidth_var,
+            width=scaled(90), font=FONT_NORMAL,
+        ).pack(side="left")
+
+        ctk.CTkLabel(
+            dl_sec,
+            text="Shared by every Nexus download. 0 = unlimited.",
+            font=FONT_SMALL, text_color=TEXT_DIM, anchor="w", justify="left",
+        ).pack(anchor="w", pady=(2, 0))
+
         # ==== Collections ====
         col_sec = _begin_section("Collections")
 
@@ -1050,6 +1196,37 @@ class SettingsPanel(ctk.CTkFrame):
                 font=FONT_SMALL, text_color=TEXT_DIM, anchor="w", justify="left",
             ).pack(anchor="w", pady=(2, 0))
 
+        # ==== Profile Backups ====
+        bk_sec = _begin_section("Profile Backups")
+
+        _bk_cfg = load_backup_settings()
+        self._backup_vars: dict[str, tk.StringVar] = {}
+        for key, text in (
+            ("keep_last", "Keep newest:"),
+            ("keep_daily", "Keep one per day for (days):"),
+            ("keep_weekly", "Keep one per week for (weeks):"),
+        ):
+            row = ctk.CTkFrame(bk_sec, fg_color="transparent")
+            row.pack(anchor="w", pady=(0, 6))
+            ctk.CTkLabel(row, text=text, font=FONT_NORMAL, text_color=TEXT_MAIN,
+                         width=scaled(230), anchor="w").pack(side="left", padx=(0, 8))
+            var = tk.StringVar(value=str(_bk_cfg[key]))
+            ctk.CTkEntry(row, textvariable=var, width=scaled(60), font=FONT_NORMAL,
+                         ).pack(side="left")
+            self._backup_vars[key] = var
+
+        self._backup_compress_var = tk.BooleanVar(value=_bk_cfg["compress"])
+        ctk.CTkCheckBox(
+            bk_sec, text="Compress backups", variable=self._backup_compress_var,
+            font=FONT_NORMAL, text_color=TEXT_MAIN,
+        ).pack(anchor="w", pady=(4, 0))
+        ctk.CTkLabel(
+            bk_sec,
+            text="A backup is made before every deploy. Older ones are pruned unless\n"
+                 "they match one of the rules above or are marked Keep.",
+            font=FONT_SMALL, text_color=TEXT_DIM, anchor="w", justify="left",
+        ).pack(anchor="w", pady=(2, 0))
+
         # ==== Theme ====
         theme_sec = _begin_section("Theme")
 
@@ -1338,17 +1515,7 @@ class SettingsPanel(ctk.CTkFrame):
                       ).pack(side="right", padx=(0, 4), pady=8)
 
     def _read_raw_ini(self) -> str:
-        import configparser
-        from Utils.ui_config import get_ui_config_path
-        path = get_ui_config_path()
-        if not path.is_file():
-            return "auto"
-        try:
-            p = configparser.ConfigParser()
-            p.read(path)
-            return p.get("ui", "scale", fallback="auto").strip().lower()
-        except Exception:
-            return "auto"
+        return load_ui_scale_setting()
 
     def _on_slider(self, _value=None):
         v = round(self._scale_var.get() * 20) / 20
@@ -1717,6 +1884,9 @@ class SettingsPanel(ctk.CTkFrame):
         save_normalize_folder_case(self._norm_case_var.get())
         save_clear_archive_after_install(self._clear_archive_var.get())
         save_keep_fomod_archives(self._keep_fomod_archives_var.get())
+        save_direct_staging_extract(self._direct_staging_var.get())
+        self._save_extract_cache_settings()
+        self._save_backup_settings()
         save_rename_mod_after_install(self._rename_after_install_var.get())
         save_restore_on_close(self._restore_on_close_var.get())
         if hasattr(self, "_allow_prerelease_var"):
@@ -1732,8 +1902,38 @@ class SettingsPanel(ctk.CTkFrame):
         save_steam_libraries_vdf_path(self._steam_vdf_var.get())
         save_default_staging_path(self._default_staging_var.get())
         self._save_download_cache_path_with_migration()
+        self._save_download_scheduler_settings()
         self._on_done(self)
 
+    def _save_extract_cache_settings(self):
+        try:
+            max_gb = int(self._extract_cache_gb_var.get().strip())
+        except ValueError:
+            max_gb = load_extract_cache_settings()["max_gb"]
+        save_extract_cache_settings(self._extract_cache_var.get(), max_gb)
+
+    def _save_backup_settings(self):
+        current = load_backup_settings()
+        values = {}
+        for key, var in self._backup_vars.items():
+            try:
+                values[key] = int(var.get().strip())
+            except ValueError:
+                values[key] = current[key]
+        save_backup_settings(compress=self._backup_compress_var.get(), **values)
+
+    def _save_download_scheduler_settings(self):
+        """Persist the scheduler caps and apply them to the running scheduler."""
+        try:
+            kbps = max(0, int(self._max_bandwidth_var.get().strip() or "0"))
+        except ValueError:
+            kbps = load_download_scheduler_settings()["max_bandwidth_kbps"]
+        max_connections = int(round(self._max_connections_var.get()))
+        save_download_scheduler_settings(max_connections, kbps)
+        from Nexus.download_scheduler import get_download_scheduler
+        get_download_scheduler().configure(
+            max_connections=max_connections, max_bytes_per_sec=kbps * 1024)
+
     def _on_close(self):
         self._on_done(self)
 
@@ -1746,6 +1946,9 @@ class SettingsPanel(ctk.CTkFrame):
         save_normalize_folder_case(self._norm_case_var.get())
         save_clear_archive_after_install(self._clear_archive_var.get())
         save_keep_fomod_archives(self._keep_fomod_archives_var.get())
+        save_direct_staging_extract(self._direct_staging_var.get())
+        self._save_extract_cache_settings()
+        self._save_backup_settings()
         save_rename_mod_after_install(self._rename_after_install_var.get())
         save_restore_on_close(self._restore_on_close_var.get())
         if hasattr(self, "_allow_prerelease_var"):
@@ -1761,7 +1964,12 @@ class SettingsPanel(ctk.CTkFrame):
         save_steam_libraries_vdf_path(self._steam_vdf_var.get())
         save_default_staging_path(self._default_staging_var.get())
         self._save_download_cache_path_with_migration()
+        self._save_download_scheduler_settings()
         self._on_done(self)
+        # execv skips atexit — write pending settings and profile state first.
+        flush_ui_config()
+        from Utils.profile_state import flush_profile_state
+        flush_profile_state()
         python = sys.executable
         os.execv(python, [python] + sys.argv)
 
@@ -53,7 +53,9 @@ from Utils.plugin_loader import get_all_wizard_tools
 from Utils.config_paths import get_profiles_dir
 from Utils.deploy import deploy_root_folder, restore_root_folder, LinkMode, load_per_mod_strip_prefixes, deploy_root_flagged_mods
 from Utils.filemap import build_filemap
+from Utils import perf_trace
 from Utils.profile_backup import create_backup
+from Utils.profile_state import flush_profile_state
 
 
 # ---------------------------------------------------------------------------
@@ -460,6 +462,8 @@ class TopBar(ctk.CTkFrame):
 
     def _reload_mod_panel(self):
         """Tell the mod panel and plugin panel to load the current game + profile."""
+        # Write out the outgoing profile's pending state edits first.
+        flush_profile_state()
         app = self.winfo_toplevel()
         if not hasattr(app, "_mod_panel"):
             return
@@ -698,7 +702,7 @@ class TopBar(ctk.CTkFrame):
 
         # Game already configured — just switch to it without re-running AddGameDialog
         if already_configured:
-            configured = sorted(n for n, g in _gh._GAMES.items() if g.is_configured())
+            configured = sorted(_gh._GAMES.configured_names())
             self._game_menu.configure(values=configured or ["No games configured"])
             self._game_var.set(result)
             _save_last_game(result)
@@ -716,7 +720,7 @@ class TopBar(ctk.CTkFrame):
         def _on_add_done(panel):
             if panel.result is not None:
                 self._log(f"Game path set: {panel.result}")
-                configured = sorted(n for n, g in _gh._GAMES.items() if g.is_configured())
+                configured = sorted(_gh._GAMES.configured_names())
                 self._game_menu.configure(values=configured or ["No games configured"])
                 if result in configured:
                     self._game_var.set(result)
@@ -759,7 +763,7 @@ class TopBar(ctk.CTkFrame):
                         self._log(f"Deleted custom game: {game_name}")
                         _gh._GAMES.pop(game_name, None)
                         game.load_paths()
-                        configured = sorted(n for n, g in _gh._GAMES.items() if g.is_configured())
+                        configured = sorted(_gh._GAMES.configured_names())
                         self._game_menu.configure(values=configured or ["No games configured"])
                         if configured:
                             self._game_var.set(configured[0])
@@ -775,7 +779,7 @@ class TopBar(ctk.CTkFrame):
                                 if getattr(p, "removed", False):
                                     self._log(f"Removed instance: {panel.saved_game.name}")
                                     updated_game.load_paths()
-                                    configured = sorted(n for n, g in _gh._GAMES.items() if g.is_configured())
+                                    configured = sorted(_gh._GAMES.configured_names())
                                     self._game_menu.configure(values=configured or ["No games configured"])
                                     if configured:
                                         self._game_var.set(configured[0])
@@ -797,7 +801,7 @@ class TopBar(ctk.CTkFrame):
                     self._log(f"Deleted custom game: {game_name}")
                     _gh._GAMES.pop(game_name, None)
                     game.load_paths()
-                    configured = sorted(n for n, g in _gh._GAMES.items() if g.is_configured())
+                    configured = sorted(_gh._GAMES.configured_names())
                     self._game_menu.configure(values=configured or ["No games configured"])
                     if configured:
                         self._game_var.set(configured[0])
@@ -815,7 +819,7 @@ class TopBar(ctk.CTkFrame):
                 if getattr(panel, "removed", False):
                     self._log(f"Removed instance: {game_name}")
                     game.load_paths()
-                    configured = sorted(n for n, g in _gh._GAMES.items() if g.is_configured())
+                    configured = sorted(_gh._GAMES.configured_names())
                     self._game_menu.configure(values=configured or ["No games configured"])
                     if configured:
                         self._game_var.set(configured[0])
@@ -833,7 +837,7 @@ class TopBar(ctk.CTkFrame):
             if getattr(dialog, "removed", False):
                 self._log(f"Removed instance: {game_name}")
                 game.load_paths()
-                configured = sorted(n for n, g in _gh._GAMES.items() if g.is_configured())
+                configured = sorted(_gh._GAMES.configured_names())
                 self._game_menu.configure(values=configured or ["No games configured"])
                 if configured:
                     self._game_var.set(configured[0])
@@ -1006,8 +1010,9 @@ class TopBar(ctk.CTkFrame):
                     _tlog(f"Backup skipped: {backup_err}")
 
                 deploy_mode = game.get_deploy_mode() if hasattr(game, "get_deploy_mode") else LinkMode.HARDLINK
-                game.deploy(log_fn=_tlog, profile=profile, progress_fn=_progress,
-                            mode=deploy_mode)
+                with perf_trace.operation("deploy", game=game.name, profile=profile):
+                    game.deploy(log_fn=_tlog, profile=profile, progress_fn=_progress,
+                                mode=deploy_mode)
 
                 # Apply Wine DLL overrides (user-added + handler-defined)
                 from Utils.wine_dll_config import deploy_game_wine_dll_overrides
@@ -1097,7 +1102,8 @@ class TopBar(ctk.CTkFrame):
                         game.get_profile_root() / "profiles" / last_deployed
                     )
                 if hasattr(game, "restore"):
-                    game.restore(log_fn=_tlog, progress_fn=_progress)
+                    with perf_trace.operation("restore", game=game.name):
+                        game.restore(log_fn=_tlog, progress_fn=_progress)
                 else:
                     _tlog(f"Restore: '{game_name}' does not support restore.")
                 # Restore Root_Folder using the last-deployed profile's Root_Folder.
@@ -24,6 +24,7 @@ import customtkinter as ctk
 from Nexus.nexus_meta import read_meta
 from Utils.config_paths import get_fomod_selections_path
 from Utils.plugins import read_plugins
+from Utils.profile_state import flush_profile_state
 from Utils.portal_filechooser import pick_save_file
 from gui.ctk_components import CTkAlert
 import gui.theme as _theme
@@ -1038,6 +1039,7 @@ class WorkshopDialog(tk.Frame):
                 # Bundle profile state files: fixed names + any *.ini files.
                 if profile_dir:
                     pdir = Path(profile_dir)
+                    flush_profile_state(pdir)
                     fixed = [
                         "modlist.txt",
                         "plugins.txt",